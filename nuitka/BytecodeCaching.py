@@ -5,17 +5,59 @@
 
 Initially this deals with preserving compiled module state after bytecode demotion
 such that it allows to restore it directly.
+
+With "--experimental=module-tree-cache" it also preserves the optimized tree of
+compiled modules, such that it can be restored instead of optimizing them again.
 """
 
 import os
+import pickle
 import sys
+import types
+from contextlib import contextmanager
 
+from nuitka import ModuleRegistry
+from nuitka.Builtins import builtin_anon_names, builtin_anon_value_list
 from nuitka.containers.OrderedSets import OrderedSet
 from nuitka.importing.Importing import locateModule, makeModuleUsageAttempt
+from nuitka.importing.Recursion import decideRecursion
 from nuitka.ModuleRegistry import getModuleOptimizationTimingInfos
+from nuitka.nodes import LocalsScopes
+from nuitka.nodes.FunctionNodes import (
+    ExpressionFunctionPureBody,
+    ExpressionFunctionPureInlineConstBody,
+)
+from nuitka.nodes.ModuleNodes import PythonModuleBase
+from nuitka.options.Options import (
+    getExperimentalIndications,
+    getFileReferenceMode,
+    getModuleNameMode,
+    hasPythonFlagNoAnnotations,
+    hasPythonFlagNoAsserts,
+    hasPythonFlagNoDocStrings,
+    hasPythonFlagPackageMode,
+    isExperimental,
+    isPythonPgoMode,
+    isStandaloneMode,
+    shallDisableBytecodeCacheUsage,
+    shallMakeModule,
+    shallMakePackage,
+)
 from nuitka.plugins.Hooks import getPluginsCacheContributionValues
+from nuitka.States import states
+from nuitka.Tracing import optimization_logger
+from nuitka.tree.InternalModule import (
+    getInternalHelperFunctionFactory,
+    getInternalModule,
+)
 from nuitka.utils.AppDirs import getCacheDir
-from nuitka.utils.FileOperations import getNormalizedPathJoin, makePath
+from nuitka.utils.Distributions import getDistribution, getDistributionVersion
+from nuitka.utils.FileOperations import (
+    getNormalizedPathJoin,
+    makePath,
+    openTextFile,
+    replaceFileAtomic,
+)
 from nuitka.utils.Hashing import Hash, getStringHash
 from nuitka.utils.Json import loadJsonFromFilename, writeJsonToFilename
 from nuitka.utils.ModuleNames import ModuleName
@@ -44,6 +86,21 @@ def makeCacheName(module_name, source_code):
     )
 
 
+def _locateUsedModule(used_module_name, finding):
+    if finding == "relative":
+        _used_module_name, filename, module_kind, finding = locateModule(
+            module_name=used_module_name.getBasename(),
+            parent_package=used_module_name.getPackageName(),
+            level=1,
+        )
+    else:
+        _used_module_name, filename, module_kind, finding = locateModule(
+            module_name=used_module_name, parent_package=None, level=0
+        )
+
+    return filename, module_kind, finding
+
+
 def hasCachedImportedModuleUsageAttempts(module_name, source_code, source_ref):
     result = getCachedImportedModuleUsageAttempts(
         module_name=module_name, source_code=source_code, source_ref=source_ref
@@ -53,7 +110,7 @@ def hasCachedImportedModuleUsageAttempts(module_name, source_code, source_ref):
 
 
 # Bump this is format is changed or enhanced implementation might different ones.
-_cache_format_version = 8
+_cache_format_version = 9
 
 
 def getCachedImportedModuleUsageAttempts(module_name, source_code, source_ref):
@@ -80,16 +137,9 @@ def getCachedImportedModuleUsageAttempts(module_name, source_code, source_ref):
         used_module_name = ModuleName(module_used["module_name"])
 
         # Retry the module scan to see if it still gives same result
-        if module_used["finding"] == "relative":
-            _used_module_name, filename, module_kind, finding = locateModule(
-                module_name=used_module_name.getBasename(),
-                parent_package=used_module_name.getPackageName(),
-                level=1,
-            )
-        else:
-            _used_module_name, filename, module_kind, finding = locateModule(
-                module_name=used_module_name, parent_package=None, level=0
-            )
+        filename, module_kind, finding = _locateUsedModule(
+            used_module_name=used_module_name, finding=module_used["finding"]
+        )
 
         if (
             finding != module_used["finding"]
@@ -170,6 +220,416 @@ def _getModuleConfigHash(full_name):
     return hash_value.asHexDigest()
 
 
+# Bump this if the tree cache format is changed, the node classes themselves are
+# covered by the Nuitka version being part of the hash.
+_tree_cache_format_version = 1
+
+# Modules whose tree was restored from cache, with the helper functions they
+# use, and the cache names of compiled modules, to write them after optimization.
+_restored_module_trees = {}
+_module_tree_cache_names = {}
+
+
+class ModuleTreeNotCacheable(Exception):
+    """Raised when a module tree references things that cannot be restored."""
+
+
+def isModuleTreeCacheUsage():
+    return (
+        isExperimental("module-tree-cache")
+        and not shallDisableBytecodeCacheUsage()
+        and not isPythonPgoMode()
+    )
+
+
+def makeModuleTreeCacheName(module_name, module_filename, source_code):
+    """Cache name for the optimized tree of a module.
+
+    Unlike the source code, these options change the tree building and
+    optimization result. The filename is included, because the tree has
+    source references to it.
+    """
+
+    hash_value = Hash()
+
+    hash_value.updateFromValues(
+        os.path.abspath(module_filename),
+        repr(
+            (
+                hasPythonFlagNoAsserts(),
+                hasPythonFlagNoDocStrings(),
+                hasPythonFlagNoAnnotations(),
+                hasPythonFlagPackageMode(),
+                isStandaloneMode(),
+                shallMakeModule(),
+                shallMakePackage(),
+                getFileReferenceMode(),
+                getModuleNameMode(),
+                states.is_debug,
+            )
+        ),
+        *sorted(set(getExperimentalIndications()))
+    )
+
+    return makeCacheName(module_name, source_code) + "@" + hash_value.asHexDigest()
+
+
+def _getGlobalObjectIds():
+    # Nuitka singletons, e.g. shapes, are identified by module and attribute
+    # name, as are the values of built-ins that cannot be pickled.
+    result = {}
+
+    for module_name, module in tuple(sys.modules.items()):
+        if (
+            module is None
+            or not module_name.startswith("nuitka.")
+            or module_name.startswith("nuitka.build.inline_copy")
+        ):
+            continue
+
+        for attribute_name, value in tuple(module.__dict__.items()):
+            if type(value).__module__.startswith("nuitka.") and not isinstance(
+                value, (type, types.FunctionType, types.ModuleType)
+            ):
+                result[id(value)] = ("global", module_name, attribute_name)
+
+    for value in builtin_anon_value_list:
+        for anon_name, anon_value in builtin_anon_names.items():
+            if anon_value is value:
+                result[id(value)] = ("anon", anon_name)
+
+    result[id(sys.version_info)] = ("version_info",)
+
+    return result
+
+
+class _ModuleTreePickler(pickle.Pickler):
+    def __init__(self, file_handle, module, global_object_ids):
+        pickle.Pickler.__init__(self, file_handle, -1)
+
+        self.module = module
+        self.global_object_ids = global_object_ids
+        self.helper_functions = []
+
+    def persistent_id(self, obj):
+        result = self.global_object_ids.get(id(obj))
+
+        if result is not None:
+            return result
+
+        obj_type = type(obj)
+
+        if obj_type is types.ModuleType:
+            return ("module", obj.__name__)
+
+        if obj_type in (
+            ExpressionFunctionPureBody,
+            ExpressionFunctionPureInlineConstBody,
+        ):
+            factory = getInternalHelperFunctionFactory(obj)
+
+            if factory is None:
+                raise ModuleTreeNotCacheable("unknown helper", obj.getName())
+
+            self.helper_functions.append(factory)
+
+            return ("helper",) + factory
+
+        # Other modules are not restored with this one, and nodes normally refer
+        # to them by name only. Trees that do otherwise are not cached, which
+        # is not happening for the standard library modules.
+        if obj is not self.module and isinstance(obj, PythonModuleBase):
+            raise ModuleTreeNotCacheable("foreign module", obj.getFullName())
+
+        return None
+
+
+class _ModuleTreeUnpickler(pickle.Unpickler):
+    def __init__(self, file_handle):
+        pickle.Unpickler.__init__(self, file_handle)
+
+        self.helper_functions = OrderedSet()
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+
+        if kind == "global":
+            __import__(pid[1])
+            return getattr(sys.modules[pid[1]], pid[2])
+        elif kind == "anon":
+            return builtin_anon_names[pid[1]]
+        elif kind == "version_info":
+            return sys.version_info
+        elif kind == "module":
+            __import__(pid[1])
+            return sys.modules[pid[1]]
+        elif kind == "helper":
+            __import__(pid[1])
+            function_body = getattr(sys.modules[pid[1]], pid[2])()
+
+            # Helpers no longer used by any module may have been released already.
+            if function_body not in getInternalModule().subnode_functions:
+                raise ModuleTreeNotCacheable("released helper", pid[2])
+
+            self.helper_functions.add(function_body)
+
+            return function_body
+        else:
+            raise pickle.UnpicklingError("unknown persistent id %r" % (pid,))
+
+
+def _getUsedModulesCacheData(module):
+    result = []
+
+    for module_usage_attempt in module.getUsedModules():
+        if module_usage_attempt.finding in ("not-found", "built-in"):
+            decision = None
+        else:
+            decision, _reason = decideRecursion(
+                using_module_name=module.getFullName(),
+                module_filename=module_usage_attempt.filename,
+                module_name=module_usage_attempt.module_name,
+                module_kind=module_usage_attempt.module_kind,
+            )
+
+        result.append(
+            (
+                module_usage_attempt.module_name.asString(),
+                module_usage_attempt.finding,
+                module_usage_attempt.module_kind,
+                module_usage_attempt.filename,
+                decision,
+            )
+        )
+
+    return result
+
+
+def _getDistributionsCacheData(module):
+    result = {}
+
+    for distribution_name in module.getUsedDistributions():
+        distribution = getDistribution(distribution_name)
+
+        result[distribution_name] = (
+            getDistributionVersion(distribution) if distribution is not None else None
+        )
+
+    return result
+
+
+def _areUsedModulesUnchanged(module_name, modules_used):
+    for used_module_name, finding, module_kind, filename, decision in modules_used:
+        used_module_name = ModuleName(used_module_name)
+
+        # Retry the module scan and inclusion decision, to see if it still gives
+        # same result.
+        new_filename, new_module_kind, new_finding = _locateUsedModule(
+            used_module_name=used_module_name, finding=finding
+        )
+
+        if (new_finding, new_module_kind, new_filename) != (
+            finding,
+            module_kind,
+            filename,
+        ):
+            return False
+
+        if finding not in ("not-found", "built-in"):
+            new_decision, _reason = decideRecursion(
+                using_module_name=module_name,
+                module_filename=filename,
+                module_name=used_module_name,
+                module_kind=module_kind,
+            )
+
+            if new_decision != decision:
+                return False
+
+    return True
+
+
+def _areDistributionsUnchanged(distributions):
+    for distribution_name, version in distributions.items():
+        distribution = getDistribution(distribution_name)
+
+        new_version = (
+            getDistributionVersion(distribution) if distribution is not None else None
+        )
+
+        if new_version != version:
+            return False
+
+    return True
+
+
+def _isModuleTreeCacheValid(module_name, header):
+    return (
+        header.get("file_format_version") == _tree_cache_format_version
+        and header["module_name"] == module_name
+        and _areUsedModulesUnchanged(module_name, header["modules_used"])
+        and _areDistributionsUnchanged(header["distributions"])
+    )
+
+
+@contextmanager
+def _withRecursionLimit(limit):
+    # Deep trees need a higher recursion limit for pickling.
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, limit))
+
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+
+def loadModuleTreeFromCache(module_name, cache_name, reason):
+    """Restore the optimized tree of a compiled module from cache.
+
+    Returns:
+        the module or None if there is no usable cache entry
+    """
+
+    cache_filename = _getCacheFilename(cache_name, "tree")
+
+    if not os.path.exists(cache_filename):
+        return None
+
+    try:
+        with openTextFile(cache_filename, "rb") as cache_file:
+            unpickler = _ModuleTreeUnpickler(cache_file)
+
+            if not _isModuleTreeCacheValid(module_name, unpickler.load()):
+                return None
+
+            with _withRecursionLimit(20000):
+                data = unpickler.load()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        optimization_logger.info_to_file_only(
+            "Cannot restore cached tree of '%s' due to '%s'." % (module_name, e)
+        )
+
+        if states.is_debug and not isinstance(e, ModuleTreeNotCacheable):
+            raise
+
+        return None
+
+    # Names of locals dictionaries are unique, and must remain so.
+    for locals_name in data["locals_dict_handles"]:
+        if locals_name in LocalsScopes.locals_dict_handles:
+            return None
+
+    LocalsScopes.locals_dict_handles.update(data["locals_dict_handles"])
+
+    module = data["module"]
+    module.reason = reason
+
+    ModuleRegistry.setModuleOptimizationTimingInfos(module_name, data["timing_infos"])
+
+    _restored_module_trees[module] = tuple(unpickler.helper_functions)
+
+    return module
+
+
+def isRestoredModuleTree(module):
+    return module in _restored_module_trees
+
+
+def getRestoredModuleTreeUsedHelperFunctions(module):
+    """Helper functions of the internal module used by a restored module."""
+    return _restored_module_trees[module]
+
+
+def rememberModuleTreeCacheName(module, cache_name):
+    _module_tree_cache_names[module] = cache_name
+
+
+def _writeModuleTreeToCache(module, cache_name, global_object_ids):
+    cache_filename = _getCacheFilename(cache_name, "tree")
+
+    # Same input gave the same result already.
+    if os.path.exists(cache_filename):
+        return
+
+    header = {
+        "file_format_version": _tree_cache_format_version,
+        "module_name": module.getFullName().asString(),
+        "modules_used": _getUsedModulesCacheData(module),
+        "distributions": _getDistributionsCacheData(module),
+    }
+
+    data = {
+        "module": module,
+        "locals_dict_handles": dict(
+            (locals_name, locals_handle)
+            for locals_name, locals_handle in LocalsScopes.locals_dict_handles.items()
+            if locals_handle.owner.getParentModule() is module
+        ),
+        "timing_infos": [
+            tuple(timing_info)
+            for timing_info in getModuleOptimizationTimingInfos(module.getFullName())
+        ],
+    }
+
+    makePath(os.path.dirname(cache_filename))
+
+    # Write to a temporary file first, such that parallel compilations never
+    # see partial contents.
+    tmp_filename = "%s.tmp%d" % (cache_filename, os.getpid())
+
+    try:
+        with openTextFile(tmp_filename, "wb") as cache_file:
+            pickler = _ModuleTreePickler(
+                file_handle=cache_file,
+                module=module,
+                global_object_ids=global_object_ids,
+            )
+            pickler.dump(header)
+
+            with _withRecursionLimit(20000):
+                pickler.dump(data)
+    except (
+        ModuleTreeNotCacheable,
+        pickle.PicklingError,
+        TypeError,
+        AttributeError,
+        RuntimeError,
+    ) as e:
+        optimization_logger.info_to_file_only(
+            "Cannot cache tree of '%s' due to '%s'." % (module.getFullName(), e)
+        )
+
+        os.unlink(tmp_filename)
+    else:
+        replaceFileAtomic(tmp_filename, cache_filename)
+
+
+def writeModuleTreesToCache():
+    """Write the optimized trees of compiled modules, that were not restored."""
+
+    # Scanning all Nuitka modules is not cheap, and the result is the same for
+    # all modules, so only do it once, and only if needed.
+    global_object_ids = None
+
+    for module in ModuleRegistry.getDoneModules():
+        cache_name = _module_tree_cache_names.get(module)
+
+        if (
+            cache_name is not None
+            and module.isCompiledPythonModule()
+            and module.getCompilationMode() == "compiled"
+        ):
+            if global_object_ids is None:
+                global_object_ids = _getGlobalObjectIds()
+
+            _writeModuleTreeToCache(
+                module=module,
+                cache_name=cache_name,
+                global_object_ids=global_object_ids,
+            )
+
+
 #     Part of "Nuitka", an optimizing Python compiler that is compatible and
 #     integrates with CPython, but also works on its own.
 #
@@ -37,6 +37,12 @@ def cleanCaches():
     _cleanCacheDirectory("zig", getCacheDir("zig"))
     _cleanCacheDirectory("bytecode", getBytecodeCacheDir())
     _cleanCacheDirectory("dll-dependencies", getCacheDir("library_dependencies"))
+    _cleanCacheDirectory("dll-copies", getCacheDir("dll-copies"))
+    _cleanCacheDirectory("package-config", getCacheDir("package-config"))
+    _cleanCacheDirectory("import-detection", getCacheDir("import-detection"))
+    _cleanCacheDirectory("data-composer", getCacheDir("data-composer"))
+    _cleanCacheDirectory("runtime", getCacheDir("runtime"))
+    _cleanCacheDirectory("compile-costs", getCacheDir("compile-costs"))
 
 
 #     Part of "Nuitka", an optimizing Python compiler that is compatible and
@@ -21,8 +21,11 @@ from nuitka.build.SconsUtils import (
     readSconsReport,
 )
 from nuitka.code_generation.CodeGeneration import (
+    discardCodeGenerationState,
+    fetchCodeGenerationState,
     generateHelpersCode,
     generateModuleCode,
+    mergeCodeGenerationState,
 )
 from nuitka.code_generation.ConstantCodes import (
     addDistributionMetadataValue,
@@ -59,6 +62,7 @@ from nuitka.options.Options import (
     getFileReferenceMode,
     getForcedStderrPath,
     getForcedStdoutPath,
+    getJobLimit,
     getMainArgs,
     getMainEntryPointFilenames,
     getMustIncludeModules,
@@ -91,6 +95,8 @@ from nuitka.options.Options import (
     isOnefileMode,
     isRemoveBuildDir,
     isRuntimeProfile,
+    isRuntimeSamplingProfiler,
+    isRuntimeStartupTrace,
     isShowInclusion,
     isShowMemory,
     isShowProgress,
@@ -170,6 +176,7 @@ from nuitka.utils.FileOperations import (
     isFilesystemEncodable,
     openTextFile,
     removeDirectory,
+    resolveShellPatternToFilenames,
 )
 from nuitka.utils.Importing import getPackageDirFilename
 from nuitka.utils.InstanceCounters import printInstanceCounterStats
@@ -198,7 +205,7 @@ from .freezer.Standalone import (
     signDistributionMacOS,
 )
 from .optimizations.Optimization import optimizeModules
-from .pgo.PGO import readPGOInputFile
+from .pgo.PGO import mergePGOInputFiles, readPGOInputFile
 from .reports.Reports import writeCompilationReports
 from .States import states
 from .tree.Building import buildMainModuleTree
@@ -457,6 +464,92 @@ def pickSourceFilenames(source_dir, modules):
     return module_filenames
 
 
+def _generateModuleSourceCode(current_module, c_filename):
+    source_code = generateModuleCode(
+        module=current_module,
+        data_filename=changeFilenameExtension(os.path.basename(c_filename), ".const"),
+    )
+
+    writeSourceCode(
+        filename=c_filename,
+        source_code=source_code,
+        logger=code_generation_logger,
+        assume_yes_for_downloads=assumeYesForDownloads(),
+    )
+
+
+# Modules to generate code for in worker processes, these are forked, and
+# therefore inherit the module trees, and are only given indexes.
+_code_generation_jobs = None
+
+
+def _generateModuleSourceCodeInWorker(job_index):
+    current_module, c_filename = _code_generation_jobs[job_index]
+
+    try:
+        _generateModuleSourceCode(current_module=current_module, c_filename=c_filename)
+    except SystemExit as e:
+        # Do not let the worker die without a result, that would hang the pool,
+        # and the error was already reported.
+        return e.code, None
+
+    return None, fetchCodeGenerationState(current_module.getFullName())
+
+
+def _getCodeGenerationJobCount(compiled_modules):
+    if not isExperimental("parallel-code-generation"):
+        return 1
+
+    # The workers are forked, spawning them would not inherit the module trees.
+    if not hasattr(os, "fork"):
+        return 1
+
+    return max(1, min(getJobLimit(), len(compiled_modules)))
+
+
+def _generateModulesSourceCodeInParallel(compiled_modules, module_filenames, jobs):
+    # Using global here, as this is given to forked workers,
+    # pylint: disable=global-statement
+    global _code_generation_jobs
+
+    import multiprocessing
+
+    _code_generation_jobs = tuple(
+        (current_module, module_filenames[current_module])
+        for current_module in compiled_modules
+    )
+
+    pool = multiprocessing.get_context("fork").Pool(
+        jobs, initializer=discardCodeGenerationState
+    )
+
+    try:
+        # Results are produced in module order, which makes merging the global
+        # state deterministic and identical to a serial run.
+        for current_module, (exit_code, code_generation_state) in zip(
+            compiled_modules,
+            pool.imap(
+                _generateModuleSourceCodeInWorker, range(len(compiled_modules))
+            ),
+        ):
+            if code_generation_state is None:
+                sys.exit(exit_code)
+
+            mergeCodeGenerationState(
+                module_name=current_module.getFullName(),
+                code_generation_state=code_generation_state,
+            )
+
+            reportProgressBar(
+                item=current_module.getFullName(),
+            )
+    finally:
+        pool.terminate()
+        pool.join()
+
+        _code_generation_jobs = None
+
+
 def makeSourceDirectory():
     """Get the full list of modules imported, create code for all of them."""
     # We deal with a lot of details here, but rather one by one, and split makes
@@ -520,29 +613,26 @@ def makeSourceDirectory():
         total=len(compiled_modules),
     )
 
+    code_generation_jobs = _getCodeGenerationJobCount(compiled_modules)
+
     # Generate code for compiled modules, this can be slow, so do it separately
     # with a progress bar.
-    for current_module in compiled_modules:
-        module_name = current_module.getFullName()
-        c_filename = module_filenames[current_module]
-
-        reportProgressBar(
-            item=module_name,
-        )
-
-        source_code = generateModuleCode(
-            module=current_module,
-            data_filename=changeFilenameExtension(
-                os.path.basename(c_filename), ".const"
-            ),
+    if code_generation_jobs > 1:
+        _generateModulesSourceCodeInParallel(
+            compiled_modules=compiled_modules,
+            module_filenames=module_filenames,
+            jobs=code_generation_jobs,
         )
+    else:
+        for current_module in compiled_modules:
+            reportProgressBar(
+                item=current_module.getFullName(),
+            )
 
-        writeSourceCode(
-            filename=c_filename,
-            source_code=source_code,
-            logger=code_generation_logger,
-            assume_yes_for_downloads=assumeYesForDownloads(),
-        )
+            _generateModuleSourceCode(
+                current_module=current_module,
+                c_filename=module_filenames[current_module],
+            )
 
     closeProgressBar()
 
@@ -582,7 +672,12 @@ def makeSourceDirectory():
     )
 
 
-def _runPgoBinary():
+def _getPgoRunsArgs():
+    # One run per workload given, and one without arguments, if none was.
+    return getPgoArgs() or [[]]
+
+
+def _runPgoBinary(pgo_args):
     pgo_executable = OutputDirectories.getPgoRunExecutable()
 
     if not os.path.isfile(pgo_executable):
@@ -591,7 +686,7 @@ def _runPgoBinary():
         )
 
     return callProcess(
-        [getExternalUsePath(pgo_executable)] + getPgoArgs(),
+        [getExternalUsePath(pgo_executable)] + pgo_args,
         shell=False,
     )
 
@@ -614,8 +709,13 @@ def _wasMsvcMode():
 def _deleteMsvcPGOFiles(pgo_mode):
     assert _wasMsvcMode()
 
+    # Every profiling run creates a numbered file, the linker merges them all.
+    for msvc_pgc_filename in resolveShellPatternToFilenames(
+        OutputDirectories.getResultBasePath(onefile=False) + "!*.pgc"
+    ):
+        deleteFile(msvc_pgc_filename, must_exist=False)
+
     msvc_pgc_filename = OutputDirectories.getResultBasePath(onefile=False) + "!1.pgc"
-    deleteFile(msvc_pgc_filename, must_exist=False)
 
     if pgo_mode == "use":
         msvc_pgd_filename = OutputDirectories.getResultBasePath(onefile=False) + ".pgd"
@@ -645,11 +745,14 @@ def _runCPgoBinary():
                 key="PATH",
             ),
         ):
-            exit_code_pgo = _runPgoBinary()
+            exit_codes_pgo = [
+                _runPgoBinary(pgo_args) for pgo_args in _getPgoRunsArgs()
+            ]
 
         pgo_data_collected = os.path.exists(msvc_pgc_filename)
     else:
-        exit_code_pgo = _runPgoBinary()
+        # The gcc profile files accumulate the information of all runs.
+        exit_codes_pgo = [_runPgoBinary(pgo_args) for pgo_args in _getPgoRunsArgs()]
 
         # gcc file suffix, spell-checker: ignore gcda
         gcc_constants_pgo_filename = getNormalizedPathJoin(
@@ -659,7 +762,7 @@ def _runCPgoBinary():
 
         pgo_data_collected = os.path.exists(gcc_constants_pgo_filename)
 
-    if exit_code_pgo != 0:
+    if any(exit_code_pgo != 0 for exit_code_pgo in exit_codes_pgo):
         pgo_logger.warning(
             """\
 Error, the C PGO compiled program error exited. Make sure it works \
@@ -683,17 +786,39 @@ def _runPythonPgoBinary():
 
     pgo_filename = OutputDirectories.getPgoRunInputFilename()
 
-    with withEnvironmentVarOverridden("NUITKA_PGO_OUTPUT", pgo_filename):
-        exit_code = _runPgoBinary()
+    pgo_runs_args = _getPgoRunsArgs()
+    pgo_run_filenames = []
 
-    if not os.path.exists(pgo_filename):
-        return general.sysexit(
-            """\
+    for count, pgo_args in enumerate(pgo_runs_args, start=1):
+        if len(pgo_runs_args) == 1:
+            pgo_run_filename = pgo_filename
+        else:
+            pgo_run_filename = "%s.%d" % (pgo_filename, count)
+
+        with withEnvironmentVarOverridden("NUITKA_PGO_OUTPUT", pgo_run_filename):
+            exit_code = _runPgoBinary(pgo_args)
+
+        if not os.path.exists(pgo_run_filename):
+            return general.sysexit(
+                """\
 Error, no Python PGO information produced, did the created binary
 run (exit code %d) as expected?"""
-            % exit_code
+                % exit_code
+            )
+
+        pgo_run_filenames.append(pgo_run_filename)
+
+    if len(pgo_run_filenames) > 1:
+        mergePGOInputFiles(
+            output_filename=pgo_filename,
+            weighted_input_filenames=[
+                (1, pgo_run_filename) for pgo_run_filename in pgo_run_filenames
+            ],
         )
 
+        for pgo_run_filename in pgo_run_filenames:
+            deleteFile(pgo_run_filename, must_exist=True)
+
     return pgo_filename
 
 
@@ -756,6 +881,12 @@ def runSconsBackend():
     if isRuntimeProfile():
         scons_options["profile_mode"] = asBoolStr(True)
 
+    if isRuntimeSamplingProfiler():
+        scons_options["sampling_profiler_mode"] = asBoolStr(True)
+
+    if isRuntimeStartupTrace():
+        scons_options["startup_trace_mode"] = asBoolStr(True)
+
     if shallTreatUninstalledPython():
         scons_options["uninstalled_python"] = asBoolStr(True)
 
@@ -35,6 +35,16 @@ ActiveModuleInfo = collections.namedtuple(
 # Already traversed modules
 done_modules = set()
 
+# Indexes by module name, as there are many modules, and lookups by name
+# are frequent. Multiple modules can have the same name, e.g. with different
+# kinds, therefore lists in order of addition.
+_active_modules_by_name = {}
+_done_modules_by_name = {}
+_active_modules_info_by_name = {}
+
+# Sorted done modules, cached until that set changes.
+_done_modules_sorted = None
+
 
 def addRootModule(module):
     root_modules.add(module)
@@ -136,41 +146,86 @@ def startTraversal():
     # Using global here, as this is really a singleton, in the form of a module,
     # pylint: disable=global-statement
     global active_modules, done_modules, active_modules_info
+    global _active_modules_by_name, _done_modules_by_name
+    global _active_modules_info_by_name, _done_modules_sorted
 
     active_modules = OrderedSet(root_modules)
 
+    _active_modules_by_name = {}
+    for root_module in root_modules:
+        _addModuleToIndex(_active_modules_by_name, root_module)
+
     active_modules_info = {}
+    _active_modules_info_by_name = {}
     for root_module in root_modules:
-        active_modules_info[root_module] = ActiveModuleInfo(
-            using_module=None,
-            usage_tag="root_module",
-            reason="Root module",
-            source_ref=None,
+        _addModuleInclusionInfo(
+            root_module,
+            ActiveModuleInfo(
+                using_module=None,
+                usage_tag="root_module",
+                reason="Root module",
+                source_ref=None,
+            ),
         )
+
     done_modules = set()
+    _done_modules_by_name = {}
+    _done_modules_sorted = None
 
     for active_module in active_modules:
         active_module.startTraversal()
 
 
+def _addModuleToIndex(index, module):
+    index.setdefault(module.getFullName(), []).append(module)
+
+
+def _removeModuleFromIndex(index, module):
+    module_name = module.getFullName()
+
+    modules = index[module_name]
+    modules.remove(module)
+
+    if not modules:
+        del index[module_name]
+
+
+def _addModuleInclusionInfo(module, info):
+    active_modules_info[module] = info
+
+    # First one wins, same as iterating the information would.
+    _active_modules_info_by_name.setdefault(module.getFullName(), info)
+
+
 def addUsedModule(module, using_module, usage_tag, reason, source_ref):
     if module not in done_modules and module not in active_modules:
         active_modules.add(module)
-
-        active_modules_info[module] = ActiveModuleInfo(
-            using_module=using_module,
-            usage_tag=usage_tag,
-            reason=reason,
-            source_ref=source_ref,
+        _addModuleToIndex(_active_modules_by_name, module)
+
+        _addModuleInclusionInfo(
+            module,
+            ActiveModuleInfo(
+                using_module=using_module,
+                usage_tag=usage_tag,
+                reason=reason,
+                source_ref=source_ref,
+            ),
         )
 
         module.startTraversal()
 
 
 def nextModule():
+    global _done_modules_sorted  # singleton, pylint: disable=global-statement
+
     if active_modules:
         result = active_modules.pop()
+        _removeModuleFromIndex(_active_modules_by_name, result)
+
         done_modules.add(result)
+        _addModuleToIndex(_done_modules_by_name, result)
+
+        _done_modules_sorted = None
 
         return result
     else:
@@ -186,19 +241,22 @@ def getDoneModulesCount():
 
 
 def getDoneModules():
-    return sorted(done_modules, key=lambda module: (module.getFullName(), module.kind))
+    global _done_modules_sorted  # singleton, pylint: disable=global-statement
+
+    if _done_modules_sorted is None:
+        _done_modules_sorted = tuple(
+            sorted(done_modules, key=lambda module: (module.getFullName(), module.kind))
+        )
+
+    return _done_modules_sorted
 
 
 def hasDoneModule(module_name):
-    return any(module.getFullName() == module_name for module in done_modules)
+    return module_name in _done_modules_by_name
 
 
 def getModuleInclusionInfoByName(module_name):
-    for module, info in active_modules_info.items():
-        if module.getFullName() == module_name:
-            return info
-
-    return None
+    return _active_modules_info_by_name.get(module_name)
 
 
 def getModuleFromCodeName(code_name):
@@ -225,15 +283,12 @@ def getOwnerFromCodeName(code_name):
 
 
 def getModuleByName(module_name):
-    for module in active_modules:
-        if module.getFullName() == module_name:
-            return module
+    modules = _active_modules_by_name.get(module_name)
 
-    for module in done_modules:
-        if module.getFullName() == module_name:
-            return module
+    if modules is None:
+        modules = _done_modules_by_name.get(module_name)
 
-    return None
+    return modules[0] if modules else None
 
 
 module_influencing_plugins = {}
@@ -304,12 +359,19 @@ ModuleOptimizationTimingInfo = makeNamedtupleClass(
         "cpu_cycles_count",
         "micro_passes",
         "merge_counts",
+        "function_computations",
     ),
 )
 
 
 def addModuleOptimizationTimeInformation(
-    module_name, pass_number, time_used, perf_counters, micro_passes, merge_counts
+    module_name,
+    pass_number,
+    time_used,
+    perf_counters,
+    micro_passes,
+    merge_counts,
+    function_computations,
 ):
     module_timing_info = list(module_timing_infos.get(module_name, []))
 
@@ -327,6 +389,7 @@ def addModuleOptimizationTimeInformation(
             cpu_cycles_count=perf_counters[1],
             micro_passes=micro_passes,
             merge_counts=merge_counts,
+            function_computations=function_computations,
         )
     )
     module_timing_infos[module_name] = tuple(module_timing_info)
@@ -342,6 +405,33 @@ def setModuleOptimizationTimingInfos(module_name, timing_infos):
     ]
 
 
+OptimizationPassInfo = makeNamedtupleClass(
+    "OptimizationPassInfo",
+    (
+        "pass_number",
+        "optimized_count",
+        "skipped_count",
+    ),
+)
+
+# Information about how many modules were optimized or skipped per pass.
+optimization_pass_infos = []
+
+
+def addOptimizationPassInformation(pass_number, optimized_count, skipped_count):
+    optimization_pass_infos.append(
+        OptimizationPassInfo(
+            pass_number=pass_number,
+            optimized_count=optimized_count,
+            skipped_count=skipped_count,
+        )
+    )
+
+
+def getOptimizationPassInfos():
+    return tuple(optimization_pass_infos)
+
+
 ModuleCodeGenerationTimingInfo = makeNamedtupleClass(
     "ModuleOptimizationTimingInfo",
     (
@@ -367,6 +457,12 @@ def getModuleCodeGenerationTimingInfos(module_name):
     return module_generation_time_infos.get(module_name)
 
 
+def setModuleCodeGenerationTimingInfos(module_name, timing_info):
+    module_generation_time_infos[module_name] = ModuleCodeGenerationTimingInfo(
+        *timing_info
+    )
+
+
 def getImportedModuleNames():
     result = OrderedSet()
 
@@ -8,9 +8,14 @@ import subprocess
 import sys
 
 from nuitka.containers.OrderedDicts import OrderedDict
+from nuitka.options.Options import (
+    getJobLimit,
+    shallDisableDataComposerCacheUsage,
+)
 from nuitka.plugins.Hooks import onDataComposerResult, onDataComposerRun
 from nuitka.States import states
 from nuitka.Tracing import data_composer_logger
+from nuitka.utils.AppDirs import getCacheDir
 from nuitka.utils.Execution import withEnvironmentVarsOverridden
 from nuitka.utils.FileOperations import (
     changeFilenameExtension,
@@ -68,6 +73,12 @@ def _runDataComposer(source_dir):
                     source_dir,
                     blob_filename,
                     stats_filename,
+                    (
+                        ""
+                        if shallDisableDataComposerCacheUsage()
+                        else getCacheDir("data-composer")
+                    ),
+                    str(getJobLimit()),
                 ],
                 shell=False,
             )
@@ -1,7 +1,13 @@
 #     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
 
 
-"""Caching of C compiler output."""
+"""Caching of C compiler output.
+
+Besides using ccache and clcache, the object file of the runtime, i.e. the
+static C code of Nuitka that is the same for all compilations, is cached in
+the Nuitka cache directory, so it can be reused across compilations of the
+same Python version with the same compiler and flags.
+"""
 
 import ast
 import os
@@ -15,13 +21,17 @@ from nuitka.utils.AppDirs import getCacheDir
 from nuitka.utils.Download import getCachedDownload
 from nuitka.utils.FileOperations import (
     areSamePaths,
+    copyFile,
     getExternalUsePath,
     getFileContentByLine,
     getFileContents,
+    getFileList,
     getLinkTarget,
     getNormalizedPathJoin,
     makePath,
+    replaceFileAtomic,
 )
+from nuitka.utils.Hashing import Hash
 from nuitka.utils.Importing import importFromInlineCopy
 from nuitka.utils.Utils import hasMacOSIntelSupport, isMacOS
 
@@ -459,6 +469,205 @@ def runClCache(args, env):
     return result
 
 
+# The runtime is compiled from this file only, it includes all the other
+# static C code as a unity build.
+_runtime_source_basename = "CompiledFunctionType"
+
+
+def _getRuntimeAction(module_mode, source_filename):
+    # pylint: disable=I0021,import-error
+    import SCons.Defaults
+
+    if source_filename.endswith(".cpp"):
+        if module_mode:
+            return "$SHCXXCOM", SCons.Defaults.ShCXXAction
+        else:
+            return "$CXXCOM", SCons.Defaults.CXXAction
+    else:
+        if module_mode:
+            return "$SHCCCOM", SCons.Defaults.ShCAction
+        else:
+            return "$CCCOM", SCons.Defaults.CAction
+
+
+def _updateRuntimeHashFromFiles(hash_value, dirname, only_suffixes):
+    for filename in getFileList(dirname, only_suffixes=only_suffixes):
+        hash_value.updateFromValues(os.path.relpath(filename, dirname))
+        hash_value.updateFromFile(filename)
+
+
+def _getRuntimeObjectCacheKey(env, command, target_filename, source_filename):
+    hash_value = Hash()
+
+    # The build directory and with it the file names differ between
+    # compilations, but these do not influence the object file.
+    for path, replacement in (
+        (target_filename, "<target>"),
+        (source_filename, "<source>"),
+        (env.source_dir, "<source_dir>"),
+    ):
+        command = command.replace(os.path.abspath(path), replacement)
+        command = command.replace(path, replacement)
+
+    hash_value.updateFromValues(command)
+
+    # Updates of the C compiler are not visible in the command line.
+    compiler_stat = os.stat(getExecutablePath(env.the_compiler, env=env))
+    hash_value.updateFromValues(compiler_stat.st_size, int(compiler_stat.st_mtime))
+
+    # Patch releases of Python do not change the include path, but maybe the
+    # headers.
+    for include_dir in env["CPPPATH"]:
+        if os.path.exists(os.path.join(include_dir, "Python.h")):
+            for header_basename in ("patchlevel.h", "pyconfig.h"):
+                header_filename = os.path.join(include_dir, header_basename)
+
+                if os.path.exists(header_filename):
+                    hash_value.updateFromFile(header_filename)
+
+    # The static C code and include files of Nuitka, and the generated header
+    # files the runtime uses from the build directory.
+    _updateRuntimeHashFromFiles(
+        hash_value=hash_value,
+        dirname=os.path.join(env.nuitka_src, "static_src"),
+        only_suffixes=(".c", ".cpp", ".h"),
+    )
+    _updateRuntimeHashFromFiles(
+        hash_value=hash_value,
+        dirname=os.path.join(env.nuitka_src, "include"),
+        only_suffixes=(".h",),
+    )
+    _updateRuntimeHashFromFiles(
+        hash_value=hash_value,
+        dirname=os.path.join(env.nuitka_src, "inline_copy", "libbacktrace"),
+        only_suffixes=(".h",),
+    )
+
+    for header_basename in ("__constants.h", "extra_python_includes.h"):
+        header_filename = os.path.join(env.source_dir, header_basename)
+
+        if os.path.exists(header_filename):
+            hash_value.updateFromValues(header_basename)
+            hash_value.updateFromFile(header_filename)
+
+    return hash_value.asHexDigest()
+
+
+def _makeRuntimeObjectBuilder(module_mode, cache_dir):
+    def buildRuntimeObject(target, source, env):
+        target_filename = str(target[0])
+        source_filename = str(source[0])
+
+        com, action = _getRuntimeAction(
+            module_mode=module_mode, source_filename=source_filename
+        )
+
+        cache_filename = getNormalizedPathJoin(
+            cache_dir,
+            _getRuntimeObjectCacheKey(
+                env=env,
+                command=env.subst(com, target=target, source=source),
+                target_filename=target_filename,
+                source_filename=source_filename,
+            )
+            + os.path.splitext(target_filename)[1],
+        )
+
+        if os.path.exists(cache_filename):
+            scons_details_logger.info(
+                "Using cached runtime object file '%s'." % cache_filename
+            )
+
+            copyFile(cache_filename, target_filename)
+            updateSconsProgressBar()
+
+            return 0
+
+        result = action(target, source, env)
+
+        if result == 0:
+            # Other compilations might store it at the same time.
+            tmp_filename = "%s.tmp%d" % (cache_filename, os.getpid())
+
+            copyFile(target_filename, tmp_filename)
+            replaceFileAtomic(tmp_filename, cache_filename)
+
+            scons_details_logger.info(
+                "Stored runtime object file in cache as '%s'." % cache_filename
+            )
+
+        return result
+
+    return buildRuntimeObject
+
+
+def _getRuntimeObjectActionString(target, source, env):
+    # signature needed towards Scons core, pylint: disable=unused-argument
+    return "Compiling runtime '%s' (cached)." % source[0]
+
+
+def enableRuntimeObjectCaching(env, source_files, disable_runtime_cache):
+    """Compile the runtime via a cached object file.
+
+    The runtime source file in source_files is replaced with the object file,
+    which is then taken from the cache, if the compiler, its flags, and the
+    static C code are the same as for a previous compilation.
+
+    With C PGO, the object file depends on the profile data, or refers to
+    the path of it, so it is not cached then. With MSVC, the command lines
+    use temporary files, and clcache covers the runtime already.
+    """
+
+    if (
+        disable_runtime_cache
+        or not env.gcc_mode
+        or env.pgo_mode in ("generate", "use")
+    ):
+        return
+
+    module_mode = env.module_mode or env.dll_mode
+
+    for count, source_filename in enumerate(source_files):
+        source_dirname, source_basename = os.path.split(source_filename)
+
+        if os.path.splitext(source_basename)[0] == _runtime_source_basename and (
+            os.path.basename(source_dirname) == "static_src"
+        ):
+            break
+    else:
+        return
+
+    cache_dir = getCacheDir("runtime")
+    makePath(cache_dir)
+
+    object_filename = os.path.splitext(source_filename)[0] + env.subst(
+        "$SHOBJSUFFIX" if module_mode else "$OBJSUFFIX"
+    )
+
+    # pylint: disable=I0021,import-error
+    import SCons.Action
+
+    target = env.Command(
+        object_filename,
+        source_filename,
+        SCons.Action.Action(
+            _makeRuntimeObjectBuilder(module_mode=module_mode, cache_dir=cache_dir),
+            strfunction=_getRuntimeObjectActionString,
+        ),
+    )
+
+    # Scons checks this for objects linked into shared libraries.
+    if module_mode:
+        for node in target:
+            node.attributes.shared = 1
+
+    # Generated header files in the build directory are not scanned for by
+    # Scons for this, but the cache key has them, so always decide there.
+    env.AlwaysBuild(target)
+
+    source_files[count] = object_filename
+
+
 #     Part of "Nuitka", an optimizing Python compiler that is compatible and
 #     integrates with CPython, but also works on its own.
 #
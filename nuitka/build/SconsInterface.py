@@ -23,6 +23,7 @@ from nuitka.options.Options import (
     getFcfProtectionMode,
     getFileVersion,
     getJobLimit,
+    getJobMemoryLimit,
     getLtoMode,
     getMacOSTargetArch,
     getMsvcVersion,
@@ -47,6 +48,8 @@ from nuitka.options.Options import (
     shallCompileWithoutBuildDirectory,
     shallCreateAppBundle,
     shallDisableCCacheUsage,
+    shallDisableCompileCostsCacheUsage,
+    shallDisableRuntimeCacheUsage,
     shallMakeDll,
     shallMakeExe,
     shallMakeModule,
@@ -643,6 +646,15 @@ def getCommonSconsOptions():
     if shallDisableCCacheUsage():
         scons_options["disable_ccache"] = asBoolStr(True)
 
+    if shallDisableRuntimeCacheUsage():
+        scons_options["disable_runtime_cache"] = asBoolStr(True)
+
+    if shallDisableCompileCostsCacheUsage():
+        scons_options["disable_compile_costs_cache"] = asBoolStr(True)
+
+    if getJobMemoryLimit() is not None:
+        scons_options["jobs_memory_limit"] = str(getJobMemoryLimit())
+
     if isWin32Windows() and getWindowsConsoleMode() != "attach":
         scons_options["console_mode"] = getWindowsConsoleMode()
 
@@ -0,0 +1,271 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Scheduling of C compilation jobs.
+
+Scons starts as many jobs as allowed, in the order of the source files. For
+generated code, the C files vary a lot in size, and the large ones take most
+of the time and memory. Therefore we predict the costs of a job, from the file
+size and from what previous compilations measured, start the most expensive
+jobs first, and hold back jobs while the predicted memory usage of the running
+ones would exceed the memory limit.
+
+Measured compile times and peak memory usage are recorded in the cache, to
+improve the predictions of the next compilation.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from nuitka.Tracing import scons_details_logger
+from nuitka.utils.AppDirs import getCacheDir
+from nuitka.utils.FileOperations import (
+    getNormalizedPathJoin,
+    makePath,
+    replaceFileAtomic,
+)
+from nuitka.utils.Hashing import getStringHash
+from nuitka.utils.Json import loadJsonFromFilename, writeJsonToFilename
+from nuitka.utils.MemoryUsage import formatMemoryUsageValue, getMaxRssFromRusage
+
+# Bump this, if the format of the recorded costs changes.
+_compile_costs_format_version = 1
+
+# Without measurements, the C compiler memory usage is predicted as a base
+# value plus a factor of the C file size, and time from the size only, which
+# is roughly what gcc needs for generated code with optimization.
+_default_memory_base = 64 * 1024 * 1024
+_default_memory_factor = 64
+_default_time_factor = 8.0 / (1024 * 1024)
+
+# Source filename as seen in command lines to predicted costs.
+_job_costs = {}
+
+# Measurements of this compilation, to be recorded for the next one.
+_job_measurements = {}
+
+_memory_limit = None
+_memory_reserved = 0
+_jobs_running = 0
+_jobs_condition = threading.Condition()
+
+_compile_costs_filename = None
+_recorded_costs = {}
+
+
+def _getCompileCostsFilename(source_dir):
+    # The build directory is specific to the compiled program, and it can be
+    # removed after the compilation, so the costs are kept in the cache.
+    return getNormalizedPathJoin(
+        getCacheDir("compile-costs"),
+        getStringHash(os.path.abspath(source_dir)) + ".json",
+    )
+
+
+def _loadCompileCosts(compile_costs_filename):
+    if not os.path.exists(compile_costs_filename):
+        return {}
+
+    try:
+        compile_costs = loadJsonFromFilename(compile_costs_filename)
+    except ValueError:
+        return {}
+
+    if (
+        type(compile_costs) is not dict
+        or compile_costs.get("version") != _compile_costs_format_version
+    ):
+        return {}
+
+    return compile_costs["files"]
+
+
+def _saveCompileCosts():
+    if not _job_measurements:
+        return
+
+    _recorded_costs.update(_job_measurements)
+
+    makePath(os.path.dirname(_compile_costs_filename))
+
+    # Other compilations might store it at the same time.
+    tmp_filename = "%s.tmp%d" % (_compile_costs_filename, os.getpid())
+
+    writeJsonToFilename(
+        filename=tmp_filename,
+        contents={
+            "version": _compile_costs_format_version,
+            "files": _recorded_costs,
+        },
+    )
+
+    replaceFileAtomic(tmp_filename, _compile_costs_filename)
+
+
+def _predictJobCosts(source_filename, source_size):
+    """Predict the time and memory needed to compile a C file."""
+
+    recorded = _recorded_costs.get(source_filename)
+
+    if recorded is None or not recorded["size"]:
+        return (
+            source_size * _default_time_factor,
+            _default_memory_base + source_size * _default_memory_factor,
+        )
+
+    # Adapt what was measured before to the size change.
+    predicted_time = recorded["time"] * source_size / float(recorded["size"])
+
+    if recorded["memory"] is None:
+        predicted_memory = _default_memory_base + source_size * _default_memory_factor
+    else:
+        predicted_memory = max(
+            0,
+            recorded["memory"]
+            + (source_size - recorded["size"]) * _default_memory_factor,
+        )
+
+    return predicted_time, predicted_memory
+
+
+def enableCompileJobScheduling(env, target, memory_limit, disable_compile_costs):
+    """Decide the order of compilation jobs and enable the memory limit.
+
+    Returns:
+        List of object file nodes, in the order they should be compiled.
+    """
+
+    # Singleton, pylint: disable=global-statement
+    global _memory_limit, _compile_costs_filename, _recorded_costs
+
+    _memory_limit = memory_limit
+
+    if not disable_compile_costs:
+        _compile_costs_filename = _getCompileCostsFilename(env.source_dir)
+        _recorded_costs = _loadCompileCosts(_compile_costs_filename)
+
+        import atexit
+
+        atexit.register(_saveCompileCosts)
+
+    object_nodes = []
+
+    for object_node in target[0].sources:
+        # Only objects compiled from our C files, not e.g. the libraries.
+        if not object_node.sources:
+            continue
+
+        source_filename = str(object_node.sources[0])
+
+        if not os.path.isfile(source_filename):
+            continue
+
+        _job_costs[source_filename] = _predictJobCosts(
+            source_filename=source_filename,
+            source_size=os.path.getsize(source_filename),
+        )
+
+        object_nodes.append(object_node)
+
+    # Most expensive jobs first, so they do not end up running alone at the
+    # end of the compilation.
+    object_nodes.sort(
+        key=lambda object_node: _job_costs[str(object_node.sources[0])][0],
+        reverse=True,
+    )
+
+    if _memory_limit is not None:
+        scons_details_logger.info(
+            "Scheduling %d C compilation jobs with memory limit of %s."
+            % (len(object_nodes), formatMemoryUsageValue(_memory_limit))
+        )
+
+    return object_nodes
+
+
+def _getCompileJobSourceFilename(args):
+    if _job_costs:
+        for arg in args:
+            arg = arg.strip('"')
+
+            if arg in _job_costs:
+                return arg
+
+    return None
+
+
+@contextmanager
+def withScheduledCompileJob(args):
+    """Run a command as a scheduled job, if it is compiling a C file.
+
+    Yields a callable that receives the "rusage" of the command, to
+    record its measured costs.
+    """
+
+    # Singleton, pylint: disable=global-statement
+    global _memory_reserved, _jobs_running
+
+    source_filename = _getCompileJobSourceFilename(args)
+
+    if source_filename is None:
+        yield lambda rusage: None
+        return
+
+    predicted_memory = _job_costs[source_filename][1]
+
+    with _jobs_condition:
+        waited = False
+
+        # Too large jobs run when no other job runs.
+        while (
+            _memory_limit is not None
+            and _jobs_running > 0
+            and _memory_reserved + predicted_memory > _memory_limit
+        ):
+            if not waited:
+                scons_details_logger.info(
+                    "Delaying compilation of '%s' with predicted memory usage %s."
+                    % (source_filename, formatMemoryUsageValue(predicted_memory))
+                )
+                waited = True
+
+            _jobs_condition.wait()
+
+        _memory_reserved += predicted_memory
+        _jobs_running += 1
+
+    start_time = time.time()
+
+    def recordCompileJobCosts(rusage):
+        _job_measurements[source_filename] = {
+            "size": os.path.getsize(source_filename),
+            "time": time.time() - start_time,
+            "memory": getMaxRssFromRusage(rusage),
+        }
+
+    try:
+        yield recordCompileJobCosts
+    finally:
+        with _jobs_condition:
+            _memory_reserved -= predicted_memory
+            _jobs_running -= 1
+
+            _jobs_condition.notify_all()
+
+
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.gnu.org/licenses/agpl.txt
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
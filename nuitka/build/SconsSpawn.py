@@ -22,6 +22,7 @@ from .SconsProgress import (
     reportSlowCompilation,
     updateSconsProgressBar,
 )
+from .SconsScheduling import withScheduledCompileJob
 from .SconsUtils import decodeData, reportSconsUnexpectedOutput
 
 
@@ -157,19 +158,22 @@ def _getWindowsSpawnFunction(env, source_files):
         new_args = " ".join(removeTrailingSlashQuote(arg) for arg in args[1:])
         cmdline = cmd + " " + new_args
 
-        # Special hook for clcache inline copy
-        if cmd == "<clcache>":
-            data, err, rv = runClCache(args, os_env)
-            _rusage = {}
-        else:
-            # TODO: Make use of _rusage
-            data, err, rv, exception, _rusage = _runProcessMonitored(
-                env, cmdline, os_env
-            )
+        with withScheduledCompileJob(args) as recordCompileJobCosts:
+            # Special hook for clcache inline copy
+            if cmd == "<clcache>":
+                data, err, rv = runClCache(args, os_env)
+                rusage = {}
+            else:
+                data, err, rv, exception, rusage = _runProcessMonitored(
+                    env, cmdline, os_env
+                )
 
-            if exception:
-                closeSconsProgressBar()
-                raise exception
+                if exception:
+                    closeSconsProgressBar()
+                    raise exception
+
+            if rv == 0:
+                recordCompileJobCosts(rusage)
 
         if rv != 0:
             closeSconsProgressBar()
@@ -445,7 +449,13 @@ def _getWrappedSpawnFunction(env):
             os_env = dict(os_env)
             os_env["CCACHE_DISABLE"] = "1"
 
-        result, exception, _rusage = _runSpawnMonitored(env, sh, cmd, args, os_env)
+        with withScheduledCompileJob(args) as recordCompileJobCosts:
+            result, exception, rusage = _runSpawnMonitored(
+                env, sh, cmd, args, os_env
+            )
+
+            if result == 0 and exception is None:
+                recordCompileJobCosts(rusage)
 
         if exception:
             closeSconsProgressBar()
@@ -13,6 +13,21 @@ static const bool use_freelists = false;
 static const bool use_freelists = true;
 #endif
 
+// With free-threading, free lists are per thread, see "NUITKA_THREAD_STATIC",
+// and must be released when a thread ends, or else the objects of these are
+// leaked. For that, the first use of free lists in a thread registers for it.
+#ifdef Py_GIL_DISABLED
+extern NUITKA_THREAD_LOCAL bool thread_free_lists_registered;
+extern void registerThreadFreeLists(void);
+
+#define REGISTER_THREAD_FREE_LISTS()                                                                                   \
+    if (unlikely(thread_free_lists_registered == false)) {                                                             \
+        registerThreadFreeLists();                                                                                     \
+    }
+#else
+#define REGISTER_THREAD_FREE_LISTS()
+#endif
+
 #define allocateFromFreeList(free_list, object_type, type_type, size)                                                  \
     if (free_list != NULL) {                                                                                           \
         result = free_list;                                                                                            \
@@ -55,6 +70,8 @@ static const bool use_freelists = true;
             free_list##_count += 1;                                                                                    \
         }                                                                                                              \
     } else {                                                                                                           \
+        REGISTER_THREAD_FREE_LISTS();                                                                                  \
+                                                                                                                       \
         free_list = object;                                                                                            \
         *((void **)object) = NULL;                                                                                     \
                                                                                                                        \
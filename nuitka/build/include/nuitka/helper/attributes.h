@@ -6,6 +6,36 @@
 // Attribute lookup except special slots below.
 extern PyObject *LOOKUP_ATTRIBUTE(PyThreadState *tstate, PyObject *source, PyObject *attr_name);
 
+// Per call site cache of attribute lookups, with the type lookup result for
+// one type, identified by its version tag.
+struct Nuitka_AttributeLookupCache {
+    // Version tag of the type the cache was filled for, 0 if not filled.
+    unsigned int type_version;
+
+    // What needs to be done for the cached type, see "HelpersAttributes.c".
+    int kind;
+
+    // Type lookup result, borrowed, the type keeps it alive as long as its
+    // version is not changed.
+    PyObject *descr;
+    descrgetfunc func;
+
+#if PYTHON_VERSION >= 0x3b0
+    // For managed dictionaries, index of the name in the shared keys of the
+    // type or -1, determined with that many entries present.
+    Py_ssize_t values_index;
+    Py_ssize_t values_keys_entries;
+#endif
+};
+
+// Attribute lookup using a per call site cache, only for constant attribute names.
+#if PYTHON_VERSION >= 0x300 && !defined(Py_GIL_DISABLED)
+extern PyObject *LOOKUP_ATTRIBUTE_CACHED(PyThreadState *tstate, PyObject *source, PyObject *attr_name,
+                                         struct Nuitka_AttributeLookupCache *cache);
+#else
+#define LOOKUP_ATTRIBUTE_CACHED(tstate, source, attr_name, cache) LOOKUP_ATTRIBUTE(tstate, source, attr_name)
+#endif
+
 // Attribute lookup of attribute slot "__dict__".
 extern PyObject *LOOKUP_ATTRIBUTE_DICT_SLOT(PyThreadState *tstate, PyObject *source);
 
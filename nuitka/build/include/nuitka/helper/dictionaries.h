@@ -150,6 +150,13 @@ extern Py_ssize_t Nuitka_PyDictLookup(PyDictObject *mp, PyObject *key, Py_hash_t
 extern Py_ssize_t Nuitka_PyDictLookupStr(PyDictObject *mp, PyObject *key, Py_hash_t hash, PyObject ***value_addr);
 #endif
 
+#ifdef Py_GIL_DISABLED
+// Module variable value lookup, giving a reference, with a per thread cache of
+// the entry, if "cache_dk" is not NULL.
+extern PyObject *GET_MODULE_VARIABLE_VALUE_CACHED(PyDictObject *dict, PyObject *key, PyDictKeysObject **cache_dk,
+                                                  Py_ssize_t *cache_dk_index);
+#endif
+
 static inline Py_hash_t Nuitka_Py_unicode_get_hash(PyObject *o) {
     assert(PyUnicode_CheckExact(o));
 
@@ -36,6 +36,12 @@ extern void startProfiling(void);
 extern void stopProfiling(void);
 #endif
 
+// For the native sampling profiler of Nuitka compiled binaries
+#if _NUITKA_SAMPLING_PROFILER
+extern void startSamplingProfiler(void);
+extern void stopSamplingProfiler(void);
+#endif
+
 #include "nuitka/helper/boolean.h"
 #include "nuitka/helper/dictionaries.h"
 #include "nuitka/helper/indexes.h"
@@ -387,6 +393,8 @@ extern PyObject *Py_SysVersionInfo;
 
 #include "nuitka/python_pgo.h"
 
+#include "nuitka/startup_trace.h"
+
 extern PyObject *MAKE_UNION_TYPE(PyObject *args);
 
 // Our wrapper for "PyType_Ready" that takes care of trying to avoid DLL entry
@@ -251,6 +251,37 @@ NUITKA_MAY_BE_UNUSED static inline managed_static_type_state *Nuitka_PyStaticTyp
 
 #define NUITKA_NO_RETURN HEDLEY_NO_RETURN
 
+/* A way to indicate that a function is rarely or often executed, e.g. from
+ * Python level PGO information, so the C compiler can optimize it for size
+ * or speed, and place it apart from other code.
+ */
+#if defined(__GNUC__) || defined(__clang__)
+#define NUITKA_COLD_FUNCTION __attribute__((__cold__))
+#define NUITKA_HOT_FUNCTION __attribute__((__hot__))
+#else
+#define NUITKA_COLD_FUNCTION
+#define NUITKA_HOT_FUNCTION
+#endif
+
+/* A way to have a variable per thread. */
+#if defined(_MSC_VER)
+#define NUITKA_THREAD_LOCAL __declspec(thread)
+#elif defined(__GNUC__) || defined(__clang__)
+#define NUITKA_THREAD_LOCAL __thread
+#else
+#define NUITKA_THREAD_LOCAL _Thread_local
+#endif
+
+/* Free lists and caches are kept in static variables. With free-threading,
+ * threads run in parallel and would race for them, so then every thread has
+ * its own.
+ */
+#ifdef Py_GIL_DISABLED
+#define NUITKA_THREAD_STATIC static NUITKA_THREAD_LOCAL
+#else
+#define NUITKA_THREAD_STATIC static
+#endif
+
 /* This is used to indicate code control flows we know cannot happen. */
 #ifndef __NUITKA_NO_ASSERT__
 #define NUITKA_CANNOT_GET_HERE(NAME)                                                                                   \
@@ -24,10 +24,56 @@ extern void PGO_onModuleEntered(char const *module_name);
 // When a module is exited.
 extern void PGO_onModuleExit(char const *module_name, bool had_error);
 
-extern void PGO_onProbePassed(char const *module_name, char const *probe_id, uint32_t probe_arg);
+extern void PGO_onProbePassed(char const *probe_str, char const *module_name, uint32_t probe_arg);
 
 extern void PGO_onTechnicalModule(char const *module_name);
 
+// Counter of a probe site, e.g. calls of a function or outcomes of a branch,
+// these are static per probe site, and only written at program end.
+struct Nuitka_PgoCounter {
+    char const *probe_name;
+    char const *module_name;
+    char const *counter_name;
+
+    uint32_t count;
+
+    bool registered;
+    struct Nuitka_PgoCounter *next;
+};
+
+extern void PGO_registerCounter(struct Nuitka_PgoCounter *counter);
+
+NUITKA_MAY_BE_UNUSED static inline void PGO_countProbe(struct Nuitka_PgoCounter *counter) {
+    if (unlikely(counter->registered == false)) {
+        PGO_registerCounter(counter);
+    }
+
+    if (likely(counter->count != UINT32_MAX)) {
+        counter->count += 1;
+    }
+}
+
+// Types observed at a probe site, e.g. for an argument, the source of an
+// attribute lookup or operands, only the first few different types are
+// distinguished.
+#define PGO_TYPE_PROBE_SIZE 4
+
+struct Nuitka_PgoTypeProbe {
+    char const *module_name;
+    char const *probe_name;
+
+    PyTypeObject *types[PGO_TYPE_PROBE_SIZE];
+    uint32_t counts[PGO_TYPE_PROBE_SIZE];
+
+    // Observations of types that did not fit anymore.
+    uint32_t other_count;
+
+    bool registered;
+    struct Nuitka_PgoTypeProbe *next;
+};
+
+extern void PGO_recordType(struct Nuitka_PgoTypeProbe *probe, PyTypeObject *type);
+
 #else
 
 #define PGO_Initialize()
@@ -36,7 +82,7 @@ extern void PGO_onTechnicalModule(char const *module_name);
 #define PGO_onModuleEntered(module_name) ;
 #define PGO_onModuleExit(module_name, had_error) ;
 
-#define PGO_onProbePassed(module_name, probe_id, probe_arg) ;
+#define PGO_onProbePassed(probe_str, module_name, probe_arg) ;
 
 #endif
 
@@ -0,0 +1,61 @@
+//     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+#ifndef __NUITKA_STARTUP_TRACE_H__
+#define __NUITKA_STARTUP_TRACE_H__
+
+// In Visual Code, evaluate the code for startup traces so we see errors of it sooner.
+#ifdef __IDE_ONLY__
+#define _NUITKA_STARTUP_TRACE 1
+#endif
+
+#if _NUITKA_STARTUP_TRACE
+
+// Start recording if asked for by environment, the process name is used as
+// a label for the process in the trace.
+extern void startStartupTrace(char const *process_name);
+
+// Write out the recorded events, ending the recording.
+extern void stopStartupTrace(void);
+
+extern bool startup_trace_active;
+
+extern void traceStartupBegin(char const *category, char const *name);
+extern void traceStartupEnd(void);
+
+#define NUITKA_STARTUP_TRACE_BEGIN(category, name)                                                                     \
+    {                                                                                                                  \
+        if (unlikely(startup_trace_active)) {                                                                          \
+            traceStartupBegin(category, name);                                                                         \
+        }                                                                                                              \
+    }
+
+#define NUITKA_STARTUP_TRACE_END()                                                                                     \
+    {                                                                                                                  \
+        if (unlikely(startup_trace_active)) {                                                                          \
+            traceStartupEnd();                                                                                         \
+        }                                                                                                              \
+    }
+
+#else
+
+#define NUITKA_STARTUP_TRACE_BEGIN(category, name)
+#define NUITKA_STARTUP_TRACE_END()
+
+#endif
+
+#endif
+
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.gnu.org/licenses/agpl.txt
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
@@ -959,8 +959,8 @@ static void Nuitka_Asyncgen_tp_finalize(struct Nuitka_AsyncgenObject *asyncgen)
 }
 
 #define MAX_ASYNCGEN_FREE_LIST_COUNT 100
-static struct Nuitka_AsyncgenObject *free_list_asyncgens = NULL;
-static int free_list_asyncgens_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_AsyncgenObject *free_list_asyncgens = NULL;
+NUITKA_THREAD_STATIC int free_list_asyncgens_count = 0;
 
 // TODO: This might have to be finalize actually.
 static void Nuitka_Asyncgen_tp_dealloc(struct Nuitka_AsyncgenObject *asyncgen) {
@@ -1197,8 +1197,8 @@ struct Nuitka_AsyncgenWrappedValueObject {
         PyObject *m_value;
 };
 
-static struct Nuitka_AsyncgenWrappedValueObject *free_list_asyncgen_value_wrappers = NULL;
-static int free_list_asyncgen_value_wrappers_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_AsyncgenWrappedValueObject *free_list_asyncgen_value_wrappers = NULL;
+NUITKA_THREAD_STATIC int free_list_asyncgen_value_wrappers_count = 0;
 
 static void Nuitka_AsyncgenValueWrapper_tp_dealloc(struct Nuitka_AsyncgenWrappedValueObject *asyncgen_value_wrapper) {
 #if _DEBUG_REFCOUNTS
@@ -1407,8 +1407,8 @@ static PyObject *_Nuitka_Asyncgen_unwrap_value(PyThreadState *tstate, struct Nui
     return result;
 }
 
-static struct Nuitka_AsyncgenAsendObject *free_list_asyncgen_asends = NULL;
-static int free_list_asyncgen_asends_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_AsyncgenAsendObject *free_list_asyncgen_asends = NULL;
+NUITKA_THREAD_STATIC int free_list_asyncgen_asends_count = 0;
 
 static void Nuitka_AsyncgenAsend_tp_dealloc(struct Nuitka_AsyncgenAsendObject *asyncgen_asend) {
 #if _DEBUG_REFCOUNTS
@@ -1799,8 +1799,8 @@ NUITKA_MAY_BE_UNUSED static void _PRINT_ASYNCGEN_ATHROW_STATUS(char const *descr
 
 #endif
 
-static struct Nuitka_AsyncgenAthrowObject *free_list_asyncgen_athrows = NULL;
-static int free_list_asyncgen_athrows_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_AsyncgenAthrowObject *free_list_asyncgen_athrows = NULL;
+NUITKA_THREAD_STATIC int free_list_asyncgen_athrows_count = 0;
 
 static void Nuitka_AsyncgenAthrow_dealloc(struct Nuitka_AsyncgenAthrowObject *asyncgen_athrow) {
 #if _DEBUG_REFCOUNTS
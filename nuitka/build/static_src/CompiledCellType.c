@@ -24,8 +24,8 @@ int count_released_Nuitka_Cell_Type;
 
 // Freelist setup
 #define MAX_CELL_FREE_LIST_COUNT 1000
-static struct Nuitka_CellObject *free_list_cells = NULL;
-static int free_list_cells_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_CellObject *free_list_cells = NULL;
+NUITKA_THREAD_STATIC int free_list_cells_count = 0;
 
 static void Nuitka_Cell_tp_dealloc(struct Nuitka_CellObject *cell) {
 #if _DEBUG_REFCOUNTS
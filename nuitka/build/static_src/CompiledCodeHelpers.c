@@ -2137,6 +2137,14 @@ PyObject *MAKE_UNION_TYPE(PyObject *args) {
 #include "HelpersProfiling.c"
 #endif
 
+#if _NUITKA_SAMPLING_PROFILER
+#include "HelpersSamplingProfiler.c"
+#endif
+
+#if _NUITKA_STARTUP_TRACE
+#include "HelpersStartupTrace.c"
+#endif
+
 #if _NUITKA_PGO_PYTHON
 #include "HelpersPythonPgo.c"
 #endif
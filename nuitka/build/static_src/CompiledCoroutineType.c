@@ -1017,8 +1017,8 @@ static long Nuitka_Coroutine_tp_traverse(struct Nuitka_CoroutineObject *coroutin
     return 0;
 }
 
-static struct Nuitka_CoroutineWrapperObject *free_list_coro_wrappers = NULL;
-static int free_list_coro_wrappers_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_CoroutineWrapperObject *free_list_coro_wrappers = NULL;
+NUITKA_THREAD_STATIC int free_list_coro_wrappers_count = 0;
 
 static PyObject *Nuitka_Coroutine_await(struct Nuitka_CoroutineObject *coroutine) {
     CHECK_OBJECT(coroutine);
@@ -1097,8 +1097,8 @@ static void Nuitka_Coroutine_tp_finalize(struct Nuitka_CoroutineObject *coroutin
 
 // Freelist setup
 #define MAX_COROUTINE_FREE_LIST_COUNT 100
-static struct Nuitka_CoroutineObject *free_list_coroutines = NULL;
-static int free_list_coroutines_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_CoroutineObject *free_list_coroutines = NULL;
+NUITKA_THREAD_STATIC int free_list_coroutines_count = 0;
 
 static void Nuitka_Coroutine_tp_dealloc(struct Nuitka_CoroutineObject *coroutine) {
 #if _DEBUG_REFCOUNTS
@@ -1709,8 +1709,8 @@ static int Nuitka_AIterWrapper_traverse(struct Nuitka_AIterWrapper *aw, visitpro
     return 0;
 }
 
-static struct Nuitka_AIterWrapper *free_list_coroutine_aiter_wrappers = NULL;
-static int free_list_coroutine_aiter_wrappers_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_AIterWrapper *free_list_coroutine_aiter_wrappers = NULL;
+NUITKA_THREAD_STATIC int free_list_coroutine_aiter_wrappers_count = 0;
 
 static void Nuitka_AIterWrapper_dealloc(struct Nuitka_AIterWrapper *aw) {
 #if _DEBUG_REFCOUNTS
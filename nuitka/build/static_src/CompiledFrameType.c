@@ -420,8 +420,8 @@ static int Nuitka_Frame_tp_clear(PyObject *frame_obj) {
 
 // Freelist setup
 #define MAX_FRAME_FREE_LIST_COUNT 100
-static struct Nuitka_FrameObject *free_list_frames = NULL;
-static int free_list_frames_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_FrameObject *free_list_frames = NULL;
+NUITKA_THREAD_STATIC int free_list_frames_count = 0;
 
 static void Nuitka_Frame_tp_dealloc(struct Nuitka_FrameObject *nuitka_frame) {
 #if _DEBUG_REFCOUNTS
@@ -803,8 +803,8 @@ static PyObject *Nuitka_Function_clone(struct Nuitka_FunctionObject *function, P
 
 // Freelist setup
 #define MAX_FUNCTION_FREE_LIST_COUNT 100
-static struct Nuitka_FunctionObject *free_list_functions = NULL;
-static int free_list_functions_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_FunctionObject *free_list_functions = NULL;
+NUITKA_THREAD_STATIC int free_list_functions_count = 0;
 
 static void Nuitka_Function_tp_dealloc(struct Nuitka_FunctionObject *function) {
 #if _DEBUG_REFCOUNTS
@@ -3391,6 +3391,104 @@ static PyObject *Nuitka_Function_tp_vectorcall(struct Nuitka_FunctionObject *fun
 
 #include "InspectPatcher.c"
 
+#ifdef Py_GIL_DISABLED
+
+// With free-threading, every thread has its own free lists, which are released
+// when its thread state dictionary is cleared. That is normally done by the
+// thread when it ends, but e.g. at program end, it can be done by another
+// thread, therefore the free lists of the owning thread are recorded when it
+// registers, and the release uses them, not the ones of the current thread.
+// Objects released to free lists after that, are not reused.
+NUITKA_THREAD_LOCAL bool thread_free_lists_registered = false;
+
+struct Nuitka_ThreadFreeList {
+    void **free_list;
+    int *free_list_count;
+};
+
+#define THREAD_FREE_LIST(free_list) {(void **)&free_list, &free_list##_count}
+
+struct Nuitka_ThreadFreeLists {
+    struct Nuitka_ThreadFreeList free_lists[14];
+};
+
+static void releaseThreadFreeLists(PyObject *capsule) {
+    struct Nuitka_ThreadFreeLists *thread_free_lists =
+        (struct Nuitka_ThreadFreeLists *)PyCapsule_GetPointer(capsule, "nuitka.free_lists");
+
+    for (size_t i = 0; i < sizeof(thread_free_lists->free_lists) / sizeof(thread_free_lists->free_lists[0]); i++) {
+        struct Nuitka_ThreadFreeList *free_list = &thread_free_lists->free_lists[i];
+
+        void *object = *free_list->free_list;
+        *free_list->free_list = NULL;
+        *free_list->free_list_count = 0;
+
+        while (object != NULL) {
+            void *next = *((void **)object);
+            PyObject_GC_Del(object);
+            object = next;
+        }
+    }
+
+    PyMem_RawFree(thread_free_lists);
+}
+
+void registerThreadFreeLists(void) {
+    // Only try once, also avoids recursion from releases done in here.
+    thread_free_lists_registered = true;
+
+    // The addresses of the thread local variables are those of this thread.
+    struct Nuitka_ThreadFreeLists const free_lists = {{
+        THREAD_FREE_LIST(free_list_functions),
+        THREAD_FREE_LIST(free_list_methods),
+        THREAD_FREE_LIST(free_list_generators),
+        THREAD_FREE_LIST(free_list_coroutines),
+        THREAD_FREE_LIST(free_list_coro_wrappers),
+        THREAD_FREE_LIST(free_list_coroutine_aiter_wrappers),
+        THREAD_FREE_LIST(free_list_asyncgens),
+        THREAD_FREE_LIST(free_list_asyncgen_value_wrappers),
+        THREAD_FREE_LIST(free_list_asyncgen_asends),
+        THREAD_FREE_LIST(free_list_asyncgen_athrows),
+        THREAD_FREE_LIST(free_list_frames),
+        THREAD_FREE_LIST(free_list_cells),
+        THREAD_FREE_LIST(free_list_tracebacks),
+        THREAD_FREE_LIST(free_list_loaders),
+    }};
+
+    struct Nuitka_ThreadFreeLists *thread_free_lists =
+        (struct Nuitka_ThreadFreeLists *)PyMem_RawMalloc(sizeof(struct Nuitka_ThreadFreeLists));
+
+    if (thread_free_lists == NULL) {
+        return;
+    }
+
+    *thread_free_lists = free_lists;
+
+    // Called from deallocation, which can happen with an exception set.
+    PyObject *saved_exception = PyErr_GetRaisedException();
+
+    PyObject *thread_dict = PyThreadState_GetDict();
+    PyObject *capsule = NULL;
+
+    if (thread_dict != NULL) {
+        capsule = PyCapsule_New(thread_free_lists, "nuitka.free_lists", releaseThreadFreeLists);
+    }
+
+    if (capsule != NULL) {
+        PyDict_SetItemString(thread_dict, "__nuitka_free_lists__", capsule);
+        Py_DECREF(capsule);
+    } else {
+        PyMem_RawFree(thread_free_lists);
+    }
+
+    // Without registration, the free lists of the thread are leaked, which is
+    // not worth an error.
+    PyErr_Clear();
+    PyErr_SetRaisedException(saved_exception);
+}
+
+#endif
+
 //     Part of "Nuitka", an optimizing Python compiler that is compatible and
 //     integrates with CPython, but also works on its own.
 //
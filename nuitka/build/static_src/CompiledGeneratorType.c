@@ -1501,8 +1501,8 @@ static void Nuitka_Generator_tp_finalizer(struct Nuitka_GeneratorObject *generat
 
 // Freelist setup
 #define MAX_GENERATOR_FREE_LIST_COUNT 100
-static struct Nuitka_GeneratorObject *free_list_generators = NULL;
-static int free_list_generators_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_GeneratorObject *free_list_generators = NULL;
+NUITKA_THREAD_STATIC int free_list_generators_count = 0;
 
 static void Nuitka_Generator_tp_dealloc(struct Nuitka_GeneratorObject *generator) {
 #if _DEBUG_REFCOUNTS
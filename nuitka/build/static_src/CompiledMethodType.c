@@ -414,8 +414,8 @@ static Py_hash_t Nuitka_Method_tp_hash(struct Nuitka_MethodObject *method) {
 
 // Freelist setup
 #define MAX_METHOD_FREE_LIST_COUNT 100
-static struct Nuitka_MethodObject *free_list_methods = NULL;
-static int free_list_methods_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_MethodObject *free_list_methods = NULL;
+NUITKA_THREAD_STATIC int free_list_methods_count = 0;
 
 static void Nuitka_Method_tp_dealloc(struct Nuitka_MethodObject *method) {
 #if _DEBUG_REFCOUNTS
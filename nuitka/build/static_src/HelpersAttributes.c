@@ -250,6 +250,294 @@ PyObject *LOOKUP_ATTRIBUTE(PyThreadState *tstate, PyObject *source, PyObject *at
 #endif
 }
 
+#if PYTHON_VERSION >= 0x300 && !defined(Py_GIL_DISABLED)
+
+// Kinds of attribute lookup cache entries.
+
+// Data descriptor, e.g. property or slot, found in the type.
+#define NUITKA_ATTRIBUTE_CACHE_DATA_DESCR 1
+// Instances have no dictionary, only the type lookup result matters.
+#define NUITKA_ATTRIBUTE_CACHE_CLASS_ATTRIBUTE 2
+// Instances have a dictionary at a fixed offset, check it before the type lookup result.
+#define NUITKA_ATTRIBUTE_CACHE_INSTANCE_DICT 3
+// Module object, where no type attribute interferes with the module dictionary.
+#define NUITKA_ATTRIBUTE_CACHE_MODULE_DICT 4
+// Instances have a managed dictionary, with values split from the shared keys
+// of the type unless it was materialized.
+#define NUITKA_ATTRIBUTE_CACHE_MANAGED_DICT 5
+// Not cacheable for this type, use the uncached variant without checking again.
+#define NUITKA_ATTRIBUTE_CACHE_UNCACHED 6
+
+static inline unsigned int Nuitka_Type_GetValidVersionTag(PyTypeObject *type) {
+#if PYTHON_VERSION < 0x3c0
+    // Before 3.12, modifications clear this flag, but leave the tag value.
+    if (!PyType_HasFeature(type, Py_TPFLAGS_VALID_VERSION_TAG)) {
+        return 0;
+    }
+#endif
+    return type->tp_version_tag;
+}
+
+#if PYTHON_VERSION >= 0x3b0
+// Index of the name in the shared keys of a type, -1 if not present.
+static Py_ssize_t Nuitka_GetSharedKeysIndex(PyDictKeysObject *keys, PyObject *attr_name) {
+    assert(DK_IS_UNICODE(keys));
+
+    PyDictUnicodeEntry *entries = DK_UNICODE_ENTRIES(keys);
+    Py_ssize_t n = keys->dk_nentries;
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        if (entries[i].me_key == attr_name) {
+            return i;
+        }
+    }
+
+    // Attribute names are normally interned, but compare the values too.
+    Py_ssize_t attr_name_length = PyUnicode_GET_LENGTH(attr_name);
+    int attr_name_kind = PyUnicode_KIND(attr_name);
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject *key = entries[i].me_key;
+
+        if (key != NULL && PyUnicode_GET_LENGTH(key) == attr_name_length && PyUnicode_KIND(key) == attr_name_kind &&
+            memcmp(PyUnicode_DATA(key), PyUnicode_DATA(attr_name), attr_name_length * attr_name_kind) == 0) {
+            return i;
+        }
+    }
+
+    return -1;
+}
+
+// Values of the instance if split from the shared keys, otherwise provides
+// the dictionary, if any.
+static inline PyDictValues *Nuitka_GetManagedDictValues(PyObject *source, PyTypeObject *type, PyObject **dict) {
+#if PYTHON_VERSION < 0x3c0
+    PyDictValues *values = *_PyObject_ValuesPointer(source);
+
+    if (values == NULL) {
+        *dict = *_PyObject_ManagedDictPointer(source);
+    }
+
+    return values;
+#elif PYTHON_VERSION < 0x3d0
+    PyDictOrValues dorv = *_PyObject_DictOrValuesPointer(source);
+
+    if (_PyDictOrValues_IsValues(dorv)) {
+        return _PyDictOrValues_GetValues(dorv);
+    }
+
+    *dict = _PyDictOrValues_GetDict(dorv);
+    return NULL;
+#else
+    if (PyType_HasFeature(type, Py_TPFLAGS_INLINE_VALUES)) {
+        PyDictValues *values = _PyObject_InlineValues(source);
+
+        if (values->valid) {
+            return values;
+        }
+    }
+
+    *dict = (PyObject *)_PyObject_GetManagedDict(source);
+    return NULL;
+#endif
+}
+#endif
+
+static bool Nuitka_FillAttributeLookupCache(PyTypeObject *type, PyObject *attr_name,
+                                            struct Nuitka_AttributeLookupCache *cache) {
+    cache->type_version = 0;
+
+    bool is_module = type->tp_getattro == PyModule_Type.tp_getattro;
+
+    if (type->tp_getattro != PyObject_GenericGetAttr_resolved && is_module == false) {
+        return false;
+    }
+
+    // Rare, leave it to the uncached variant.
+    if (unlikely(type->tp_dict == NULL)) {
+        return false;
+    }
+
+    // This also assigns the version tag, if there is none yet.
+    PyObject *descr = Nuitka_TypeLookup(type, attr_name);
+
+    unsigned int type_version = Nuitka_Type_GetValidVersionTag(type);
+
+    if (type_version == 0) {
+        return false;
+    }
+
+    descrgetfunc func = descr != NULL ? Py_TYPE(descr)->tp_descr_get : NULL;
+    int kind;
+
+    if (is_module) {
+        // Module types have descriptors for some attributes, these cannot use
+        // the module dictionary only.
+        if (descr != NULL) {
+            kind = NUITKA_ATTRIBUTE_CACHE_UNCACHED;
+        } else {
+            kind = NUITKA_ATTRIBUTE_CACHE_MODULE_DICT;
+        }
+    } else if (func != NULL && Nuitka_Descr_IsData(descr)) {
+        kind = NUITKA_ATTRIBUTE_CACHE_DATA_DESCR;
+    }
+#if PYTHON_VERSION >= 0x3b0
+    else if (PyType_HasFeature(type, Py_TPFLAGS_MANAGED_DICT)) {
+        if (((PyHeapTypeObject *)type)->ht_cached_keys != NULL) {
+            kind = NUITKA_ATTRIBUTE_CACHE_MANAGED_DICT;
+
+            // The index in the shared keys is determined on first use.
+            cache->values_index = -1;
+            cache->values_keys_entries = -1;
+        } else {
+            kind = NUITKA_ATTRIBUTE_CACHE_UNCACHED;
+        }
+    }
+#endif
+    else if (type->tp_dictoffset == 0) {
+        kind = NUITKA_ATTRIBUTE_CACHE_CLASS_ATTRIBUTE;
+    } else if (type->tp_dictoffset > 0) {
+        kind = NUITKA_ATTRIBUTE_CACHE_INSTANCE_DICT;
+    } else {
+        kind = NUITKA_ATTRIBUTE_CACHE_UNCACHED;
+    }
+
+    cache->kind = kind;
+    cache->descr = descr;
+    cache->func = func;
+    cache->type_version = type_version;
+
+    return true;
+}
+
+static PyObject *Nuitka_CallCachedDescriptor(struct Nuitka_AttributeLookupCache *cache, PyObject *source,
+                                             PyTypeObject *type) {
+    PyObject *descr = cache->descr;
+
+    // The call can modify the type, releasing the borrowed descriptor.
+    Py_INCREF(descr);
+    PyObject *result = cache->func(descr, source, (PyObject *)type);
+    Py_DECREF(descr);
+
+    CHECK_OBJECT_X(result);
+    return result;
+}
+
+PyObject *LOOKUP_ATTRIBUTE_CACHED(PyThreadState *tstate, PyObject *source, PyObject *attr_name,
+                                  struct Nuitka_AttributeLookupCache *cache) {
+#if _NUITKA_EXPERIMENTAL_DISABLE_ATTR_OPT
+    return PyObject_GetAttr(source, attr_name);
+#else
+    CHECK_OBJECT(source);
+    CHECK_OBJECT(attr_name);
+
+    PyTypeObject *type = Py_TYPE(source);
+
+    if (cache->type_version == 0 || Nuitka_Type_GetValidVersionTag(type) != cache->type_version) {
+        if (Nuitka_FillAttributeLookupCache(type, attr_name, cache) == false) {
+            return LOOKUP_ATTRIBUTE(tstate, source, attr_name);
+        }
+    }
+
+    int kind = cache->kind;
+
+    if (kind == NUITKA_ATTRIBUTE_CACHE_UNCACHED) {
+        return LOOKUP_ATTRIBUTE(tstate, source, attr_name);
+    }
+
+    if (kind == NUITKA_ATTRIBUTE_CACHE_DATA_DESCR) {
+        return Nuitka_CallCachedDescriptor(cache, source, type);
+    }
+
+    if (kind == NUITKA_ATTRIBUTE_CACHE_MODULE_DICT) {
+        PyObject *result = DICT_GET_ITEM1(tstate, PyModule_GetDict(source), attr_name);
+
+        if (result != NULL) {
+            CHECK_OBJECT(result);
+            return result;
+        }
+
+        // Module "__getattr__" or the attribute error.
+        return type->tp_getattro(source, attr_name);
+    }
+
+    if (kind == NUITKA_ATTRIBUTE_CACHE_INSTANCE_DICT || kind == NUITKA_ATTRIBUTE_CACHE_MANAGED_DICT) {
+        PyObject *dict = NULL;
+
+#if PYTHON_VERSION >= 0x3b0
+        if (kind == NUITKA_ATTRIBUTE_CACHE_MANAGED_DICT) {
+            PyDictValues *values = Nuitka_GetManagedDictValues(source, type, &dict);
+
+            if (values != NULL) {
+                PyDictKeysObject *keys = ((PyHeapTypeObject *)type)->ht_cached_keys;
+
+                // Only while the type is being cleared.
+                if (unlikely(keys == NULL)) {
+                    return LOOKUP_ATTRIBUTE(tstate, source, attr_name);
+                }
+
+                // Shared keys are only added to, without changing the type
+                // version, entries keep their index.
+                if (keys->dk_nentries != cache->values_keys_entries) {
+                    cache->values_index = Nuitka_GetSharedKeysIndex(keys, attr_name);
+                    cache->values_keys_entries = keys->dk_nentries;
+                }
+
+                if (cache->values_index >= 0) {
+                    PyObject *result = values->values[cache->values_index];
+
+                    if (result != NULL) {
+                        CHECK_OBJECT(result);
+
+                        Py_INCREF(result);
+                        return result;
+                    }
+                }
+            }
+        } else
+#endif
+        {
+            dict = *(PyObject **)((char *)source + type->tp_dictoffset);
+        }
+
+        if (dict != NULL) {
+            CHECK_OBJECT(dict);
+
+            Py_INCREF(dict);
+            PyObject *result = DICT_GET_ITEM1(tstate, dict, attr_name);
+            Py_DECREF(dict);
+
+            if (result != NULL) {
+                CHECK_OBJECT(result);
+                return result;
+            }
+
+            // Key comparisons could have run code that modified the type.
+            if (unlikely(Nuitka_Type_GetValidVersionTag(type) != cache->type_version)) {
+                return LOOKUP_ATTRIBUTE(tstate, source, attr_name);
+            }
+        }
+    } else {
+        assert(kind == NUITKA_ATTRIBUTE_CACHE_CLASS_ATTRIBUTE);
+    }
+
+    if (cache->func != NULL) {
+        return Nuitka_CallCachedDescriptor(cache, source, type);
+    }
+
+    if (cache->descr != NULL) {
+        CHECK_OBJECT(cache->descr);
+
+        Py_INCREF(cache->descr);
+        return cache->descr;
+    }
+
+    // Let it raise the attribute error.
+    return LOOKUP_ATTRIBUTE(tstate, source, attr_name);
+#endif
+}
+#endif
+
 PyObject *LOOKUP_ATTRIBUTE_DICT_SLOT(PyThreadState *tstate, PyObject *source) {
     CHECK_OBJECT(source);
 
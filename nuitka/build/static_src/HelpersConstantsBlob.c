@@ -536,6 +536,35 @@ static PyObject *_Nuitka_Unicode_ImmortalFromStringAndSize(PyThreadState *tstate
 static unsigned char const *_unpackBlobConstants(PyThreadState *tstate, PyObject **output, unsigned char const *data,
                                                  int count);
 
+static unsigned char const *findConstantsBlobSection(char const *name);
+
+// Large constants used by multiple modules are stored only once, in a shared
+// section, and referenced from the module sections. They are created when
+// first referenced.
+static PyObject **shared_constants = NULL;
+
+static PyObject *getSharedBlobConstant(PyThreadState *tstate, int index) {
+    if (unlikely(shared_constants == NULL)) {
+        unsigned char const *data = findConstantsBlobSection(".shared");
+
+        int count = (int)unpackValueUint16(&data);
+
+#ifdef _NUITKA_EXPERIMENTAL_DEBUG_CONSTANTS
+        printf("getSharedBlobConstant count %d\n", count);
+#endif
+
+        PyObject **values = (PyObject **)malloc(count * sizeof(PyObject *));
+        assert(values != NULL);
+
+        _unpackBlobConstants(tstate, values, data, count);
+
+        shared_constants = values;
+    }
+
+    CHECK_OBJECT(shared_constants[index]);
+    return shared_constants[index];
+}
+
 static unsigned char const *_unpackBlobConstant(PyThreadState *tstate, PyObject **output, unsigned char const *data) {
 
     // Make sure we discover failures to assign.
@@ -555,6 +584,14 @@ static unsigned char const *_unpackBlobConstant(PyThreadState *tstate, PyObject
 
         break;
     }
+    case 'R': {
+        int index = (int)_unpackVariableLength(&data);
+
+        *output = getSharedBlobConstant(tstate, index);
+        is_object = true;
+
+        break;
+    }
     case 'T': {
         int size = (int)_unpackVariableLength(&data);
 
@@ -1397,9 +1434,88 @@ unsigned char *findMacOSBinarySection(void) {
 
 #endif
 
+// The blob starts with a directory of sections, sorted by the hash of their
+// names, giving offset to the section name, size and CRC32 of its data. The
+// offsets are relative to the end of the directory.
+static uint32_t constant_bin_section_count = 0;
+static unsigned char const *constant_bin_directory = NULL;
+
+#define CONSTANTS_BLOB_DIRECTORY_ENTRY_SIZE (4 * sizeof(uint32_t))
+
+static uint32_t hashConstantsBlobName(char const *name) {
+    // FNV-1a hash, must match what the data composer does.
+    uint32_t result = 2166136261U;
+
+    while (*name != 0) {
+        result ^= (unsigned char)*name++;
+        result *= 16777619U;
+    }
+
+    return result;
+}
+
+static unsigned char const *findConstantsBlobSection(char const *name) {
+    uint32_t name_hash = hashConstantsBlobName(name);
+
+    // Bisect for the first entry with a matching hash.
+    uint32_t low = 0;
+    uint32_t high = constant_bin_section_count;
+
+    while (low < high) {
+        uint32_t middle = low + (high - low) / 2;
+
+        unsigned char const *entry = constant_bin_directory + middle * CONSTANTS_BLOB_DIRECTORY_ENTRY_SIZE;
+
+        if (unpackValueUint32(&entry) < name_hash) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+
+    // There can be hash collisions, check the names of entries with the hash.
+    for (; low < constant_bin_section_count; low++) {
+        unsigned char const *entry = constant_bin_directory + low * CONSTANTS_BLOB_DIRECTORY_ENTRY_SIZE;
+
+        if (unpackValueUint32(&entry) != name_hash) {
+            break;
+        }
+
+        uint32_t offset = unpackValueUint32(&entry);
+        NUITKA_MAY_BE_UNUSED uint32_t size = unpackValueUint32(&entry);
+        NUITKA_MAY_BE_UNUSED uint32_t hash = unpackValueUint32(&entry);
+
+        unsigned char const *w = constant_bin + offset;
+
+        if (strcmp(name, (char const *)w) != 0) {
+            continue;
+        }
+
+        w += strlen((char const *)w) + 1;
+
+#ifdef _NUITKA_EXPERIMENTAL_DEBUG_CONSTANTS
+        printf("Loading blob named '%s' with size %d\n", name, size);
+#endif
+
+#if !defined(_NUITKA_DEPLOYMENT_MODE)
+        if (calcCRC32(w, size) != hash) {
+            puts("Error, corrupted constants object");
+            abort();
+        }
+#endif
+
+        return w;
+    }
+
+    printf("Error, missing constants blob section '%s'\n", name);
+    abort();
+}
+
 void loadConstantsBlob(PyThreadState *tstate, PyObject **output, char const *name) {
     static bool init_done = false;
 
+    NUITKA_STARTUP_TRACE_BEGIN("constants", *name != 0 ? name : "<global>");
+
     if (init_done == false) {
         NUITKA_PRINT_TIMING("loadConstantsBlob(): One time init.");
 
@@ -1429,21 +1545,12 @@ void loadConstantsBlob(PyThreadState *tstate, PyObject **output, char const *nam
         NUITKA_PRINT_TIMING("loadConstantsBlob(): Found blob, decoding now.");
         DECODE(constant_bin);
 
-        NUITKA_PRINT_TIMING("loadConstantsBlob(): CRC32 that blob for correctness.");
-        uint32_t hash = unpackValueUint32(&constant_bin);
-        uint32_t size = unpackValueUint32(&constant_bin);
+        constant_bin_section_count = unpackValueUint32(&constant_bin);
+        constant_bin_directory = constant_bin;
+        constant_bin += constant_bin_section_count * CONSTANTS_BLOB_DIRECTORY_ENTRY_SIZE;
 
 #ifdef _NUITKA_EXPERIMENTAL_DEBUG_CONSTANTS
-        printf("loadConstantsBlob '%u' hash value\n", hash);
-        printf("loadConstantsBlob '%u' size value\n", size);
-#endif
-        if (calcCRC32(constant_bin, size) != hash) {
-            puts("Error, corrupted constants object");
-            abort();
-        }
-
-#ifdef _NUITKA_EXPERIMENTAL_DEBUG_CONSTANTS
-        printf("Checked CRC32 to match hash %u size %u\n", hash, size);
+        printf("loadConstantsBlob '%u' sections\n", constant_bin_section_count);
 #endif
 
         NUITKA_PRINT_TIMING("loadConstantsBlob(): One time init complete.");
@@ -1459,30 +1566,9 @@ void loadConstantsBlob(PyThreadState *tstate, PyObject **output, char const *nam
         initCaches();
     }
 
-    unsigned char const *w = constant_bin;
-
-    for (;;) {
-        int match = strcmp(name, (char const *)w);
-        w += strlen((char const *)w) + 1;
-
-#ifdef _NUITKA_EXPERIMENTAL_DEBUG_CONSTANTS
-        printf("offset of blob size %d\n", w - constant_bin);
-#endif
-
-        uint32_t size = unpackValueUint32(&w);
-
-        if (match == 0) {
-#ifdef _NUITKA_EXPERIMENTAL_DEBUG_CONSTANTS
-            printf("Loading blob named '%s' with size %d\n", name, size);
-#endif
-            break;
-        }
-
-        // Skip other module data.
-        w += size;
-    }
+    unpackBlobConstants(tstate, output, findConstantsBlobSection(name));
 
-    unpackBlobConstants(tstate, output, w);
+    NUITKA_STARTUP_TRACE_END();
 }
 
 //     Part of "Nuitka", an optimizing Python compiler that is compatible and
@@ -1636,6 +1636,51 @@ read_failed:
     return ix;
 }
 
+PyObject *GET_MODULE_VARIABLE_VALUE_CACHED(PyDictObject *dict, PyObject *key, PyDictKeysObject **cache_dk,
+                                           Py_ssize_t *cache_dk_index) {
+    assert(PyDict_CheckExact(dict));
+    CHECK_OBJECT(key);
+    assert(PyUnicode_CheckExact(key));
+
+    PyDictKeysObject *dk = _Py_atomic_load_ptr(&dict->ma_keys);
+
+    // The cached entry is only used, if it is still for the key, and the keys
+    // are still those of the dictionary after taking the reference. Entries of
+    // keys objects are never used for another key, and old keys objects of
+    // shared dictionaries are released only after no thread can use them.
+    if (cache_dk != NULL && dk == *cache_dk && dk->dk_kind == DICT_KEYS_UNICODE &&
+        *cache_dk_index < LOAD_KEYS_NENTRIES(dk)) {
+        PyDictUnicodeEntry *entry = &DK_UNICODE_ENTRIES(dk)[*cache_dk_index];
+
+        if (_Py_atomic_load_ptr_relaxed(&entry->me_key) == key) {
+            PyObject *result = _Py_TryXGetRef(&entry->me_value);
+
+            if (result != NULL) {
+                if (dk == _Py_atomic_load_ptr(&dict->ma_keys)) {
+                    return result;
+                }
+
+                Py_DECREF(result);
+            }
+        }
+    }
+
+    Py_hash_t hash = Nuitka_Py_unicode_get_hash(key);
+    if (unlikely(hash == -1)) {
+        hash = PyUnicode_Type.tp_hash(key);
+    }
+
+    PyObject *result;
+    Py_ssize_t ix = Nuitka_Py_dict_lookup_threadsafe(dict, key, hash, &result);
+
+    if (cache_dk != NULL && ix >= 0 && dk == _Py_atomic_load_ptr(&dict->ma_keys)) {
+        *cache_dk = dk;
+        *cache_dk_index = ix;
+    }
+
+    return result;
+}
+
 #else // Py_GIL_DISABLED
 
 Py_ssize_t Nuitka_Py_dict_lookup_threadsafe(PyDictObject *mp, PyObject *key, Py_hash_t hash, PyObject **value_addr) {
@@ -3,6 +3,9 @@
 /**
  * This is responsible for collection of Nuitka Python PGO information. It writes
  * traces to files, for reuse in a future Python compilation of the same program.
+ *
+ * Counters of function calls and branch outcomes, and types observed at probe
+ * sites are kept in memory, and only written at the end of the program.
  */
 
 // This file is included from another C file, help IDEs to still parse it on
@@ -20,22 +23,73 @@ static char const **PGO_ProbeNameMappings = NULL;
 uint32_t PGO_ProbeNameMappings_size = 0;
 uint32_t PGO_ProbeNameMappings_used = 0;
 
-uint32_t PGO_getStringID(char const *str) {
+// Hash table from string pointers to their ID plus one, zero for unused
+// entries. The size is a power of two, and it is kept at most half full.
+static char const **PGO_StringHashKeys = NULL;
+static uint32_t *PGO_StringHashIDs = NULL;
+static uint32_t PGO_StringHashSize = 0;
+
+static uint32_t PGO_hashStringPointer(char const *str) {
+    // Fibonacci hashing of the address, the upper bits are the best mixed.
+    return (uint32_t)(((uint64_t)(uintptr_t)str * 0x9E3779B97F4A7C15ULL) >> 32);
+}
+
+static void PGO_insertStringHash(char const *str, uint32_t id) {
+    uint32_t mask = PGO_StringHashSize - 1;
+    uint32_t index = PGO_hashStringPointer(str) & mask;
+
+    while (PGO_StringHashIDs[index] != 0) {
+        index = (index + 1) & mask;
+    }
+
+    PGO_StringHashKeys[index] = str;
+    PGO_StringHashIDs[index] = id + 1;
+}
+
+static void PGO_resizeStringHash(uint32_t size) {
+    free(PGO_StringHashKeys);
+    free(PGO_StringHashIDs);
+
+    PGO_StringHashSize = size;
+    PGO_StringHashKeys = (char const **)calloc(size, sizeof(char const *));
+    PGO_StringHashIDs = (uint32_t *)calloc(size, sizeof(uint32_t));
+
     for (uint32_t i = 0; i < PGO_ProbeNameMappings_used; i++) {
-        if (str == PGO_ProbeNameMappings[i]) {
-            return i;
+        PGO_insertStringHash(PGO_ProbeNameMappings[i], i);
+    }
+}
+
+uint32_t PGO_getStringID(char const *str) {
+    uint32_t mask = PGO_StringHashSize - 1;
+    uint32_t index = PGO_hashStringPointer(str) & mask;
+
+    while (PGO_StringHashIDs[index] != 0) {
+        if (PGO_StringHashKeys[index] == str) {
+            return PGO_StringHashIDs[index] - 1;
         }
+
+        index = (index + 1) & mask;
     }
 
     if (PGO_ProbeNameMappings_used == PGO_ProbeNameMappings_size) {
         PGO_ProbeNameMappings_size += 10000;
-        PGO_ProbeNameMappings = realloc(PGO_ProbeNameMappings, PGO_ProbeNameMappings_size);
+        PGO_ProbeNameMappings =
+            realloc(PGO_ProbeNameMappings, PGO_ProbeNameMappings_size * sizeof(char const *));
     }
 
-    PGO_ProbeNameMappings[PGO_ProbeNameMappings_used] = str;
+    uint32_t id = PGO_ProbeNameMappings_used;
+
+    PGO_ProbeNameMappings[id] = str;
     PGO_ProbeNameMappings_used += 1;
 
-    return PGO_ProbeNameMappings_used - 1;
+    if (PGO_ProbeNameMappings_used * 2 > PGO_StringHashSize) {
+        PGO_resizeStringHash(PGO_StringHashSize * 2);
+    } else {
+        PGO_StringHashKeys[index] = str;
+        PGO_StringHashIDs[index] = id + 1;
+    }
+
+    return id;
 }
 
 static void PGO_writeString(char const *value) {
@@ -56,7 +110,7 @@ void PGO_Initialize(void) {
 
     pgo_output = fopen(output_filename, "wb");
 
-    if (unlikely(output_filename == NULL)) {
+    if (unlikely(pgo_output == NULL)) {
         fprintf(stderr, "Error, failed to open '%s' for writing.", output_filename);
         exit(27);
     }
@@ -66,9 +120,92 @@ void PGO_Initialize(void) {
 
     PGO_ProbeNameMappings_size = 10000;
     PGO_ProbeNameMappings = malloc(PGO_ProbeNameMappings_size * sizeof(char const *));
+
+    PGO_resizeStringHash(1 << 14);
+}
+
+// Counters and type probes passed at least once, written only at the end.
+static struct Nuitka_PgoCounter *pgo_counters = NULL;
+static struct Nuitka_PgoTypeProbe *pgo_type_probes = NULL;
+
+void PGO_registerCounter(struct Nuitka_PgoCounter *counter) {
+    assert(counter->registered == false);
+
+    counter->registered = true;
+    counter->next = pgo_counters;
+    pgo_counters = counter;
+}
+
+void PGO_recordType(struct Nuitka_PgoTypeProbe *probe, PyTypeObject *type) {
+    if (unlikely(probe->registered == false)) {
+        probe->registered = true;
+        probe->next = pgo_type_probes;
+        pgo_type_probes = probe;
+    }
+
+    for (int i = 0; i < PGO_TYPE_PROBE_SIZE; i++) {
+        if (probe->types[i] == type) {
+            if (likely(probe->counts[i] != UINT32_MAX)) {
+                probe->counts[i] += 1;
+            }
+
+            return;
+        }
+
+        if (probe->types[i] == NULL) {
+            // Keep the type, and therefore its name alive, until written.
+            Py_INCREF(type);
+            probe->types[i] = type;
+            probe->counts[i] = 1;
+
+            return;
+        }
+    }
+
+    if (likely(probe->other_count != UINT32_MAX)) {
+        probe->other_count += 1;
+    }
+}
+
+static void PGO_writeCounters(void) {
+    for (struct Nuitka_PgoCounter *counter = pgo_counters; counter != NULL; counter = counter->next) {
+        PGO_writeString(counter->probe_name);
+        PGO_writeString(counter->module_name);
+        PGO_writeString(counter->counter_name);
+        fwrite(&counter->count, sizeof(counter->count), 1, pgo_output);
+    }
+
+    for (struct Nuitka_PgoTypeProbe *probe = pgo_type_probes; probe != NULL; probe = probe->next) {
+        for (int i = 0; i < PGO_TYPE_PROBE_SIZE + 1; i++) {
+            char const *type_name;
+            uint32_t count;
+
+            if (i == PGO_TYPE_PROBE_SIZE) {
+                type_name = "<other>";
+                count = probe->other_count;
+            } else if (probe->types[i] != NULL) {
+                type_name = probe->types[i]->tp_name;
+                count = probe->counts[i];
+            } else {
+                continue;
+            }
+
+            if (count == 0) {
+                continue;
+            }
+
+            PGO_writeString("TypeObserved");
+            PGO_writeString(probe->module_name);
+            PGO_writeString(probe->probe_name);
+            PGO_writeString(type_name);
+            fwrite(&count, sizeof(count), 1, pgo_output);
+        }
+    }
 }
 
 void PGO_Finalize(void) {
+    PGO_writeCounters();
+
     PGO_writeString("END");
 
     assert(pgo_output != NULL);
@@ -0,0 +1,388 @@
+//     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+/**
+ * This is responsible for a native sampling profiler, included in the program
+ * if asked for at compile time, and activated at run time by setting the
+ * "NUITKA_SAMPLING_PROFILE" environment variable to an output filename.
+ *
+ * A timer signal interrupts the program, and the handler walks the frame
+ * stack of the interrupted thread, compiled frames and uncompiled ones, and
+ * counts identical stacks. At program end, these are written in "collapsed
+ * stack" format, one line per stack of "function (filename:line)" entries
+ * with its count, as used by e.g. "flamegraph.pl" or "speedscope". The line
+ * is the first line of the function, compiled frames do not track lines.
+ *
+ * The signal handler must not allocate memory or call into Python, so it
+ * only copies the names from the code objects of frames into storage that
+ * is allocated in advance, and samples not fitting anymore are only counted.
+ */
+
+// This file is included from another C file, help IDEs to still parse it on
+// its own.
+#ifdef __IDE_ONLY__
+#include "nuitka/prelude.h"
+#endif
+
+#if _NUITKA_SAMPLING_PROFILER
+
+#include <errno.h>
+#include <signal.h>
+#include <sys/time.h>
+
+#define NUITKA_SAMPLING_MAX_DEPTH 128
+#define NUITKA_SAMPLING_NAME_SIZE 64
+#define NUITKA_SAMPLING_FILENAME_SIZE 192
+
+// Sizes of hash tables must be powers of two.
+#define NUITKA_SAMPLING_FRAMES_SIZE 8192
+#define NUITKA_SAMPLING_STACKS_SIZE 16384
+#define NUITKA_SAMPLING_STACK_POOL_SIZE (1024 * 1024)
+
+// Default interval between samples in microseconds.
+#define NUITKA_SAMPLING_DEFAULT_INTERVAL 10000
+
+struct Nuitka_SamplingFrame {
+    uint32_t hash;
+    int line;
+    char name[NUITKA_SAMPLING_NAME_SIZE];
+    char filename[NUITKA_SAMPLING_FILENAME_SIZE];
+};
+
+struct Nuitka_SamplingStack {
+    uint32_t hash;
+    uint32_t count;
+
+    // Frame indexes, innermost first, in the stack pool.
+    uint32_t depth;
+    uint32_t offset;
+};
+
+static char const *sampling_output_filename = NULL;
+
+static struct Nuitka_SamplingFrame *sampling_frames = NULL;
+static uint32_t sampling_frames_used = 0;
+
+static struct Nuitka_SamplingStack *sampling_stacks = NULL;
+static uint32_t sampling_stacks_used = 0;
+
+static uint32_t *sampling_stack_pool = NULL;
+static uint32_t sampling_stack_pool_used = 0;
+
+static uint32_t sampling_dropped_samples = 0;
+
+// Protect against handlers running in multiple threads at once.
+static volatile int sampling_handler_busy = 0;
+
+static uint32_t Nuitka_SamplingProfiler_hashBytes(uint32_t hash, char const *value, size_t size) {
+    // FNV-1a, good enough for names.
+    for (size_t i = 0; i < size; i++) {
+        hash ^= (unsigned char)value[i];
+        hash *= 16777619U;
+    }
+
+    return hash;
+}
+
+static void Nuitka_SamplingProfiler_copyString(char *target, size_t target_size, PyObject *value, bool keep_tail) {
+    char const *source = NULL;
+    Py_ssize_t size = 0;
+
+#if PYTHON_VERSION < 0x300
+    if (value != NULL && PyString_Check(value)) {
+        source = PyString_AS_STRING(value);
+        size = PyString_GET_SIZE(value);
+    }
+#else
+    // Only ASCII strings have their data directly usable, without allocating
+    // memory for conversion, others are not named.
+    if (value != NULL && PyUnicode_Check(value) && PyUnicode_IS_COMPACT_ASCII(value)) {
+        source = (char const *)(((PyASCIIObject *)value) + 1);
+        size = ((PyASCIIObject *)value)->length;
+    }
+#endif
+
+    if (source == NULL) {
+        source = "?";
+        size = 1;
+    }
+
+    if ((size_t)size >= target_size) {
+        if (keep_tail) {
+            source += size - (target_size - 1);
+        }
+
+        size = target_size - 1;
+    }
+
+    memcpy(target, source, size);
+    target[size] = 0;
+}
+
+// Find or add the frame, returns its index or -1 if there is no space left.
+static int32_t Nuitka_SamplingProfiler_getFrameIndex(PyCodeObject *code) {
+    struct Nuitka_SamplingFrame frame;
+
+    Nuitka_SamplingProfiler_copyString(frame.name, sizeof(frame.name), code->co_name, false);
+    Nuitka_SamplingProfiler_copyString(frame.filename, sizeof(frame.filename), code->co_filename, true);
+    frame.line = code->co_firstlineno;
+
+    uint32_t hash = 2166136261U;
+    hash = Nuitka_SamplingProfiler_hashBytes(hash, frame.name, strlen(frame.name));
+    hash = Nuitka_SamplingProfiler_hashBytes(hash, frame.filename, strlen(frame.filename));
+    hash = Nuitka_SamplingProfiler_hashBytes(hash, (char const *)&frame.line, sizeof(frame.line));
+
+    // Zero marks unused entries.
+    frame.hash = hash | 1;
+
+    for (uint32_t i = frame.hash;; i++) {
+        struct Nuitka_SamplingFrame *entry = &sampling_frames[i & (NUITKA_SAMPLING_FRAMES_SIZE - 1)];
+
+        if (entry->hash == 0) {
+            // Keep the table sparse enough for lookups to remain fast.
+            if (sampling_frames_used >= NUITKA_SAMPLING_FRAMES_SIZE / 4 * 3) {
+                return -1;
+            }
+
+            *entry = frame;
+            sampling_frames_used += 1;
+
+            return (int32_t)(entry - sampling_frames);
+        }
+
+        if (entry->hash == frame.hash && entry->line == frame.line && strcmp(entry->name, frame.name) == 0 &&
+            strcmp(entry->filename, frame.filename) == 0) {
+            return (int32_t)(entry - sampling_frames);
+        }
+    }
+}
+
+static bool Nuitka_SamplingProfiler_countStack(uint32_t const *frame_indexes, uint32_t depth) {
+    uint32_t hash = Nuitka_SamplingProfiler_hashBytes(2166136261U, (char const *)frame_indexes,
+                                                      depth * sizeof(frame_indexes[0]));
+    hash |= 1;
+
+    for (uint32_t i = hash;; i++) {
+        struct Nuitka_SamplingStack *entry = &sampling_stacks[i & (NUITKA_SAMPLING_STACKS_SIZE - 1)];
+
+        if (entry->hash == 0) {
+            if (sampling_stacks_used >= NUITKA_SAMPLING_STACKS_SIZE / 4 * 3 ||
+                sampling_stack_pool_used + depth > NUITKA_SAMPLING_STACK_POOL_SIZE) {
+                return false;
+            }
+
+            memcpy(&sampling_stack_pool[sampling_stack_pool_used], frame_indexes, depth * sizeof(frame_indexes[0]));
+
+            entry->count = 1;
+            entry->depth = depth;
+            entry->offset = sampling_stack_pool_used;
+            entry->hash = hash;
+
+            sampling_stack_pool_used += depth;
+            sampling_stacks_used += 1;
+
+            return true;
+        }
+
+        if (entry->hash == hash && entry->depth == depth &&
+            memcmp(&sampling_stack_pool[entry->offset], frame_indexes, depth * sizeof(frame_indexes[0])) == 0) {
+            entry->count += 1;
+
+            return true;
+        }
+    }
+}
+
+// The thread state of the interrupted thread, if it is allowed to look at
+// its frames, i.e. it holds the GIL.
+static PyThreadState *Nuitka_SamplingProfiler_getThreadState(void) {
+#if PYTHON_VERSION >= 0x3c0
+    // Only set for threads attached to the interpreter.
+    return _PyThreadState_GET();
+#else
+    PyThreadState *tstate = PyThreadState_GET();
+
+    if (tstate == NULL || tstate != PyGILState_GetThisThreadState()) {
+        return NULL;
+    }
+
+    return tstate;
+#endif
+}
+
+static void Nuitka_SamplingProfiler_takeSample(PyThreadState *tstate) {
+    uint32_t frame_indexes[NUITKA_SAMPLING_MAX_DEPTH];
+    uint32_t depth = 0;
+
+#if PYTHON_VERSION < 0x3b0
+    for (PyFrameObject *frame = tstate->frame; frame != NULL && depth < NUITKA_SAMPLING_MAX_DEPTH;
+         frame = frame->f_back) {
+        PyCodeObject *code = frame->f_code;
+#else
+    for (_PyInterpreterFrame *frame = CURRENT_TSTATE_INTERPRETER_FRAME(tstate);
+         frame != NULL && depth < NUITKA_SAMPLING_MAX_DEPTH; frame = frame->previous) {
+#if PYTHON_VERSION >= 0x3c0
+        // Entry frames of the C stack are not Python functions.
+        if (frame->owner == FRAME_OWNED_BY_CSTACK) {
+            continue;
+        }
+#endif
+
+        PyCodeObject *code = Nuitka_InterpreterFrame_GetCodeObject(frame);
+#endif
+        if (code == NULL || !PyCode_Check(code)) {
+            continue;
+        }
+
+        int32_t frame_index = Nuitka_SamplingProfiler_getFrameIndex(code);
+
+        if (frame_index < 0) {
+            sampling_dropped_samples += 1;
+            return;
+        }
+
+        frame_indexes[depth] = (uint32_t)frame_index;
+        depth += 1;
+    }
+
+    if (depth == 0) {
+        return;
+    }
+
+    if (Nuitka_SamplingProfiler_countStack(frame_indexes, depth) == false) {
+        sampling_dropped_samples += 1;
+    }
+}
+
+static void Nuitka_SamplingProfiler_onSignal(int signal_number) {
+    int saved_errno = errno;
+
+    if (__sync_lock_test_and_set(&sampling_handler_busy, 1) == 0) {
+        if (sampling_output_filename != NULL) {
+            PyThreadState *tstate = Nuitka_SamplingProfiler_getThreadState();
+
+            if (tstate != NULL) {
+                Nuitka_SamplingProfiler_takeSample(tstate);
+            }
+        }
+
+        __sync_lock_release(&sampling_handler_busy);
+    } else {
+        sampling_dropped_samples += 1;
+    }
+
+    errno = saved_errno;
+}
+
+static void Nuitka_SamplingProfiler_setTimer(long interval) {
+    struct itimerval timer;
+
+    timer.it_interval.tv_sec = interval / 1000000;
+    timer.it_interval.tv_usec = interval % 1000000;
+    timer.it_value = timer.it_interval;
+
+    setitimer(ITIMER_PROF, &timer, NULL);
+}
+
+void startSamplingProfiler(void) {
+    char const *output_filename = getenv("NUITKA_SAMPLING_PROFILE");
+
+    if (output_filename == NULL || *output_filename == 0) {
+        return;
+    }
+
+    long interval = NUITKA_SAMPLING_DEFAULT_INTERVAL;
+
+    char const *interval_value = getenv("NUITKA_SAMPLING_PROFILE_INTERVAL");
+    if (interval_value != NULL && atol(interval_value) > 0) {
+        interval = atol(interval_value);
+    }
+
+    sampling_frames = (struct Nuitka_SamplingFrame *)calloc(NUITKA_SAMPLING_FRAMES_SIZE, sizeof(sampling_frames[0]));
+    sampling_stacks = (struct Nuitka_SamplingStack *)calloc(NUITKA_SAMPLING_STACKS_SIZE, sizeof(sampling_stacks[0]));
+    sampling_stack_pool = (uint32_t *)malloc(NUITKA_SAMPLING_STACK_POOL_SIZE * sizeof(sampling_stack_pool[0]));
+
+    if (sampling_frames == NULL || sampling_stacks == NULL || sampling_stack_pool == NULL) {
+        fprintf(stderr, "Nuitka: Failed to allocate memory for sampling profiler.\n");
+        return;
+    }
+
+    // Keep our own copy, the program might change the environment.
+    sampling_output_filename = strdup(output_filename);
+
+    struct sigaction sa;
+    memset(&sa, 0, sizeof(sa));
+    sa.sa_handler = Nuitka_SamplingProfiler_onSignal;
+    sa.sa_flags = SA_RESTART;
+    sigemptyset(&sa.sa_mask);
+    sigaction(SIGPROF, &sa, NULL);
+
+    Nuitka_SamplingProfiler_setTimer(interval);
+}
+
+static void Nuitka_SamplingProfiler_writeFrame(FILE *output, uint32_t frame_index) {
+    struct Nuitka_SamplingFrame *frame = &sampling_frames[frame_index];
+
+    fprintf(output, "%s (%s:%d)", frame->name, frame->filename, frame->line);
+}
+
+void stopSamplingProfiler(void) {
+    if (sampling_output_filename == NULL) {
+        return;
+    }
+
+    Nuitka_SamplingProfiler_setTimer(0);
+    signal(SIGPROF, SIG_IGN);
+
+    // Wait for a handler still running in another thread.
+    while (__sync_lock_test_and_set(&sampling_handler_busy, 1) != 0) {
+    }
+
+    FILE *output = fopen(sampling_output_filename, "w");
+
+    if (output == NULL) {
+        fprintf(stderr, "Nuitka: Failed to open '%s' for writing sampling profile.\n", sampling_output_filename);
+        return;
+    }
+
+    for (uint32_t i = 0; i < NUITKA_SAMPLING_STACKS_SIZE; i++) {
+        struct Nuitka_SamplingStack *stack = &sampling_stacks[i];
+
+        if (stack->hash == 0) {
+            continue;
+        }
+
+        // Collapsed stacks start with the outermost frame.
+        for (uint32_t j = stack->depth; j > 0; j--) {
+            Nuitka_SamplingProfiler_writeFrame(output, sampling_stack_pool[stack->offset + j - 1]);
+
+            if (j > 1) {
+                fputc(';', output);
+            }
+        }
+
+        fprintf(output, " %u\n", stack->count);
+    }
+
+    if (sampling_dropped_samples > 0) {
+        fprintf(output, "<dropped> %u\n", sampling_dropped_samples);
+    }
+
+    fclose(output);
+}
+
+#endif
+
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.gnu.org/licenses/agpl.txt
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
@@ -0,0 +1,330 @@
+//     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+/**
+ * This is responsible for a structured trace of program startup, included in
+ * the program if asked for at compile time, and activated at run time by
+ * setting the "NUITKA_STARTUP_TRACE" environment variable to an output
+ * filename.
+ *
+ * Nested begin and end events with monotonic timestamps are recorded, e.g.
+ * for unpacking of onefile payloads, interpreter initialization, loading of
+ * constants and imports of modules, and written in Chrome trace event format,
+ * usable with e.g. "chrome://tracing", "ui.perfetto.dev" or "speedscope".
+ *
+ * The process that starts the trace creates the file, and child processes,
+ * e.g. the program started by the onefile bootstrap, append their events to
+ * it, so the trace is left as an unterminated JSON array, which the trace
+ * format allows for. Events are kept in memory, and written with a single
+ * write at the end, so they do not disturb the timing and processes do not
+ * mix their outputs.
+ *
+ * This file is used by the onefile bootstrap too, so it must not use Python.
+ */
+
+// This file is included from another C file, help IDEs to still parse it on
+// its own.
+#ifdef __IDE_ONLY__
+#include "nuitka/prelude.h"
+#endif
+
+#if _NUITKA_STARTUP_TRACE
+
+#include <stdarg.h>
+
+#if defined(_WIN32)
+#include <windows.h>
+#else
+#include <pthread.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#endif
+
+#define NUITKA_STARTUP_TRACE_INITIAL_BUFFER_SIZE (64 * 1024)
+
+bool startup_trace_active = false;
+
+static environment_char_t startup_trace_filename[4096];
+
+static char *startup_trace_buffer = NULL;
+static size_t startup_trace_buffer_size = 0;
+static size_t startup_trace_buffer_used = 0;
+
+static unsigned long startup_trace_pid = 0;
+
+// Protect against events from multiple threads at once.
+#if defined(_WIN32)
+static LONG volatile startup_trace_lock = 0;
+
+#define LOCK_STARTUP_TRACE()                                                                                           \
+    while (InterlockedExchange(&startup_trace_lock, 1) != 0) {                                                         \
+    }
+#define UNLOCK_STARTUP_TRACE() InterlockedExchange(&startup_trace_lock, 0)
+#else
+static volatile int startup_trace_lock = 0;
+
+#define LOCK_STARTUP_TRACE()                                                                                           \
+    while (__sync_lock_test_and_set(&startup_trace_lock, 1) != 0) {                                                    \
+    }
+#define UNLOCK_STARTUP_TRACE() __sync_lock_release(&startup_trace_lock)
+#endif
+
+// Monotonic time in microseconds, which is what the trace format uses. The
+// clocks used are system wide, so times of processes can be compared.
+static unsigned long long getStartupTraceTime(void) {
+#if defined(_WIN32)
+    static LARGE_INTEGER frequency = {0};
+
+    if (frequency.QuadPart == 0) {
+        QueryPerformanceFrequency(&frequency);
+    }
+
+    LARGE_INTEGER counter;
+    QueryPerformanceCounter(&counter);
+
+    return (unsigned long long)(counter.QuadPart / frequency.QuadPart) * 1000000 +
+           (unsigned long long)(counter.QuadPart % frequency.QuadPart) * 1000000 / frequency.QuadPart;
+#else
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+
+    return (unsigned long long)now.tv_sec * 1000000 + (unsigned long long)now.tv_nsec / 1000;
+#endif
+}
+
+static unsigned long getStartupTraceThreadId(void) {
+#if defined(_WIN32)
+    return (unsigned long)GetCurrentThreadId();
+#elif defined(__linux__) && defined(SYS_gettid)
+    return (unsigned long)syscall(SYS_gettid);
+#elif defined(__APPLE__)
+    uint64_t thread_id;
+    pthread_threadid_np(NULL, &thread_id);
+
+    return (unsigned long)thread_id;
+#else
+    // Not the thread ids of the system, but distinct for running threads,
+    // which is all it takes for events to be nested per thread.
+    return (unsigned long)(uintptr_t)pthread_self();
+#endif
+}
+
+static bool reserveStartupTraceBuffer(size_t size) {
+    if (startup_trace_buffer_used + size <= startup_trace_buffer_size) {
+        return true;
+    }
+
+    size_t new_size = startup_trace_buffer_size;
+
+    while (startup_trace_buffer_used + size > new_size) {
+        new_size *= 2;
+    }
+
+    char *new_buffer = (char *)realloc(startup_trace_buffer, new_size);
+
+    if (new_buffer == NULL) {
+        return false;
+    }
+
+    startup_trace_buffer = new_buffer;
+    startup_trace_buffer_size = new_size;
+
+    return true;
+}
+
+static void appendStartupTraceFormatted(char const *format, ...) {
+    va_list args;
+
+    for (;;) {
+        size_t available = startup_trace_buffer_size - startup_trace_buffer_used;
+
+        va_start(args, format);
+        int res = vsnprintf(startup_trace_buffer + startup_trace_buffer_used, available, format, args);
+        va_end(args);
+
+        if (unlikely(res < 0)) {
+            return;
+        }
+
+        if ((size_t)res < available) {
+            startup_trace_buffer_used += res;
+            return;
+        }
+
+        if (reserveStartupTraceBuffer(res + 1) == false) {
+            return;
+        }
+    }
+}
+
+// Names are module names mostly, but quotes and control characters would
+// break the JSON format.
+static void appendStartupTraceString(char const *value) {
+    if (reserveStartupTraceBuffer(strlen(value) * 6 + 2) == false) {
+        return;
+    }
+
+    char *w = startup_trace_buffer + startup_trace_buffer_used;
+
+    *w++ = '"';
+
+    for (; *value != 0; value++) {
+        unsigned char c = (unsigned char)*value;
+
+        if (c == '"' || c == '\\') {
+            *w++ = '\\';
+            *w++ = (char)c;
+        } else if (c < 0x20) {
+            w += sprintf(w, "\\u%04x", c);
+        } else {
+            *w++ = (char)c;
+        }
+    }
+
+    *w++ = '"';
+
+    startup_trace_buffer_used = w - startup_trace_buffer;
+}
+
+static FILE *openStartupTraceFile(bool append) {
+#if defined(_WIN32)
+    return _wfopen(startup_trace_filename, append ? L"ab" : L"wb");
+#else
+    return fopen(startup_trace_filename, append ? "ab" : "wb");
+#endif
+}
+
+void startStartupTrace(char const *process_name) {
+    environment_char_t const *filename = getEnvironmentVariable("NUITKA_STARTUP_TRACE");
+
+    if (filename == NULL || *filename == 0 || startup_trace_active) {
+        return;
+    }
+
+    size_t i;
+    for (i = 0; filename[i] != 0 && i + 1 < sizeof(startup_trace_filename) / sizeof(environment_char_t); i++) {
+        startup_trace_filename[i] = filename[i];
+    }
+    startup_trace_filename[i] = 0;
+
+    // The first process of a program creates the file, others, typically its
+    // child processes, append to it.
+    environment_char_t const *append = getEnvironmentVariable("NUITKA_STARTUP_TRACE_APPEND");
+
+    if (append == NULL || *append == 0) {
+        FILE *output = openStartupTraceFile(false);
+
+        if (output == NULL) {
+            return;
+        }
+
+        fputs("[\n", output);
+        fclose(output);
+
+        setEnvironmentVariable("NUITKA_STARTUP_TRACE_APPEND", makeEnvironmentLiteral("1"));
+    }
+
+    startup_trace_buffer = (char *)malloc(NUITKA_STARTUP_TRACE_INITIAL_BUFFER_SIZE);
+
+    if (startup_trace_buffer == NULL) {
+        return;
+    }
+
+    startup_trace_buffer_size = NUITKA_STARTUP_TRACE_INITIAL_BUFFER_SIZE;
+    startup_trace_buffer_used = 0;
+
+#if defined(_WIN32)
+    startup_trace_pid = (unsigned long)GetCurrentProcessId();
+#else
+    startup_trace_pid = (unsigned long)getpid();
+#endif
+
+    appendStartupTraceFormatted("{\"ph\":\"M\",\"name\":\"process_name\",\"pid\":%lu,\"args\":{\"name\":",
+                                startup_trace_pid);
+    appendStartupTraceString(process_name);
+    appendStartupTraceFormatted("}},\n");
+
+    startup_trace_active = true;
+
+    // Also for exits that do not return from the main program normally.
+    atexit(stopStartupTrace);
+}
+
+void traceStartupBegin(char const *category, char const *name) {
+    unsigned long long now = getStartupTraceTime();
+
+    LOCK_STARTUP_TRACE();
+
+    // Might have been stopped by another thread meanwhile.
+    if (unlikely(startup_trace_active == false)) {
+        UNLOCK_STARTUP_TRACE();
+        return;
+    }
+
+    appendStartupTraceFormatted("{\"ph\":\"B\",\"pid\":%lu,\"tid\":%lu,\"ts\":%llu,\"cat\":", startup_trace_pid,
+                                getStartupTraceThreadId(), now);
+    appendStartupTraceString(category);
+    appendStartupTraceFormatted(",\"name\":");
+    appendStartupTraceString(name);
+    appendStartupTraceFormatted("},\n");
+
+    UNLOCK_STARTUP_TRACE();
+}
+
+void traceStartupEnd(void) {
+    unsigned long long now = getStartupTraceTime();
+
+    LOCK_STARTUP_TRACE();
+
+    if (unlikely(startup_trace_active == false)) {
+        UNLOCK_STARTUP_TRACE();
+        return;
+    }
+
+    appendStartupTraceFormatted("{\"ph\":\"E\",\"pid\":%lu,\"tid\":%lu,\"ts\":%llu},\n", startup_trace_pid,
+                                getStartupTraceThreadId(), now);
+
+    UNLOCK_STARTUP_TRACE();
+}
+
+void stopStartupTrace(void) {
+    if (startup_trace_active == false) {
+        return;
+    }
+
+    LOCK_STARTUP_TRACE();
+
+    startup_trace_active = false;
+
+    FILE *output = openStartupTraceFile(true);
+
+    if (output != NULL) {
+        // Unbuffered, so this is a single write of all events, with other
+        // processes appending to the file too.
+        setvbuf(output, NULL, _IONBF, 0);
+
+        fwrite(startup_trace_buffer, 1, startup_trace_buffer_used, output);
+        fclose(output);
+    }
+
+    free(startup_trace_buffer);
+    startup_trace_buffer = NULL;
+
+    UNLOCK_STARTUP_TRACE();
+}
+
+#endif
+
+//     Part of "Nuitka", an optimizing Python compiler that is compatible and
+//     integrates with CPython, but also works on its own.
+//
+//     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+//     you may not use this file except in compliance with the License.
+//     You may obtain a copy of the License at
+//
+//        http://www.gnu.org/licenses/agpl.txt
+//
+//     Unless required by applicable law or agreed to in writing, software
+//     distributed under the License is distributed on an "AS IS" BASIS,
+//     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+//     See the License for the specific language governing permissions and
+//     limitations under the License.
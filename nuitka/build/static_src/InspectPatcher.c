@@ -359,8 +359,8 @@ void patchTypeComparison(void) {
 
 // Freelist setup
 #define MAX_TRACEBACK_FREE_LIST_COUNT 1000
-static PyTracebackObject *free_list_tracebacks = NULL;
-static int free_list_tracebacks_count = 0;
+NUITKA_THREAD_STATIC PyTracebackObject *free_list_tracebacks = NULL;
+NUITKA_THREAD_STATIC int free_list_tracebacks_count = 0;
 
 // Create a traceback for a given frame, using a free list hacked into the
 // existing type.
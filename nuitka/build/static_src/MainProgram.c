@@ -1482,6 +1482,11 @@ static int Nuitka_Main(int argc, native_command_line_argument_t **argv) {
 
     NUITKA_PRINT_TIMING("main(): Entered.");
 
+#if _NUITKA_STARTUP_TRACE
+    // Structured startup trace if asked for by environment.
+    startStartupTrace("program");
+#endif
+
     // NUITKA_INIT_PROGRAM_EARLY(argc, argv);
 
 #ifdef __FreeBSD__
@@ -1496,7 +1501,9 @@ static int Nuitka_Main(int argc, native_command_line_argument_t **argv) {
 
 #if _NUITKA_STANDALONE_MODE
     NUITKA_PRINT_TIMING("main(): Prepare standalone environment.");
+    NUITKA_STARTUP_TRACE_BEGIN("startup", "prepareStandaloneEnvironment");
     prepareStandaloneEnvironment();
+    NUITKA_STARTUP_TRACE_END();
 #endif
 
 #if _NUITKA_FROZEN > 0
@@ -1657,7 +1664,9 @@ static int Nuitka_Main(int argc, native_command_line_argument_t **argv) {
 
     /* Initialize the embedded CPython interpreter. */
     NUITKA_PRINT_TIMING("main(): Calling Nuitka_Py_Initialize to initialize interpreter.");
+    NUITKA_STARTUP_TRACE_BEGIN("startup", "Nuitka_Py_Initialize");
     Nuitka_Py_Initialize();
+    NUITKA_STARTUP_TRACE_END();
 
     PyThreadState *tstate = PyThreadState_GET();
 
@@ -1707,14 +1716,18 @@ static int Nuitka_Main(int argc, native_command_line_argument_t **argv) {
      * "sys.executable" while at it.
      */
     NUITKA_PRINT_TIMING("main(): Calling createGlobalConstants().");
+    NUITKA_STARTUP_TRACE_BEGIN("startup", "createGlobalConstants");
     createGlobalConstants(tstate);
+    NUITKA_STARTUP_TRACE_END();
     NUITKA_PRINT_TIMING("main(): Returned createGlobalConstants().");
 
     /* Complex call helpers need "__main__" constants, even if we only
      * go into "__parents__main__" module as a start point.
      */
     NUITKA_PRINT_TIMING("main(): Calling createMainModuleConstants().");
+    NUITKA_STARTUP_TRACE_BEGIN("startup", "createMainModuleConstants");
     createMainModuleConstants(tstate);
+    NUITKA_STARTUP_TRACE_END();
     NUITKA_PRINT_TIMING("main(): Returned createMainModuleConstants().");
 
     NUITKA_PRINT_TRACE("main(): Calling _initBuiltinOriginalValues().");
@@ -1896,6 +1909,11 @@ static int Nuitka_Main(int argc, native_command_line_argument_t **argv) {
     startProfiling();
 #endif
 
+#if _NUITKA_SAMPLING_PROFILER
+    // Native sampling profiling if asked for by environment.
+    startSamplingProfiler();
+#endif
+
     // Execute the main module unless plugins want to do something else. In case
     // of multiprocessing making a fork on Windows, we should execute
     // "__parents_main__" instead. And for Windows Service we call the plugin C
@@ -2048,7 +2066,9 @@ static int Nuitka_Main(int argc, native_command_line_argument_t **argv) {
 #else
     /* Execute the "__main__" module. */
     NUITKA_PRINT_TIMING("main(): Calling " NUITKA_MAIN_MODULE_NAME ".");
+    NUITKA_STARTUP_TRACE_BEGIN("startup", "EXECUTE_MAIN_MODULE");
     EXECUTE_MAIN_MODULE(tstate, NUITKA_MAIN_MODULE_NAME, NUITKA_MAIN_IS_PACKAGE_BOOL);
+    NUITKA_STARTUP_TRACE_END();
     NUITKA_PRINT_TIMING("main(): Exited from " NUITKA_MAIN_MODULE_NAME ".");
 
 #endif
@@ -2060,6 +2080,14 @@ static int Nuitka_Main(int argc, native_command_line_argument_t **argv) {
     stopProfiling();
 #endif
 
+#if _NUITKA_SAMPLING_PROFILER
+    stopSamplingProfiler();
+#endif
+
+#if _NUITKA_STARTUP_TRACE
+    stopStartupTrace();
+#endif
+
 #if _NUITKA_PGO_PYTHON
     // Write out profiling with our own Python PGO if enabled.
     PGO_Finalize();
@@ -258,56 +258,121 @@ static PyObject *loadModuleFromCodeObject(PyThreadState *tstate, PyObject *modul
     return module;
 }
 
-static struct Nuitka_MetaPathBasedLoaderEntry *findEntry(char const *name) {
+// Hash index of the loader entries by name, using open addressing with linear
+// probing, so entries of the same name are found in loader entries order. It
+// is created when the loader is registered, before any lookup can happen, and
+// created again if entry names get changed. Without memory for it, lookups scan
+// the loader entries instead.
+static struct Nuitka_MetaPathBasedLoaderEntry **loader_entries_index = NULL;
+static size_t loader_entries_index_mask = 0;
+
+static size_t hashLoaderEntryName(char const *name, size_t length) {
+    // FNV-1a hash, good enough for module names.
+    uint32_t result = 2166136261U;
+
+    while (length-- > 0) {
+        result ^= (unsigned char)*name++;
+        result *= 16777619U;
+    }
+
+    return (size_t)result;
+}
+
+static void createLoaderEntriesIndex(void) {
     struct Nuitka_MetaPathBasedLoaderEntry *current = loader_entries;
     assert(current);
 
+    size_t count = 0;
+
     while (current->name != NULL) {
         if ((current->flags & NUITKA_TRANSLATED_FLAG) != 0) {
             current->name = UN_TRANSLATE(current->name);
             current->flags -= NUITKA_TRANSLATED_FLAG;
         }
 
-        if (strcmp(name, current->name) == 0) {
-            return current;
-        }
-
+        count += 1;
         current++;
     }
 
-    return NULL;
-}
+    // Keep the load factor at most one half.
+    size_t size = 16;
+    while (size < 2 * count) {
+        size *= 2;
+    }
 
-#if !_NUITKA_STANDALONE_MODE
-static struct Nuitka_MetaPathBasedLoaderEntry *findContainingPackageEntry(char const *name) {
-    struct Nuitka_MetaPathBasedLoaderEntry *current = loader_entries;
+    loader_entries_index =
+        (struct Nuitka_MetaPathBasedLoaderEntry **)calloc(size, sizeof(struct Nuitka_MetaPathBasedLoaderEntry *));
 
-    // Consider the package name of the searched entry.
-    char const *package_name_end = strrchr(name, '.');
-    if (package_name_end == NULL) {
-        return NULL;
+    if (unlikely(loader_entries_index == NULL)) {
+        return;
     }
 
-    size_t length = package_name_end - name;
+    loader_entries_index_mask = size - 1;
 
-    while (current->name != NULL) {
-        if ((current->flags & NUITKA_TRANSLATED_FLAG) != 0) {
-            current->name = UN_TRANSLATE(current->name);
-            current->flags -= NUITKA_TRANSLATED_FLAG;
+    for (current = loader_entries; current->name != NULL; current++) {
+        size_t slot = hashLoaderEntryName(current->name, strlen(current->name)) & loader_entries_index_mask;
+
+        while (loader_entries_index[slot] != NULL) {
+            slot = (slot + 1) & loader_entries_index_mask;
         }
 
-        if ((current->flags & NUITKA_PACKAGE_FLAG) != 0) {
-            if (strlen(current->name) == length && strncmp(name, current->name, length) == 0) {
+        loader_entries_index[slot] = current;
+    }
+}
+
+#if _NUITKA_MODULE_MODE
+static void releaseLoaderEntriesIndex(void) {
+    free(loader_entries_index);
+    loader_entries_index = NULL;
+}
+#endif
+
+// Find the first loader entry with the given name, that has all the given flags.
+static struct Nuitka_MetaPathBasedLoaderEntry *lookupLoaderEntry(char const *name, size_t length, int flags) {
+    assert(loader_entries != NULL);
+
+    if (unlikely(loader_entries_index == NULL)) {
+        for (struct Nuitka_MetaPathBasedLoaderEntry *current = loader_entries; current->name != NULL; current++) {
+            if ((current->flags & flags) == flags && strncmp(name, current->name, length) == 0 &&
+                current->name[length] == 0) {
                 return current;
             }
         }
 
-        current++;
+        return NULL;
+    }
+
+    size_t slot = hashLoaderEntryName(name, length) & loader_entries_index_mask;
+
+    struct Nuitka_MetaPathBasedLoaderEntry *current;
+
+    while ((current = loader_entries_index[slot]) != NULL) {
+        if ((current->flags & flags) == flags && strncmp(name, current->name, length) == 0 &&
+            current->name[length] == 0) {
+            return current;
+        }
+
+        slot = (slot + 1) & loader_entries_index_mask;
     }
 
     return NULL;
 }
 
+static struct Nuitka_MetaPathBasedLoaderEntry *findEntry(char const *name) {
+    return lookupLoaderEntry(name, strlen(name), 0);
+}
+
+#if !_NUITKA_STANDALONE_MODE
+static struct Nuitka_MetaPathBasedLoaderEntry *findContainingPackageEntry(char const *name) {
+    // Consider the package name of the searched entry.
+    char const *package_name_end = strrchr(name, '.');
+    if (package_name_end == NULL) {
+        return NULL;
+    }
+
+    return lookupLoaderEntry(name, package_name_end - name, NUITKA_PACKAGE_FLAG);
+}
+
 static PyObject *_getFileList(PyThreadState *tstate, PyObject *dirname) {
     static PyObject *listdir_func = NULL;
 
@@ -491,9 +556,17 @@ static PyObject *callIntoInstalledExtensionModule(PyThreadState *tstate, PyObjec
     char const *extension_module_filename_str = Nuitka_String_AsString(extension_module_filename);
 #endif
 
+    char const *module_name_str = Nuitka_String_AsString(module_name);
+
+    NUITKA_STARTUP_TRACE_BEGIN("extension", module_name_str);
+
     // TODO: The value of "is_package" is guessed, maybe infer from filename being
     // a "__init__.so" and the like.
-    return callIntoExtensionModule(tstate, Nuitka_String_AsString(module_name), extension_module_filename_str, false);
+    PyObject *result = callIntoExtensionModule(tstate, module_name_str, extension_module_filename_str, false);
+
+    NUITKA_STARTUP_TRACE_END();
+
+    return result;
 }
 
 #endif
@@ -1377,7 +1450,9 @@ static PyObject *_EXECUTE_EMBEDDED_MODULE(PyThreadState *tstate, PyObject *modul
         PyGC_Collect();
 #endif
 
+        NUITKA_STARTUP_TRACE_BEGIN(getEntryModeString(entry), name);
         result = loadModule(tstate, module, module_name, entry);
+        NUITKA_STARTUP_TRACE_END();
 
 #if !defined(_NUITKA_DEPLOYMENT_MODE) && !defined(_NUITKA_NO_DEPLOYMENT_PERFECT_SUPPORT)
         if (unlikely(HAS_ERROR_OCCURRED(tstate))) {
@@ -1406,9 +1481,11 @@ static PyObject *_EXECUTE_EMBEDDED_MODULE(PyThreadState *tstate, PyObject *modul
     }
 
     if (frozen_import) {
+        NUITKA_STARTUP_TRACE_BEGIN("frozen", name);
         PGO_onModuleEntered(name);
         int res = PyImport_ImportFrozenModule((char *)name);
         PGO_onModuleExit(name, res == -1);
+        NUITKA_STARTUP_TRACE_END();
 
         if (unlikely(res == -1)) {
             return NULL;
@@ -2259,8 +2336,8 @@ static PyObject *Nuitka_Loader_tp_repr(struct Nuitka_LoaderObject *loader) {
 
 // Freelist setup
 #define MAX_LOADER_FREE_LIST_COUNT 10
-static struct Nuitka_LoaderObject *free_list_loaders = NULL;
-static int free_list_loaders_count = 0;
+NUITKA_THREAD_STATIC struct Nuitka_LoaderObject *free_list_loaders = NULL;
+NUITKA_THREAD_STATIC int free_list_loaders_count = 0;
 
 static void Nuitka_Loader_tp_dealloc(struct Nuitka_LoaderObject *loader) {
     Nuitka_GC_UnTrack(loader);
@@ -2344,6 +2421,10 @@ void updateMetaPathBasedLoaderModuleRoot(char const *module_root_name) {
     char const *last_dot = strrchr(module_root_name, '.');
 
     if (last_dot != NULL) {
+        // Names are going to change, the index needs to be created again.
+        bool had_index = loader_entries_index != NULL;
+        releaseLoaderEntriesIndex();
+
         struct Nuitka_MetaPathBasedLoaderEntry *current = loader_entries;
         assert(current);
 
@@ -2372,6 +2453,10 @@ void updateMetaPathBasedLoaderModuleRoot(char const *module_root_name) {
 
             current++;
         }
+
+        if (had_index) {
+            createLoaderEntriesIndex();
+        }
     }
 }
 #endif
@@ -2399,6 +2484,10 @@ void registerMetaPathBasedLoader(struct Nuitka_MetaPathBasedLoaderEntry *_loader
     }
 #endif
 
+    // Lookups use the index without creating it, so this must be done before
+    // anything can be imported.
+    createLoaderEntriesIndex();
+
     Nuitka_PyType_Ready(&Nuitka_Loader_Type, NULL, true, false, false, false, false);
 
 #if PYTHON_VERSION >= 0x370
@@ -74,6 +74,19 @@
 #define _NUITKA_ATTACH_CONSOLE_WINDOW 1
 #endif
 
+// With compression, file contents are in independent frames, that can be
+// decompressed in parallel. For archives, every file is a frame, otherwise
+// blocks of files are a frame.
+#if _NUITKA_ONEFILE_COMPRESSION_BOOL == 1
+#define _NUITKA_ONEFILE_PARALLEL_EXTRACTION_BOOL 1
+#else
+#define _NUITKA_ONEFILE_PARALLEL_EXTRACTION_BOOL 0
+#endif
+
+#if _NUITKA_ONEFILE_PARALLEL_EXTRACTION_BOOL == 1 && !defined(_WIN32)
+#include <pthread.h>
+#endif
+
 #if _NUITKA_ONEFILE_COMPRESSION_BOOL == 1
 // Header of zstd goes first, spellchecker: ignore ZSTDERRORLIB,ZSTDLIB
 #define ZSTDERRORLIB_VISIBILITY
@@ -121,6 +134,13 @@
 // For tracing outputs if enabled at compile time.
 #include "nuitka/tracing.h"
 
+// For structured startup trace if enabled at compile time.
+#include "nuitka/startup_trace.h"
+
+#if _NUITKA_STARTUP_TRACE
+#include "HelpersStartupTrace.c"
+#endif
+
 static void fatalError(char const *message) {
     puts(message);
     exit(2);
@@ -143,7 +163,7 @@ static void fatalErrorAttachedData(void) { fatalError("Error, couldn't decode at
 static void fatalErrorHeaderAttachedData(void) { fatalError("Error, couldn't find attached data header."); }
 
 // Out of memory error.
-#if !defined(_WIN32) || _NUITKA_ONEFILE_COMPRESSION_BOOL == 1
+#if !defined(_WIN32) || _NUITKA_ONEFILE_COMPRESSION_BOOL == 1 || _NUITKA_ONEFILE_TEMP_BOOL == 0
 static void fatalErrorMemory(void) { fatalError("Error, couldn't allocate memory."); }
 #endif
 
@@ -255,35 +275,6 @@ static void initPayloadData(void) {
 #endif
 }
 
-#if _NUITKA_ONEFILE_COMPRESSION_BOOL == 1
-
-static ZSTD_DCtx *dest_ctx = NULL;
-static ZSTD_inBuffer input = {NULL, 0, 0};
-static ZSTD_outBuffer output = {NULL, 0, 0};
-
-static void initZSTD(void) {
-    input.src = NULL;
-
-    size_t const output_buffer_size = ZSTD_DStreamOutSize();
-    output.dst = malloc(output_buffer_size);
-    if (output.dst == NULL) {
-        fatalErrorMemory();
-    }
-
-    dest_ctx = ZSTD_createDCtx();
-    if (dest_ctx == NULL) {
-        fatalErrorMemory();
-    }
-}
-
-static void releaseZSTD(void) {
-    ZSTD_freeDCtx(dest_ctx);
-
-    free(output.dst);
-}
-
-#endif
-
 static void readChunk(void *buffer, size_t size) {
     // printf("Reading %d\n", size);
 
@@ -291,68 +282,44 @@ static void readChunk(void *buffer, size_t size) {
     payload_current += size;
 }
 
-static void readPayloadChunk(void *buffer, size_t size) {
 #if _NUITKA_ONEFILE_COMPRESSION_BOOL == 1 && _NUITKA_ONEFILE_ARCHIVE_BOOL == 0
-    bool end_of_buffer = false;
-
-    // Loop until finished with asked chunk.
-    while (size > 0) {
-        size_t available = output.size - output.pos;
-
-        // printf("already available %d asking for %d\n", available, size);
-
-        // Consider available data.
-        if (available != 0) {
-            size_t use = available;
-            if (size < use) {
-                use = size;
-            }
-
-            memcpy(buffer, ((char *)output.dst) + output.pos, use);
-            buffer = (void *)(((char *)buffer) + use);
-            size -= use;
-
-            output.pos += use;
-
-            // Loop end check may exist when "size" is "use".
-            continue;
-        }
+// Without archive, the payload starts with a compressed index of the files,
+// that is then read instead of the payload, and the compressed blocks of file
+// contents follow it.
+static unsigned char *payload_index = NULL;
+static unsigned char const *payload_blocks = NULL;
 
-        // Nothing available, make sure to make it available from existing input.
-        if (input.pos < input.size || end_of_buffer) {
-            output.pos = 0;
-            output.size = ZSTD_DStreamOutSize();
+static void readPayloadIndex(void) {
+    unsigned long long index_compressed_size;
+    readChunk(&index_compressed_size, sizeof(index_compressed_size));
 
-            size_t const ret = ZSTD_decompressStream(dest_ctx, &output, &input);
-            // printf("return output %d %d\n", output.pos, output.size);
-            end_of_buffer = (output.pos == output.size);
+    unsigned long long index_size = ZSTD_getFrameContentSize(payload_current, (size_t)index_compressed_size);
 
-            if (ZSTD_isError(ret)) {
-                fatalErrorAttachedData();
-            }
+    if (index_size == ZSTD_CONTENTSIZE_UNKNOWN || index_size == ZSTD_CONTENTSIZE_ERROR) {
+        fatalErrorAttachedData();
+    }
 
-            output.size = output.pos;
-            output.pos = 0;
+    payload_index = (unsigned char *)malloc((size_t)index_size);
 
-            // printf("made output %d %d\n", output.pos, output.size);
+    if (payload_index == NULL) {
+        fatalErrorMemory();
+    }
 
-            // Above code gets a turn.
-            continue;
-        }
+    size_t res = ZSTD_decompress(payload_index, (size_t)index_size, payload_current, (size_t)index_compressed_size);
 
-        if (input.size != input.pos) {
-            fatalErrorAttachedData();
-        }
+    if (ZSTD_isError(res) || res != index_size) {
+        fatalErrorAttachedData();
     }
-#else
-    readChunk(buffer, size);
-#endif
+
+    payload_blocks = payload_current + index_compressed_size;
+    payload_current = payload_index;
 }
+#endif
 
 #if _NUITKA_ONEFILE_TEMP_BOOL == 0
 static uint32_t readPayloadChecksumValue(void) {
     unsigned int result;
-    readPayloadChunk(&result, sizeof(unsigned int));
+    readChunk(&result, sizeof(unsigned int));
 
     return (uint32_t)result;
 }
@@ -361,7 +328,7 @@ static uint32_t readPayloadChecksumValue(void) {
 #if !defined(_WIN32) && !defined(__MSYS__)
 static unsigned char readPayloadFileFlagsValue(void) {
     unsigned char result;
-    readPayloadChunk(&result, 1);
+    readChunk(&result, 1);
 
     return result;
 }
@@ -369,15 +336,15 @@ static unsigned char readPayloadFileFlagsValue(void) {
 
 static unsigned long long readPayloadSizeValue(void) {
     unsigned long long result;
-    readPayloadChunk(&result, sizeof(unsigned long long));
+    readChunk(&result, sizeof(unsigned long long));
 
     return result;
 }
 
 #if _NUITKA_ONEFILE_ARCHIVE_BOOL == 1 && _NUITKA_ONEFILE_COMPRESSION_BOOL == 1
 static unsigned long long readArchiveFileSizeValue(void) {
-    unsigned long long result;
-    readPayloadChunk(&result, sizeof(unsigned int));
+    unsigned int result;
+    readChunk(&result, sizeof(unsigned int));
 
     return result;
 }
@@ -386,7 +353,7 @@ static unsigned long long readArchiveFileSizeValue(void) {
 static filename_char_t readPayloadFilenameCharacter(void) {
     filename_char_t result;
 
-    readPayloadChunk(&result, sizeof(filename_char_t));
+    readChunk(&result, sizeof(filename_char_t));
 
     return result;
 }
@@ -409,10 +376,9 @@ static filename_char_t *readPayloadFilename(void) {
     return buffer;
 }
 
+// With compression, files are done by the parallel extraction instead.
+#if _NUITKA_ONEFILE_PARALLEL_EXTRACTION_BOOL == 0
 static void writeContainedFile(FILE_HANDLE target_file, unsigned long long file_size) {
-#if _NUITKA_ONEFILE_ARCHIVE_BOOL == 1
-
-#if _NUITKA_ONEFILE_COMPRESSION_BOOL == 0
     if (target_file != FILE_HANDLE_NULL) {
         if (writeFileChunk(target_file, payload_current, file_size) == false) {
             fatalErrorTempFiles();
@@ -420,63 +386,347 @@ static void writeContainedFile(FILE_HANDLE target_file, unsigned long long file_
     }
 
     payload_current += file_size;
+}
+#endif
+
+#if !defined(_WIN32) && !defined(__MSYS__)
+static void setContainedFileExecutable(FILE_HANDLE target_file) {
+    int fd = fileno(target_file);
+
+    struct stat stat_buffer;
+    int res = fstat(fd, &stat_buffer);
+
+    if (res == -1) {
+        printOSErrorMessage("fstat", errno);
+    }
+
+    // User shall be able to execute if at least.
+    stat_buffer.st_mode |= S_IXUSR;
+
+    // Follow read flags for group, others according to umask.
+    if ((stat_buffer.st_mode & S_IRGRP) != 0) {
+        stat_buffer.st_mode |= S_IXOTH;
+    }
+
+    if ((stat_buffer.st_mode & S_IRGRP) != 0) {
+        stat_buffer.st_mode |= S_IXOTH;
+    }
+
+    res = fchmod(fd, stat_buffer.st_mode);
+
+    if (res == -1) {
+        printOSErrorMessage("fchmod", errno);
+    }
+}
+#endif
+
+#if _NUITKA_ONEFILE_PARALLEL_EXTRACTION_BOOL == 1
+
+// Files to extract are collected while going over the payload, and then done
+// by a small pool of threads, each with its own decompression context. Every
+// block is an independent frame with the contents of one or more files.
+struct OnefileExtractionFile {
+    // Not set, if the file is unchanged, and doesn't need to be written.
+    filename_char_t *target_path;
+    unsigned long long file_size;
+    unsigned char file_flags;
+#if _NUITKA_ONEFILE_TEMP_BOOL == 0
+    uint32_t manifest_index;
+#endif
+};
+
+struct OnefileExtractionBlock {
+    unsigned char const *compressed_data;
+    size_t compressed_size;
+    size_t first_file;
+    size_t file_count;
+};
+
+#define MAX_EXTRACTION_THREADS 8
+
+static struct OnefileExtractionFile *extraction_files = NULL;
+static size_t extraction_file_count = 0;
+static size_t extraction_file_allocated = 0;
+
+static struct OnefileExtractionBlock *extraction_blocks = NULL;
+static size_t extraction_block_count = 0;
+static size_t extraction_block_allocated = 0;
+static size_t extraction_block_next = 0;
+
+#if defined(_WIN32)
+static CRITICAL_SECTION extraction_block_lock;
 #else
-    if (target_file != FILE_HANDLE_NULL) {
+static pthread_mutex_t extraction_block_lock = PTHREAD_MUTEX_INITIALIZER;
+#endif
 
-        // Nothing available, make sure to make it available from existing input.
-        while (input.pos < input.size) {
-            // printf("available input %ld %ld\n", input.pos, input.size);
+static struct OnefileExtractionFile *addExtractionFile(filename_char_t const *target_path) {
+    if (extraction_file_count == extraction_file_allocated) {
+        extraction_file_allocated = extraction_file_allocated == 0 ? 256 : extraction_file_allocated * 2;
 
-            output.pos = 0;
-            output.size = ZSTD_DStreamOutSize();
+        extraction_files = (struct OnefileExtractionFile *)realloc(
+            extraction_files, extraction_file_allocated * sizeof(struct OnefileExtractionFile));
 
-            size_t const ret = ZSTD_decompressStream(dest_ctx, &output, &input);
-            if (ZSTD_isError(ret)) {
-                fatalErrorAttachedData();
-            }
+        if (extraction_files == NULL) {
+            fatalErrorMemory();
+        }
+    }
 
-            // printf("available output %ld %ld\n", output.pos, output.size);
+    struct OnefileExtractionFile *file = &extraction_files[extraction_file_count++];
+    memset(file, 0, sizeof(struct OnefileExtractionFile));
 
-            if (writeFileChunk(target_file, (char const *)output.dst, output.pos) == false) {
-                fatalErrorTempFiles();
-            }
+    if (target_path != NULL) {
+        size_t target_path_size = (strlenFilename(target_path) + 1) * sizeof(filename_char_t);
+        file->target_path = (filename_char_t *)malloc(target_path_size);
+
+        if (file->target_path == NULL) {
+            fatalErrorMemory();
+        }
+
+        memcpy(file->target_path, target_path, target_path_size);
+    }
 
-            // printf("made output %ld %lld\n", output.pos, file_size);
-            file_size -= output.pos;
-            assert(file_size >= 0);
+    return file;
+}
+
+static void addExtractionBlock(unsigned char const *compressed_data, size_t compressed_size, size_t first_file,
+                               size_t file_count) {
+    // Blocks with only unchanged files need not be decompressed at all.
+    bool needs_write = false;
+
+    for (size_t i = first_file; i < first_file + file_count; i++) {
+        if (extraction_files[i].target_path != NULL) {
+            needs_write = true;
+            break;
         }
+    }
+
+    if (needs_write == false) {
+        return;
+    }
+
+    if (extraction_block_count == extraction_block_allocated) {
+        extraction_block_allocated = extraction_block_allocated == 0 ? 256 : extraction_block_allocated * 2;
 
-        assert(file_size == 0);
+        extraction_blocks = (struct OnefileExtractionBlock *)realloc(
+            extraction_blocks, extraction_block_allocated * sizeof(struct OnefileExtractionBlock));
+
+        if (extraction_blocks == NULL) {
+            fatalErrorMemory();
+        }
     }
+
+    struct OnefileExtractionBlock *block = &extraction_blocks[extraction_block_count++];
+
+    block->compressed_data = compressed_data;
+    block->compressed_size = compressed_size;
+    block->first_file = first_file;
+    block->file_count = file_count;
+}
+
+static struct OnefileExtractionBlock *getNextExtractionBlock(void) {
+    struct OnefileExtractionBlock *result = NULL;
+
+#if defined(_WIN32)
+    EnterCriticalSection(&extraction_block_lock);
+#else
+    pthread_mutex_lock(&extraction_block_lock);
 #endif
+
+    if (extraction_block_next < extraction_block_count) {
+        result = &extraction_blocks[extraction_block_next++];
+    }
+
+#if defined(_WIN32)
+    LeaveCriticalSection(&extraction_block_lock);
 #else
-    while (file_size > 0) {
-        static char chunk[32768];
+    pthread_mutex_unlock(&extraction_block_lock);
+#endif
 
-        long chunk_size;
+    return result;
+}
 
-        // Doing min manually, as otherwise the compiler is confused from types.
-        if (file_size <= sizeof(chunk)) {
-            chunk_size = (long)file_size;
-        } else {
-            chunk_size = sizeof(chunk);
+struct OnefileExtractionStream {
+    ZSTD_DCtx *ctx;
+    ZSTD_inBuffer input;
+    char *output_buffer;
+    size_t output_pos;
+    size_t output_size;
+};
+
+// Provide up to "wanted" bytes of decompressed block contents.
+static size_t readExtractionStream(struct OnefileExtractionStream *stream, char const **data,
+                                   unsigned long long wanted) {
+    while (stream->output_pos == stream->output_size) {
+        ZSTD_outBuffer output = {stream->output_buffer, ZSTD_DStreamOutSize(), 0};
+
+        size_t ret = ZSTD_decompressStream(stream->ctx, &output, &stream->input);
+
+        // Without output, either the frame is complete, or the input is used
+        // up, then the block is shorter than its files.
+        if (ZSTD_isError(ret) || (output.pos == 0 && (ret == 0 || stream->input.pos == stream->input.size))) {
+            fatalErrorAttachedData();
+        }
+
+        stream->output_pos = 0;
+        stream->output_size = output.pos;
+    }
+
+    size_t result = stream->output_size - stream->output_pos;
+
+    if (wanted < result) {
+        result = (size_t)wanted;
+    }
+
+    *data = stream->output_buffer + stream->output_pos;
+    stream->output_pos += result;
+
+    return result;
+}
+
+static void runExtractionBlock(ZSTD_DCtx *job_ctx, void *output_buffer, struct OnefileExtractionBlock const *block) {
+    struct OnefileExtractionStream stream = {
+        job_ctx, {block->compressed_data, block->compressed_size, 0}, (char *)output_buffer, 0, 0};
+
+    ZSTD_DCtx_reset(job_ctx, ZSTD_reset_session_only);
+
+    for (size_t i = block->first_file; i < block->first_file + block->file_count; i++) {
+        struct OnefileExtractionFile const *file = &extraction_files[i];
+
+        FILE_HANDLE target_file = FILE_HANDLE_NULL;
+
+        if (file->target_path != NULL) {
+            target_file = createFileForWritingChecked(file->target_path);
         }
 
-        readPayloadChunk(chunk, chunk_size);
+        unsigned long long file_size = file->file_size;
+
+        while (file_size > 0) {
+            char const *data;
+            size_t data_size = readExtractionStream(&stream, &data, file_size);
+
+            if (target_file != FILE_HANDLE_NULL) {
+                if (writeFileChunk(target_file, data, data_size) == false) {
+                    fatalErrorTempFiles();
+                }
+            }
+
+            file_size -= data_size;
+        }
 
         if (target_file != FILE_HANDLE_NULL) {
-            if (writeFileChunk(target_file, chunk, chunk_size) == false) {
+#if !defined(_WIN32) && !defined(__MSYS__)
+            if (file->file_flags & 1) {
+                setContainedFileExecutable(target_file);
+            }
+#endif
+
+            if (closeFile(target_file) == false) {
                 fatalErrorTempFiles();
             }
         }
+    }
+}
 
-        file_size -= chunk_size;
+#if defined(_WIN32)
+static DWORD WINAPI runExtractionJobs(LPVOID arg)
+#else
+static void *runExtractionJobs(void *arg)
+#endif
+{
+    ZSTD_DCtx *job_ctx = ZSTD_createDCtx();
+    void *output_buffer = malloc(ZSTD_DStreamOutSize());
+
+    if (job_ctx == NULL || output_buffer == NULL) {
+        fatalErrorMemory();
     }
 
-    assert(file_size == 0);
+    for (;;) {
+        struct OnefileExtractionBlock *block = getNextExtractionBlock();
+
+        if (block == NULL) {
+            break;
+        }
+
+        runExtractionBlock(job_ctx, output_buffer, block);
+    }
+
+    free(output_buffer);
+    ZSTD_freeDCtx(job_ctx);
+
+    return 0;
+}
+
+static unsigned int getExtractionThreadCount(void) {
+#if defined(_WIN32)
+    SYSTEM_INFO system_info;
+    GetSystemInfo(&system_info);
+
+    unsigned int result = system_info.dwNumberOfProcessors;
+#else
+    long cpu_count = sysconf(_SC_NPROCESSORS_ONLN);
+
+    unsigned int result = cpu_count > 0 ? (unsigned int)cpu_count : 1;
 #endif
+
+    if (result > MAX_EXTRACTION_THREADS) {
+        result = MAX_EXTRACTION_THREADS;
+    }
+
+    if (result > extraction_block_count) {
+        result = (unsigned int)extraction_block_count;
+    }
+
+    return result;
 }
 
+static void runExtractionThreads(void) {
+    unsigned int thread_count = getExtractionThreadCount();
+
+#if defined(_WIN32)
+    InitializeCriticalSection(&extraction_block_lock);
+
+    HANDLE threads[MAX_EXTRACTION_THREADS];
+#else
+    pthread_t threads[MAX_EXTRACTION_THREADS];
+#endif
+
+    // The main thread works too, failing to start more threads only means
+    // less parallelism.
+    unsigned int started_count = 0;
+
+    while (started_count + 1 < thread_count) {
+#if defined(_WIN32)
+        threads[started_count] = CreateThread(NULL, 0, runExtractionJobs, NULL, 0, NULL);
+
+        if (threads[started_count] == NULL) {
+            break;
+        }
+#else
+        if (pthread_create(&threads[started_count], NULL, runExtractionJobs, NULL) != 0) {
+            break;
+        }
+#endif
+        started_count += 1;
+    }
+
+    runExtractionJobs(NULL);
+
+    for (unsigned int i = 0; i < started_count; i++) {
+#if defined(_WIN32)
+        WaitForSingleObject(threads[i], INFINITE);
+        CloseHandle(threads[i]);
+#else
+        pthread_join(threads[i], NULL);
+#endif
+    }
+
+#if defined(_WIN32)
+    DeleteCriticalSection(&extraction_block_lock);
+#endif
+}
+
+#endif
+
 // Zero means, not yet created, created unsuccessfully, terminated already.
 #if defined(_WIN32)
 HANDLE handle_process = 0;
@@ -575,6 +825,188 @@ static bool createContainingDirectory(filename_char_t const *path) {
     return true;
 }
 
+#if _NUITKA_ONEFILE_TEMP_BOOL == 0
+
+// In cached mode, a manifest next to the unpacked directory records for every
+// payload file what was unpacked, and the size and modification time it had
+// afterwards. Warm starts then only need to check these, rather than reading
+// every file to compute its checksum.
+struct OnefileManifestHeader {
+    char magic[4];
+    uint32_t entry_count;
+    unsigned long long payload_size;
+    unsigned char payload_hash[16];
+};
+
+struct OnefileManifestEntry {
+    uint32_t filename_checksum;
+    uint32_t contained_checksum;
+    unsigned long long file_size;
+    long long file_mtime;
+};
+
+static filename_char_t manifest_path[4096] = {0};
+
+// Hash of the payload contents, as computed when creating it.
+static unsigned char payload_hash[16];
+
+static struct OnefileManifestEntry *old_manifest_entries = NULL;
+static uint32_t old_manifest_entry_count = 0;
+
+static struct OnefileManifestEntry *manifest_entries = NULL;
+static uint32_t manifest_entry_count = 0;
+static uint32_t manifest_entry_allocated = 0;
+
+// Needs to be written again, because it was missing, stale, or files changed.
+static bool manifest_changed = false;
+
+static bool getFileStatInfo(filename_char_t const *filename, unsigned long long *file_size, long long *file_mtime) {
+#if defined(_WIN32)
+    WIN32_FILE_ATTRIBUTE_DATA attributes;
+
+    if (GetFileAttributesExW(filename, GetFileExInfoStandard, &attributes) == 0) {
+        return false;
+    }
+
+    *file_size = ((unsigned long long)attributes.nFileSizeHigh << 32) | attributes.nFileSizeLow;
+    *file_mtime = (long long)(((unsigned long long)attributes.ftLastWriteTime.dwHighDateTime << 32) |
+                              attributes.ftLastWriteTime.dwLowDateTime);
+#else
+    struct stat stat_buffer;
+
+    if (stat(filename, &stat_buffer) == -1) {
+        return false;
+    }
+
+    *file_size = (unsigned long long)stat_buffer.st_size;
+#if defined(__linux__)
+    *file_mtime = (long long)stat_buffer.st_mtim.tv_sec * 1000000000 + stat_buffer.st_mtim.tv_nsec;
+#else
+    *file_mtime = (long long)stat_buffer.st_mtime;
+#endif
+#endif
+
+    return true;
+}
+
+static void readManifest(void) {
+    appendStringSafeFilename(manifest_path, payload_path, sizeof(manifest_path) / sizeof(filename_char_t));
+    appendStringSafeFilename(manifest_path, FILENAME_EMPTY_STR ".manifest",
+                             sizeof(manifest_path) / sizeof(filename_char_t));
+
+    manifest_changed = true;
+
+    FILE_HANDLE manifest_file = openFileForReading(manifest_path);
+
+    if (manifest_file == FILE_HANDLE_NULL) {
+        return;
+    }
+
+    struct OnefileManifestHeader header;
+    int64_t manifest_size = getFileSize(manifest_file);
+
+    // Only accept manifests written for this very payload.
+    if (manifest_size >= (int64_t)sizeof(header) && readFileChunk(manifest_file, &header, sizeof(header)) &&
+        memcmp(header.magic, "KAMF", 4) == 0 && header.payload_size == payload_size &&
+        memcmp(header.payload_hash, payload_hash, sizeof(payload_hash)) == 0 && header.entry_count > 0 &&
+        manifest_size == (int64_t)(sizeof(header) + header.entry_count * sizeof(struct OnefileManifestEntry))) {
+        old_manifest_entries =
+            (struct OnefileManifestEntry *)malloc(header.entry_count * sizeof(struct OnefileManifestEntry));
+
+        if (old_manifest_entries == NULL) {
+            fatalErrorMemory();
+        }
+
+        if (readFileChunk(manifest_file, old_manifest_entries,
+                          header.entry_count * sizeof(struct OnefileManifestEntry))) {
+            old_manifest_entry_count = header.entry_count;
+            manifest_changed = false;
+        } else {
+            free(old_manifest_entries);
+            old_manifest_entries = NULL;
+        }
+    }
+
+    closeFile(manifest_file);
+
+#ifdef _NUITKA_EXPERIMENTAL_DEBUG_ONEFILE_CACHING
+    fprintf(stderr, "MANIFEST %s for '" FILENAME_FORMAT_STR "'.\n", manifest_changed ? "MISS" : "HIT", manifest_path);
+#endif
+}
+
+// Check if the next file is unchanged according to the manifest.
+static bool isManifestEntryUnchanged(struct OnefileManifestEntry const *entry) {
+    if (manifest_entry_count >= old_manifest_entry_count) {
+        return false;
+    }
+
+    return memcmp(&old_manifest_entries[manifest_entry_count], entry, sizeof(struct OnefileManifestEntry)) == 0;
+}
+
+static void addManifestEntry(struct OnefileManifestEntry const *entry) {
+    if (manifest_entry_count == manifest_entry_allocated) {
+        manifest_entry_allocated = manifest_entry_allocated == 0 ? 256 : manifest_entry_allocated * 2;
+
+        manifest_entries = (struct OnefileManifestEntry *)realloc(
+            manifest_entries, manifest_entry_allocated * sizeof(struct OnefileManifestEntry));
+
+        if (manifest_entries == NULL) {
+            fatalErrorMemory();
+        }
+    }
+
+    manifest_entries[manifest_entry_count++] = *entry;
+}
+
+static void writeManifest(void) {
+    if (manifest_changed == false && manifest_entry_count == old_manifest_entry_count) {
+        return;
+    }
+
+    // Write to a temporary file, and rename it into place, so concurrently
+    // started processes never see a partial manifest. Failing to write it is
+    // not an error, next start will just have to check checksums again.
+    filename_char_t manifest_tmp_path[4096] = {0};
+    appendStringSafeFilename(manifest_tmp_path, manifest_path, sizeof(manifest_tmp_path) / sizeof(filename_char_t));
+#if defined(_WIN32)
+    appendStringSafeFilename(manifest_tmp_path, FILENAME_TMP_STR, sizeof(manifest_tmp_path) / sizeof(filename_char_t));
+#else
+    char pid_buffer[128];
+    snprintf(pid_buffer, sizeof(pid_buffer), ".%ld" FILENAME_TMP_STR, (long)getpid());
+    appendStringSafeFilename(manifest_tmp_path, pid_buffer, sizeof(manifest_tmp_path) / sizeof(filename_char_t));
+#endif
+
+    FILE_HANDLE manifest_file = createFileForWriting(manifest_tmp_path);
+
+    if (manifest_file == FILE_HANDLE_NULL) {
+        return;
+    }
+
+    struct OnefileManifestHeader header;
+    memset(&header, 0, sizeof(header));
+    memcpy(header.magic, "KAMF", 4);
+    header.entry_count = manifest_entry_count;
+    header.payload_size = payload_size;
+    memcpy(header.payload_hash, payload_hash, sizeof(payload_hash));
+
+    bool res = writeFileChunk(manifest_file, &header, sizeof(header)) &&
+               writeFileChunk(manifest_file, manifest_entries, manifest_entry_count * sizeof(struct OnefileManifestEntry));
+
+    if (closeFile(manifest_file) == false || res == false) {
+        deleteFile(manifest_tmp_path);
+        return;
+    }
+
+#if defined(_WIN32)
+    deleteFile(manifest_path);
+#endif
+    if (renameFile(manifest_tmp_path, manifest_path) == false) {
+        deleteFile(manifest_tmp_path);
+    }
+}
+
+#endif
+
 #if _NUITKA_ONEFILE_TEMP_BOOL
 #if defined(_WIN32)
 
@@ -1213,6 +1645,10 @@ int main(int argc, char **argv) {
 
     NUITKA_PRINT_TIMING("ONEFILE: Entered main().");
 
+#if _NUITKA_STARTUP_TRACE
+    startStartupTrace("onefile bootstrap");
+#endif
+
 #if _NUITKA_ONEFILE_DLL_MODE
     NUITKA_PRINT_TIMING("ONEFILE: Checking role of process.");
     environment_char_t const *process_role = getEnvironmentVariable("NUITKA_ONEFILE_PARENT");
@@ -1298,6 +1734,7 @@ int main(int argc, char **argv) {
 #endif
 
     NUITKA_PRINT_TIMING("ONEFILE: Unpacking payload.");
+    NUITKA_STARTUP_TRACE_BEGIN("onefile", "unpack payload");
     initPayloadData();
 
     static filename_char_t first_filename[1024] = {0};
@@ -1338,20 +1775,21 @@ int main(int argc, char **argv) {
 
     NUITKA_PRINT_TIMING("ONEFILE: Header is OK.");
 
+#if _NUITKA_ONEFILE_TEMP_BOOL == 0
+    readChunk(payload_hash, sizeof(payload_hash));
+#endif
+
 // The 'X' stands for no compression, 'Y' is compressed, handle that.
 #if _NUITKA_ONEFILE_COMPRESSION_BOOL == 1
     if (header[2] != 'Y') {
         fatalErrorHeaderAttachedData();
     }
-    initZSTD();
-
-    input.src = payload_current;
-    input.pos = 0;
-
-    // TODO: Ought to assert that this doesn't truncate anything.
-    input.size = (size_t)payload_size;
 
     assert(payload_size > 0);
+
+#if _NUITKA_ONEFILE_ARCHIVE_BOOL == 0
+    readPayloadIndex();
+#endif
 #else
     if (header[2] != 'X') {
         fatalErrorHeaderAttachedData();
@@ -1362,6 +1800,8 @@ int main(int argc, char **argv) {
 
 #if _NUITKA_ONEFILE_TEMP_BOOL
     payload_created = true;
+#else
+    readManifest();
 #endif
 
     for (;;) {
@@ -1419,36 +1859,69 @@ int main(int argc, char **argv) {
         bool needs_write = true;
 
 #if _NUITKA_ONEFILE_TEMP_BOOL == 0
-        uint32_t contained_file_checksum = readPayloadChecksumValue();
-        uint32_t existing_file_checksum = getFileCRC32(target_path);
+        struct OnefileManifestEntry manifest_entry;
+        memset(&manifest_entry, 0, sizeof(manifest_entry));
+
+        manifest_entry.filename_checksum =
+            calcCRC32((unsigned char const *)filename, (uint32_t)(strlenFilename(filename) * sizeof(filename_char_t)));
+        manifest_entry.contained_checksum = readPayloadChecksumValue();
+
+        bool exists = getFileStatInfo(target_path, &manifest_entry.file_size, &manifest_entry.file_mtime);
 
-        if (contained_file_checksum == existing_file_checksum) {
+        if (exists && manifest_entry.file_size == file_size && isManifestEntryUnchanged(&manifest_entry)) {
             needs_write = false;
 
 #ifdef _NUITKA_EXPERIMENTAL_DEBUG_ONEFILE_CACHING
-            fprintf(stderr, "CACHE HIT for '" FILENAME_FORMAT_STR "'.\n", target_path);
+            fprintf(stderr, "CACHE HIT for '" FILENAME_FORMAT_STR "' from manifest.\n", target_path);
 #endif
         } else {
+            // Not known from manifest, fall back to checking the file contents.
+            manifest_changed = true;
+
+            if (exists && manifest_entry.file_size == file_size &&
+                manifest_entry.contained_checksum == getFileCRC32(target_path)) {
+                needs_write = false;
+
 #ifdef _NUITKA_EXPERIMENTAL_DEBUG_ONEFILE_CACHING
-            fprintf(stderr, "CACHE MISS for '" FILENAME_FORMAT_STR "'.\n", target_path);
+                fprintf(stderr, "CACHE HIT for '" FILENAME_FORMAT_STR "'.\n", target_path);
 #endif
+            } else {
+#ifdef _NUITKA_EXPERIMENTAL_DEBUG_ONEFILE_CACHING
+                fprintf(stderr, "CACHE MISS for '" FILENAME_FORMAT_STR "'.\n", target_path);
+#endif
+            }
         }
 #endif
 
-#if _NUITKA_ONEFILE_ARCHIVE_BOOL == 1
-#if _NUITKA_ONEFILE_COMPRESSION_BOOL == 1
-        uint32_t contained_archive_file_size = readArchiveFileSizeValue();
+#if _NUITKA_ONEFILE_PARALLEL_EXTRACTION_BOOL == 1
+        // Only directories are created right away, writing is done later.
+        if (needs_write) {
+            createContainingDirectory(target_path);
+        }
+
+        struct OnefileExtractionFile *extraction_file = addExtractionFile(needs_write ? target_path : NULL);
+
+        extraction_file->file_size = file_size;
+#if !defined(_WIN32) && !defined(__MSYS__)
+        extraction_file->file_flags = file_flags;
+#endif
+#if _NUITKA_ONEFILE_TEMP_BOOL == 0
+        extraction_file->manifest_index = manifest_entry_count;
+#endif
 
-        input.src = payload_current;
-        input.pos = 0;
-        input.size = contained_archive_file_size;
+#if _NUITKA_ONEFILE_ARCHIVE_BOOL == 1
+        // Archive files are individually compressed, each is a block of its own.
+        uint32_t contained_archive_file_size = (uint32_t)readArchiveFileSizeValue();
 
-        output.pos = 0;
-        output.size = 0;
+        addExtractionBlock(payload_current, contained_archive_file_size, extraction_file_count - 1, 1);
 
         payload_current += contained_archive_file_size;
 #endif
+
+#if _NUITKA_ONEFILE_TEMP_BOOL == 0
+        addManifestEntry(&manifest_entry);
 #endif
+#else
         FILE_HANDLE target_file = FILE_HANDLE_NULL;
 
         if (needs_write) {
@@ -1460,42 +1933,91 @@ int main(int argc, char **argv) {
 
 #if !defined(_WIN32) && !defined(__MSYS__)
         if ((file_flags & 1) && (target_file != FILE_HANDLE_NULL)) {
-            int fd = fileno(target_file);
-
-            struct stat stat_buffer;
-            int res = fstat(fd, &stat_buffer);
+            setContainedFileExecutable(target_file);
+        }
+#endif
 
-            if (res == -1) {
-                printOSErrorMessage("fstat", errno);
+        if (target_file != FILE_HANDLE_NULL) {
+            if (closeFile(target_file) == false) {
+                fatalErrorTempFiles();
             }
+        }
 
-            // User shall be able to execute if at least.
-            stat_buffer.st_mode |= S_IXUSR;
+#if _NUITKA_ONEFILE_TEMP_BOOL == 0
+        // Record what the file looks like after writing it, unless it fails,
+        // then the manifest entry will not match next time.
+        if (needs_write) {
+            getFileStatInfo(target_path, &manifest_entry.file_size, &manifest_entry.file_mtime);
+        }
 
-            // Follow read flags for group, others according to umask.
-            if ((stat_buffer.st_mode & S_IRGRP) != 0) {
-                stat_buffer.st_mode |= S_IXOTH;
-            }
+        addManifestEntry(&manifest_entry);
+#endif
+#endif
+    }
 
-            if ((stat_buffer.st_mode & S_IRGRP) != 0) {
-                stat_buffer.st_mode |= S_IXOTH;
-            }
+#if _NUITKA_ONEFILE_PARALLEL_EXTRACTION_BOOL == 1
+#if _NUITKA_ONEFILE_ARCHIVE_BOOL == 0
+    // After the files, the index lists the blocks holding their contents, in
+    // the same order.
+    {
+        unsigned char const *block_data = payload_blocks;
+        size_t first_file = 0;
+
+        unsigned int block_count;
+        readChunk(&block_count, sizeof(block_count));
+
+        for (unsigned int i = 0; i < block_count; i++) {
+            unsigned long long block_compressed_size = readPayloadSizeValue();
 
-            res = fchmod(fd, stat_buffer.st_mode);
+            unsigned int block_file_count;
+            readChunk(&block_file_count, sizeof(block_file_count));
 
-            if (res == -1) {
-                printOSErrorMessage("fchmod", errno);
+            if (first_file + block_file_count > extraction_file_count) {
+                fatalErrorAttachedData();
             }
+
+            addExtractionBlock(block_data, (size_t)block_compressed_size, first_file, block_file_count);
+
+            block_data += block_compressed_size;
+            first_file += block_file_count;
         }
+
+        if (first_file != extraction_file_count) {
+            fatalErrorAttachedData();
+        }
+    }
+
+    free(payload_index);
 #endif
 
-        if (target_file != FILE_HANDLE_NULL) {
-            if (closeFile(target_file) == false) {
-                fatalErrorTempFiles();
-            }
+    NUITKA_PRINT_TIMING("ONEFILE: Extracting files in parallel.");
+
+    runExtractionThreads();
+
+    for (size_t i = 0; i < extraction_file_count; i++) {
+        if (extraction_files[i].target_path == NULL) {
+            continue;
         }
+
+#if _NUITKA_ONEFILE_TEMP_BOOL == 0
+        // Record what the file looks like after writing it.
+        struct OnefileManifestEntry *written_manifest_entry = &manifest_entries[extraction_files[i].manifest_index];
+
+        getFileStatInfo(extraction_files[i].target_path, &written_manifest_entry->file_size,
+                        &written_manifest_entry->file_mtime);
+#endif
+
+        free(extraction_files[i].target_path);
     }
 
+    free(extraction_files);
+    free(extraction_blocks);
+#endif
+
+#if _NUITKA_ONEFILE_TEMP_BOOL == 0
+    writeManifest();
+#endif
+
     NUITKA_PRINT_TIMING("ONEFILE: Finishing decompression, cleanup payload.");
 
     closePayloadData();
@@ -1504,9 +2026,7 @@ int main(int argc, char **argv) {
     exe_file_updatable = true;
 #endif
 
-#if _NUITKA_ONEFILE_COMPRESSION_BOOL == 1
-    releaseZSTD();
-#endif
+    NUITKA_STARTUP_TRACE_END();
 
 #if defined(_WIN32)
     filename_char_t const *binary_filename = getBinaryFilenameWideChars(false);
@@ -1518,6 +2038,7 @@ int main(int argc, char **argv) {
     setEnvironmentVariable("NUITKA_ORIGINAL_ARGV0", argv[0]);
 
     NUITKA_PRINT_TIMING("ONEFILE: Preparing forking of slave process.");
+    NUITKA_STARTUP_TRACE_BEGIN("onefile", "run child process");
 
 #if _NUITKA_ONEFILE_DLL_MODE
     filename_char_t const *fork_binary = getBinaryPath();
@@ -1633,6 +2154,12 @@ int main(int argc, char **argv) {
         cleanupChildProcess(false);
     }
 
+#endif
+
+    NUITKA_STARTUP_TRACE_END();
+
+#if _NUITKA_STARTUP_TRACE
+    stopStartupTrace();
 #endif
 
     NUITKA_PRINT_TIMING("ONEFILE: Exiting.");
@@ -6,6 +6,7 @@
 Attribute lookup, setting.
 """
 
+from nuitka.options.Options import isExperimental
 from nuitka.States import states
 
 from .CodeHelpers import (
@@ -15,6 +16,11 @@ from .CodeHelpers import (
     withObjectCodeTemporaryAssignment,
 )
 from .ErrorCodes import getErrorExitBoolCode, getErrorExitCode, getReleaseCode
+from .PgoCodes import (
+    allocateAttributeLookupPgoSiteName,
+    decideDominantType,
+    getTypePgoRecordCode,
+)
 from .PythonAPICodes import (
     generateCAPIObjectCode,
     generateCAPIObjectCode0,
@@ -91,6 +97,23 @@ def generateDelAttributeCode(statement, emit, context):
         )
 
 
+def _shallUseAttributeLookupCache(source_name, attribute_name, emit, context):
+    pgo_site_name = allocateAttributeLookupPgoSiteName(
+        context=context, attribute_name=attribute_name
+    )
+
+    getTypePgoRecordCode(
+        context=context, site_name=pgo_site_name, value_name=source_name, emit=emit
+    )
+
+    # The cache checks the type it was filled for, so it specializes the lookup
+    # for a dominant type observed with PGO behind a guard.
+    return (
+        isExperimental("attribute-lookup-caches")
+        or decideDominantType(context=context, site_name=pgo_site_name) is not None
+    )
+
+
 def getAttributeLookupCode(
     to_name, source_name, attribute_name, needs_check, emit, context
 ):
@@ -98,6 +121,21 @@ def getAttributeLookupCode(
         emit("%s = LOOKUP_ATTRIBUTE_DICT_SLOT(tstate, %s);" % (to_name, source_name))
     elif attribute_name == "__class__":
         emit("%s = LOOKUP_ATTRIBUTE_CLASS_SLOT(tstate, %s);" % (to_name, source_name))
+    elif _shallUseAttributeLookupCache(
+        source_name=source_name,
+        attribute_name=attribute_name,
+        emit=emit,
+        context=context,
+    ):
+        emit(
+            "%s = LOOKUP_ATTRIBUTE_CACHED(tstate, %s, %s, &%s);"
+            % (
+                to_name,
+                source_name,
+                context.getConstantCode(attribute_name),
+                context.allocateAttributeLookupCache(),
+            )
+        )
     else:
         emit(
             "%s = LOOKUP_ATTRIBUTE(tstate, %s, %s);"
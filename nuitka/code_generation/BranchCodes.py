@@ -7,6 +7,12 @@ from .CodeHelpers import generateStatementSequenceCode
 from .ConditionalCodes import generateConditionCode
 from .Emission import withSubCollector
 from .LabelCodes import getGotoCode, getLabelCode
+from .PgoCodes import (
+    allocateBranchPgoSiteName,
+    decideBranchLikeliness,
+    getBranchPgoCountCode,
+    shallCountBranchPgo,
+)
 
 
 def generateBranchCode(statement, emit, context):
@@ -20,30 +26,50 @@ def generateBranchCode(statement, emit, context):
     context.setTrueBranchTarget(true_target)
     context.setFalseBranchTarget(false_target)
 
+    pgo_site_name = allocateBranchPgoSiteName(
+        context=context, source_ref=statement.getSourceReference()
+    )
+
     # Have own declaration scope for condition, to limit visibility from branches
     # which can be huge.
     with withSubCollector(emit, context) as condition_emit:
         generateConditionCode(
-            condition=statement.subnode_condition, emit=condition_emit, context=context
+            condition=statement.subnode_condition,
+            emit=condition_emit,
+            context=context,
+            likeliness=decideBranchLikeliness(
+                context=context, site_name=pgo_site_name
+            ),
         )
 
     context.setTrueBranchTarget(old_true_target)
     context.setFalseBranchTarget(old_false_target)
 
     getLabelCode(true_target, emit)
+    getBranchPgoCountCode(
+        context=context, site_name=pgo_site_name, taken=True, emit=emit
+    )
 
     generateStatementSequenceCode(
         statement_sequence=statement.subnode_yes_branch, emit=emit, context=context
     )
 
-    if statement.subnode_no_branch is not None:
+    # For counting, the branch not taken needs code of its own.
+    if statement.subnode_no_branch is not None or shallCountBranchPgo(pgo_site_name):
         getGotoCode(end_target, emit)
         getLabelCode(false_target, emit)
 
-        generateStatementSequenceCode(
-            statement_sequence=statement.subnode_no_branch, emit=emit, context=context
+        getBranchPgoCountCode(
+            context=context, site_name=pgo_site_name, taken=False, emit=emit
         )
 
+        if statement.subnode_no_branch is not None:
+            generateStatementSequenceCode(
+                statement_sequence=statement.subnode_no_branch,
+                emit=emit,
+                context=context,
+            )
+
         getLabelCode(end_target, emit)
     else:
         getLabelCode(false_target, emit)
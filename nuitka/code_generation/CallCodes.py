@@ -572,6 +572,36 @@ quick_instance_calls_used = set()
 quick_mixed_calls_used = set()
 
 
+def fetchQuickCallsUsed():
+    """Get and reset the quick call helpers used, for merging elsewhere."""
+    result = []
+
+    for calls_used in (
+        quick_calls_used,
+        quick_tuple_calls_used,
+        quick_instance_calls_used,
+        quick_mixed_calls_used,
+    ):
+        result.append(tuple(sorted(calls_used)))
+        calls_used.clear()
+
+    return tuple(result)
+
+
+def mergeQuickCallsUsed(quick_calls):
+    """Merge quick call helpers used as provided by "fetchQuickCallsUsed"."""
+    for calls_used, values in zip(
+        (
+            quick_calls_used,
+            quick_tuple_calls_used,
+            quick_instance_calls_used,
+            quick_mixed_calls_used,
+        ),
+        quick_calls,
+    ):
+        calls_used.update(values)
+
+
 def _getInstanceCallCodePosArgsQuick(
     to_name,
     called_name,
@@ -12,7 +12,11 @@ branches and make a code block out of it. But it doesn't contain any target
 language syntax.
 """
 
-from nuitka.ModuleRegistry import addModuleCodeGenerationTimeInformation
+from nuitka.ModuleRegistry import (
+    addModuleCodeGenerationTimeInformation,
+    getModuleCodeGenerationTimingInfos,
+    setModuleCodeGenerationTimingInfos,
+)
 from nuitka.nodes.AttributeNodesGenerated import (
     attribute_classes,
     attribute_typed_classes,
@@ -20,7 +24,12 @@ from nuitka.nodes.AttributeNodesGenerated import (
 from nuitka.nodes.BytesNodes import getBytesOperationClasses
 from nuitka.nodes.StrNodes import getStrOperationClasses
 from nuitka.options.Options import isCompileTimeProfile
+from nuitka.pgo.PGO import fetchPGODecisions, mergePGODecisions
 from nuitka.plugins.Hooks import deriveModuleConstantsBlobName
+from nuitka.plugins.Plugins import (
+    fetchPluginHookTimings,
+    mergePluginHookTimings,
+)
 from nuitka.Tracing import code_generation_logger
 from nuitka.utils.CStrings import encodePythonStringToC
 from nuitka.utils.Timing import TimerReport
@@ -69,7 +78,12 @@ from .BuiltinCodes import (
     generateBuiltinXrange2Code,
     generateBuiltinXrange3Code,
 )
-from .CallCodes import generateCallCode, getCallsCode
+from .CallCodes import (
+    fetchQuickCallsUsed,
+    generateCallCode,
+    getCallsCode,
+    mergeQuickCallsUsed,
+)
 from .ClassCodes import (
     generateBuiltinSuper1Code,
     generateBuiltinSuperCode,
@@ -92,9 +106,11 @@ from .ConditionalCodes import (
     generateConditionalCode,
 )
 from .ConstantCodes import (
+    fetchDistributionMetadataValues,
     generateConstantGenericAliasCode,
     generateConstantReferenceCode,
     getConstantsDefinitionCode,
+    mergeDistributionMetadataValues,
 )
 from .Contexts import (
     PythonAsyncgenObjectContext,
@@ -311,6 +327,12 @@ from .RaisingCodes import (
     generateRaiseExpressionCode,
     generateReraiseCode,
 )
+from .Reports import (
+    fetchMissingHelpers,
+    fetchMissingOptimizations,
+    mergeMissingHelpers,
+    mergeMissingOptimizations,
+)
 from .ReturnCodes import (
     generateGeneratorReturnNoneCode,
     generateGeneratorReturnValueCode,
@@ -619,6 +641,57 @@ def generateModuleCode(module, data_filename):
         raise KeyboardInterrupt("Interrupted while working on", module)
 
 
+def fetchCodeGenerationState(module_name):
+    """Get and reset global state of module code generation done so far.
+
+    This is used to transfer state from code generation done in a separate
+    process, it is merged with "mergeCodeGenerationState" in the main one.
+    """
+    timing_info = getModuleCodeGenerationTimingInfos(module_name)
+
+    return (
+        fetchQuickCallsUsed(),
+        fetchDistributionMetadataValues(),
+        fetchMissingHelpers(),
+        fetchMissingOptimizations(),
+        fetchPGODecisions(),
+        fetchPluginHookTimings(),
+        tuple(timing_info) if timing_info is not None else None,
+    )
+
+
+def discardCodeGenerationState():
+    """Discard global state of module code generation done so far.
+
+    Forked processes inherit the state of the main process, and must only
+    report what they add to it.
+    """
+    fetchCodeGenerationState(module_name=None)
+
+
+def mergeCodeGenerationState(module_name, code_generation_state):
+    """Merge global state of module code generation from another process."""
+    (
+        quick_calls,
+        metadata_values,
+        missing_helpers,
+        missing_optimizations,
+        pgo_decisions,
+        plugin_hook_timings,
+        timing_info,
+    ) = code_generation_state
+
+    mergeQuickCallsUsed(quick_calls)
+    mergeDistributionMetadataValues(metadata_values)
+    mergeMissingHelpers(missing_helpers)
+    mergeMissingOptimizations(missing_optimizations)
+    mergePGODecisions(pgo_decisions)
+    mergePluginHookTimings(plugin_hook_timings)
+
+    if timing_info is not None:
+        setModuleCodeGenerationTimingInfos(module_name, timing_info)
+
+
 def generateHelpersCode():
     calls_decl_code, calls_body_code = getCallsCode()
 
@@ -16,7 +16,7 @@ from .ErrorCodes import (
 from .LabelCodes import getBranchingCode, getGotoCode, getLabelCode
 
 
-def generateConditionCode(condition, emit, context):
+def generateConditionCode(condition, emit, context, likeliness=None):
     if condition.mayRaiseExceptionBool(BaseException):
         compare_name = context.allocateTempName("condition_result", "nuitka_bool")
     else:
@@ -30,6 +30,7 @@ def generateConditionCode(condition, emit, context):
         condition=compare_name.getCType().getTruthCheckCode(compare_name),
         emit=emit,
         context=context,
+        likeliness=likeliness,
     )
 
     getReleaseCode(compare_name, emit, context)
@@ -191,8 +192,7 @@ def generateConditionalCode(to_name, expression, emit, context):
         getGotoCode(end_target, real_emit)
         getLabelCode(false_target, real_emit)
 
-        for line in emit.codes:
-            real_emit(line)
+        emit.emitTo(real_emit)
         emit = real_emit
 
         getTakeReferenceCode(to_name, emit)
@@ -203,15 +203,13 @@ def generateConditionalCode(to_name, expression, emit, context):
         getGotoCode(end_target, real_emit)
         getLabelCode(false_target, real_emit)
 
-        for line in emit.codes:
-            real_emit(line)
+        emit.emitTo(real_emit)
         emit = real_emit
     else:
         getGotoCode(end_target, real_emit)
         getLabelCode(false_target, real_emit)
 
-        for line in emit.codes:
-            real_emit(line)
+        emit.emitTo(real_emit)
         emit = real_emit
 
     getLabelCode(end_target, emit)
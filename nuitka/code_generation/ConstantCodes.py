@@ -225,6 +225,29 @@ def addDistributionMetadataValue(distribution_name, distribution, reason):
         _metadata_values[distribution_name].reasons.append(reason)
 
 
+def fetchDistributionMetadataValues():
+    """Get and reset the distribution metadata values, for merging elsewhere."""
+    result = tuple(
+        (distribution_name, tuple(metadata_value))
+        for distribution_name, metadata_value in _metadata_values.items()
+    )
+
+    _metadata_values.clear()
+
+    return result
+
+
+def mergeDistributionMetadataValues(metadata_values):
+    """Merge metadata values as provided by "fetchDistributionMetadataValues"."""
+    for distribution_name, metadata_value in metadata_values:
+        metadata_value = MetaDataDescription(*metadata_value)
+
+        if distribution_name not in _metadata_values:
+            _metadata_values[distribution_name] = metadata_value
+        else:
+            _metadata_values[distribution_name].reasons.extend(metadata_value.reasons)
+
+
 def getDistributionMetadataValues():
     result = []
 
@@ -582,6 +582,15 @@ class PythonChildContextBase(PythonContextBase):
     def isModuleVariableAccessorCaching(self, variable_name):
         return self.parent.isModuleVariableAccessorCaching(variable_name)
 
+    def allocateAttributeLookupCache(self):
+        return self.parent.allocateAttributeLookupCache()
+
+    def allocatePgoSiteName(self, owner_name, site_kind, source_ref):
+        return self.parent.allocatePgoSiteName(owner_name, site_kind, source_ref)
+
+    def allocatePgoProbe(self, c_type, initializer):
+        return self.parent.allocatePgoProbe(c_type, initializer)
+
     def addInclude(self, header_name):
         self.parent.addInclude(header_name)
 
@@ -789,6 +798,9 @@ class PythonModuleContext(
         "module_init_codes",
         "module_includes",
         "module_variable_caching",
+        "attribute_lookup_cache_count",
+        "pgo_probe_count",
+        "pgo_probe_site_ordinals",
         # FrameDeclarationsMixin
         "frame_variables_stack",
         "frame_type_descriptions",
@@ -853,6 +865,11 @@ class PythonModuleContext(
 
         self.module_variable_caching = {}
 
+        self.attribute_lookup_cache_count = 0
+
+        self.pgo_probe_count = 0
+        self.pgo_probe_site_ordinals = {}
+
     def __repr__(self):
         return "<PythonModuleContext instance for module %s>" % self.name
 
@@ -874,6 +891,46 @@ class PythonModuleContext(
     def getModuleVariableAccessors(self):
         return self.module_variable_caching
 
+    def allocateAttributeLookupCache(self):
+        """Declare a new per call site attribute lookup cache, and return its name."""
+        self.attribute_lookup_cache_count += 1
+
+        cache_name = "attribute_lookup_cache_%d" % self.attribute_lookup_cache_count
+
+        self.addDeclaration(
+            cache_name,
+            "static struct Nuitka_AttributeLookupCache %s;" % cache_name,
+        )
+
+        return cache_name
+
+    def allocatePgoSiteName(self, owner_name, site_kind, source_ref):
+        """Name a Python PGO probe site, same for the same source code."""
+        key = owner_name, site_kind, source_ref.getLineNumber()
+
+        ordinal = self.pgo_probe_site_ordinals.get(key, 0)
+        self.pgo_probe_site_ordinals[key] = ordinal + 1
+
+        return "%s:%d:%s%d" % (
+            owner_name,
+            source_ref.getLineNumber(),
+            site_kind,
+            ordinal,
+        )
+
+    def allocatePgoProbe(self, c_type, initializer):
+        """Declare a new Python PGO probe struct, and return its name."""
+        self.pgo_probe_count += 1
+
+        probe_name = "pgo_probe_%d" % self.pgo_probe_count
+
+        self.addDeclaration(
+            probe_name,
+            "static struct %s %s = {%s};" % (c_type, probe_name, initializer),
+        )
+
+        return probe_name
+
     def isCompiledPythonModule(self):
         return True
 
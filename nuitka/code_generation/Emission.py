@@ -7,6 +7,10 @@ Code generation is driven via "emit", which is to receive lines of code and
 this is to collect them, providing the emit implementation. Sometimes nested
 use of these will occur.
 
+Collectors keep the code pieces as given, and nested collectors emitted into
+them are kept as a whole, so nesting them does not copy or split code again
+for each level, which was quadratic for deeply nested code of huge functions.
+Only when the code is used, it is split into lines once.
 """
 
 import contextlib
@@ -15,20 +19,51 @@ from .Indentation import indented
 
 
 class SourceCodeCollector(object):
+    __slots__ = ("fragments",)
+
     def __init__(self):
-        self.codes = []
+        # Strings of one or more lines of code, and nested collectors.
+        self.fragments = []
 
     def __call__(self, code):
-        self.emit(code)
+        self.fragments.append(code)
 
     def emit(self, code):
-        self.codes.extend(code.split("\n"))
+        self.fragments.append(code)
 
     def emitTo(self, emit):
-        for code in self.codes:
-            emit(indented(code))
-
-        self.codes = None
+        if type(emit) is SourceCodeCollector:
+            emit.fragments.append(self)
+        else:
+            for code in self.codes:
+                emit(indented(code))
+
+    def _iterFragmentCodes(self):
+        # Avoid recursion, nesting can be deep.
+        pending = [iter(self.fragments)]
+
+        while pending:
+            for fragment in pending[-1]:
+                if type(fragment) is SourceCodeCollector:
+                    pending.append(iter(fragment.fragments))
+                    break
+
+                yield fragment
+            else:
+                del pending[-1]
+
+    @property
+    def codes(self):
+        """The lines of code collected."""
+        result = []
+
+        for code in self._iterFragmentCodes():
+            if "\n" in code:
+                result.extend(code.split("\n"))
+            else:
+                result.append(code)
+
+        return result
 
 
 @contextlib.contextmanager
@@ -21,6 +21,7 @@ from .Indentation import indented
 from .LabelCodes import getGotoCode, getLabelCode
 from .LineNumberCodes import emitErrorLineNumberUpdateCode
 from .ModuleCodes import getModuleAccessCode
+from .PgoCodes import getFunctionPgoAttributes, getFunctionPgoEntryCode
 from .PythonAPICodes import generateCAPIObjectCode, getReferenceExportCode
 from .templates.CodeTemplatesFunction import (
     function_direct_body_template,
@@ -628,6 +629,10 @@ def _getFunctionCode(
 
     function_codes = SourceCodeCollector()
 
+    getFunctionPgoEntryCode(
+        context=context, parameters=parameters, emit=function_codes
+    )
+
     generateStatementSequenceCode(
         statement_sequence=context.getOwner().subnode_body,
         allow_none=True,
@@ -690,6 +695,7 @@ def _getFunctionCode(
             )
 
         result += function_direct_body_template % {
+            "function_attributes": getFunctionPgoAttributes(context),
             "file_scope": file_scope,
             "function_identifier": function_identifier,
             "direct_call_arg_spec": ", ".join(parameter_objects_decl),
@@ -699,6 +705,7 @@ def _getFunctionCode(
         }
     else:
         result += template_function_body % {
+            "function_attributes": getFunctionPgoAttributes(context),
             "function_identifier": function_identifier,
             "parameter_objects_decl": ", ".join(parameter_objects_decl),
             "function_locals": indented(function_locals),
@@ -23,10 +23,16 @@ def getLabelCode(label, emit):
     emit("%s:;" % label)
 
 
-def getBranchingCode(condition, emit, context):
+def getBranchingCode(condition, emit, context, likeliness=None):
     true_target = context.getTrueBranchTarget()
     false_target = context.getFalseBranchTarget()
 
+    # Hints from PGO information.
+    if likeliness is True:
+        condition = "likely(%s)" % condition
+    elif likeliness is False:
+        condition = "unlikely(%s)" % condition
+
     if true_target is not None and false_target is None:
         emit("if (%s) goto %s;" % (condition, true_target))
     elif true_target is None and false_target is not None:
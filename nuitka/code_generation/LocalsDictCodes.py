@@ -224,8 +224,8 @@ def generateLocalsDictVariableRefOrFallbackCode(to_name, expression, emit, conte
                 }
             )
 
-            if needs_ref:
-                context.addCleanupTempName(value_name)
+            # With a reference taken by the fallback, e.g. for module variables
+            # without the GIL, the release is registered already.
         else:
             if needs_ref:
                 template = template_read_locals_mapping_with_fallback_ref
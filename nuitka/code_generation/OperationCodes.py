@@ -33,6 +33,13 @@ from .ErrorCodes import (
     getTakeReferenceCode,
 )
 from .ExpressionCTypeSelectionHelpers import decideExpressionCTypes
+from .PgoCodes import (
+    allocateOperationPgoSiteName,
+    decideDominantType,
+    getOperandPgoSiteName,
+    getPgoTypeGuard,
+    getTypePgoRecordCode,
+)
 
 
 def generateOperationBinaryCode(to_name, expression, emit, context):
@@ -88,6 +95,100 @@ def generateOperationUnaryCode(to_name, expression, emit, context):
     )
 
 
+def _isPgoTypeGuardCandidate(shape, c_type):
+    # Only values of unknown type as objects can be checked for a type.
+    return c_type is CTypePyObjectPtr and shape.helper_code == "OBJECT"
+
+
+def _getBinaryOperationPgoTypeGuard(
+    prefix,
+    specialized_helpers_set,
+    helper_type,
+    operands,
+    argument_swap,
+    pgo_site_name,
+    emit,
+    context,
+):
+    """Record operand types with PGO, or decide a helper for dominant ones.
+
+    Returns:
+        None or a pair of the guard condition and helper function to use when
+        it is true.
+    """
+
+    guard_conditions = []
+    guard_shapes = []
+
+    for operand_index, (operand_name, shape, c_type) in enumerate(operands):
+        if _isPgoTypeGuardCandidate(shape, c_type):
+            operand_site_name = getOperandPgoSiteName(pgo_site_name, operand_index)
+
+            getTypePgoRecordCode(
+                context=context,
+                site_name=operand_site_name,
+                value_name=operand_name,
+                emit=emit,
+            )
+
+            type_guard = getPgoTypeGuard(
+                decideDominantType(context=context, site_name=operand_site_name)
+            )
+
+            if type_guard is not None:
+                shape, type_object_name = type_guard
+
+                guard_conditions.append(
+                    "Py_TYPE(%s) == &%s" % (operand_name, type_object_name)
+                )
+
+        guard_shapes.append(shape)
+
+    if not guard_conditions:
+        return None
+
+    _helper_type, helper_function = selectCodeHelper(
+        prefix=prefix,
+        specialized_helpers_set=specialized_helpers_set,
+        non_specialized_helpers_set=None,
+        result_type=helper_type,
+        left_shape=guard_shapes[0],
+        right_shape=guard_shapes[1],
+        left_c_type=operands[0][2],
+        right_c_type=operands[1][2],
+        argument_swap=argument_swap,
+        report_missing=False,
+        source_ref=None,
+    )
+
+    if helper_function is None:
+        return None
+
+    return " && ".join(guard_conditions), helper_function
+
+
+def _getHelperCallCode(assign_code, helper_function, args_code, pgo_type_guard):
+    call_code = "%s%s(%s);" % (assign_code, helper_function, args_code)
+
+    if pgo_type_guard is None:
+        return call_code
+
+    guard_condition, guarded_helper_function = pgo_type_guard
+
+    return """\
+if (likely(%s)) {
+    %s%s(%s);
+} else {
+    %s
+}""" % (
+        guard_condition,
+        assign_code,
+        guarded_helper_function,
+        args_code,
+        call_code,
+    )
+
+
 def _getBinaryOperationCode(
     to_name, operator, inplace, left, right, needs_check, source_ref, emit, context
 ):
@@ -207,6 +308,15 @@ def _getBinaryOperationCode(
 
         assert helper_function is not None, (left, right)
 
+    if _isPgoTypeGuardCandidate(
+        left_shape, left_c_type
+    ) or _isPgoTypeGuardCandidate(right_shape, right_c_type):
+        pgo_site_name = allocateOperationPgoSiteName(
+            context=context, source_ref=source_ref
+        )
+    else:
+        pgo_site_name = None
+
     left_name = context.allocateTempName(
         "%s_expr_left" % operator.lower(), type_name=left_c_type.c_type
     )
@@ -221,6 +331,23 @@ def _getBinaryOperationCode(
         to_name=right_name, expression=right, emit=emit, context=context
     )
 
+    if pgo_site_name is not None:
+        pgo_type_guard = _getBinaryOperationPgoTypeGuard(
+            prefix=prefix,
+            specialized_helpers_set=specialized_helpers_set,
+            helper_type=helper_type,
+            operands=(
+                (left_name, left_shape, left_c_type),
+                (right_name, right_shape, right_c_type),
+            ),
+            argument_swap=needs_argument_swap,
+            pgo_site_name=pgo_site_name,
+            emit=emit,
+            context=context,
+        )
+    else:
+        pgo_type_guard = None
+
     # We must assume to write to a variable if "inplace" is active, not e.g.
     # a constant reference. That was asserted before calling us.
     if inplace or "INPLACE" in helper_function:
@@ -228,15 +355,40 @@ def _getBinaryOperationCode(
 
         res_name = context.getBoolResName()
 
-        # For module variable C type to reference later.
         if left.isExpressionVariableRef() and left.getVariable().isModuleVariable():
-            emit("%s = %s;" % (context.getInplaceLeftName(), left_name))
+            # Without the GIL, module variable values are references of our
+            # own. The helper takes it, and only if it fails, it's ours still.
+            left_owned = context.needsCleanup(left_name)
+
+            if left_owned:
+                context.removeCleanupTempName(left_name)
+            else:
+                # For module variable C type to reference later.
+                emit("%s = %s;" % (context.getInplaceLeftName(), left_name))
+        else:
+            left_owned = False
 
         if not left.isExpressionVariableRefOrTempVariableRef():
             if not context.needsCleanup(left_name):
                 getTakeReferenceCode(left_name, emit)
 
-        emit("%s = %s(&%s, %s);" % (res_name, helper_function, left_name, right_name))
+        emit(
+            _getHelperCallCode(
+                assign_code="%s = " % res_name,
+                helper_function=helper_function,
+                args_code="&%s, %s" % (left_name, right_name),
+                pgo_type_guard=pgo_type_guard,
+            )
+        )
+
+        if left_owned:
+            emit(
+                """\
+if (unlikely(%s == false)) {
+    Py_DECREF(%s);
+}"""
+                % (res_name, left_name)
+            )
 
         getErrorExitBoolCode(
             condition="%s == false" % res_name,
@@ -278,15 +430,18 @@ def _getBinaryOperationCode(
             # TODO: If possible, pass variable storage directly to avoid useless
             # copy.
             emit(
-                "%s = %s(&%s, %s%s, %s%s);"
-                % (
-                    res_name,
-                    helper_function,
-                    value_name,
-                    "&" if arg1_c_type.isDualType() else "",
-                    arg1_name,
-                    "&" if arg2_c_type.isDualType() else "",
-                    arg2_name,
+                _getHelperCallCode(
+                    assign_code="%s = " % res_name,
+                    helper_function=helper_function,
+                    args_code="&%s, %s%s, %s%s"
+                    % (
+                        value_name,
+                        "&" if arg1_c_type.isDualType() else "",
+                        arg1_name,
+                        "&" if arg2_c_type.isDualType() else "",
+                        arg2_name,
+                    ),
+                    pgo_type_guard=pgo_type_guard,
                 )
             )
 
@@ -299,12 +454,11 @@ def _getBinaryOperationCode(
             )
         else:
             emit(
-                "%s = %s(%s, %s);"
-                % (
-                    value_name,
-                    helper_function,
-                    arg1_name,
-                    arg2_name,
+                _getHelperCallCode(
+                    assign_code="%s = " % value_name,
+                    helper_function=helper_function,
+                    args_code="%s, %s" % (arg1_name, arg2_name),
+                    pgo_type_guard=pgo_type_guard,
                 )
             )
 
@@ -0,0 +1,296 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Python level PGO related codes.
+
+Probes for call counts, branch outcomes and observed types are emitted when
+creating PGO information, and the information is used for hints to the C
+compiler, and for code specialized to dominant types, when compiling with it.
+"""
+
+from nuitka.nodes.shapes.BuiltinTypeShapes import (
+    tshape_bytes,
+    tshape_float,
+    tshape_int,
+    tshape_list,
+    tshape_long,
+    tshape_str,
+    tshape_tuple,
+    tshape_unicode,
+)
+from nuitka.options.Options import isPythonPgoMode, shallCreatePythonPgoInput
+from nuitka.pgo.PGO import (
+    decideBranchLikelinessFromPGO,
+    decideDominantTypeFromPGO,
+    decideFunctionHotnessFromPGO,
+)
+from nuitka.PythonVersions import python_version
+from nuitka.utils.CStrings import encodePythonStringToC
+
+# Shapes of types that code can be specialized for behind a type guard, by
+# their type name as observed at run time, and the C type object to check.
+if python_version < 0x300:
+    _pgo_guard_types = (
+        (tshape_int, "PyInt_Type"),
+        (tshape_long, "PyLong_Type"),
+        (tshape_float, "PyFloat_Type"),
+        (tshape_str, "PyString_Type"),
+        (tshape_unicode, "PyUnicode_Type"),
+        (tshape_list, "PyList_Type"),
+        (tshape_tuple, "PyTuple_Type"),
+    )
+else:
+    _pgo_guard_types = (
+        (tshape_int, "PyLong_Type"),
+        (tshape_float, "PyFloat_Type"),
+        (tshape_str, "PyUnicode_Type"),
+        (tshape_bytes, "PyBytes_Type"),
+        (tshape_list, "PyList_Type"),
+        (tshape_tuple, "PyTuple_Type"),
+    )
+
+_pgo_guard_types = dict(
+    (shape.getTypeName(), (shape, type_object_name))
+    for shape, type_object_name in _pgo_guard_types
+)
+
+
+def _getPgoCString(value):
+    if str is not bytes:
+        value = value.encode("utf8")
+
+    return encodePythonStringToC(value)
+
+
+def _getPgoModuleName(context):
+    return context.getModuleName().asString()
+
+
+def _getPgoOwnerName(context):
+    entry_point = context.getEntryPoint()
+
+    if entry_point.isCompiledPythonModule():
+        return "<module>"
+    else:
+        return entry_point.getFunctionQualname()
+
+
+def _allocatePgoCounter(context, probe_name, counter_name):
+    return context.allocatePgoProbe(
+        c_type="Nuitka_PgoCounter",
+        initializer="%s, %s, %s, 0, false, NULL"
+        % (
+            _getPgoCString(probe_name),
+            _getPgoCString(_getPgoModuleName(context)),
+            _getPgoCString(counter_name),
+        ),
+    )
+
+
+def _allocatePgoTypeProbe(context, site_name):
+    return context.allocatePgoProbe(
+        c_type="Nuitka_PgoTypeProbe",
+        initializer="%s, %s, {NULL}, {0}, 0, false, NULL"
+        % (
+            _getPgoCString(_getPgoModuleName(context)),
+            _getPgoCString(site_name),
+        ),
+    )
+
+
+def _getFunctionPgoName(context):
+    return "%s:%d" % (
+        _getPgoOwnerName(context),
+        context.getOwner().getSourceReference().getLineNumber(),
+    )
+
+
+def getFunctionPgoAttributes(context):
+    """C attributes for a function implementation, from PGO information."""
+
+    if not isPythonPgoMode() or shallCreatePythonPgoInput():
+        return ""
+
+    hotness = decideFunctionHotnessFromPGO(
+        module_name=_getPgoModuleName(context),
+        function_name=_getFunctionPgoName(context),
+    )
+
+    if hotness == "cold":
+        return "NUITKA_COLD_FUNCTION "
+    elif hotness == "hot":
+        return "NUITKA_HOT_FUNCTION "
+    else:
+        return ""
+
+
+def getFunctionPgoEntryCode(context, parameters, emit):
+    """Count calls of a function and record its argument types."""
+
+    if not isPythonPgoMode():
+        return
+
+    function_name = _getFunctionPgoName(context)
+
+    if shallCreatePythonPgoInput():
+        emit(
+            "PGO_countProbe(&%s);"
+            % _allocatePgoCounter(
+                context=context,
+                probe_name="FunctionCalls",
+                counter_name=function_name,
+            )
+        )
+
+    if parameters is not None:
+        for count, variable in enumerate(parameters.getAllVariables()):
+            site_name = "%s:%s" % (function_name, variable.getName())
+
+            # Argument types are only reported, code is specialized where the
+            # values are used, with the types observed there.
+            getTypePgoRecordCode(
+                context=context,
+                site_name=site_name,
+                value_name="python_pars[%d]" % count,
+                emit=emit,
+            )
+            decideDominantType(context=context, site_name=site_name)
+
+
+def getTypePgoRecordCode(context, site_name, value_name, emit):
+    """Record the type of a value at a probe site."""
+
+    if site_name is None or not shallCreatePythonPgoInput():
+        return
+
+    emit(
+        "PGO_recordType(&%s, Py_TYPE(%s));"
+        % (_allocatePgoTypeProbe(context=context, site_name=site_name), value_name)
+    )
+
+
+def decideDominantType(context, site_name):
+    """Name of the type dominating a probe site, None if there is none."""
+
+    if site_name is None or shallCreatePythonPgoInput():
+        return None
+
+    return decideDominantTypeFromPGO(
+        module_name=_getPgoModuleName(context),
+        site_name=site_name,
+    )
+
+
+def getPgoTypeGuard(type_name):
+    """Shape and C type object for a type name to specialize code for.
+
+    Returns:
+        None, unless code can be specialized to the type, behind a check
+        of the C type object for it.
+    """
+    return _pgo_guard_types.get(type_name)
+
+
+def allocateAttributeLookupPgoSiteName(context, attribute_name):
+    """Name of an attribute lookup for PGO, None if PGO is not used."""
+
+    if not isPythonPgoMode():
+        return None
+
+    return "%s:%s" % (
+        context.allocatePgoSiteName(
+            owner_name=_getPgoOwnerName(context),
+            site_kind="attribute",
+            source_ref=context.getCurrentSourceCodeReference(),
+        ),
+        attribute_name,
+    )
+
+
+def allocateOperationPgoSiteName(context, source_ref):
+    """Name of an operation for PGO, None if PGO is not used.
+
+    Notes:
+        The types of operands are recorded with "getTypePgoRecordCode" for
+        site names derived with "getOperandPgoSiteName" from it.
+    """
+
+    if not isPythonPgoMode():
+        return None
+
+    return context.allocatePgoSiteName(
+        owner_name=_getPgoOwnerName(context),
+        site_kind="operation",
+        source_ref=source_ref,
+    )
+
+
+def getOperandPgoSiteName(site_name, operand_index):
+    """Name of an operand of an operation for PGO, None if PGO is not used."""
+
+    if site_name is None:
+        return None
+
+    return "%s:%d" % (site_name, operand_index)
+
+
+def allocateBranchPgoSiteName(context, source_ref):
+    """Name of a branch for PGO, None if PGO is not used."""
+
+    if not isPythonPgoMode():
+        return None
+
+    return context.allocatePgoSiteName(
+        owner_name=_getPgoOwnerName(context),
+        site_kind="branch",
+        source_ref=source_ref,
+    )
+
+
+def decideBranchLikeliness(context, site_name):
+    """Hint for a branch, True for likely, False for unlikely, None for none."""
+
+    if site_name is None or shallCreatePythonPgoInput():
+        return None
+
+    return decideBranchLikelinessFromPGO(
+        module_name=_getPgoModuleName(context),
+        branch_name=site_name,
+    )
+
+
+def shallCountBranchPgo(site_name):
+    """Decide if outcomes of a branch are counted for PGO."""
+    return site_name is not None and shallCreatePythonPgoInput()
+
+
+def getBranchPgoCountCode(context, site_name, taken, emit):
+    """Count an outcome of a branch."""
+
+    if not shallCountBranchPgo(site_name):
+        return
+
+    emit(
+        "PGO_countProbe(&%s);"
+        % _allocatePgoCounter(
+            context=context,
+            probe_name="BranchTaken" if taken else "BranchNotTaken",
+            counter_name=site_name,
+        )
+    )
+
+
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.gnu.org/licenses/agpl.txt
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
@@ -70,6 +70,68 @@ def onMissingHelper(helper_name, source_ref):
         _missing_helpers[helper_name].append(source_ref)
 
 
+def fetchMissingHelpers():
+    """Get and reset the missing helpers, for merging elsewhere."""
+    result = tuple(_missing_helpers.items())
+    _missing_helpers.clear()
+
+    return result
+
+
+def mergeMissingHelpers(missing_helpers):
+    """Merge missing helpers as provided by "fetchMissingHelpers"."""
+    for helper_name, source_refs in missing_helpers:
+        if helper_name not in _missing_helpers:
+            _missing_helpers[helper_name] = []
+
+        _missing_helpers[helper_name].extend(source_refs)
+
+
+def fetchMissingOptimizations():
+    """Get and reset the missing operations, trust, and overloads."""
+    result = (
+        tuple(_missing_operations),
+        tuple(
+            (key, tuple(source_refs)) for key, source_refs in _missing_trust.items()
+        ),
+        tuple(
+            (method_name, tuple(node_kinds))
+            for method_name, node_kinds in _missing_overloads.items()
+        ),
+    )
+
+    _missing_operations.clear()
+    _missing_trust.clear()
+    _missing_overloads.clear()
+
+    return result
+
+
+def mergeMissingOptimizations(missing_optimizations):
+    """Merge missing optimizations as provided by "fetchMissingOptimizations"."""
+    operations, trust, overloads = missing_optimizations
+
+    # Shapes are copies after being transferred, compare their descriptions.
+    known_operations = set(repr(desc) for desc in _missing_operations)
+
+    for desc in operations:
+        if repr(desc) not in known_operations:
+            known_operations.add(repr(desc))
+            _missing_operations.add(desc)
+
+    for key, source_refs in trust:
+        if key not in _missing_trust:
+            _missing_trust[key] = OrderedSet()
+
+        _missing_trust[key].update(source_refs)
+
+    for method_name, node_kinds in overloads:
+        if method_name not in _missing_overloads:
+            _missing_overloads[method_name] = OrderedSet()
+
+        _missing_overloads[method_name].update(node_kinds)
+
+
 def onMissingOperation(operation, left, right):
     # Avoid the circular dependency on tshape_uninitialized from StandardShapes.
     if right.__class__.__name__ != "ShapeTypeUninitialized":
@@ -7,7 +7,7 @@ from nuitka.nodes.shapes.BuiltinTypeShapes import (
     tshape_bool,
     tshape_int_or_long,
 )
-from nuitka.PythonVersions import python_version
+from nuitka.PythonVersions import isPythonWithGil, python_version
 from nuitka.utils.CStrings import encodePythonIdentifierToC
 
 from .c_types.CTypeNuitkaBooleans import CTypeNuitkaBoolEnum
@@ -26,6 +26,7 @@ from .ErrorCodes import (
     getErrorExitCode,
     getLocalVariableReferenceErrorCode,
     getNameReferenceErrorCode,
+    getReleaseCode,
 )
 from .VariableDeclarations import VariableDeclaration
 
@@ -151,6 +152,14 @@ if (unlikely(%(value_name)s == NULL)) {
             needs_check=needs_check,
         )
 
+        # Without the GIL, other threads can release the value at any time,
+        # so the accessor then gives a reference, that we need to release.
+        if not isPythonWithGil():
+            context.addCleanupTempName(value_name)
+
+    if value_name is not to_name:
+        getReleaseCode(value_name, emit, context)
+
 
 def getNonModuleVariableReferenceCode(
     to_name, variable, variable_trace, needs_check, conversion_check, emit, context
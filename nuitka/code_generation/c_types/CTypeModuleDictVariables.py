@@ -14,6 +14,7 @@ from nuitka.code_generation.templates.CodeTemplatesVariables import (
     template_del_global_unclear,
     template_read_mvar_unclear,
 )
+from nuitka.PythonVersions import isPythonWithGil
 
 from .CTypeBases import CTypeBase
 
@@ -23,7 +24,7 @@ class CTypeModuleDictVariable(CTypeBase):
     def emitVariableAssignCode(
         cls, value_name, needs_release, tmp_name, ref_count, inplace, emit, context
     ):
-        if inplace:
+        if inplace and isPythonWithGil():
             orig_name = context.getInplaceLeftName()
 
             emit(
@@ -40,7 +41,18 @@ if (%(orig_name)s != %(tmp_name)s) {
                     ),
                 }
             )
-
+        elif inplace:
+            # Without the GIL, the in-place operation was done on a reference
+            # of our own, not the one of the dictionary, which is therefore
+            # updated normally, also releasing an unchanged value.
+            emit(
+                "UPDATE_STRING_DICT1(moduledict_%s, (Nuitka_StringObject *)%s, %s);"
+                % (
+                    context.getModuleCodeName(),
+                    context.getConstantCode(constant=value_name.code_name),
+                    tmp_name,
+                )
+            )
         else:
             emit(
                 "UPDATE_STRING_DICT%s(moduledict_%s, (Nuitka_StringObject *)%s, %s);"
@@ -293,6 +293,22 @@ if (%(test_code)s) {
 
 template_module_variable_accessor_function = """\
 static PyObject *%(accessor_function_name)s(PyThreadState *tstate) {
+#if defined(Py_GIL_DISABLED)
+#if %(caching)s
+    NUITKA_THREAD_STATIC PyDictKeysObject *cache_dk = NULL;
+    NUITKA_THREAD_STATIC Py_ssize_t cache_dk_index = 0;
+
+    PyObject *result = GET_MODULE_VARIABLE_VALUE_CACHED(moduledict_%(module_identifier)s, %(var_name)s, &cache_dk, &cache_dk_index);
+#else
+    PyObject *result = GET_MODULE_VARIABLE_VALUE_CACHED(moduledict_%(module_identifier)s, %(var_name)s, NULL, NULL);
+#endif
+
+    if (unlikely(result == NULL)) {
+        result = GET_MODULE_VARIABLE_VALUE_CACHED(dict_builtin, %(var_name)s, NULL, NULL);
+    }
+
+    return result;
+#else
 #if %(caching)s
     PyObject *result;
 
@@ -364,6 +380,7 @@ static PyObject *%(accessor_function_name)s(PyThreadState *tstate) {
     }
 
     return result;
+#endif
 }
 """
 
@@ -7,6 +7,7 @@ It works around bugs present in some version of Python, and provides extra
 methods like "asDict".
 """
 
+import sys
 from collections import namedtuple
 
 
@@ -30,6 +31,12 @@ def makeNamedtupleClass(name, element_names):
 
     DynamicNamedtuple.__name__ = name
 
+    # Like "namedtuple" does it, use the module of the caller, so values can
+    # be pickled, when assigned to the same name there.
+    DynamicNamedtuple.__module__ = sys._getframe(  # pylint: disable=protected-access
+        1
+    ).f_globals.get("__name__", "__main__")
+
     return DynamicNamedtuple
 
 
@@ -0,0 +1,272 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Persistent cache of DLLs as copied to standalone distribution folders.
+
+Copying DLLs to the dist folder involves modifications, e.g. setting the
+RPATH on ELF platforms, which need external tools and dominate the time of
+incremental builds of large distributions. The modified result only depends
+on the source file contents and the modifications applied, so it is kept in
+a cache and reused by later builds, cloning the file where the file system
+supports it.
+
+The manifest records per source file its state and hash, so files are only
+hashed again when they changed, and per cache entry the state of the cached
+file, so it being modified, e.g. through a hard link, is detected.
+"""
+
+import os
+import time
+
+from nuitka.options.Options import isExperimental, isShowInclusion
+from nuitka.Tracing import inclusion_logger
+from nuitka.utils.AppDirs import getCacheDir
+from nuitka.utils.FileOperations import (
+    copyFile,
+    deleteFile,
+    getNormalizedPathJoin,
+    listDir,
+    makePath,
+    replaceFileAtomic,
+)
+from nuitka.utils.Hashing import Hash
+from nuitka.utils.Json import loadJsonFromFilename, writeJsonToFilename
+from nuitka.utils.Utils import isLinux
+from nuitka.Version import version_string
+
+# Entries not used for this long are removed from the cache.
+_cache_expiry_seconds = 30 * 24 * 60 * 60
+
+# From "linux/fs.h", clone file contents, supported by e.g. btrfs and XFS.
+_FICLONE = 0x40049409
+
+_use_cache = False
+_update_cache = False
+
+_manifest = None
+_manifest_changed = False
+
+
+def _getDllCopyCacheDir():
+    return getCacheDir("dll-copies")
+
+
+def _getManifestFilename():
+    return getNormalizedPathJoin(_getDllCopyCacheDir(), "manifest.json")
+
+
+def _getFileState(filename):
+    stat_result = os.stat(filename)
+
+    return [stat_result.st_size, stat_result.st_mtime]
+
+
+def startDllCopyCache(use_cache, update_cache):
+    """Load the manifest of the cache, to be done before copying DLLs."""
+
+    # singleton, pylint: disable=global-statement
+    global _use_cache, _update_cache, _manifest, _manifest_changed
+
+    _use_cache = use_cache
+    _update_cache = update_cache
+
+    _manifest = None
+    _manifest_changed = False
+
+    if (use_cache or update_cache) and os.path.exists(_getManifestFilename()):
+        _manifest = loadJsonFromFilename(_getManifestFilename())
+
+    if (
+        type(_manifest) is not dict
+        or _manifest.get("version") != version_string
+        or type(_manifest.get("sources")) is not dict
+        or type(_manifest.get("entries")) is not dict
+    ):
+        _manifest = {"version": version_string, "sources": {}, "entries": {}}
+
+
+def _getSourceFileHash(source_path):
+    global _manifest_changed  # singleton, pylint: disable=global-statement
+
+    source_path = os.path.abspath(source_path)
+    source_state = _getFileState(source_path)
+
+    source_info = _manifest["sources"].get(source_path)
+
+    if source_info is not None and source_info[:2] == source_state:
+        return source_info[2]
+
+    hash_value = Hash()
+    hash_value.updateFromFile(filename=source_path)
+    result = hash_value.asHexDigest()
+
+    _manifest["sources"][source_path] = source_state + [result]
+    _manifest_changed = True
+
+    return result
+
+
+def getDllCopyCacheKey(source_path, modifications):
+    """Cache key for a DLL copied with the given modifications.
+
+    Returns:
+        str or None if the cache is not used at all.
+
+    Notes:
+        The modifications must describe everything done to the copy, that
+        is not derived from the source file contents.
+    """
+    if not _use_cache and not _update_cache:
+        return None
+
+    hash_value = Hash()
+    hash_value.updateFromValues(
+        _getSourceFileHash(source_path), modifications, version_string
+    )
+
+    # Keep the basename, for the cache directory to be readable.
+    return hash_value.asHexDigest() + "_" + os.path.basename(source_path)
+
+
+def _cloneFile(source_path, dest_path):
+    if isLinux():
+        import fcntl
+
+        with open(source_path, "rb") as source_file:
+            with open(dest_path, "wb") as dest_file:
+                try:
+                    fcntl.ioctl(dest_file.fileno(), _FICLONE, source_file.fileno())
+                except (IOError, OSError):
+                    pass
+                else:
+                    return
+
+    # Hard links share the file with the cache, which is only good, if nothing
+    # modifies the dist folder files in place afterwards.
+    if isExperimental("dll-copy-hardlinks"):
+        deleteFile(dest_path, must_exist=False)
+
+        try:
+            os.link(source_path, dest_path)
+        except OSError:
+            pass
+        else:
+            return
+
+    copyFile(source_path=source_path, dest_path=dest_path)
+
+
+def restoreCachedDllCopy(cache_key, target_filename):
+    """Provide a DLL copy from the cache, if present.
+
+    Returns:
+        bool - True if the target file was created from the cache.
+    """
+    global _manifest_changed  # singleton, pylint: disable=global-statement
+
+    if cache_key is None or not _use_cache:
+        return False
+
+    entry = _manifest["entries"].get(cache_key)
+    if entry is None:
+        return False
+
+    cache_filename = getNormalizedPathJoin(_getDllCopyCacheDir(), cache_key)
+
+    if (
+        not os.path.exists(cache_filename)
+        or _getFileState(cache_filename) != entry[:2]
+    ):
+        if isShowInclusion():
+            inclusion_logger.info(
+                "Ignoring modified DLL copy cache entry '%s'." % cache_filename
+            )
+
+        del _manifest["entries"][cache_key]
+        _manifest_changed = True
+
+        return False
+
+    _cloneFile(source_path=cache_filename, dest_path=target_filename)
+
+    entry[2] = time.time()
+    _manifest_changed = True
+
+    return True
+
+
+def storeCachedDllCopy(cache_key, target_filename):
+    """Put a DLL copy into the cache."""
+    global _manifest_changed  # singleton, pylint: disable=global-statement
+
+    if cache_key is None or not _update_cache:
+        return
+
+    cache_dir = _getDllCopyCacheDir()
+    makePath(cache_dir)
+
+    cache_filename = getNormalizedPathJoin(cache_dir, cache_key)
+
+    # Other builds might use the cache at the same time.
+    cache_filename_tmp = "%s.tmp%d" % (cache_filename, os.getpid())
+    copyFile(source_path=target_filename, dest_path=cache_filename_tmp)
+    replaceFileAtomic(cache_filename_tmp, cache_filename)
+
+    _manifest["entries"][cache_key] = _getFileState(cache_filename) + [time.time()]
+    _manifest_changed = True
+
+
+def _removeStaleCacheFiles():
+    cache_dir = _getDllCopyCacheDir()
+    expiry_time = time.time() - _cache_expiry_seconds
+
+    sources = _manifest["sources"]
+    for source_path in tuple(sources):
+        if not os.path.exists(source_path):
+            del sources[source_path]
+
+    entries = _manifest["entries"]
+    for cache_key in tuple(entries):
+        if entries[cache_key][2] < expiry_time:
+            del entries[cache_key]
+
+    # Also files of entries lost to concurrent builds, these will be old.
+    if os.path.isdir(cache_dir):
+        for cache_filename, cache_key in listDir(cache_dir):
+            if cache_key in entries or cache_key == "manifest.json":
+                continue
+
+            if os.path.getmtime(cache_filename) < expiry_time:
+                deleteFile(cache_filename, must_exist=False)
+
+
+def finishDllCopyCache():
+    """Save the manifest of the cache, to be done after copying DLLs."""
+
+    if not _update_cache or not _manifest_changed:
+        return
+
+    _removeStaleCacheFiles()
+
+    manifest_filename = _getManifestFilename()
+    makePath(os.path.dirname(manifest_filename))
+
+    manifest_filename_tmp = "%s.tmp%d" % (manifest_filename, os.getpid())
+    writeJsonToFilename(filename=manifest_filename_tmp, contents=_manifest, indent=0)
+    replaceFileAtomic(manifest_filename_tmp, manifest_filename)
+
+
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.gnu.org/licenses/agpl.txt
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
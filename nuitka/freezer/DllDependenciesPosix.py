@@ -1,24 +1,45 @@
 #     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
 
 
-"""DLL dependency scan methods for POSIX (Linux, *BSD, MSYS2)."""
+"""DLL dependency scan methods for POSIX (Linux, *BSD, MSYS2).
+
+On Linux with glibc, ELF files are read directly and the search rules of the
+dynamic loader are applied to find the dependencies, otherwise "ldd" is used.
+"""
 
 import os
+import struct
 import sys
 
+from nuitka.containers.OrderedDicts import OrderedDict
 from nuitka.containers.OrderedSets import OrderedSet
+from nuitka.options.Options import isExperimental
 from nuitka.PythonFlavors import isAnacondaPython
 from nuitka.Tracing import inclusion_logger
+from nuitka.utils.AppDirs import getCacheDir
+from nuitka.utils.ElfFiles import getElfFileInfo
 from nuitka.utils.Execution import executeProcess, withEnvironmentPathAdded
+from nuitka.utils.FileOperations import (
+    getFileContentByLine,
+    getFileContents,
+    getNormalizedPathJoin,
+    makePath,
+    putTextFileContents,
+)
+from nuitka.utils.Hashing import Hash
 from nuitka.utils.SharedLibraries import getSharedLibraryRPATHs
 from nuitka.utils.Utils import (
     isAlpineLinux,
     isAndroidBasedLinux,
+    isLinux,
     isPosixWindows,
 )
+from nuitka.Version import version_string
 
 from .DllDependenciesCommon import getLdLibraryPath
 
+# spell-checker: ignore RUNPATH,SONAME,ldconfig
+
 # Detected Python rpath is cached.
 _detected_python_rpaths = None
 
@@ -33,16 +54,7 @@ def _resolveOriginValue(rpath, origin):
     return rpath
 
 
-def detectBinaryPathDLLsPosix(dll_filename, package_name, original_dir):
-    # This is complex, as it also includes the caching mechanism
-    # pylint: disable=too-many-branches,too-many-locals
-
-    if ldd_result_cache.get(dll_filename):
-        return ldd_result_cache[dll_filename]
-
-    # Ask "ldd" about the libraries being used by the created binary, these
-    # are the ones that interest us.
-
+def _getPythonRpaths():
     # This is the rpath of the Python binary, which will be effective when
     # loading the other DLLs too. This happens at least for Python installs
     # on Travis. pylint: disable=global-statement
@@ -65,21 +77,31 @@ def detectBinaryPathDLLsPosix(dll_filename, package_name, original_dir):
             for detected_python_rpath in _detected_python_rpaths
         ]
 
-    python_rpaths = _detected_python_rpaths[:]
+    return _detected_python_rpaths[:]
+
+
+def _getDllSearchPath(dll_filename, package_name, original_dir):
+    python_rpaths = _getPythonRpaths()
 
     if os.path.islink(dll_filename):
         link_target_path = os.path.dirname(os.path.realpath(dll_filename))
         python_rpaths.append(link_target_path)
 
-    # TODO: Actually would be better to pass it as env to the created process instead.
-    with withEnvironmentPathAdded(
-        "LD_LIBRARY_PATH",
-        *getLdLibraryPath(
+    return tuple(
+        getLdLibraryPath(
             package_name=package_name,
             python_rpaths=python_rpaths,
             original_dir=original_dir,
         )
-    ):
+    )
+
+
+def detectBinaryPathDLLsLdd(dll_filename, ld_library_path):
+    # Ask "ldd" about the libraries being used by the created binary, these
+    # are the ones that interest us.
+
+    # TODO: Actually would be better to pass it as env to the created process instead.
+    with withEnvironmentPathAdded("LD_LIBRARY_PATH", *ld_library_path):
         # TODO: Check exit code, should never fail.
         stdout, stderr, _exit_code = executeProcess(command=("ldd", dll_filename))
 
@@ -96,7 +118,7 @@ def detectBinaryPathDLLsPosix(dll_filename, package_name, original_dir):
     if stderr:
         inclusion_logger.debug("ldd error for %s is:\n%s" % (dll_filename, stderr))
 
-    result = OrderedSet()
+    result = []
 
     for line in stdout.split(b"\n"):
         if not line:
@@ -122,6 +144,436 @@ def detectBinaryPathDLLsPosix(dll_filename, package_name, original_dir):
         if filename in ("not found", "ldd"):
             continue
 
+        result.append(filename)
+
+    return result
+
+
+class ElfDependencyScanUnsupported(Exception):
+    """Raised when the ELF dependency scan cannot reproduce the loader."""
+
+
+_elf_file_infos = {}
+
+
+def _getElfFileInfo(filename):
+    # Cached, as the system libraries are looked at for every binary. For
+    # use from threads, duplicate work is harmless.
+    if filename not in _elf_file_infos:
+        _elf_file_infos[filename] = (
+            getElfFileInfo(filename) if os.path.isfile(filename) else None
+        )
+
+    return _elf_file_infos[filename]
+
+
+# Library name to paths from "/etc/ld.so.cache", False if not usable.
+_ld_so_cache = None
+
+
+def _parseLdSoCache(filename):
+    # Only the "new" format is supported, which glibc uses since many years.
+    try:
+        cache_data = getFileContents(filename, mode="rb")
+    except (IOError, OSError):
+        return False
+
+    cache_start = cache_data.find(b"glibc-ld.so.cache1.1")
+
+    if cache_start == -1:
+        return False
+
+    try:
+        library_count, _strings_size = struct.unpack_from(
+            "=II", cache_data, cache_start + 20
+        )
+
+        result = OrderedDict()
+
+        # Header is 48 bytes, each entry is 24 bytes, and the string offsets
+        # are relative to the header start.
+        for count in range(library_count):
+            _flags, key, value, _os_version, _hwcap = struct.unpack_from(
+                "=iIIIQ", cache_data, cache_start + 48 + count * 24
+            )
+
+            def _getString(offset):
+                offset += cache_start
+                return cache_data[offset : cache_data.index(b"\0", offset)]
+
+            name = _getString(key)
+            path = _getString(value)
+
+            if str is not bytes:
+                name = name.decode("utf8", "surrogateescape")
+                path = path.decode("utf8", "surrogateescape")
+
+            result.setdefault(name, []).append(path)
+    except (struct.error, ValueError):
+        return False
+
+    return result
+
+
+def _getLdSoCache():
+    global _ld_so_cache  # singleton, pylint: disable=global-statement
+
+    if _ld_so_cache is None:
+        _ld_so_cache = _parseLdSoCache("/etc/ld.so.cache")
+
+    if _ld_so_cache is False:
+        raise ElfDependencyScanUnsupported("cannot read '/etc/ld.so.cache'")
+
+    return _ld_so_cache
+
+
+def _getDefaultLibraryDirs(elf_class):
+    result = []
+
+    if elf_class == 2:
+        result += ["/lib64", "/usr/lib64"]
+
+    result += ["/lib", "/usr/lib"]
+
+    return result
+
+
+_dynamic_loader_names = None
+
+
+def _getDynamicLoaderNames():
+    # The dynamic loader is always loaded already, and "ldd" does not list it
+    # as a dependency, so we need to know the names it can be referred to by.
+    global _dynamic_loader_names  # singleton, pylint: disable=global-statement
+
+    if _dynamic_loader_names is None:
+        _dynamic_loader_names = set()
+
+        python_info = _getElfFileInfo(os.path.realpath(sys.executable))
+
+        if python_info is not None and python_info.interpreter is not None:
+            _dynamic_loader_names.add(os.path.basename(python_info.interpreter))
+
+            loader_info = _getElfFileInfo(python_info.interpreter)
+
+            if loader_info is not None and loader_info.soname is not None:
+                _dynamic_loader_names.add(loader_info.soname)
+
+    return _dynamic_loader_names
+
+
+def _expandElfSearchPath(search_path, origin_filename):
+    result = []
+
+    for path in search_path.split(":"):
+        path = path.replace("${ORIGIN}", "$ORIGIN").replace(
+            "$ORIGIN", os.path.dirname(os.path.abspath(origin_filename))
+        )
+
+        # Other dynamic string tokens, e.g. "$LIB", are not done.
+        if "$" in path:
+            raise ElfDependencyScanUnsupported(
+                "unsupported search path '%s' in '%s'" % (search_path, origin_filename)
+            )
+
+        result.append(os.path.abspath(path))
+
+    return result
+
+
+def _findElfDependency(needed, loader_chain, ld_library_path):
+    requester_filename, requester_info = loader_chain[-1]
+
+    if "/" in needed:
+        candidates = [os.path.abspath(needed)]
+    else:
+        search_dirs = []
+
+        # The "DT_RPATH" of the requester and the objects that loaded it is
+        # used, unless the requester has "DT_RUNPATH", which comes after the
+        # "LD_LIBRARY_PATH" then.
+        if requester_info.runpath is None:
+            for loader_filename, loader_info in reversed(loader_chain):
+                if loader_info.rpath is not None and loader_info.runpath is None:
+                    search_dirs += _expandElfSearchPath(
+                        loader_info.rpath, loader_filename
+                    )
+
+        search_dirs += ld_library_path
+
+        if requester_info.runpath is not None:
+            search_dirs += _expandElfSearchPath(
+                requester_info.runpath, requester_filename
+            )
+
+        candidates = [os.path.join(search_dir, needed) for search_dir in search_dirs]
+        candidates += _getLdSoCache().get(needed, ())
+        candidates += [
+            os.path.join(search_dir, needed)
+            for search_dir in _getDefaultLibraryDirs(requester_info.elf_class)
+        ]
+
+    # The loader skips files that are not ELF, or not for the same machine.
+    for candidate in candidates:
+        candidate_info = _getElfFileInfo(candidate)
+
+        if (
+            candidate_info is not None
+            and candidate_info.elf_class == requester_info.elf_class
+            and candidate_info.machine == requester_info.machine
+        ):
+            return os.path.normpath(candidate), candidate_info
+
+    return None, None
+
+
+def _scanElfDependencies(dll_filename, ld_library_path):
+    """Find the dependencies of an ELF file like "ldd" reports them."""
+
+    dll_info = _getElfFileInfo(dll_filename)
+
+    if dll_info is None:
+        raise ElfDependencyScanUnsupported("cannot read '%s'" % dll_filename)
+
+    # Names already loaded, which are not searched again.
+    loaded_names = set(_getDynamicLoaderNames())
+    loaded_names.add(dll_filename)
+    if dll_info.soname is not None:
+        loaded_names.add(dll_info.soname)
+
+    loaded_paths = set([os.path.realpath(dll_filename)])
+
+    result = []
+
+    # Breadth first, like the loader does it, remembering who loaded what, as
+    # that decides the search path.
+    pending = [((dll_filename, dll_info),)]
+
+    while pending:
+        loader_chain = pending.pop(0)
+
+        for needed in loader_chain[-1][1].needed:
+            if needed in loaded_names:
+                continue
+
+            filename, info = _findElfDependency(
+                needed=needed,
+                loader_chain=loader_chain,
+                ld_library_path=ld_library_path,
+            )
+
+            # Not found, "ldd" would report that, but it's not a dependency
+            # we can use.
+            if filename is None:
+                continue
+
+            loaded_names.add(needed)
+
+            # Same file under another name, is not loaded again.
+            real_filename = os.path.realpath(filename)
+            if real_filename in loaded_paths:
+                continue
+            loaded_paths.add(real_filename)
+
+            if info.soname is not None:
+                loaded_names.add(info.soname)
+
+            result.append(filename)
+            pending.append(loader_chain + ((filename, info),))
+
+    return result
+
+
+def _getElfScanCacheFilename(dll_filename, ld_library_path):
+    hash_value = Hash()
+
+    hash_value.updateFromFile(filename=dll_filename)
+    hash_value.updateFromValues(dll_filename, *ld_library_path)
+
+    # Outside influences on the search.
+    hash_value.updateFromValues(os.getenv("LD_LIBRARY_PATH", ""))
+    if os.path.exists("/etc/ld.so.cache"):
+        hash_value.updateFromValues(str(os.path.getmtime("/etc/ld.so.cache")))
+
+    # Take Nuitka version into account as well, ought to catch code changes.
+    hash_value.updateFromValues(version_string)
+
+    cache_dir = getNormalizedPathJoin(getCacheDir("library_dependencies"), "elf")
+    makePath(cache_dir)
+
+    return getNormalizedPathJoin(cache_dir, hash_value.asHexDigest())
+
+
+def _getElfScanCacheFileState(filename):
+    return "%d %s" % (os.path.getsize(filename), os.path.getmtime(filename))
+
+
+def _readElfScanCache(cache_filename):
+    result = []
+
+    for line in getFileContentByLine(cache_filename):
+        parts = line.rstrip("\r\n").split(" ", 2)
+
+        # The dependencies of dependencies matter too, so ignore the cache if
+        # any of these has become missing or was changed.
+        if (
+            len(parts) != 3
+            or not os.path.exists(parts[2])
+            or _getElfScanCacheFileState(parts[2]) != " ".join(parts[:2])
+        ):
+            return None
+
+        result.append(parts[2])
+
+    return result
+
+
+def detectBinaryPathDLLsElf(dll_filename, ld_library_path, use_cache, update_cache):
+    if use_cache or update_cache:
+        cache_filename = _getElfScanCacheFilename(
+            dll_filename=dll_filename, ld_library_path=ld_library_path
+        )
+
+        if use_cache and os.path.exists(cache_filename):
+            result = _readElfScanCache(cache_filename)
+
+            if result is not None:
+                return result
+
+    # The effective search path is what "ldd" would see.
+    ld_library_path = [
+        path for path in os.getenv("LD_LIBRARY_PATH", "").split(os.pathsep) if path
+    ] + [os.path.abspath(path) for path in ld_library_path]
+
+    result = _scanElfDependencies(
+        dll_filename=dll_filename, ld_library_path=ld_library_path
+    )
+
+    if update_cache:
+        putTextFileContents(
+            filename=cache_filename,
+            contents=[
+                "%s %s" % (_getElfScanCacheFileState(filename), filename)
+                for filename in result
+            ],
+        )
+
+    return result
+
+
+def shallUseElfDependencyScan():
+    # Only glibc loader search rules are implemented.
+    return (
+        isLinux()
+        and not isAlpineLinux()
+        and not isAndroidBasedLinux()
+        and not isExperimental("force-dependencies-ldd")
+    )
+
+
+# Results of scans done ahead of time by threads.
+_elf_scan_results = {}
+
+
+def _scanBinaryPathDLLsElf(dll_filename, ld_library_path, use_cache, update_cache):
+    try:
+        return detectBinaryPathDLLsElf(
+            dll_filename=dll_filename,
+            ld_library_path=ld_library_path,
+            use_cache=use_cache,
+            update_cache=update_cache,
+        )
+    except ElfDependencyScanUnsupported as e:
+        inclusion_logger.debug("Using 'ldd' for '%s' due to: %s" % (dll_filename, e))
+
+        return None
+
+
+def scanBinaryPathDLLsPosix(dll_infos, use_cache, update_cache, job_limit):
+    """Scan binaries for their dependencies ahead of time using threads.
+
+    Args:
+        dll_infos: iterable of (dll_filename, package_name) pairs
+        use_cache: Whether to use caching.
+        update_cache: Whether to update the cache.
+        job_limit: Number of threads to use.
+
+    Notes:
+        Hashing for the cache and reading files mostly release the GIL, so
+        this scales with threads.
+    """
+
+    if not shallUseElfDependencyScan():
+        return
+
+    try:
+        from concurrent.futures import (  # pylint: disable=I0021,import-error,no-name-in-module
+            ThreadPoolExecutor,
+        )
+    except ImportError:
+        return
+
+    # Computing the search path uses plugins, and therefore is done here.
+    jobs = OrderedDict()
+    for dll_filename, package_name in dll_infos:
+        ld_library_path = _getDllSearchPath(
+            dll_filename=dll_filename,
+            package_name=package_name,
+            original_dir=os.path.dirname(dll_filename),
+        )
+
+        jobs[dll_filename, ld_library_path] = None
+
+    with ThreadPoolExecutor(max_workers=max(1, job_limit)) as executor:
+        futures = [
+            (
+                key,
+                executor.submit(
+                    _scanBinaryPathDLLsElf, key[0], key[1], use_cache, update_cache
+                ),
+            )
+            for key in jobs
+        ]
+
+        for key, future in futures:
+            _elf_scan_results[key] = future.result()
+
+
+def detectBinaryPathDLLsPosix(
+    dll_filename, package_name, original_dir, use_cache=False, update_cache=False
+):
+    if ldd_result_cache.get(dll_filename):
+        return ldd_result_cache[dll_filename]
+
+    ld_library_path = _getDllSearchPath(
+        dll_filename=dll_filename,
+        package_name=package_name,
+        original_dir=original_dir,
+    )
+
+    filenames = None
+
+    if shallUseElfDependencyScan():
+        key = dll_filename, ld_library_path
+
+        if key not in _elf_scan_results:
+            _elf_scan_results[key] = _scanBinaryPathDLLsElf(
+                dll_filename=dll_filename,
+                ld_library_path=ld_library_path,
+                use_cache=use_cache,
+                update_cache=update_cache,
+            )
+
+        filenames = _elf_scan_results[key]
+
+    if filenames is None:
+        filenames = detectBinaryPathDLLsLdd(
+            dll_filename=dll_filename, ld_library_path=ld_library_path
+        )
+
+    result = OrderedSet()
+
+    for filename in filenames:
         # Normalize, sometimes the DLLs produce "something/../", this has
         # been seen with Qt at least.
         filename = os.path.normpath(filename)
@@ -153,6 +605,8 @@ def detectBinaryPathDLLsPosix(dll_filename, package_name, original_dir):
                 dll_filename=sub_dll_filename,
                 package_name=package_name,
                 original_dir=original_dir,
+                use_cache=use_cache,
+                update_cache=update_cache,
             )
         )
 
@@ -6,6 +6,9 @@
 In the freezer, this is a step done to detect the technically needed modules to
 initialize the CPython interpreter.
 
+Running a child Python for this is costly, and the result only depends on the
+Python installation, so it is kept in a cache, keyed by the identity of the
+interpreter, its standard library and the detection code run.
 """
 
 import os
@@ -18,12 +21,117 @@ from nuitka.importing.StandardLibrary import (
     isStandardLibraryPath,
     scanStandardLibraryPath,
 )
-from nuitka.options.Options import isStandaloneMode
+from nuitka.options.Options import (
+    isStandaloneMode,
+    shallDisableImportDetectionCacheUsage,
+)
 from nuitka.PythonVersions import python_version
 from nuitka.Tracing import general, printError
+from nuitka.utils.AppDirs import getCacheDir
 from nuitka.utils.Execution import executeProcess
-from nuitka.utils.FileOperations import areSamePaths
+from nuitka.utils.FileOperations import (
+    areSamePaths,
+    getNormalizedPathJoin,
+    makePath,
+    replaceFileAtomic,
+)
+from nuitka.utils.Hashing import Hash
+from nuitka.utils.Json import loadJsonFromFilename, writeJsonToFilename
 from nuitka.utils.ModuleNames import ModuleName
+from nuitka.Version import version_string
+
+# Environment variables, that can change what the child Python imports.
+_cache_key_environment_variables = (
+    "PYTHONHOME",
+    "PYTHONPLATLIBDIR",
+    "PYTHONUTF8",
+    "PYTHONSAFEPATH",
+    "LANG",
+    "LC_ALL",
+    "LC_CTYPE",
+)
+
+
+def _getFileStateValues(filename):
+    try:
+        stat_result = os.stat(filename)
+    except OSError:
+        return (filename, None)
+
+    return (filename, str(stat_result.st_size), repr(stat_result.st_mtime))
+
+
+def _getImportDetectionCacheFilename(command):
+    hash_value = Hash()
+
+    # Identity of the interpreter binary, the detection is done with, updates
+    # of the installation change it.
+    executable = os.path.realpath(sys.executable)
+    hash_value.updateFromValues(
+        version_string,
+        sys.version,
+        repr(sys.flags),
+        str(isStandaloneMode()),
+        _getFileStateValues(executable),
+    )
+
+    # Modules added to or removed from the standard library change the
+    # directory modification times.
+    for stdlib_dir in sorted(getStandardLibraryPaths()):
+        hash_value.updateFromValues(
+            _getFileStateValues(stdlib_dir),
+            _getFileStateValues(os.path.join(stdlib_dir, "lib-dynload")),
+        )
+
+    for variable_name in _cache_key_environment_variables:
+        hash_value.updateFromValues(variable_name, os.getenv(variable_name))
+
+    # The code run, includes the modules imported and the "sys.path" used.
+    hash_value.updateFromBytes(command)
+
+    return getNormalizedPathJoin(
+        getCacheDir("import-detection"), hash_value.asHexDigest() + ".json"
+    )
+
+
+def _getCachedImportDetection(cache_filename):
+    if shallDisableImportDetectionCacheUsage():
+        return None
+
+    if not os.path.exists(cache_filename):
+        return None
+
+    cache_data = loadJsonFromFilename(cache_filename)
+
+    if (
+        type(cache_data) is not dict
+        or cache_data.get("version") != version_string
+        or type(cache_data.get("module_names")) is not list
+    ):
+        return None
+
+    return set(ModuleName(module_name) for module_name in cache_data["module_names"])
+
+
+def _writeImportDetectionCache(cache_filename, module_names):
+    if shallDisableImportDetectionCacheUsage():
+        return
+
+    makePath(os.path.dirname(cache_filename))
+
+    # Other compilations might use the cache at the same time.
+    cache_filename_tmp = "%s.tmp%d" % (cache_filename, os.getpid())
+    writeJsonToFilename(
+        filename=cache_filename_tmp,
+        contents={
+            "version": version_string,
+            "module_names": sorted(
+                module_name.asString() for module_name in module_names
+            ),
+        },
+        indent=0,
+    )
+    replaceFileAtomic(cache_filename_tmp, cache_filename)
 
 
 def _detectImports(command):
@@ -57,6 +165,13 @@ print("\\n".join(sorted(
     if str is not bytes:
         command = command.encode("utf8")
 
+    cache_filename = _getImportDetectionCacheFilename(command)
+
+    module_names = _getCachedImportDetection(cache_filename)
+
+    if module_names is not None:
+        return module_names
+
     _stdout, stderr, exit_code = executeProcess(
         command=(
             sys.executable,
@@ -194,6 +309,8 @@ print("\\n".join(sorted(
         else:
             assert False, kind
 
+    _writeImportDetectionCache(cache_filename, module_names)
+
     return module_names
 
 
@@ -22,6 +22,7 @@ from nuitka.options.Options import (
     isLowMemory,
     isOnefileTempDirMode,
     isRemoveBuildDir,
+    isRuntimeStartupTrace,
     shallDisableCompressionCacheUsage,
     shallNotCompressOnefile,
     shallOnefileAsArchive,
@@ -99,6 +100,8 @@ def _runOnefileScons(onefile_compression, onefile_archive):
     )
     if isWin32Windows() and shallIncludeWindowsRuntimeDLLs():
         scons_options["onefile_windows_static_runtime"] = asBoolStr(True)
+    if isRuntimeStartupTrace():
+        scons_options["startup_trace_mode"] = asBoolStr(True)
 
     env_values["_NUITKA_ONEFILE_TEMP_SPEC"] = getOnefileTempDirSpec()
     env_values["_NUITKA_ONEFILE_COMPRESSION_BOOL"] = "1" if onefile_compression else "0"
@@ -18,8 +18,10 @@ from nuitka.importing.Importing import (
 )
 from nuitka.importing.StandardLibrary import isStandardLibraryPath
 from nuitka.options.Options import (
+    getJobLimit,
     isShowProgress,
     shallCreateAppBundle,
+    shallDisableDllCopyCacheUsage,
     shallNotStoreDependsExeCachedResults,
     shallNotUseDependsExeCachedResults,
 )
@@ -64,11 +66,15 @@ from nuitka.utils.Utils import (
     isWin32Windows,
 )
 
+from .DllCopyCache import finishDllCopyCache, startDllCopyCache
 from .DllDependenciesMacOS import (
     detectBinaryPathDLLsMacOS,
     fixupBinaryDLLPathsMacOS,
 )
-from .DllDependenciesPosix import detectBinaryPathDLLsPosix
+from .DllDependenciesPosix import (
+    detectBinaryPathDLLsPosix,
+    scanBinaryPathDLLsPosix,
+)
 from .DllDependenciesWin32 import (
     detectBinaryPathDLLsWin32,
     shallIncludeVCRedistDLL,
@@ -156,6 +162,8 @@ def _detectBinaryDLLs(
             dll_filename=original_filename,
             package_name=package_name,
             original_dir=os.path.dirname(original_filename),
+            use_cache=use_cache,
+            update_cache=update_cache,
         )
     elif isWin32Windows():
         with TimerReport(
@@ -218,6 +226,9 @@ def copyDllsUsed(dist_dir, standalone_entry_points):
             "$ORIGIN",
         )
 
+    use_dll_copy_cache = not shallDisableDllCopyCacheUsage()
+    startDllCopyCache(use_cache=use_dll_copy_cache, update_cache=use_dll_copy_cache)
+
     setupProgressBar(
         stage="Copying used DLLs",
         unit="DLL",
@@ -233,6 +244,7 @@ def copyDllsUsed(dist_dir, standalone_entry_points):
             dest_path=standalone_entry_point.dest_path,
             executable=standalone_entry_point.executable,
             other_entry_points=copy_standalone_entry_points,
+            use_cache=use_dll_copy_cache,
         )
 
         if isMacOS():
@@ -247,6 +259,8 @@ def copyDllsUsed(dist_dir, standalone_entry_points):
 
     closeProgressBar()
 
+    finishDllCopyCache()
+
     onCopiedDLLs(
         dist_dir=dist_dir,
         standalone_entry_points=copy_standalone_entry_points,
@@ -519,6 +533,20 @@ Error, cannot detect used DLLs for DLL '%s' in package '%s' due to: %s"""
 
 
 def detectUsedDLLs(standalone_entry_points, source_dir):
+    if getOS() == "Linux":
+        scanBinaryPathDLLsPosix(
+            dll_infos=[
+                (standalone_entry_point.source_path, standalone_entry_point.package_name)
+                for standalone_entry_point in standalone_entry_points
+                if not (
+                    standalone_entry_point.kind == "executable" and isMonolithPy()
+                )
+            ],
+            use_cache=not shallNotUseDependsExeCachedResults(),
+            update_cache=not shallNotStoreDependsExeCachedResults(),
+            job_limit=getJobLimit(),
+        )
+
     setupProgressBar(
         stage="Detecting used DLLs",
         unit="DLL",
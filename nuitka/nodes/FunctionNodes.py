@@ -22,7 +22,10 @@ from nuitka.Constants import isMutable
 from nuitka.optimizations.TraceCollections import (
     TraceCollectionFunction,
     TraceCollectionPureFunction,
+    isFunctionComputationSkippable,
+    onFunctionComputationSkipped,
     withChangeIndicationsTo,
+    withFunctionComputation,
 )
 from nuitka.PythonVersions import python_version
 from nuitka.specs.ParameterSpecs import (
@@ -491,6 +494,10 @@ class ExpressionFunctionEntryPointBase(EntryPointMixin, ExpressionFunctionBodyBa
         return self.getFunctionQualname() + ".<locals>." + function_name
 
     def computeFunctionRaw(self, trace_collection):
+        if isFunctionComputationSkippable(self):
+            onFunctionComputationSkipped(self, trace_collection)
+            return
+
         trace_collection = TraceCollectionFunction(
             parent=trace_collection,
             function_body=self,
@@ -498,9 +505,12 @@ class ExpressionFunctionEntryPointBase(EntryPointMixin, ExpressionFunctionBodyBa
         )
         old_collection = self.setTraceCollection(trace_collection)
 
-        self.computeFunction(trace_collection)
+        with withFunctionComputation(self, trace_collection):
+            self.computeFunction(trace_collection)
 
-        updateVariablesFromCollection(old_collection, trace_collection, self.source_ref)
+            updateVariablesFromCollection(
+                old_collection, trace_collection, self.source_ref
+            )
 
     def computeFunction(self, trace_collection):
         statements_sequence = self.subnode_body
@@ -13,7 +13,10 @@ from nuitka.containers.OrderedSets import OrderedSet
 from nuitka.importing.Importing import locateModule, makeModuleUsageAttempt
 from nuitka.importing.Recursion import decideRecursion, recurseTo
 from nuitka.ModuleRegistry import getModuleByName, getOwnerFromCodeName
-from nuitka.optimizations.TraceCollections import TraceCollectionModule
+from nuitka.optimizations.TraceCollections import (
+    TraceCollectionModule,
+    withFunctionLocalChanges,
+)
 from nuitka.options.Options import (
     getFileReferenceMode,
     hasPythonFlagIsolated,
@@ -647,14 +650,15 @@ class CompiledPythonModule(
         markEntryPointAsComplete(self)
 
         for function_body in self.getUsedFunctions():
-            markEntryPointAsComplete(function_body)
+            with withFunctionLocalChanges(function_body):
+                markEntryPointAsComplete(function_body)
 
-            if old_collection is not None:
-                function_body.optimizeVeryHardHardModuleVariables(
-                    old_collection.getVeryTrustedModuleVariables()
-                )
-            function_body.optimizeUnusedClosureVariables()
-            function_body.optimizeVariableReleases()
+                if old_collection is not None:
+                    function_body.optimizeVeryHardHardModuleVariables(
+                        old_collection.getVeryTrustedModuleVariables()
+                    )
+                function_body.optimizeUnusedClosureVariables()
+                function_body.optimizeVariableReleases()
 
         if propagated_scopes:
             visitor = LocalsScopePropagationVisitor(
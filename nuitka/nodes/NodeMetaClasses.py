@@ -13,6 +13,7 @@ from abc import ABCMeta
 from nuitka.__past__ import intern
 from nuitka.Errors import NuitkaAssumptionError, NuitkaNodeDesignError
 from nuitka.PythonVersions import python_version
+from nuitka.utils.SlotMetaClasses import setSlotsObjectState
 
 
 def _checkBases(name, bases):
@@ -153,7 +154,9 @@ class NodeCheckMetaClass(ABCMeta):
 # For Python2/3 compatible source, we create a base class that has the metaclass
 # used and doesn't require making a syntax choice.
 NodeMetaClassBase = NodeCheckMetaClass(
-    "NodeMetaClassBase", (object,), {"__slots__": ()}
+    "NodeMetaClassBase",
+    (object,),
+    {"__slots__": (), "__setstate__": setSlotsObjectState},
 )
 
 #     Part of "Nuitka", an optimizing Python compiler that is compatible and
@@ -11,10 +11,17 @@ make others possible.
 import inspect
 
 from nuitka import ModuleRegistry
+from nuitka.BytecodeCaching import (
+    getRestoredModuleTreeUsedHelperFunctions,
+    isModuleTreeCacheUsage,
+    isRestoredModuleTree,
+    writeModuleTreesToCache,
+)
 from nuitka.importing.Importing import addExtraSysPaths
 from nuitka.importing.Recursion import considerUsedModules
 from nuitka.options.Options import (
     isCompileTimeProfile,
+    isExperimental,
     isShowMemory,
     isShowProgress,
 )
@@ -36,7 +43,13 @@ from nuitka.Variables import removeVariablesFromCollection
 from . import Graphs
 from .BytecodeDemotion import demoteCompiledModuleToBytecode
 from .Tags import TagSet
-from .TraceCollections import fetchMergeCounts, withChangeIndicationsTo
+from .TraceCollections import (
+    fetchFunctionComputations,
+    fetchMergeCounts,
+    fetchUsedFunctions,
+    startFunctionMicroPass,
+    withChangeIndicationsTo,
+)
 
 tag_set = None
 
@@ -84,11 +97,26 @@ def optimizeCompiledPythonModule(module):
     # Count the micro passes, so we can see how often we looped
     micro_pass = 0
 
+    # Only functions that changed, or use changed functions, are computed again
+    # in later micro passes, unless shared things like variable usage changed.
+    function_micro_passes = isExperimental("function-micro-passes")
+    scopes_were_incomplete = True
+
     while True:
         micro_pass += 1
 
         tag_set.clear()
 
+        # The extra micro pass that checks for no more changes, computes all
+        # functions, so it really checks.
+        startFunctionMicroPass(
+            module=module,
+            skip_unchanged=function_micro_passes
+            and unchanged_count == 0
+            and not scopes_were_incomplete
+            and module.locals_scope.complete,
+        )
+
         try:
             # print("Compute module")
             with withChangeIndicationsTo(signalChange):
@@ -196,6 +224,156 @@ def optimizeModule(module):
 pass_count = 0
 last_total = 0
 
+# Module optimization worklist state. Every module optimization gets a serial
+# number, and for modules we remember the serial of their last optimization,
+# of their last change, and what other modules they consumed at that time.
+_optimization_serial = 0
+_module_optimized_serials = {}
+_module_changed_serials = {}
+_module_dependencies = {}
+_module_used_functions = {}
+_module_used_foreign_functions = {}
+_modules_by_name = {}
+
+
+def _getModuleDependencies(module, used_functions):
+    """Get the modules, the optimization result of a module depends on.
+
+    These are the modules it imports, including hard imports, the modules
+    whose functions it used, and the owners of module variables from other
+    modules, that its traces reference.
+    """
+    result = {}
+
+    for used_module in module.getUsedModules():
+        result[used_module.module_name] = None
+
+    for used_function in used_functions:
+        used_function_module = used_function.getParentModule()
+
+        if used_function_module is not module:
+            result[used_function_module.getFullName()] = None
+
+    for trace_collection in module.getTraceCollections():
+        for variable in trace_collection.getVariableTracesAll():
+            if variable.isModuleVariable() and variable.owner is not module:
+                result[variable.owner.getFullName()] = None
+
+    return tuple(
+        (module_name, _modules_by_name.get(module_name))
+        for module_name in sorted(result)
+    )
+
+
+def _recordModuleOptimization(module, changed):
+    global _optimization_serial  # Singleton, pylint: disable=global-statement
+    _optimization_serial += 1
+
+    _modules_by_name[module.getFullName()] = module
+
+    if changed or module not in _module_optimized_serials:
+        _module_changed_serials[module] = _optimization_serial
+
+    _module_optimized_serials[module] = _optimization_serial
+
+    used_functions = fetchUsedFunctions()
+
+    if module.isCompiledPythonModule() and isExperimental("module-skipping"):
+        _module_dependencies[module] = _getModuleDependencies(module, used_functions)
+
+        # Functions of other modules, e.g. helper functions, are only kept by
+        # their module, if their users mark them as used.
+        _module_used_foreign_functions[module] = tuple(
+            (used_function.getParentModule(), used_function)
+            for used_function in used_functions
+            if used_function.getParentModule() is not module
+        )
+
+
+def _hasModuleDependencyChanged(module, optimized_serial):
+    """Check if modules or functions consumed by a module changed since."""
+
+    for module_name, used_module in _module_dependencies[module]:
+        current_module = _modules_by_name.get(module_name)
+
+        if current_module is not used_module:
+            return True
+
+        if (
+            used_module is not None
+            and _module_changed_serials.get(used_module, 0) > optimized_serial
+        ):
+            return True
+
+    for used_function_module, used_function in _module_used_foreign_functions[module]:
+        if used_function not in used_function_module.subnode_functions:
+            return True
+
+    return False
+
+
+def _isModuleOptimizationNeeded(module):
+    """Decide if a module needs to be optimized again in this pass.
+
+    Only compiled modules are considered for skipping, the others are cheap
+    to handle. The micro passes of a module optimization run until there is
+    no more change, but functions used in early micro passes stay marked as
+    used for the whole pass. So a module is only clean, if its last
+    optimization did not change it, and none of the modules it consumed
+    changed or got replaced since.
+    """
+    # Restored modules are the result of a finished optimization already.
+    if isRestoredModuleTree(module):
+        return False
+
+    if (
+        pass_count == 1
+        or not module.isCompiledPythonModule()
+        or not isExperimental("module-skipping")
+    ):
+        return True
+
+    optimized_serial = _module_optimized_serials.get(module)
+
+    return (
+        optimized_serial is None
+        or _module_changed_serials[module] == optimized_serial
+        or _hasModuleDependencyChanged(module, optimized_serial)
+    )
+
+
+def _skipModuleOptimization(module):
+    """Keep the result of the last optimization of a clean module.
+
+    The used functions of the module need to be marked again, and the
+    modules it uses, need to be considered for this pass too.
+    """
+    addExtraSysPaths(getModuleSysPathAdditions(module.getFullName()))
+
+    if isRestoredModuleTree(module):
+        # Helper functions are created anew in this compilation, and their
+        # users need to make sure they are computed.
+        for function_body in getRestoredModuleTreeUsedHelperFunctions(module):
+            module.trace_collection.onUsedFunction(function_body)
+
+        fetchUsedFunctions()
+
+        used_functions = _module_used_functions.get(module, module.subnode_functions)
+        used_foreign_functions = ()
+    else:
+        used_functions = _module_used_functions.get(module, ())
+        used_foreign_functions = _module_used_foreign_functions[module]
+
+    for function_body in used_functions:
+        module.addUsedFunction(function_body)
+
+    for used_function_module, function_body in used_foreign_functions:
+        used_function_module.addUsedFunction(function_body)
+
+    module.attemptRecursion()
+
+    considerUsedModules(module=module, pass_count=pass_count)
+
 
 def _restartProgress():
     global pass_count  # Singleton, pylint: disable=global-statement
@@ -286,6 +464,9 @@ def makeOptimizationPass():
     main_module = None
     stdlib_phase_done = False
 
+    optimized_count = 0
+    skipped_count = 0
+
     while True:
         current_module = ModuleRegistry.nextModule()
 
@@ -306,6 +487,13 @@ def makeOptimizationPass():
 
         module_name = current_module.getFullName()
 
+        if not _isModuleOptimizationNeeded(current_module):
+            _skipModuleOptimization(current_module)
+            skipped_count += 1
+
+            _traceProgressModuleEnd(current_module)
+            continue
+
         with TimerReport(
             message="Optimizing '%s'" % module_name,
             logger=optimization_logger,
@@ -323,8 +511,12 @@ def makeOptimizationPass():
             perf_counters=module_timer.getPerfCounters(),
             micro_passes=micro_passes,
             merge_counts=fetchMergeCounts(),
+            function_computations=fetchFunctionComputations(),
         )
 
+        _recordModuleOptimization(current_module, changed)
+        optimized_count += 1
+
         _traceProgressModuleEnd(current_module)
 
         if changed:
@@ -347,8 +539,23 @@ def makeOptimizationPass():
                 if function in current_module.getUsedFunctions()
             )
 
+            _module_used_functions[current_module] = current_module.subnode_functions
+
     _endProgress()
 
+    if skipped_count:
+        optimization_logger.info_if_file(
+            "PASS %d: Skipped %d of %d module optimizations, inputs unchanged."
+            % (pass_count, skipped_count, skipped_count + optimized_count),
+            other_logger=progress_logger,
+        )
+
+    ModuleRegistry.addOptimizationPassInformation(
+        pass_number=pass_count,
+        optimized_count=optimized_count,
+        skipped_count=skipped_count,
+    )
+
     return finished
 
 
@@ -370,6 +577,9 @@ def _optimizeModules(output_filename):
     while not finished:
         finished = makeOptimizationPass()
 
+    if isModuleTreeCacheUsage():
+        writeModuleTreesToCache()
+
     Graphs.endGraph(output_filename)
 
 
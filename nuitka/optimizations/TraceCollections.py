@@ -62,8 +62,180 @@ def fetchMergeCounts():
     return result
 
 
+# Keeping trace of functions that got used between calls
+_used_functions = OrderedSet()
+
+
+def fetchUsedFunctions():
+    result = tuple(_used_functions)
+    _used_functions.clear()
+    return result
+
+
 signalChange = None
 
+# Function level change tracking for the micro passes of a module. Changes
+# signaled are attributed to all the functions currently being computed.
+_computing_functions = []
+
+# Changes to things shared between functions, e.g. variable usage or trusted
+# module variables, affect all functions. Module level code otherwise only
+# creates functions, and changes to it do not affect function bodies.
+_global_change_signaled = False
+
+_global_change_tags = (
+    "var_usage",
+    "read_only_module_variable",
+    "trusted_module_variables",
+)
+
+# Changes known to concern only the function and its users.
+_function_local_changes = False
+
+# Functions computed or replayed in the current micro pass, and functions that
+# are known to be unchanged and need not be computed again in it.
+_micro_pass_functions = set()
+_clean_functions = frozenset()
+
+# Keeping trace of how often functions got computed between calls
+_function_computations = defaultdict(int)
+
+
+def fetchFunctionComputations():
+    result = dict(
+        (function_body.getCodeName(), count)
+        for function_body, count in iterItems(_function_computations)
+    )
+    _function_computations.clear()
+    return result
+
+
+def _onChangeSignaled(tags):
+    global _global_change_signaled  # Singleton, pylint: disable=global-statement
+
+    if type(tags) is str:
+        tags = tags.split()
+
+    if _function_local_changes:
+        pass
+    elif any(tag in _global_change_tags for tag in tags):
+        _global_change_signaled = True
+
+    for trace_collection in _computing_functions:
+        trace_collection.changed = True
+
+
+def startFunctionMicroPass(module, skip_unchanged):
+    """Start a micro pass of a module, deciding what functions to compute.
+
+    With "skip_unchanged", functions whose last computation in the previous
+    micro pass signaled no change, and all whose used functions are in the same
+    situation, are not computed again, but their results are replayed. Changes
+    to things shared between functions make all functions computed again.
+    """
+
+    # Singleton, pylint: disable=global-statement
+    global _global_change_signaled, _micro_pass_functions, _clean_functions
+
+    candidates = _micro_pass_functions
+    _micro_pass_functions = set()
+
+    if not skip_unchanged or _global_change_signaled:
+        _clean_functions = frozenset()
+    else:
+        dirty_functions = set()
+        function_users = defaultdict(list)
+
+        for function_body in candidates:
+            if function_body.getParentModule() is not module:
+                continue
+
+            function_trace_collection = function_body.trace_collection
+
+            if function_trace_collection.changed:
+                dirty_functions.add(function_body)
+
+            for used_function in function_trace_collection.getUsedFunctions():
+                if used_function.isExpressionFunctionPureBody():
+                    continue
+
+                if used_function not in candidates or (
+                    used_function.getParentModule() is not module
+                ):
+                    dirty_functions.add(function_body)
+
+                function_users[used_function].append(function_body)
+
+        # Callers and inlining sites of changed functions are to be computed
+        # again as well.
+        pending = list(dirty_functions)
+        while pending:
+            for function_user in function_users.get(pending.pop(), ()):
+                if function_user not in dirty_functions:
+                    dirty_functions.add(function_user)
+                    pending.append(function_user)
+
+        _clean_functions = frozenset(
+            function_body
+            for function_body in candidates
+            if function_body not in dirty_functions
+            if function_body.getParentModule() is module
+        )
+
+    _global_change_signaled = False
+
+
+def isFunctionComputationSkippable(function_body):
+    """Decide if a function can use its result from the previous micro pass.
+
+    Functions used by functions being computed are always computed too, as
+    their closure variables might have changed.
+    """
+    return not _computing_functions and function_body in _clean_functions
+
+
+def onFunctionComputationSkipped(function_body, trace_collection):
+    _micro_pass_functions.add(function_body)
+
+    function_body.trace_collection.replayToParent(trace_collection)
+
+
+@contextmanager
+def withFunctionComputation(function_body, trace_collection):
+    """Attribute changes signaled to the function while computing it."""
+
+    _micro_pass_functions.add(function_body)
+    _function_computations[function_body] += 1
+
+    _computing_functions.append(trace_collection)
+
+    try:
+        yield
+    finally:
+        _computing_functions.pop()
+
+
+@contextmanager
+def withFunctionLocalChanges(function_body):
+    """Attribute changes to a function, that concern only it and its users.
+
+    This is for the cleanups done after the module is complete, e.g. removal
+    of unused closure variables, which affects the function creation too.
+    """
+
+    global _function_local_changes  # Singleton, pylint: disable=global-statement
+
+    old = _function_local_changes
+    _function_local_changes = True
+
+    _computing_functions.append(function_body.trace_collection)
+
+    try:
+        yield
+    finally:
+        _computing_functions.pop()
+        _function_local_changes = old
+
 
 @contextmanager
 def withChangeIndicationsTo(signal_change):
@@ -257,6 +429,8 @@ class CollectionStartPointMixin(CollectionUpdateMixin):
             source_ref=owning_module.source_ref,
         )
 
+        _used_functions.add(function_body)
+
         needs_visit = owning_module.addUsedFunction(function_body)
 
         if needs_visit or function_body.isExpressionFunctionPureBody():
@@ -294,6 +468,9 @@ class CollectionStartPointMixin(CollectionUpdateMixin):
         if self.very_trusted_module_variables.get(variable, None) is old_node:
             self.very_trusted_module_variables[variable] = new_node
 
+            # These are shared by all functions of the module.
+            _onChangeSignaled(_global_change_tags)
+
 
 class TraceCollectionBase(object):
     """This contains for logic for maintaining active traces.
@@ -448,6 +625,8 @@ class TraceCollectionBase(object):
 
     @staticmethod
     def signalChange(tags, source_ref, message):
+        _onChangeSignaled(tags)
+
         # This is monkey patched from another module. pylint: disable=I0021,not-callable
         signalChange(tags, source_ref, message)
 
@@ -1158,6 +1337,10 @@ class TraceCollectionFunction(CollectionStartPointMixin, TraceCollectionBase):
         "outline_functions",
         "very_trusted_module_variables",
         "delayed_work",
+        "changed",
+        "used_functions",
+        "module_usage_attempts",
+        "distribution_usages",
     )
 
     def __init__(self, parent, old_collection, function_body):
@@ -1184,6 +1367,15 @@ class TraceCollectionFunction(CollectionStartPointMixin, TraceCollectionBase):
         else:
             self.very_trusted_module_variables = ()
 
+        # Dirty flag, set when changes are signaled during the computation.
+        self.changed = False
+
+        # What was given to the parent, to be able to replay it, when the
+        # computation is not repeated.
+        self.used_functions = OrderedSet()
+        self.module_usage_attempts = OrderedSet()
+        self.distribution_usages = []
+
         if function_body.isExpressionFunctionBody():
             parameters = function_body.getParameters()
 
@@ -1254,11 +1446,50 @@ class TraceCollectionFunction(CollectionStartPointMixin, TraceCollectionBase):
 
         return assign_trace
 
+    def getUsedFunctions(self):
+        return self.used_functions
+
+    def onUsedFunction(self, function_body):
+        self.used_functions.add(function_body)
+
+        CollectionStartPointMixin.onUsedFunction(self, function_body=function_body)
+
+    def onModuleUsageAttempts(self, module_usage_attempts):
+        self.module_usage_attempts.update(module_usage_attempts)
+
+        TraceCollectionBase.onModuleUsageAttempts(self, module_usage_attempts)
+
+    def onModuleUsageAttempt(self, module_usage_attempt):
+        self.module_usage_attempts.add(module_usage_attempt)
+
+        TraceCollectionBase.onModuleUsageAttempt(self, module_usage_attempt)
+
+    def onDistributionUsed(self, distribution_name, node, success):
+        self.distribution_usages.append((distribution_name, node, success))
+
+        TraceCollectionBase.onDistributionUsed(
+            self, distribution_name=distribution_name, node=node, success=success
+        )
+
+    def replayToParent(self, trace_collection):
+        """Give the parent what the computation of the function gave it."""
+
+        if self.module_usage_attempts:
+            trace_collection.onModuleUsageAttempts(self.module_usage_attempts)
+
+        for distribution_name, node, success in self.distribution_usages:
+            trace_collection.onDistributionUsed(
+                distribution_name=distribution_name, node=node, success=success
+            )
+
+        for function_body in self.used_functions:
+            trace_collection.onUsedFunction(function_body)
+
 
 class TraceCollectionPureFunction(TraceCollectionFunction):
     """Pure functions don't feed their parent."""
 
-    __slots__ = ("used_functions",)
+    __slots__ = ()
 
     def __init__(self, old_collection, function_body):
         TraceCollectionFunction.__init__(
@@ -1268,16 +1499,6 @@ class TraceCollectionPureFunction(TraceCollectionFunction):
             function_body=function_body,
         )
 
-        self.used_functions = OrderedSet()
-
-    def getUsedFunctions(self):
-        return self.used_functions
-
-    def onUsedFunction(self, function_body):
-        self.used_functions.add(function_body)
-
-        TraceCollectionFunction.onUsedFunction(self, function_body=function_body)
-
 
 class TraceCollectionModule(CollectionStartPointMixin, TraceCollectionBase):
     __slots__ = (
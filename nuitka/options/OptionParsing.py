@@ -1066,6 +1066,32 @@ debug_group.add_option(
 Enable vmprof based profiling of time spent. Not working currently. Defaults to off.""",
 )
 
+debug_group.add_option(
+    "--runtime-sampling-profiler",
+    action="store_true",
+    dest="runtime_sampling_profiler",
+    default=False,
+    help="""\
+Include a native sampling profiler in the created program, that needs no extra
+packages. It is only active when the environment variable 'NUITKA_SAMPLING_PROFILE'
+is set to a filename, to which stacks with their sample counts are written in
+collapsed stack format at program end. The sampling interval can be given in
+microseconds with 'NUITKA_SAMPLING_PROFILE_INTERVAL'. Not supported on Windows.
+Defaults to off.""",
+)
+
+debug_group.add_option(
+    "--runtime-startup-trace",
+    action="store_true",
+    dest="runtime_startup_trace",
+    default=False,
+    help="""Include a structured trace of program startup in the created program, e.g. of
+onefile unpacking, interpreter initialization, loading of constants and module
+imports. It is only active when the environment variable 'NUITKA_STARTUP_TRACE'
+is set to a filename, to which the trace is written in Chrome trace event format,
+usable with e.g. 'chrome://tracing' or 'ui.perfetto.dev'. Defaults to off.""",
+)
+
 debug_group.add_option(
     "--trace-execution",
     action="store_true",
@@ -1316,6 +1342,19 @@ are system CPU minus the given value. Defaults to the full system CPU
 count unless low memory mode is activated, then it defaults to 1.""",
 )
 
+c_compiler_group.add_option(
+    "--jobs-memory-limit",
+    action="store",
+    dest="jobs_memory_limit",
+    metavar="MB",
+    default=None,
+    help="""\
+Memory in MB that parallel C compiler jobs are allowed to use together. The
+memory need of jobs is predicted from the size of the C files, and from what
+previous compilations measured. Larger files are compiled first. Use 0 for
+no limit. Defaults to 75% of the system memory.""",
+)
+
 c_compiler_group.add_option(
     "--lto",
     action="store",
@@ -1360,7 +1399,18 @@ del c_compiler_group
 
 caching_group = parser.add_option_group("Cache Control")
 
-_cache_names = ("all", "ccache", "bytecode", "compression")
+_cache_names = (
+    "all",
+    "ccache",
+    "bytecode",
+    "compression",
+    "dll-copies",
+    "package-config",
+    "import-detection",
+    "data-composer",
+    "runtime",
+    "compile-costs",
+)
 
 if isWin32Windows():
     _cache_names += ("dll-dependencies",)
@@ -1473,12 +1523,14 @@ pgo_group.add_option(
 
 pgo_group.add_option(
     "--pgo-args",
-    action="store",
+    action="append",
     dest="pgo_args",
-    default="",
+    default=[],
     help="""\
 Arguments to be passed in case of profile guided optimization. These are passed to the special
-built executable during the PGO profiling run. Default empty.""",
+built executable during the PGO profiling run. Can be given multiple times, for one profiling
+run per workload, with the information of all runs combined. Default one run without
+arguments.""",
 )
 
 pgo_group.add_option(
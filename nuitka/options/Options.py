@@ -74,6 +74,7 @@ from nuitka.utils.FileOperations import (
 )
 from nuitka.utils.Images import checkIconUsage
 from nuitka.utils.Importing import getInlineCopyFolder
+from nuitka.utils.MemoryUsage import getTotalPhysicalMemory
 from nuitka.utils.ModuleNames import ModuleName, checkModuleName
 from nuitka.utils.StaticLibraries import getSystemStaticLibPythonPath
 from nuitka.utils.Utils import (
@@ -1321,6 +1322,14 @@ library. Please upgrade/downgrade to a supported micro version."""
             % options.jobs
         )
 
+    try:
+        getJobMemoryLimit()
+    except ValueError:
+        return options_logger.sysexit(
+            "For '--jobs-memory-limit' value, use integer values only, but not '%s'."
+            % options.jobs_memory_limit
+        )
+
     if isOnefileMode():
         standalone_mode = "onefile"
     elif isStandaloneMode():
@@ -1395,6 +1404,11 @@ make sure that is intended."""
 
         options.static_libpython = "no"
 
+    if options.runtime_sampling_profiler and isWin32Windows():
+        options_logger.warning(
+            "The '--runtime-sampling-profiler' option is not supported on Windows, ignoring it."
+        )
+
     if (
         not isCPgoMode()
         and not isPythonPgoMode()
@@ -1908,6 +1922,16 @@ def isRuntimeProfile():
     return options.debug_profile_runtime
 
 
+def isRuntimeSamplingProfiler():
+    """:returns: bool derived from ``--runtime-sampling-profiler``"""
+    return options.runtime_sampling_profiler and not isWin32Windows()
+
+
+def isRuntimeStartupTrace():
+    """:returns: bool derived from ``--runtime-startup-trace``"""
+    return options.runtime_startup_trace
+
+
 def isCompileTimeProfile():
     """:returns: bool derived from ``--devel-profile-compilation``"""
     return options.devel_profile_compilation
@@ -2207,6 +2231,28 @@ def getJobLimit():
     return result
 
 
+def getJobMemoryLimit():
+    """*int*, value of ``--jobs-memory-limit`` in bytes or None for no limit"""
+    memory_limit = options.jobs_memory_limit
+
+    # Default to most of the physical memory, the rest is for the system and
+    # not predicted peaks.
+    if memory_limit is None:
+        total_memory = getTotalPhysicalMemory()
+
+        if total_memory is None:
+            return None
+
+        return total_memory * 3 // 4
+
+    memory_limit = int(memory_limit)
+
+    if memory_limit <= 0:
+        return None
+
+    return memory_limit * 1024 * 1024
+
+
 def getLtoMode():
     """:returns: bool derived from ``--lto``"""
     return options.lto
@@ -2276,6 +2322,36 @@ def shallDisableCompressionCacheUsage():
     return shallDisableCacheUsage("compression")
 
 
+def shallDisableDllCopyCacheUsage():
+    """:returns: bool derived from ``--disable-cache=dll-copies``"""
+    return shallDisableCacheUsage("dll-copies")
+
+
+def shallDisableDataComposerCacheUsage():
+    """:returns: bool derived from ``--disable-cache=data-composer``"""
+    return shallDisableCacheUsage("data-composer")
+
+
+def shallDisableImportDetectionCacheUsage():
+    """:returns: bool derived from ``--disable-cache=import-detection``"""
+    return shallDisableCacheUsage("import-detection")
+
+
+def shallDisablePackageConfigCacheUsage():
+    """:returns: bool derived from ``--disable-cache=package-config``"""
+    return shallDisableCacheUsage("package-config")
+
+
+def shallDisableRuntimeCacheUsage():
+    """:returns: bool derived from ``--disable-cache=runtime``"""
+    return shallDisableCacheUsage("runtime")
+
+
+def shallDisableCompileCostsCacheUsage():
+    """:returns: bool derived from ``--disable-cache=compile-costs``"""
+    return shallDisableCacheUsage("compile-costs")
+
+
 def getWindowsConsoleMode():
     """:returns: str from ``--windows-console-mode``"""
     if options.disable_console is True:
@@ -2477,8 +2553,8 @@ def shallCreatePythonPgoInput():
 
 
 def getPgoArgs():
-    """*list* = ``--pgo-args``"""
-    return shlex.split(options.pgo_args)
+    """*list* of *list* = ``--pgo-args`` split per profiling run"""
+    return [shlex.split(pgo_args) for pgo_args in options.pgo_args]
 
 
 def getPgoExecutable():
@@ -3,101 +3,263 @@
 
 """Python level PGO handling in Nuitka."""
 
-import os
+import array
 import struct
 
-from nuitka.__past__ import xrange
 from nuitka.options.Options import getPythonPgoUnseenModulePolicy
 from nuitka.Tracing import pgo_logger
+from nuitka.utils.FileOperations import getFileContents, putBinaryFileContents
 
 _pgo_active = False
 
-_pgo_strings = None
-
 _module_entries = {}
 _module_exits = {}
+_module_technicals = set()
+
+# Counts of calls per function and outcomes per branch, keyed by module name
+# and the probe name given at code generation.
+_function_calls = {}
+_branch_outcomes = {}
+
+# Types observed per probe site and their counts.
+_observed_types = {}
+
+# Functions with at least this share of all recorded calls are considered hot.
+_hot_function_call_share = 0.01
+_total_function_calls = 0
+
+# Branches need this many samples, and go one way this strongly, to be hinted.
+_branch_hint_min_samples = 100
+_branch_hint_ratio = 0.99
+
+# Probe sites need this many samples, with one type this dominant, for code to
+# be specialized to that type.
+_type_dominance_min_samples = 100
+_type_dominance_ratio = 0.95
+
+# Largest count value the file format can hold.
+_max_count_value = 0xFFFFFFFF
+
+# Decisions given to code generation, for use in the compilation report.
+_function_decisions = {}
+_branch_decisions = {}
+_type_decisions = {}
 
 
-def _readCString(input_file):
-    return b"".join(iter(lambda: input_file.read(1), b"\0"))
+def _readPGOInputFileContents(input_filename):
+    contents = getFileContents(input_filename, mode="rb")
 
+    if contents[:7] != b"KAY.PGO":
+        pgo_logger.sysexit(
+            "Error, file '%s' is not a valid PGO input for this version of Nuitka."
+            % input_filename
+        )
 
-def _readCIntValue(input_file):
-    return struct.unpack("i", input_file.read(4))[0]
+    if len(contents) < 22 or contents[-7:] != b"YAK.PGO":
+        pgo_logger.sysexit(
+            "Error, file '%s' was not completed correctly." % input_filename
+        )
 
+    string_table_end = len(contents) - 8 - 7
+    count, offset = struct.unpack_from("II", contents, string_table_end)
 
-def _readStringValue(input_file):
-    return _pgo_strings[_readCIntValue(input_file)]
+    if offset > string_table_end or (offset - 7) % 4 != 0:
+        pgo_logger.sysexit("Error, file '%s' is corrupt." % input_filename)
 
+    strings = contents[offset:string_table_end].split(b"\0")[:count]
 
-def _readModuleIdentifierValue(input_file):
-    module_identifier = _readStringValue(input_file)
     if str is not bytes:
-        module_identifier = module_identifier.decode("utf8")
+        strings = [value.decode("utf8") for value in strings]
+
+    # All probe records consist only of 32 bit values, string ids or counts.
+    values = array.array("I")
+
+    if str is bytes:
+        values.fromstring(contents[7:offset])
+    else:
+        values.frombytes(contents[7:offset])
+
+    return strings, values
+
+
+def _readModuleEnterRecord(strings, args, _weight):
+    _module_entries[strings[args[0]]] = args[1]
+
+
+def _readModuleExitRecord(strings, args, _weight):
+    module_name = strings[args[0]]
+    had_error = args[1] != 0
 
-    return module_identifier
+    _module_exits[module_name] = _module_exits.get(module_name) or had_error
 
 
-def readPGOInputFile(input_filename):
-    """Read PGO information produced by a PGO run."""
+def _readModuleTechnicalRecord(strings, args, _weight):
+    _module_technicals.add(strings[args[0]])
 
+
+def _readFunctionCallsRecord(strings, args, weight):
     # Using global here, as this is really a singleton, in the form of a module,
     # pylint: disable=global-statement
-    global _pgo_strings, _pgo_active
+    global _total_function_calls
 
-    with open(input_filename, "rb") as input_file:
-        header = input_file.read(7)
+    key = strings[args[0]], strings[args[1]]
+    count = args[2] * weight
 
-        if header != b"KAY.PGO":
-            pgo_logger.sysexit(
-                "Error, file '%s' is not a valid PGO input for this version of Nuitka."
-                % input_filename
-            )
+    _function_calls[key] = _function_calls.get(key, 0) + count
+    _total_function_calls += count
 
-        input_file.seek(-7, os.SEEK_END)
-        header = input_file.read(7)
 
-        if header != b"YAK.PGO":
-            pgo_logger.sysexit(
-                "Error, file '%s' was not completed correctly." % input_filename
-            )
+def _readBranchTakenRecord(strings, args, weight):
+    key = strings[args[0]], strings[args[1]]
 
-        input_file.seek(-8 - 7, os.SEEK_END)
-        count, offset = struct.unpack("ii", input_file.read(8))
+    _branch_outcomes.setdefault(key, [0, 0])[0] += args[2] * weight
 
-        input_file.seek(offset, os.SEEK_SET)
 
-        _pgo_strings = [None] * count
+def _readBranchNotTakenRecord(strings, args, weight):
+    key = strings[args[0]], strings[args[1]]
 
-        for i in xrange(count):
-            _pgo_strings[i] = _readCString(input_file)
+    _branch_outcomes.setdefault(key, [0, 0])[1] += args[2] * weight
 
-        input_file.seek(7, os.SEEK_SET)
 
-        while True:
-            # Which probe is it.
-            probe_name = _readStringValue(input_file)
+def _readTypeObservedRecord(strings, args, weight):
+    key = strings[args[0]], strings[args[1]]
+    type_name = strings[args[2]]
 
-            if probe_name == b"ModuleEnter":
-                module_name = _readModuleIdentifierValue(input_file)
-                arg = _readCIntValue(input_file)
+    observed_types = _observed_types.setdefault(key, {})
+    observed_types[type_name] = observed_types.get(type_name, 0) + args[3] * weight
 
-                _module_entries[module_name] = arg
-            elif probe_name == b"ModuleExit":
-                module_name = _readModuleIdentifierValue(input_file)
-                had_error = _readCIntValue(input_file) != 0
 
-                _module_exits[module_name] = had_error
-            elif probe_name == b"END":
-                break
-            else:
-                pgo_logger.sysexit(
-                    "Error, unknown probe '%s' encountered." % probe_name
-                )
+# Probe records by name, with the number of values following the name, and
+# the function to read them.
+_pgo_record_readers = {
+    "ModuleEnter": (2, _readModuleEnterRecord),
+    "ModuleExit": (2, _readModuleExitRecord),
+    "ModuleTechnical": (2, _readModuleTechnicalRecord),
+    "FunctionCalls": (3, _readFunctionCallsRecord),
+    "BranchTaken": (3, _readBranchTakenRecord),
+    "BranchNotTaken": (3, _readBranchNotTakenRecord),
+    "TypeObserved": (4, _readTypeObservedRecord),
+}
+
+
+def readPGOInputFile(input_filename, weight=1):
+    """Read PGO information produced by a PGO run.
+
+    Notes:
+        Reading multiple files, merges their information, with the counts
+        multiplied by the weight given.
+    """
+
+    # Using global here, as this is really a singleton, in the form of a module,
+    # pylint: disable=global-statement
+    global _pgo_active
+
+    strings, values = _readPGOInputFileContents(input_filename)
+
+    pos = 0
+    while True:
+        # Which probe is it.
+        probe_name = strings[values[pos]]
+
+        if probe_name == "END":
+            break
+
+        if probe_name not in _pgo_record_readers:
+            pgo_logger.sysexit("Error, unknown probe '%s' encountered." % probe_name)
+
+        arg_count, record_reader = _pgo_record_readers[probe_name]
+        record_reader(strings, values[pos + 1 : pos + 1 + arg_count], weight)
+
+        pos += 1 + arg_count
 
     _pgo_active = True
 
 
+def _iterPGOOutputRecords():
+    """Records to write, with strings and numbers as values."""
+
+    for module_name, arg in sorted(_module_entries.items()):
+        yield "ModuleEnter", module_name, arg
+
+    for module_name, had_error in sorted(_module_exits.items()):
+        yield "ModuleExit", module_name, int(had_error)
+
+    for module_name in sorted(_module_technicals):
+        yield "ModuleTechnical", module_name, 0
+
+    for (module_name, function_name), count in sorted(_function_calls.items()):
+        yield "FunctionCalls", module_name, function_name, count
+
+    for (module_name, branch_name), outcomes in sorted(_branch_outcomes.items()):
+        for probe_name, count in zip(("BranchTaken", "BranchNotTaken"), outcomes):
+            if count:
+                yield probe_name, module_name, branch_name, count
+
+    for (module_name, site_name), observed_types in sorted(_observed_types.items()):
+        for type_name, count in sorted(observed_types.items()):
+            yield "TypeObserved", module_name, site_name, type_name, count
+
+    yield ("END",)
+
+
+def writePGOOutputFile(output_filename):
+    """Write PGO information read, e.g. from multiple files, to a file.
+
+    Notes:
+        The result is in the same format as produced by a PGO run, and can be
+        read the same way.
+    """
+
+    strings = []
+    string_ids = {}
+
+    values = array.array("I")
+
+    for record in _iterPGOOutputRecords():
+        for value in record:
+            if isinstance(value, str):
+                if value not in string_ids:
+                    string_ids[value] = len(strings)
+                    strings.append(value)
+
+                values.append(string_ids[value])
+            else:
+                values.append(min(int(round(value)), _max_count_value))
+
+    if str is bytes:
+        records = values.tostring()
+    else:
+        records = values.tobytes()
+        strings = [value.encode("utf8") for value in strings]
+
+    putBinaryFileContents(
+        output_filename,
+        b"".join(
+            (
+                b"KAY.PGO",
+                records,
+                b"".join(value + b"\0" for value in strings),
+                struct.pack("II", len(strings), 7 + len(records)),
+                b"YAK.PGO",
+            )
+        ),
+    )
+
+
+def mergePGOInputFiles(output_filename, weighted_input_filenames):
+    """Merge the PGO information of multiple PGO runs into one file.
+
+    Args:
+        output_filename: file to write the merged information to
+        weighted_input_filenames: iterable of (weight, filename) of the runs
+    """
+
+    for weight, input_filename in weighted_input_filenames:
+        readPGOInputFile(input_filename=input_filename, weight=weight)
+
+    writePGOOutputFile(output_filename)
+
+
 def decideInclusionFromPGO(module_name, module_kind):
     """Decide module inclusion based on PGO input.
 
@@ -144,6 +306,158 @@ def decideCompilationFromPGO(module_name):
         return None
 
 
+def decideFunctionHotnessFromPGO(module_name, function_name):
+    """Decide if a function is hot or cold based on PGO input.
+
+    Returns:
+        "hot", "cold" or None if there is no information. Functions of
+        modules entered, but never called themselves are cold.
+    """
+
+    if not _pgo_active or not _function_calls:
+        return None
+
+    module_name = str(module_name)
+    count = _function_calls.get((module_name, function_name))
+
+    if count is None:
+        if module_name in _module_entries:
+            result = "cold"
+        else:
+            result = None
+    elif count >= _total_function_calls * _hot_function_call_share:
+        result = "hot"
+    else:
+        result = None
+
+    _function_decisions[module_name, function_name] = (count or 0, result)
+
+    return result
+
+
+def decideBranchLikelinessFromPGO(module_name, branch_name):
+    """Decide if a branch is likely or unlikely taken based on PGO input.
+
+    Returns:
+        True for likely, False for unlikely, or None if the branch was not
+        passed often enough, or not one sided enough to give a hint.
+    """
+
+    if not _pgo_active:
+        return None
+
+    module_name = str(module_name)
+    outcomes = _branch_outcomes.get((module_name, branch_name))
+
+    if outcomes is None:
+        return None
+
+    taken, not_taken = outcomes
+    total = taken + not_taken
+
+    if total < _branch_hint_min_samples:
+        result = None
+    elif taken >= total * _branch_hint_ratio:
+        result = True
+    elif not_taken >= total * _branch_hint_ratio:
+        result = False
+    else:
+        result = None
+
+    _branch_decisions[module_name, branch_name] = (taken, not_taken, result)
+
+    return result
+
+
+def decideDominantTypeFromPGO(module_name, site_name):
+    """Decide the type a probe site is dominated by based on PGO input.
+
+    Returns:
+        Name of the type, or None if the site was not passed often enough, or
+        no type was observed often enough to specialize code for it.
+
+    Notes:
+        Values of types beyond the first few ones distinguished at run time,
+        are counted as "<other>", which therefore is never given.
+    """
+
+    if not _pgo_active:
+        return None
+
+    module_name = str(module_name)
+    observed_types = _observed_types.get((module_name, site_name))
+
+    if observed_types is None:
+        return None
+
+    total = sum(observed_types.values())
+    type_name, count = max(observed_types.items(), key=lambda item: item[1])
+
+    if (
+        total < _type_dominance_min_samples
+        or count < total * _type_dominance_ratio
+        or type_name == "<other>"
+    ):
+        result = None
+    else:
+        result = type_name
+
+    _type_decisions[module_name, site_name] = (
+        tuple(sorted(observed_types.items())),
+        result,
+    )
+
+    return result
+
+
+def getFunctionPGODecisions():
+    """Function hotness decisions made, keyed by module and function name.
+
+    Values are the recorded call count and the hotness given.
+    """
+    return _function_decisions
+
+
+def getBranchPGODecisions():
+    """Branch hint decisions made, keyed by module and branch name.
+
+    Values are the recorded taken and not taken counts, and the hint given.
+    """
+    return _branch_decisions
+
+
+def getTypePGODecisions():
+    """Type specialization decisions made, keyed by module and site name.
+
+    Values are the observed types with their counts, and the type given.
+    """
+    return _type_decisions
+
+
+def fetchPGODecisions():
+    """Get and reset the decisions made so far, for merging elsewhere."""
+    result = (
+        tuple(_function_decisions.items()),
+        tuple(_branch_decisions.items()),
+        tuple(_type_decisions.items()),
+    )
+
+    _function_decisions.clear()
+    _branch_decisions.clear()
+    _type_decisions.clear()
+
+    return result
+
+
+def mergePGODecisions(pgo_decisions):
+    """Merge decisions as provided by "fetchPGODecisions"."""
+    function_decisions, branch_decisions, type_decisions = pgo_decisions
+
+    _function_decisions.update(function_decisions)
+    _branch_decisions.update(branch_decisions)
+    _type_decisions.update(type_decisions)
+
+
 #     Part of "Nuitka", an optimizing Python compiler that is compatible and
 #     integrates with CPython, but also works on its own.
 #
@@ -21,8 +21,9 @@ from contextlib import contextmanager
 from optparse import OptionConflictError
 
 import nuitka.plugins.Hooks
-from nuitka.__past__ import basestring, iter_modules
+from nuitka.__past__ import basestring, iter_modules, perf_counter
 from nuitka.build.DataComposerInterface import deriveModuleConstantsBlobName
+from nuitka.containers.Namedtuples import makeNamedtupleClass
 from nuitka.containers.OrderedDicts import OrderedDict
 from nuitka.containers.OrderedSets import OrderedSet
 from nuitka.Errors import NuitkaForbiddenImportEncounter, NuitkaSyntaxError
@@ -135,6 +136,7 @@ def _addActivePlugin(plugin_class, args, force=False):
     assert isinstance(plugin_instance, NuitkaPluginBase), plugin_instance
 
     active_plugins[plugin_name] = plugin_instance
+    _hook_plugins.clear()
 
     is_gui_toolkit_plugin = getattr(plugin_class, "plugin_gui_toolkit", False)
 
@@ -172,6 +174,201 @@ def getActivePlugins():
     return active_plugins.values()
 
 
+# Maps hook method names to the active plugins implementing them, the default
+# implementations of hooks in the base class do nothing, so plugins that do not
+# override a hook need not be asked.
+_hook_plugins = {}
+
+# Methods that the default implementation of a hook calls, overriding these
+# makes a plugin implement the hook as well.
+_hook_extra_method_names = {"onModuleSourceCode": ("checkModuleSourceCode",)}
+
+
+def _isPluginMethodOverridden(plugin, method_name):
+    if method_name in plugin.__dict__:
+        return True
+
+    for plugin_class in type(plugin).__mro__:
+        if method_name in plugin_class.__dict__:
+            return plugin_class is not NuitkaPluginBase
+
+    return False
+
+
+def _isPluginHookImplemented(plugin, hook_name):
+    for method_name in (hook_name,) + _hook_extra_method_names.get(hook_name, ()):
+        if _isPluginMethodOverridden(plugin, method_name):
+            return True
+
+    return False
+
+
+def getActivePluginsForHook(*hook_names):
+    """Return active plugins that implement any of the given hooks.
+
+    Notes:
+        The result is computed once per hook after plugin activation, and
+        plugins that do not override the default implementation of a hook
+        are left out.
+
+    Returns:
+        tuple of plugins
+    """
+
+    try:
+        return _hook_plugins[hook_names]
+    except KeyError:
+        result = tuple(
+            plugin
+            for plugin in getActivePlugins()
+            if any(
+                _isPluginHookImplemented(plugin, hook_name) for hook_name in hook_names
+            )
+        )
+
+        _hook_plugins[hook_names] = result
+
+        return result
+
+
+# Maps plugin name and hook name to call count and time used.
+_plugin_hook_timings = {}
+
+PluginHookTimingInfo = makeNamedtupleClass(
+    "PluginHookTimingInfo",
+    (
+        "plugin_name",
+        "hook_name",
+        "call_count",
+        "time_used",
+    ),
+)
+
+
+def _addPluginHookTime(plugin, hook_name, time_used, is_call):
+    key = plugin.plugin_name, hook_name
+
+    timing = _plugin_hook_timings.get(key)
+
+    if timing is None:
+        _plugin_hook_timings[key] = [1 if is_call else 0, time_used]
+    else:
+        if is_call:
+            timing[0] += 1
+        timing[1] += time_used
+
+
+def _iterateTimedPluginHookGenerator(plugin, hook_name, generator):
+    """Forward to a generator of a hook, taking the time of each step.
+
+    Values sent, exceptions thrown, and closing are forwarded like "yield from"
+    does it, which is not available for Python2.
+    """
+
+    def timedStep(method, *args):
+        start_time = perf_counter()
+
+        try:
+            return method(*args)
+        finally:
+            _addPluginHookTime(
+                plugin=plugin,
+                hook_name=hook_name,
+                time_used=perf_counter() - start_time,
+                is_call=False,
+            )
+
+    try:
+        value = timedStep(next, generator)
+    except StopIteration:
+        return
+
+    while True:
+        try:
+            sent = yield value
+        except GeneratorExit:
+            timedStep(generator.close)
+            raise
+        except BaseException as e:  # Forwarding all, pylint: disable=broad-except
+            try:
+                value = timedStep(generator.throw, e)
+            except StopIteration:
+                return
+        else:
+            try:
+                if sent is None:
+                    value = timedStep(next, generator)
+                else:
+                    value = timedStep(generator.send, sent)
+            except StopIteration:
+                return
+
+
+def _callPluginHook(plugin, hook_name, *args, **kwargs):
+    """Call a hook method of a plugin, taking the time it uses."""
+
+    start_time = perf_counter()
+
+    try:
+        result = getattr(plugin, hook_name)(*args, **kwargs)
+    finally:
+        _addPluginHookTime(
+            plugin=plugin,
+            hook_name=hook_name,
+            time_used=perf_counter() - start_time,
+            is_call=True,
+        )
+
+    # Generators do their work only when iterated, take that time too.
+    if inspect.isgenerator(result):
+        result = _iterateTimedPluginHookGenerator(
+            plugin=plugin, hook_name=hook_name, generator=result
+        )
+
+    return result
+
+
+def getPluginHookTimingInfos():
+    """Return call counts and time used per plugin and hook, for reporting.
+
+    Notes:
+        Times include those of hooks called from within hooks, e.g. for
+        modules imported as a consequence.
+
+    Returns:
+        tuple of PluginHookTimingInfo
+    """
+
+    return tuple(
+        PluginHookTimingInfo(plugin_name, hook_name, call_count, time_used)
+        for (plugin_name, hook_name), (call_count, time_used) in sorted(
+            _plugin_hook_timings.items()
+        )
+    )
+
+
+def fetchPluginHookTimings():
+    """Get and reset the plugin hook timings, for merging elsewhere."""
+    result = tuple(
+        (key, tuple(timing)) for key, timing in _plugin_hook_timings.items()
+    )
+    _plugin_hook_timings.clear()
+
+    return result
+
+
+def mergePluginHookTimings(plugin_hook_timings):
+    """Merge plugin hook timings as provided by "fetchPluginHookTimings"."""
+    for key, (call_count, time_used) in plugin_hook_timings:
+        timing = _plugin_hook_timings.get(key)
+
+        if timing is None:
+            _plugin_hook_timings[key] = [call_count, time_used]
+        else:
+            timing[0] += call_count
+            timing[1] += time_used
+
+
 def getActiveQtPlugin():
     """Get active Qt plugin name."""
     for plugin_name in getQtPluginNames():
@@ -465,7 +662,9 @@ class Plugins(object):
 
         seen = set()
 
-        for full_name in iterateModuleNames(plugin.getImplicitImports(module)):
+        for full_name in iterateModuleNames(
+            _callPluginHook(plugin, "getImplicitImports", module)
+        ):
             if full_name in seen:
                 continue
             seen.add(full_name)
@@ -553,7 +752,9 @@ through implicit import by '%s' plugin encountered."""
     @classmethod
     def _getPackageExtraScanPaths(cls, plugin, package_name, package_dir):
         with withPluginModuleNameProblemReporting(plugin, package_name):
-            for path in plugin.getPackageExtraScanPaths(package_name, package_dir):
+            for path in _callPluginHook(
+                plugin, "getPackageExtraScanPaths", package_name, package_dir
+            ):
                 if os.path.isdir(path):
                     yield path
 
@@ -564,7 +765,7 @@ through implicit import by '%s' plugin encountered."""
         if key not in cls.extra_scan_paths_cache:
             cls.extra_scan_paths_cache[key] = ()
 
-            for plugin in getActivePlugins():
+            for plugin in getActivePluginsForHook("getPackageExtraScanPaths"):
                 cls.extra_scan_paths_cache[key] += tuple(
                     cls._getPackageExtraScanPaths(
                         plugin=plugin,
@@ -585,7 +786,7 @@ through implicit import by '%s' plugin encountered."""
             iterable of module names
         """
 
-        for plugin in getActivePlugins():
+        for plugin in getActivePluginsForHook("getImplicitImports"):
             key = (module.getFullName(), plugin)
 
             if key not in cls.implicit_imports_cache:
@@ -638,50 +839,50 @@ through implicit import by '%s' plugin encountered."""
             if entry_point.kind.endswith("_ignored"):
                 continue
 
-            for plugin in getActivePlugins():
+            for plugin in getActivePluginsForHook("onCopiedDLL"):
                 dll_path = os.path.join(dist_dir, entry_point.dest_path)
 
                 with withPluginProblemReporting(plugin, "DLL '%s'", dll_path):
-                    plugin.onCopiedDLL(dll_path)
+                    _callPluginHook(plugin, "onCopiedDLL", dll_path)
 
     @staticmethod
     def onBeforeCodeParsing():
         """Let plugins prepare for code parsing"""
-        for plugin in getActivePlugins():
-            plugin.onBeforeCodeParsing()
+        for plugin in getActivePluginsForHook("onBeforeCodeParsing"):
+            _callPluginHook(plugin, "onBeforeCodeParsing")
 
     @staticmethod
     def onStandaloneDistributionFinished(dist_dir, standalone_binary):
         """Let plugins post-process the distribution folder in standalone mode"""
-        for plugin in getActivePlugins():
-            plugin.onStandaloneDistributionFinished(dist_dir)
+        for plugin in getActivePluginsForHook("onStandaloneDistributionFinished"):
+            _callPluginHook(plugin, "onStandaloneDistributionFinished", dist_dir)
 
-        for plugin in getActivePlugins():
-            plugin.onStandaloneBinary(standalone_binary)
+        for plugin in getActivePluginsForHook("onStandaloneBinary"):
+            _callPluginHook(plugin, "onStandaloneBinary", standalone_binary)
 
     @staticmethod
     def onGeneratedSourceCode(source_dir, onefile):
         """Let plugins modify the generated source code"""
-        for plugin in getActivePlugins():
-            plugin.onGeneratedSourceCode(source_dir, onefile)
+        for plugin in getActivePluginsForHook("onGeneratedSourceCode"):
+            _callPluginHook(plugin, "onGeneratedSourceCode", source_dir, onefile)
 
     @staticmethod
     def onOnefileFinished(filename):
         """Let plugins post-process the onefile executable in onefile mode"""
-        for plugin in getActivePlugins():
-            plugin.onOnefileFinished(filename)
+        for plugin in getActivePluginsForHook("onOnefileFinished"):
+            _callPluginHook(plugin, "onOnefileFinished", filename)
 
     @staticmethod
     def onBootstrapBinary(filename):
         """Let plugins add to bootstrap binary in some way"""
-        for plugin in getActivePlugins():
-            plugin.onBootstrapBinary(filename)
+        for plugin in getActivePluginsForHook("onBootstrapBinary"):
+            _callPluginHook(plugin, "onBootstrapBinary", filename)
 
     @staticmethod
     def onFinalResult(filename):
         """Let plugins add to final binary in some way"""
-        for plugin in getActivePlugins():
-            plugin.onFinalResult(filename)
+        for plugin in getActivePluginsForHook("onFinalResult"):
+            _callPluginHook(plugin, "onFinalResult", filename)
 
     @staticmethod
     def considerExtraDlls(module):
@@ -711,10 +912,10 @@ through implicit import by '%s' plugin encountered."""
                     % (repr(value), module.asString())
                 )
 
-        for plugin in getActivePlugins():
+        for plugin in getActivePluginsForHook("getExtraDlls"):
             with withPluginModuleProblemReporting(plugin, module):
                 for entry_point in _iterateExtraBinaries(
-                    plugin, plugin.getExtraDlls(module)
+                    plugin, _callPluginHook(plugin, "getExtraDlls", module)
                 ):
                     result.append(entry_point)
 
@@ -729,8 +930,10 @@ through implicit import by '%s' plugin encountered."""
 
         """
         result = OrderedSet()
-        for plugin in getActivePlugins():
-            for dll_path in plugin.getModuleSpecificDllPaths(module_name):
+        for plugin in getActivePluginsForHook("getModuleSpecificDllPaths"):
+            for dll_path in _callPluginHook(
+                plugin, "getModuleSpecificDllPaths", module_name
+            ):
                 result.add(dll_path)
 
         return result
@@ -748,8 +951,10 @@ through implicit import by '%s' plugin encountered."""
         if cls._uncompiled_decorator_names is None:
             cls._uncompiled_decorator_names = set()
 
-            for plugin in getActivePlugins():
-                for decorator_name in plugin.getUncompiledDecoratorNames():
+            for plugin in getActivePluginsForHook("getUncompiledDecoratorNames"):
+                for decorator_name in _callPluginHook(
+                    plugin, "getUncompiledDecoratorNames"
+                ):
                     assert type(decorator_name) is str, decorator_name
                     cls._uncompiled_decorator_names.add(decorator_name)
 
@@ -770,8 +975,10 @@ through implicit import by '%s' plugin encountered."""
         if module_name not in cls.sys_path_additions_cache:
             cls.sys_path_additions_cache[module_name] = OrderedSet()
 
-            for plugin in getActivePlugins():
-                for dll_path in plugin.getModuleSysPathAdditions(module_name):
+            for plugin in getActivePluginsForHook("getModuleSysPathAdditions"):
+                for dll_path in _callPluginHook(
+                    plugin, "getModuleSysPathAdditions", module_name
+                ):
                     cls.sys_path_additions_cache[module_name].add(dll_path)
 
         return cls.sys_path_additions_cache[module_name]
@@ -790,9 +997,11 @@ through implicit import by '%s' plugin encountered."""
 
         to_remove = OrderedSet()
 
-        for plugin in getActivePlugins():
+        for plugin in getActivePluginsForHook("removeDllDependencies"):
             removed_dlls = tuple(
-                plugin.removeDllDependencies(dll_filename, dll_filenames)
+                _callPluginHook(
+                    plugin, "removeDllDependencies", dll_filename, dll_filenames
+                )
             )
 
             if removed_dlls and isShowInclusion():
@@ -829,20 +1038,20 @@ through implicit import by '%s' plugin encountered."""
             else:
                 plugin.sysexit("Plugin return non-datafile '%s'" % repr(value))
 
-        for plugin in getActivePlugins():
-            for value in plugin.considerDataFiles(module):
+        for plugin in getActivePluginsForHook("considerDataFiles"):
+            for value in _callPluginHook(plugin, "considerDataFiles", module):
                 for included_datafile in _iterateIncludedDataFiles(plugin, value):
                     yield included_datafile
 
     @staticmethod
     def onDataFileTags(included_datafile):
-        for plugin in getActivePlugins():
-            plugin.onDataFileTags(included_datafile)
+        for plugin in getActivePluginsForHook("onDataFileTags"):
+            _callPluginHook(plugin, "onDataFileTags", included_datafile)
 
     @staticmethod
     def onDllTags(included_entry_point):
-        for plugin in getActivePlugins():
-            plugin.onDllTags(included_entry_point)
+        for plugin in getActivePluginsForHook("onDllTags"):
+            _callPluginHook(plugin, "onDllTags", included_entry_point)
 
     @classmethod
     def _createTriggerLoadedModule(cls, module, trigger_name, code, flags):
@@ -953,21 +1162,34 @@ through implicit import by '%s' plugin encountered."""
                 _untangleLoadDescription(_getMainModulePreloadCodes())
             )
 
-        for plugin in getActivePlugins():
-            plugin.onModuleDiscovered(module)
+        for plugin in getActivePluginsForHook(
+            "onModuleDiscovered",
+            "createPreModuleLoadCode",
+            "createPostModuleLoadCode",
+            "createFakeModuleDependency",
+        ):
+            _callPluginHook(plugin, "onModuleDiscovered", module)
 
             pre_module_load_descriptions.extend(
                 _untangleLoadDescription(
-                    description=plugin.createPreModuleLoadCode(module)
+                    description=_callPluginHook(
+                        plugin, "createPreModuleLoadCode", module
+                    )
                 )
             )
             post_module_load_descriptions.extend(
                 _untangleLoadDescription(
-                    description=plugin.createPostModuleLoadCode(module)
+                    description=_callPluginHook(
+                        plugin, "createPostModuleLoadCode", module
+                    )
                 )
             )
             fake_module_descriptions.extend(
-                _untangleFakeDesc(description=plugin.createFakeModuleDependency(module))
+                _untangleFakeDesc(
+                    description=_callPluginHook(
+                        plugin, "createFakeModuleDependency", module
+                    )
+                )
             )
 
         def combineLoadCodes(module_load_descriptions):
@@ -1064,9 +1286,11 @@ through implicit import by '%s' plugin encountered."""
 
         contributing_plugins = OrderedSet()
 
-        for plugin in getActivePlugins():
+        for plugin in getActivePluginsForHook("onModuleSourceCode"):
             with withPluginModuleNameProblemReporting(plugin, module_name):
-                new_source_code = plugin.onModuleSourceCode(
+                new_source_code = _callPluginHook(
+                    plugin,
+                    "onModuleSourceCode",
                     module_name=module_name,
                     source_filename=source_filename,
                     source_code=source_code,
@@ -1084,8 +1308,10 @@ through implicit import by '%s' plugin encountered."""
         assert type(module_name) is ModuleName
         assert bytecode.__class__.__name__ == "code"
 
-        for plugin in getActivePlugins():
-            bytecode = plugin.onFrozenModuleBytecode(module_name, is_package, bytecode)
+        for plugin in getActivePluginsForHook("onFrozenModuleBytecode"):
+            bytecode = _callPluginHook(
+                plugin, "onFrozenModuleBytecode", module_name, is_package, bytecode
+            )
             assert bytecode.__class__.__name__ == "code"
 
         return bytecode
@@ -1095,8 +1321,10 @@ through implicit import by '%s' plugin encountered."""
         result = None
         deciding_plugins = []
 
-        for plugin in getActivePlugins():
-            must_recurse = plugin.onModuleEncounter(
+        for plugin in getActivePluginsForHook("onModuleEncounter"):
+            must_recurse = _callPluginHook(
+                plugin,
+                "onModuleEncounter",
                 using_module_name=using_module_name,
                 module_name=module_name,
                 module_filename=module_filename,
@@ -1136,6 +1364,10 @@ through implicit import by '%s' plugin encountered."""
         if module_name.getTopLevelPackageName() == "":
             return
 
+        # Without plugins looking, parent packages need not be located either.
+        if not getActivePluginsForHook("onModuleUsageLookAhead"):
+            return
+
         if module_name in cls.module_usage_looked_ahead_cache:
             return
 
@@ -1190,8 +1422,10 @@ through implicit import by '%s' plugin encountered."""
                 raise NuitkaSyntaxError(e)
 
         try:
-            for plugin in getActivePlugins():
-                plugin.onModuleUsageLookAhead(
+            for plugin in getActivePluginsForHook("onModuleUsageLookAhead"):
+                _callPluginHook(
+                    plugin,
+                    "onModuleUsageLookAhead",
                     module_name=module_name,
                     module_filename=module_filename,
                     module_kind=module_kind,
@@ -1204,8 +1438,10 @@ through implicit import by '%s' plugin encountered."""
     def onModuleRecursion(
         module_name, module_filename, module_kind, using_module_name, source_ref, reason
     ):
-        for plugin in getActivePlugins():
-            plugin.onModuleRecursion(
+        for plugin in getActivePluginsForHook("onModuleRecursion"):
+            _callPluginHook(
+                plugin,
+                "onModuleRecursion",
                 module_name=module_name,
                 module_filename=module_filename,
                 module_kind=module_kind,
@@ -1218,9 +1454,9 @@ through implicit import by '%s' plugin encountered."""
     def onCompilationStartChecks():
         """The compilation is setup, locating modules if expected to work."""
 
-        for plugin in getActivePlugins():
+        for plugin in getActivePluginsForHook("onCompilationStartChecks"):
             with withPluginProblemReporting(plugin, "plugin startup checks", ()):
-                plugin.onCompilationStartChecks()
+                _callPluginHook(plugin, "onCompilationStartChecks")
 
     @staticmethod
     def onModuleInitialSet():
@@ -1228,8 +1464,8 @@ through implicit import by '%s' plugin encountered."""
 
         from nuitka.ModuleRegistry import addRootModule
 
-        for plugin in getActivePlugins():
-            for module in plugin.onModuleInitialSet():
+        for plugin in getActivePluginsForHook("onModuleInitialSet"):
+            for module in _callPluginHook(plugin, "onModuleInitialSet"):
                 addRootModule(module)
 
     @staticmethod
@@ -1240,8 +1476,8 @@ through implicit import by '%s' plugin encountered."""
         # Make sure it's immutable.
         module_set = tuple(getDoneModules())
 
-        for plugin in getActivePlugins():
-            plugin.onModuleCompleteSet(module_set)
+        for plugin in getActivePluginsForHook("onModuleCompleteSet"):
+            _callPluginHook(plugin, "onModuleCompleteSet", module_set)
 
     @staticmethod
     def suppressUnknownImportWarning(importing, source_ref, module_name):
@@ -1258,8 +1494,14 @@ through implicit import by '%s' plugin encountered."""
         """
         source_ref = importing.getSourceReference()
 
-        for plugin in getActivePlugins():
-            if plugin.suppressUnknownImportWarning(importing, module_name, source_ref):
+        for plugin in getActivePluginsForHook("suppressUnknownImportWarning"):
+            if _callPluginHook(
+                plugin,
+                "suppressUnknownImportWarning",
+                importing,
+                module_name,
+                source_ref,
+            ):
                 return True
 
         return False
@@ -1274,8 +1516,8 @@ through implicit import by '%s' plugin encountered."""
         Returns:
             "compiled" (default) or "bytecode".
         """
-        for plugin in getActivePlugins():
-            value = plugin.decideCompilation(module_name)
+        for plugin in getActivePluginsForHook("decideCompilation"):
+            value = _callPluginHook(plugin, "decideCompilation", module_name)
 
             if value is not None:
                 assert value in ("compiled", "bytecode")
@@ -1293,8 +1535,10 @@ through implicit import by '%s' plugin encountered."""
         """
         result = None
 
-        for plugin in getActivePlugins():
-            plugin_result = plugin.decideRecompileExtensionModules(module_name)
+        for plugin in getActivePluginsForHook("decideRecompileExtensionModules"):
+            plugin_result = _callPluginHook(
+                plugin, "decideRecompileExtensionModules", module_name
+            )
             if plugin_result is not None:
                 value, plugin_reason = plugin_result
 
@@ -1345,8 +1589,8 @@ may work too."""
         if cls.preprocessor_symbols is None:
             cls.preprocessor_symbols = OrderedDict()
 
-            for plugin in getActivePlugins():
-                value = plugin.getPreprocessorSymbols()
+            for plugin in getActivePluginsForHook("getPreprocessorSymbols"):
+                value = _callPluginHook(plugin, "getPreprocessorSymbols")
 
                 if value is not None:
                     assert type(value) is dict, value
@@ -1377,8 +1621,8 @@ may work too."""
         if cls.build_definitions is None:
             cls.build_definitions = OrderedDict()
 
-            for plugin in getActivePlugins():
-                value = plugin.getBuildDefinitions()
+            for plugin in getActivePluginsForHook("getBuildDefinitions"):
+                value = _callPluginHook(plugin, "getBuildDefinitions")
 
                 if value is not None:
                     assert type(value) is dict, value
@@ -1407,8 +1651,8 @@ may work too."""
         if cls.extra_include_directories is None:
             cls.extra_include_directories = OrderedSet()
 
-            for plugin in getActivePlugins():
-                value = plugin.getExtraIncludeDirectories()
+            for plugin in getActivePluginsForHook("getExtraIncludeDirectories"):
+                value = _callPluginHook(plugin, "getExtraIncludeDirectories")
 
                 if value:
                     cls.extra_include_directories.update(value)
@@ -1419,8 +1663,8 @@ may work too."""
     def _getExtraCodeFiles(for_onefile):
         result = OrderedDict()
 
-        for plugin in getActivePlugins():
-            value = plugin.getExtraCodeFiles()
+        for plugin in getActivePluginsForHook("getExtraCodeFiles"):
+            value = _callPluginHook(plugin, "getExtraCodeFiles")
 
             if value is not None:
                 assert type(value) is dict
@@ -1472,8 +1716,8 @@ may work too."""
         if cls.extra_link_libraries is None:
             cls.extra_link_libraries = OrderedSet()
 
-            for plugin in getActivePlugins():
-                value = plugin.getExtraLinkLibraries()
+            for plugin in getActivePluginsForHook("getExtraLinkLibraries"):
+                value = _callPluginHook(plugin, "getExtraLinkLibraries")
 
                 if value is not None:
                     if isinstance(value, basestring):
@@ -1491,8 +1735,8 @@ may work too."""
         if cls.extra_link_directories is None:
             cls.extra_link_directories = OrderedSet()
 
-            for plugin in getActivePlugins():
-                value = plugin.getExtraLinkDirectories()
+            for plugin in getActivePluginsForHook("getExtraLinkDirectories"):
+                value = _callPluginHook(plugin, "getExtraLinkDirectories")
 
                 if value is not None:
                     if isinstance(value, basestring):
@@ -1505,13 +1749,13 @@ may work too."""
 
     @classmethod
     def onDataComposerRun(cls):
-        for plugin in getActivePlugins():
-            plugin.onDataComposerRun()
+        for plugin in getActivePluginsForHook("onDataComposerRun"):
+            _callPluginHook(plugin, "onDataComposerRun")
 
     @classmethod
     def onDataComposerResult(cls, blob_filename):
-        for plugin in getActivePlugins():
-            plugin.onDataComposerResult(blob_filename)
+        for plugin in getActivePluginsForHook("onDataComposerResult"):
+            _callPluginHook(plugin, "onDataComposerResult", blob_filename)
 
     @classmethod
     def deriveModuleConstantsBlobName(cls, data_filename):
@@ -1525,8 +1769,8 @@ may work too."""
         if str is not bytes:
             name = name.encode("utf8")
 
-        for plugin in getActivePlugins():
-            r = plugin.encodeDataComposerName(name)
+        for plugin in getActivePluginsForHook("encodeDataComposerName"):
+            r = _callPluginHook(plugin, "encodeDataComposerName", name)
 
             if r is not None:
                 name = r
@@ -1540,10 +1784,12 @@ may work too."""
 
         function_qualname = provider.getChildQualname(function_name)
 
-        for plugin in getActivePlugins():
+        for plugin in getActivePluginsForHook("onFunctionBodyParsing"):
             # TODO: Could record what functions got modified by what plugin
             # and in what way checking the return value
-            plugin.onFunctionBodyParsing(
+            _callPluginHook(
+                plugin,
+                "onFunctionBodyParsing",
                 module_name=module_name,
                 function_qualname=function_qualname,
                 function_name=function_name,
@@ -1554,10 +1800,12 @@ may work too."""
     def onClassBodyParsing(cls, provider, class_name, node):
         module_name = provider.getParentModule().getFullName()
 
-        for plugin in getActivePlugins():
+        for plugin in getActivePluginsForHook("onClassBodyParsing"):
             # TODO: Could record what classes got modified by what plugin
             # and in what way checking the return value
-            plugin.onClassBodyParsing(
+            _callPluginHook(
+                plugin,
+                "onClassBodyParsing",
                 module_name=module_name,
                 class_name=class_name,
                 node=node,
@@ -1573,15 +1821,15 @@ may work too."""
 
     @classmethod
     def getExtraConstantDefaultPopulation(cls):
-        for plugin in getActivePlugins():
-            for value in plugin.getExtraConstantDefaultPopulation():
+        for plugin in getActivePluginsForHook("getExtraConstantDefaultPopulation"):
+            for value in _callPluginHook(plugin, "getExtraConstantDefaultPopulation"):
                 yield value
 
     @classmethod
     def _decideWithoutDisagreement(
         cls,
         method_name,
-        call_per_plugin,
+        module_name,
         legal_values,
         abstain_values,
         get_default_value,
@@ -1589,8 +1837,8 @@ may work too."""
         result = abstain_values[0]
         plugin_name = None
 
-        for plugin in getActivePlugins():
-            value = call_per_plugin(plugin)
+        for plugin in getActivePluginsForHook(method_name):
+            value = _callPluginHook(plugin, method_name, module_name)
 
             if value not in legal_values:
                 plugin.sysexit(
@@ -1625,7 +1873,7 @@ may work too."""
 
         if module_name not in cls.decide_annotations_cache:
             cls.decide_annotations_cache[module_name] = cls._decideWithoutDisagreement(
-                call_per_plugin=lambda plugin: plugin.decideAnnotations(module_name),
+                module_name=module_name,
                 legal_values=(None, True, False),
                 abstain_values=(None,),
                 method_name="decideAnnotations",
@@ -1640,7 +1888,7 @@ may work too."""
     def decideDocStrings(cls, module_name):
         if module_name not in cls.decide_doc_strings_cache:
             cls.decide_doc_strings_cache[module_name] = cls._decideWithoutDisagreement(
-                call_per_plugin=lambda plugin: plugin.decideDocStrings(module_name),
+                module_name=module_name,
                 legal_values=(None, True, False),
                 abstain_values=(None,),
                 method_name="decideDocStrings",
@@ -1655,7 +1903,7 @@ may work too."""
     def decideAssertions(cls, module_name):
         if module_name not in cls.decide_assertions_cache:
             cls.decide_assertions_cache[module_name] = cls._decideWithoutDisagreement(
-                call_per_plugin=lambda plugin: plugin.decideAssertions(module_name),
+                module_name=module_name,
                 legal_values=(None, True, False),
                 abstain_values=(None,),
                 method_name="decideAssertions",
@@ -1671,8 +1919,10 @@ may work too."""
 
         assert module_name is not None
 
-        for plugin in getActivePlugins():
-            value = plugin.decideAllowOutsideDependencies(module_name)
+        for plugin in getActivePluginsForHook("decideAllowOutsideDependencies"):
+            value = _callPluginHook(
+                plugin, "decideAllowOutsideDependencies", module_name
+            )
 
             if value is True:
                 if result is False:
@@ -1713,9 +1963,12 @@ may work too."""
         result = None
         plugin_name = None
 
-        for plugin in getActivePlugins():
-            value = plugin.isAcceptableMissingDLL(
-                package_name=package_name, dll_basename=dll_basename
+        for plugin in getActivePluginsForHook("isAcceptableMissingDLL"):
+            value = _callPluginHook(
+                plugin,
+                "isAcceptableMissingDLL",
+                package_name=package_name,
+                dll_basename=dll_basename,
             )
 
             if value is True:
@@ -67,6 +67,44 @@ def getEmbeddedDataFilenames(compilation_report):
     return result
 
 
+def extractPythonPgoDecisions(compilation_report):
+    """Python PGO decisions, keyed by module and name.
+
+    Returns a tuple of dictionaries, with the report attributes as values, for
+    types the observed ones are given with their counts as "observed".
+    """
+    function_decisions = OrderedDict()
+    branch_decisions = OrderedDict()
+    type_decisions = OrderedDict()
+
+    pgo_node = compilation_report.find("python_pgo")
+
+    if pgo_node is not None:
+        for function_node in pgo_node.findall("function"):
+            entry = OrderedDict(function_node.attrib)
+            entry["calls"] = int(entry["calls"])
+
+            function_decisions[entry.pop("module"), entry.pop("name")] = entry
+
+        for branch_node in pgo_node.findall("branch"):
+            entry = OrderedDict(branch_node.attrib)
+            entry["taken"] = int(entry["taken"])
+            entry["not_taken"] = int(entry["not_taken"])
+
+            branch_decisions[entry.pop("module"), entry.pop("name")] = entry
+
+        for type_node in pgo_node.findall("type"):
+            entry = OrderedDict(type_node.attrib)
+            entry["observed"] = OrderedDict(
+                (observed_node.attrib["type"], int(observed_node.attrib["count"]))
+                for observed_node in type_node.findall("observed")
+            )
+
+            type_decisions[entry.pop("module"), entry.pop("name")] = entry
+
+    return function_decisions, branch_decisions, type_decisions
+
+
 #     Part of "Nuitka", an optimizing Python compiler that is compatible and
 #     integrates with CPython, but also works on its own.
 #
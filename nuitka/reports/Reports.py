@@ -31,6 +31,7 @@ from nuitka.ModuleRegistry import (
     getModuleInclusionInfoByName,
     getModuleInfluences,
     getModuleOptimizationTimingInfos,
+    getOptimizationPassInfos,
 )
 from nuitka.options.Options import (
     getCompilationMode,
@@ -47,7 +48,12 @@ from nuitka.OutputDirectories import (
     getSourceDirectoryPath,
     hasMainModule,
 )
-from nuitka.plugins.Plugins import getActivePlugins
+from nuitka.pgo.PGO import (
+    getBranchPGODecisions,
+    getFunctionPGODecisions,
+    getTypePGODecisions,
+)
+from nuitka.plugins.Plugins import getActivePlugins, getPluginHookTimingInfos
 from nuitka.PythonFlavors import getPythonFlavorName
 from nuitka.PythonVersions import (
     getLaunchingSystemPrefixPath,
@@ -229,6 +235,10 @@ def _getReportInputData(aborted):
 
     memory_infos = getMemoryInfos()
 
+    optimization_pass_infos = getOptimizationPassInfos()
+
+    plugin_hook_timing_infos = getPluginHookTimingInfos()
+
     python_exe = sys.executable
 
     python_flavor = getPythonFlavorName()
@@ -296,6 +306,10 @@ def _getReportInputData(aborted):
 
     compilation_mode = getCompilationMode()
 
+    pgo_function_decisions = getFunctionPGODecisions()
+    pgo_branch_decisions = getBranchPGODecisions()
+    pgo_type_decisions = getTypePGODecisions()
+
     return dict(
         (var_name, var_value)
         for var_name, var_value in locals().items()
@@ -306,6 +320,63 @@ def _getReportInputData(aborted):
 _report_prefixes = None
 
 
+def _getPgoHintName(hint):
+    if hint is None:
+        return "none"
+    else:
+        return "likely" if hint else "unlikely"
+
+
+def _addPythonPgoDecisionsToReport(
+    root, function_decisions, branch_decisions, type_decisions
+):
+    pgo_xml_node = appendTreeElement(root, "python_pgo")
+
+    for (module_name, function_name), (count, hotness) in sorted(
+        function_decisions.items()
+    ):
+        appendTreeElement(
+            pgo_xml_node,
+            "function",
+            module=module_name,
+            name=function_name,
+            calls=str(count),
+            hotness=hotness or "none",
+        )
+
+    for (module_name, branch_name), (taken, not_taken, hint) in sorted(
+        branch_decisions.items()
+    ):
+        appendTreeElement(
+            pgo_xml_node,
+            "branch",
+            module=module_name,
+            name=branch_name,
+            taken=str(taken),
+            not_taken=str(not_taken),
+            hint=_getPgoHintName(hint),
+        )
+
+    for (module_name, site_name), (observed_types, type_name) in sorted(
+        type_decisions.items()
+    ):
+        type_xml_node = appendTreeElement(
+            pgo_xml_node,
+            "type",
+            module=module_name,
+            name=site_name,
+            specialized=type_name or "none",
+        )
+
+        for observed_type_name, count in observed_types:
+            appendTreeElement(
+                type_xml_node,
+                "observed",
+                type=observed_type_name,
+                count=str(count),
+            )
+
+
 def _getReportPathPrefixes():
     # Using global here, as this is really a singleton, in the form of a module,
     # pylint: disable=global-statement
@@ -430,6 +501,26 @@ def _addModulesToReport(root, report_input_data, diffable):
             if timing_info.micro_passes:
                 timing_xml_node.attrib["micro_passes"] = str(timing_info.micro_passes)
 
+            if timing_info.function_computations:
+                timing_xml_node.attrib["function_computations"] = str(
+                    sum(timing_info.function_computations.values())
+                )
+
+                # Only the functions not computed in every micro pass are
+                # listed, others are implied.
+                for function_name, computations in sorted(
+                    timing_info.function_computations.items()
+                ):
+                    if computations == timing_info.micro_passes:
+                        continue
+
+                    appendTreeElement(
+                        timing_xml_node,
+                        "function-computations",
+                        name=function_name,
+                        count=str(computations),
+                    )
+
             if timing_info.merge_counts:
                 merged_total = 0
 
@@ -562,6 +653,39 @@ def _addMemoryInfosToReport(performance_xml_node, memory_infos, diffable):
         )
 
 
+def _addOptimizationPassInfosToReport(performance_xml_node, optimization_pass_infos):
+    for optimization_pass_info in optimization_pass_infos:
+        optimization_pass_xml_node = appendTreeElement(
+            performance_xml_node,
+            "optimization-pass",
+        )
+
+        # Going via attrib, because pass is a keyword in Python.
+        optimization_pass_xml_node.attrib["pass"] = str(
+            optimization_pass_info.pass_number
+        )
+        optimization_pass_xml_node.attrib["optimized"] = str(
+            optimization_pass_info.optimized_count
+        )
+        optimization_pass_xml_node.attrib["skipped"] = str(
+            optimization_pass_info.skipped_count
+        )
+
+
+def _addPluginHookTimingInfosToReport(
+    performance_xml_node, plugin_hook_timing_infos, diffable
+):
+    for plugin_hook_timing_info in plugin_hook_timing_infos:
+        appendTreeElement(
+            performance_xml_node,
+            "plugin-hook-time",
+            plugin=plugin_hook_timing_info.plugin_name,
+            hook=plugin_hook_timing_info.hook_name,
+            calls=str(plugin_hook_timing_info.call_count),
+            time="volatile" if diffable else "%.2f" % plugin_hook_timing_info.time_used,
+        )
+
+
 def _addUserDataToReport(root, user_data):
     if user_data:
         user_data_xml_node = appendTreeElement(
@@ -688,7 +812,11 @@ def writeCompilationReport(report_filename, report_input_data, diffable):
         root=root, report_input_data=report_input_data, diffable=diffable
     )
 
-    if report_input_data["memory_infos"]:
+    if (
+        report_input_data["memory_infos"]
+        or report_input_data["optimization_pass_infos"]
+        or report_input_data["plugin_hook_timing_infos"]
+    ):
         performance_xml_node = appendTreeElement(
             root,
             "performance",
@@ -700,6 +828,17 @@ def writeCompilationReport(report_filename, report_input_data, diffable):
             diffable=diffable,
         )
 
+        _addOptimizationPassInfosToReport(
+            performance_xml_node=performance_xml_node,
+            optimization_pass_infos=report_input_data["optimization_pass_infos"],
+        )
+
+        _addPluginHookTimingInfosToReport(
+            performance_xml_node=performance_xml_node,
+            plugin_hook_timing_infos=report_input_data["plugin_hook_timing_infos"],
+            diffable=diffable,
+        )
+
     for included_datafile in getIncludedDataFiles():
         if included_datafile.kind == "data_file":
             appendTreeElement(
@@ -844,6 +983,18 @@ def writeCompilationReport(report_filename, report_input_data, diffable):
             unpack_dir=getOnefileTempDirSpec(),
         )
 
+    if (
+        report_input_data["pgo_function_decisions"]
+        or report_input_data["pgo_branch_decisions"]
+        or report_input_data["pgo_type_decisions"]
+    ):
+        _addPythonPgoDecisionsToReport(
+            root=root,
+            function_decisions=report_input_data["pgo_function_decisions"],
+            branch_decisions=report_input_data["pgo_branch_decisions"],
+            type_decisions=report_input_data["pgo_type_decisions"],
+        )
+
     distributions_xml_node = appendTreeElement(
         root,
         "distributions",
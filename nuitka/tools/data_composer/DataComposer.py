@@ -6,8 +6,10 @@
 import binascii
 import os
 import re
+import shutil
 import struct
 import sys
+from contextlib import contextmanager
 from math import copysign, isinf, isnan
 
 from nuitka.__past__ import BytesIO, long, to_byte, unicode, xrange
@@ -25,8 +27,16 @@ from nuitka.Serialization import (
     ConstantStreamReader,
 )
 from nuitka.Tracing import data_composer_logger
-from nuitka.utils.FileOperations import getFileSize, listDir, syncFileOutput
+from nuitka.utils.FileOperations import (
+    getFileSize,
+    listDir,
+    makePath,
+    replaceFileAtomic,
+    syncFileOutput,
+)
+from nuitka.utils.Hashing import Hash
 from nuitka.utils.Json import writeJsonToFilename
+from nuitka.Version import version_string
 
 _max_uint64_t_value = 2**64 - 1
 _max_uint31_t_value = 2**31 - 1
@@ -437,6 +447,9 @@ def _writeConstantStream(constants_reader):
     global _last_written
     _last_written = None
 
+    # End offsets of the top level values in the part, after the count.
+    value_ends = []
+
     count = 0
     while 1:
         try:
@@ -446,6 +459,7 @@ def _writeConstantStream(constants_reader):
 
         old_size = result.tell()
         _writeConstantValue(result, constant_value)
+        value_ends.append(result.tell() + 2)
 
         if not data_composer_logger.is_quiet:
             new_size = result.tell()
@@ -465,48 +479,379 @@ def _writeConstantStream(constants_reader):
     # TODO: Debug mode only?
     result.write(b".")
 
-    return count, struct.pack("H", count) + result.getvalue()
+    return struct.pack("H", count) + result.getvalue(), value_ends
 
 
-crc32 = 0
+def _getConstantsBlobNameHash(name):
+    """FNV-1a hash of a blob name, must match "hashConstantsBlobName" in C."""
 
+    result = 2166136261
 
-def _writeConstantsBlob(output_filename, desc):
-    global crc32  # singleton, pylint: disable=global-statement
+    for value in bytearray(name):
+        result ^= value
+        result = (result * 16777619) & 0xFFFFFFFF
+
+    return result
 
-    with open(output_filename, "w+b") as output:
-        output.write(b"\0" * 8)
 
-        def write(data):
-            global crc32  # singleton, pylint: disable=global-statement
+def _makeConstantsBlobDirectory(desc):
+    """Make the directory of the sections of the constants blob.
+
+    It is sorted by name hash for lookup by bisection at run time. Each section
+    has its own CRC32, so only the used sections need to be verified. Offsets
+    are relative to the end of the directory and point to the section name, the
+    data follows it.
+    """
+
+    directory = []
+    offset = 0
+
+    for name, part_size, part_crc32, _part in desc:
+        directory.append(
+            (
+                _getConstantsBlobNameHash(name),
+                offset,
+                part_size,
+                part_crc32,
+            )
+        )
 
-            output.write(data)
-            crc32 = binascii.crc32(data, crc32)
+        offset += len(name) + 1 + part_size
 
-        for name, part in desc:
-            write(name + b"\0")
-            write(struct.pack("I", len(part)))
-            write(part)
+    directory.sort()
+
+    return struct.pack("I", len(directory)) + b"".join(
+        struct.pack("IIII", *directory_entry) for directory_entry in directory
+    )
+
+
+def _writeConstantsBlobPart(output, part):
+    # Cached parts are copied from their cache file, so they need not all be
+    # held in memory.
+    if type(part) is bytes:
+        output.write(part)
+    else:
+        cache_filename, offset = part
+
+        with open(cache_filename, "rb") as part_file:
+            part_file.seek(offset)
+            shutil.copyfileobj(part_file, output)
+
+
+def _writeConstantsBlob(output_filename, desc):
+    with open(output_filename, "wb") as output:
+        output.write(_makeConstantsBlobDirectory(desc))
 
-        data_size = output.tell() - 8
+        header_size = output.tell()
 
-        if str is bytes:
-            # Python2 is doing signed CRC32, but we want unsigned.
-            crc32 %= 1 << 32
+        for name, _part_size, _part_crc32, part in desc:
+            output.write(name + b"\0")
 
-        output.seek(0)
-        output.write(struct.pack("II", crc32, data_size))
+            _writeConstantsBlobPart(output=output, part=part)
 
-        assert output.tell() == 8
+        data_size = output.tell() - header_size
 
         data_composer_logger.info(
             "Total constants blob size without header %d." % data_size
         )
-        data_composer_logger.info("Total constants blob CRC32 is %d." % crc32)
+        data_composer_logger.info(
+            "Total constants blob sections in directory %d." % len(desc)
+        )
 
         syncFileOutput(output)
 
 
+def _getDataComposerCacheKeyBase():
+    # Changes of the encoding, during development these need not come with a
+    # version change, must make a difference.
+    hash_value = Hash()
+    hash_value.updateFromValues(version_string, sys.version)
+    hash_value.updateFromFile(__file__.replace(".pyc", ".py"))
+    hash_value.updateFromFile(
+        sys.modules["nuitka.Serialization"].__file__.replace(".pyc", ".py")
+    )
+
+    return hash_value.asHexDigest()
+
+
+def _getCacheFilename(cache_dir, cache_key_base, fullpath):
+    hash_value = Hash()
+    hash_value.updateFromValues(cache_key_base)
+    hash_value.updateFromFile(fullpath)
+
+    return os.path.join(cache_dir, hash_value.asHexDigest() + ".bin")
+
+
+def _encodeConstFile(fullpath):
+    data_composer_logger.info(
+        "Working on constant file '%s'." % os.path.basename(fullpath)
+    )
+
+    try:
+        with open(fullpath, "rb") as const_file:
+            constants_reader = ConstantStreamReader(const_file)
+            return _writeConstantStream(constants_reader)
+    except Exception:
+        data_composer_logger.warning("Problem with constant file '%s'." % fullpath)
+        raise
+
+
+@contextmanager
+def _withEncodingPool(job_limit):
+    """Pool of forked workers, terminated when done, even if not exhausted.
+
+    Python2 pools are no context managers, therefore this is not using theirs.
+    """
+    import multiprocessing
+
+    if python_version < 0x300:
+        pool = multiprocessing.Pool(job_limit)
+    else:
+        pool = multiprocessing.get_context("fork").Pool(job_limit)
+
+    try:
+        yield pool
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _encodeConstFilesUncached(fullpaths, job_limit):
+    job_limit = min(job_limit, len(fullpaths))
+
+    # The workers are forked, spawning them would not find Nuitka, and the
+    # verbose output would be interleaved.
+    if job_limit <= 1 or not hasattr(os, "fork") or not data_composer_logger.is_quiet:
+        for fullpath in fullpaths:
+            yield _encodeConstFile(fullpath)
+
+        return
+
+    with _withEncodingPool(job_limit) as pool:
+        # Results are produced in file order, which keeps the blob the same as
+        # with a serial run.
+        for result in pool.imap(_encodeConstFile, fullpaths, chunksize=4):
+            yield result
+
+
+class EncodedConstants(object):
+    """Encoded constants of a ".const" file, held in memory or in the cache.
+
+    Cache files start with the number of values and their end offsets, which
+    are needed to find the top level values for sharing, the part follows.
+    """
+
+    __slots__ = ("value_ends", "part", "cache_location")
+
+    def __init__(self, value_ends, part, cache_location):
+        self.value_ends = value_ends
+        self.part = part
+        self.cache_location = cache_location
+
+    def getCount(self):
+        return len(self.value_ends)
+
+    def getPart(self):
+        if self.part is not None:
+            return self.part
+
+        cache_filename, offset = self.cache_location
+
+        with open(cache_filename, "rb") as cache_file:
+            cache_file.seek(offset)
+            return cache_file.read()
+
+    def getStoredPart(self):
+        """The part as stored in the blob, cached ones are copied from file."""
+        if self.part is not None:
+            return self.part
+        else:
+            return self.cache_location
+
+    def iterValues(self, part):
+        start = 2
+
+        for end in self.value_ends:
+            yield part[start:end]
+            start = end
+
+    @classmethod
+    def fromCacheFile(cls, cache_filename):
+        with open(cache_filename, "rb") as cache_file:
+            (value_count,) = struct.unpack("I", cache_file.read(4))
+            value_ends = struct.unpack(
+                "%dI" % value_count, cache_file.read(4 * value_count)
+            )
+
+        return cls(
+            value_ends=value_ends,
+            part=None,
+            cache_location=(cache_filename, 4 + 4 * value_count),
+        )
+
+    def writeCacheFile(self, cache_filename):
+        # Other compilations might use the cache at the same time.
+        cache_filename_tmp = "%s.tmp%d" % (cache_filename, os.getpid())
+
+        with open(cache_filename_tmp, "wb") as cache_file:
+            cache_file.write(struct.pack("I", len(self.value_ends)))
+            cache_file.write(
+                struct.pack("%dI" % len(self.value_ends), *self.value_ends)
+            )
+            cache_file.write(self.part)
+
+        replaceFileAtomic(cache_filename_tmp, cache_filename)
+
+
+def _encodeConstFiles(const_files, cache_dir, job_limit):
+    """Encode the constants of ".const" files, from cache where possible.
+
+    Returns:
+        list of EncodedConstants in the order of the files.
+    """
+
+    results = {}
+    cache_filenames = {}
+
+    if cache_dir:
+        makePath(cache_dir)
+        cache_key_base = _getDataComposerCacheKeyBase()
+
+        for fullpath, _filename in const_files:
+            cache_filename = _getCacheFilename(cache_dir, cache_key_base, fullpath)
+
+            if os.path.exists(cache_filename):
+                results[fullpath] = EncodedConstants.fromCacheFile(cache_filename)
+            else:
+                cache_filenames[fullpath] = cache_filename
+
+    missing = [
+        fullpath for fullpath, _filename in const_files if fullpath not in results
+    ]
+
+    data_composer_logger.info(
+        "Encoding %d constant files, %d taken from cache."
+        % (len(missing), len(results))
+    )
+
+    for fullpath, (part, value_ends) in zip(
+        missing, _encodeConstFilesUncached(missing, job_limit)
+    ):
+        encoded_constants = EncodedConstants(
+            value_ends=value_ends, part=part, cache_location=None
+        )
+
+        if cache_dir:
+            encoded_constants.writeCacheFile(cache_filenames[fullpath])
+
+        results[fullpath] = encoded_constants
+
+    return [results[fullpath] for fullpath, _filename in const_files]
+
+
+# Top level constants, that occur in multiple sections, and are at least this
+# large encoded, are stored only once, in a shared section, and referenced from
+# the sections.
+_min_shared_constant_size = 32
+
+# Types of constants that can be shared. Not the "p" back reference to the
+# previous value, which depends on its context, and not types that are not
+# shared at run time already, e.g. "B" for bytearray values, which are mutable.
+_shareable_type_chars = b"TLDPSuvacb"
+
+# Sections that do not take part, ".bytecode" is loaded before Python is
+# initialized.
+_unshared_section_names = (".bytecode", ".files")
+
+# The count of a section is stored as a 16 bit value.
+_max_shared_constants = 2**16 - 1
+
+
+def _isShareableConstant(value):
+    return (
+        len(value) >= _min_shared_constant_size
+        and value[:1] in _shareable_type_chars
+    )
+
+
+def _findSharedConstants(sections):
+    """Find large top level constants used by multiple sections.
+
+    Returns:
+        dict of encoded constant to its index in the shared section
+    """
+
+    # Values are the first section to use a constant, and if it was used by
+    # more than one.
+    occurrences = OrderedDict()
+
+    for name, encoded_constants in sections:
+        if name in _unshared_section_names:
+            continue
+
+        for value in encoded_constants.iterValues(encoded_constants.getPart()):
+            if not _isShareableConstant(value):
+                continue
+
+            first_name = occurrences.get(value)
+
+            if first_name is None:
+                occurrences[value] = name
+            elif first_name is not True and first_name != name:
+                occurrences[value] = True
+
+    shared_constants = [
+        value for value, first_name in occurrences.items() if first_name is True
+    ]
+
+    return dict(
+        (value, index)
+        for index, value in enumerate(shared_constants[:_max_shared_constants])
+    )
+
+
+def _makeSharedPart(shared_constants):
+    values = sorted(shared_constants, key=shared_constants.__getitem__)
+
+    return struct.pack("H", len(values)) + b"".join(values) + b"."
+
+
+def _makeStoredPart(name, encoded_constants, shared_constants):
+    """Get the part to store for a section, referencing shared constants.
+
+    Returns:
+        tuple of size, CRC32 and either bytes or cache file location.
+    """
+
+    part = encoded_constants.getPart()
+
+    if shared_constants and name not in _unshared_section_names:
+        values = []
+        has_shared = False
+
+        for value in encoded_constants.iterValues(part):
+            shared_index = shared_constants.get(value)
+
+            if shared_index is None:
+                values.append(value)
+            else:
+                values.append(b"R" + _encodeVariableLength(shared_index))
+                has_shared = True
+
+        if has_shared:
+            part = (
+                part[:2] + b"".join(values) + part[encoded_constants.value_ends[-1] :]
+            )
+
+            return len(part), binascii.crc32(part) & 0xFFFFFFFF, part
+
+    return (
+        len(part),
+        binascii.crc32(part) & 0xFFFFFFFF,
+        encoded_constants.getStoredPart(),
+    )
+
+
 def main():
     # many details, mostly needed for reporting: pylint: disable=too-many-locals
 
@@ -519,57 +864,95 @@ def main():
     build_dir = sys.argv[1]
     output_filename = sys.argv[2]
     stats_filename = sys.argv[3]
+    # Empty if caching is disabled.
+    cache_dir = sys.argv[4]
+    job_limit = int(sys.argv[5])
 
     # Scan file ".const" files from the build directory.
     const_files = scanConstFiles(build_dir)
 
-    total = 0
-
-    desc = []
+    sections = []
 
     names = set()
 
-    stats = OrderedDict()
+    for (_fullpath, filename), encoded_constants in zip(
+        const_files,
+        _encodeConstFiles(
+            const_files=const_files, cache_dir=cache_dir, job_limit=job_limit
+        ),
+    ):
+        name = deriveModuleConstantsBlobName(filename)
 
-    for fullpath, filename in const_files:
-        data_composer_logger.info("Working on constant file '%s'." % filename)
+        # Make sure that is not repeated.
+        assert name not in names, name
+        names.add(name)
 
-        try:
-            with open(fullpath, "rb") as const_file:
-                constants_reader = ConstantStreamReader(const_file)
-                count, part = _writeConstantStream(constants_reader)
-            total += count
+        sections.append((name, encoded_constants))
 
-            name = deriveModuleConstantsBlobName(filename)
+    shared_constants = _findSharedConstants(sections)
 
-            # Make sure that is not repeated.
-            assert name not in names, name
-            names.add(name)
+    total = 0
 
-            data_composer_logger.info(
-                "Storing %r chunk with %s values size %r." % (name, count, len(part))
-            )
+    desc = []
 
-            if str is not bytes:
-                encoded_name = name.encode("utf8")
-            else:
-                encoded_name = name
+    stats = OrderedDict()
 
-            desc.append((encoded_name, part))
-        except Exception:
-            data_composer_logger.warning("Problem with constant file '%s'." % filename)
-            raise
+    for (fullpath, filename), (name, encoded_constants) in zip(
+        const_files, sections
+    ):
+        count = encoded_constants.getCount()
+        total += count
+
+        part_size, part_crc32, part = _makeStoredPart(
+            name=name,
+            encoded_constants=encoded_constants,
+            shared_constants=shared_constants,
+        )
+
+        data_composer_logger.info(
+            "Storing %r chunk with %s values size %r." % (name, count, part_size)
+        )
+
+        if str is not bytes:
+            encoded_name = name.encode("utf8")
+        else:
+            encoded_name = name
+
+        desc.append((encoded_name, part_size, part_crc32, part))
 
         stats[filename] = {
             "input_size": getFileSize(fullpath),
             "blob_name": name,
-            "blob_size": len(part),
+            "blob_size": part_size,
         }
 
     stats["total"] = total
 
     data_composer_logger.info("Total amount of constants is %d." % total)
 
+    shared_size = 0
+
+    if shared_constants:
+        shared_part = _makeSharedPart(shared_constants)
+        shared_size = len(shared_part)
+
+        desc.append(
+            (
+                b".shared",
+                len(shared_part),
+                binascii.crc32(shared_part) & 0xFFFFFFFF,
+                shared_part,
+            )
+        )
+
+        data_composer_logger.info(
+            "Shared %d constants used by multiple sections, size %d."
+            % (len(shared_constants), shared_size)
+        )
+
+    stats["shared_count"] = len(shared_constants)
+    stats["shared_size"] = shared_size
+
     _writeConstantsBlob(output_filename=output_filename, desc=desc)
 
     writeJsonToFilename(stats_filename, contents=stats)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Benchmark the ELF dependency scan against 'ldd' on a set of binaries.
+
+Give it directories, e.g. a "site-packages" with the wheels of interest
+installed, and it compares time and results of both methods for all ELF
+files found in there.
+"""
+
+import os
+import sys
+
+from nuitka.freezer.DllDependenciesPosix import (
+    ElfDependencyScanUnsupported,
+    detectBinaryPathDLLsElf,
+    detectBinaryPathDLLsLdd,
+)
+from nuitka.options.CommandLineOptionsTools import makeOptionsParser
+from nuitka.Tracing import my_print, tools_logger
+from nuitka.utils.ElfFiles import getElfFileInfo
+from nuitka.utils.FileOperations import getFileList
+from nuitka.utils.Timing import TimerReport
+
+
+def _getElfFilenames(directories):
+    result = []
+
+    for directory in directories:
+        for filename in getFileList(directory):
+            if (
+                not os.path.islink(filename)
+                and (".so" in os.path.basename(filename))
+                and getElfFileInfo(filename) is not None
+            ):
+                result.append(filename)
+
+    return result
+
+
+def main():
+    parser = makeOptionsParser(usage=None, epilog=None)
+
+    parser.add_option(
+        "--show-differences",
+        action="store_true",
+        dest="show_differences",
+        default=False,
+        help="""Output the differing results of both methods.""",
+    )
+
+    options, positional_args = parser.parse_args()
+
+    if not positional_args:
+        sys.exit("No directories given.")
+
+    filenames = _getElfFilenames(positional_args)
+
+    my_print("Found %d ELF files." % len(filenames))
+
+    # Like for extension modules, their directory is searched too.
+    ldd_results = {}
+    with TimerReport(
+        message="Scanning with 'ldd' took %.2f seconds", logger=tools_logger
+    ):
+        for filename in filenames:
+            ldd_results[filename] = [
+                os.path.normpath(dll_filename)
+                for dll_filename in detectBinaryPathDLLsLdd(
+                    dll_filename=filename,
+                    ld_library_path=(os.path.dirname(filename),),
+                )
+            ]
+
+    elf_results = {}
+    with TimerReport(
+        message="Scanning with ELF reader took %.2f seconds", logger=tools_logger
+    ):
+        for filename in filenames:
+            try:
+                elf_results[filename] = detectBinaryPathDLLsElf(
+                    dll_filename=filename,
+                    ld_library_path=(os.path.dirname(filename),),
+                    use_cache=False,
+                    update_cache=False,
+                )
+            except ElfDependencyScanUnsupported:
+                elf_results[filename] = None
+
+    unsupported_count = 0
+    difference_count = 0
+
+    for filename in filenames:
+        if elf_results[filename] is None:
+            unsupported_count += 1
+        elif set(elf_results[filename]) != set(ldd_results[filename]):
+            difference_count += 1
+
+            if options.show_differences:
+                my_print("Difference for '%s':" % filename)
+                my_print(
+                    "   ldd only: %s"
+                    % sorted(set(ldd_results[filename]) - set(elf_results[filename]))
+                )
+                my_print(
+                    "   ELF only: %s"
+                    % sorted(set(elf_results[filename]) - set(ldd_results[filename]))
+                )
+
+    my_print(
+        "Differences %d, falling back to 'ldd' %d."
+        % (difference_count, unsupported_count)
+    )
+
+
+if __name__ == "__main__":
+    main()
+
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.gnu.org/licenses/agpl.txt
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
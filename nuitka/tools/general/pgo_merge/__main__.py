@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Main program for Nuitka PGO merge tool.
+
+Merges Python level PGO information of multiple PGO runs, e.g. of different
+workloads, into one file to be used with "--pgo-python-input".
+"""
+
+import os
+import sys
+
+from nuitka.options.CommandLineOptionsTools import makeOptionsParser
+from nuitka.pgo.PGO import mergePGOInputFiles
+from nuitka.Tracing import my_print
+
+
+def _parseWeightedInput(parser, value):
+    if "," not in value:
+        parser.print_help()
+
+        sys.exit(
+            "\nError, weighted input '%s' must be given as 'WEIGHT,PGO_FILENAME'."
+            % value
+        )
+
+    weight, filename = value.split(",", 1)
+
+    try:
+        weight = float(weight)
+    except ValueError:
+        parser.print_help()
+
+        sys.exit("\nError, weight of '%s' is not a number." % value)
+
+    if weight < 0:
+        parser.print_help()
+
+        sys.exit("\nError, weight of '%s' must not be negative." % value)
+
+    if not filename:
+        parser.print_help()
+
+        sys.exit("\nError, weighted input '%s' has no filename." % value)
+
+    return weight, filename
+
+
+def main():
+    parser = makeOptionsParser(
+        usage="%prog [options] --output=MERGED_FILENAME PGO_FILENAME...",
+        epilog=None,
+    )
+
+    parser.add_option(
+        "--output",
+        action="store",
+        dest="output_filename",
+        metavar="MERGED_FILENAME",
+        default=None,
+        help="""Filename to write the merged PGO information to. Mandatory.""",
+    )
+
+    parser.add_option(
+        "--weighted-input",
+        action="append",
+        dest="weighted_inputs",
+        metavar="WEIGHT,PGO_FILENAME",
+        default=[],
+        help="""\
+PGO information file with a weight to multiply its counts with, e.g. to
+make one workload count more than another. Can be given multiple times,
+files given as positional arguments have weight 1.""",
+    )
+
+    options, positional_args = parser.parse_args()
+
+    if options.output_filename is None:
+        sys.exit("Error, need to provide '--output' filename.")
+
+    weighted_input_filenames = [(1, filename) for filename in positional_args]
+    weighted_input_filenames += [
+        _parseWeightedInput(parser=parser, value=value)
+        for value in options.weighted_inputs
+    ]
+
+    if not weighted_input_filenames:
+        sys.exit("Error, no PGO information files given.")
+
+    for _weight, filename in weighted_input_filenames:
+        if not os.path.isfile(filename):
+            sys.exit("Error, file '%s' not found." % filename)
+
+    mergePGOInputFiles(
+        output_filename=options.output_filename,
+        weighted_input_filenames=weighted_input_filenames,
+    )
+
+    my_print(
+        "Merged %d PGO information files into '%s'."
+        % (len(weighted_input_filenames), options.output_filename)
+    )
+
+
+if __name__ == "__main__":
+    main()
+
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.gnu.org/licenses/agpl.txt
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
@@ -7,7 +7,10 @@ import os
 import shutil
 import struct
 import sys
+import tempfile
+import threading
 from contextlib import contextmanager
+from io import BytesIO
 
 from nuitka.__past__ import to_byte
 from nuitka.Progress import (
@@ -66,6 +69,73 @@ def getCompressorFunction(expect_compression, low_memory, job_limit):
         return b"X", useSameFile
 
 
+def _writeOnefilePayloadLink(output_file, filename_full, filename_encoding):
+    link_target = os.readlink(filename_full)
+
+    # Flag value 2 indicates a link, the target follows instead of contents.
+    file_header = to_byte(2)
+    link_target_encoded = (link_target + "\0").encode(filename_encoding)
+
+    output_file.write(file_header)
+    output_file.write(link_target_encoded)
+
+    return len(file_header) + len(link_target_encoded)
+
+
+def _writeOnefilePayloadFileContents(
+    output_file,
+    input_file,
+    file_header,
+    is_archive,
+    is_compressing,
+    use_compression_cache,
+    low_memory,
+    file_compressor,
+    filename_full,
+    count,
+    compression_cache_filename,
+    with_contents,
+):
+    # Also need to pass all modes, since this can be run in a separate process
+    # that has no access to options, pylint: disable=too-many-arguments
+
+    if is_archive and is_compressing:
+        if compression_cache_filename is None:
+            compression_cache_filename = _getCacheFilename(
+                binary_filename=filename_full, low_memory=low_memory
+            )
+
+        if not os.path.exists(compression_cache_filename):
+            with open(compression_cache_filename, "wb") as archive_entry_file:
+                with file_compressor(archive_entry_file) as compressed_file_tmp2:
+                    shutil.copyfileobj(input_file, compressed_file_tmp2)
+
+        compressed_size = getFileSize(compression_cache_filename)
+
+        file_header += struct.pack("I", compressed_size)
+
+    output_file.write(file_header)
+    payload_item_size = len(file_header)
+
+    if is_archive and is_compressing:
+        with open(compression_cache_filename, "rb") as archive_entry_file:
+            pos1 = output_file.tell()
+            shutil.copyfileobj(archive_entry_file, output_file)
+            pos2 = output_file.tell()
+            assert pos2 - pos1 == compressed_size
+
+        if count == 0 or not use_compression_cache:
+            os.unlink(compression_cache_filename)
+
+        payload_item_size += compressed_size
+    elif with_contents:
+        input_file.seek(0, 0)
+        shutil.copyfileobj(input_file, output_file)
+        payload_item_size += getFileSize(filename_full)
+
+    return payload_item_size
+
+
 def _attachOnefilePayloadFile(
     output_file,
     is_archive,
@@ -79,13 +149,14 @@ def _attachOnefilePayloadFile(
     filename_encoding,
     file_checksums,
     win_path_sep,
+    compression_cache_filename,
+    file_checksum,
+    with_contents=True,
 ):
     # Somewhat detail rich, at least unless we make more things mandatory, and
     # we also need to pass all modes, since this can be run in a separate process
     # that has no access to options.
-    # pylint: disable=too-many-arguments,too-many-locals,too-many-statements
-
-    payload_item_size = 0
+    # pylint: disable=too-many-arguments
 
     filename_relative = os.path.relpath(filename_full, dist_dir)
 
@@ -103,88 +174,89 @@ def _attachOnefilePayloadFile(
     filename_encoded = (filename_relative + "\0").encode(filename_encoding)
 
     output_file.write(filename_encoded)
-    payload_item_size += len(filename_encoded)
-
-    file_flags = 0
-    if not isWin32OrPosixWindows() and os.path.islink(filename_full):
-        link_target = os.readlink(filename_full)
+    payload_item_size = len(filename_encoded)
 
-        file_flags |= 2
-        file_header = to_byte(file_flags)
+    if _isPayloadLink(filename_full):
+        payload_item_size += _writeOnefilePayloadLink(
+            output_file=output_file,
+            filename_full=filename_full,
+            filename_encoding=filename_encoding,
+        )
+    else:
+        file_header = b""
 
-        output_file.write(file_header)
-        payload_item_size += len(file_header)
+        # The executable flag is only relevant for non-links.
+        if not isWin32OrPosixWindows():
+            file_header += to_byte(1 if os.access(filename_full, os.X_OK) else 0)
 
-        link_target_encoded = (link_target + "\0").encode(filename_encoding)
+        file_header += struct.pack("Q", getFileSize(filename_full))
 
-        output_file.write(link_target_encoded)
-        payload_item_size += len(link_target_encoded)
-    else:
-        # This flag is only relevant for non-links.
-        if not isWin32OrPosixWindows() and os.access(filename_full, os.X_OK):
-            file_flags |= 1
+        if file_checksums:
+            file_header += struct.pack("I", file_checksum)
 
         with open(filename_full, "rb") as input_file:
-            input_file.seek(0, 2)
-            input_size = input_file.tell()
-            input_file.seek(0, 0)
-
-            file_header = b""
+            payload_item_size += _writeOnefilePayloadFileContents(
+                output_file=output_file,
+                input_file=input_file,
+                file_header=file_header,
+                is_archive=is_archive,
+                is_compressing=is_compressing,
+                use_compression_cache=use_compression_cache,
+                low_memory=low_memory,
+                file_compressor=file_compressor,
+                filename_full=filename_full,
+                count=count,
+                compression_cache_filename=compression_cache_filename,
+                with_contents=with_contents,
+            )
 
-            if not isWin32OrPosixWindows():
-                file_header += to_byte(file_flags)
+    reportProgressBar(
+        item=filename_relative,
+        update=True,
+    )
 
-            file_header += struct.pack("Q", input_size)
+    return payload_item_size
 
-            if file_checksums:
-                hash_crc32 = HashCRC32()
-                hash_crc32.updateFromFileHandle(input_file)
-                input_file.seek(0, 0)
 
-                # CRC32 value 0 is avoided, used as error indicator in C code.
-                file_header += struct.pack("I", hash_crc32.asDigest() or 1)
+def _getPayloadChecksums(file_list, dist_dir):
+    """Get checksums of the files, and a hash of the payload as a whole.
 
-            if is_archive and is_compressing:
-                compression_cache_filename = _getCacheFilename(
-                    binary_filename=filename_full, low_memory=low_memory
-                )
+    These are used in cached mode, the manifest of the unpacked files is only
+    reused for the payload with the same hash.
+    """
 
-                if not os.path.exists(compression_cache_filename):
-                    with open(compression_cache_filename, "wb") as archive_entry_file:
-                        with file_compressor(
-                            archive_entry_file
-                        ) as compressed_file_tmp2:
-                            shutil.copyfileobj(input_file, compressed_file_tmp2)
+    file_checksum_values = {}
+    payload_hash = Hash()
 
-                compressed_size = getFileSize(compression_cache_filename)
+    for filename_full in file_list:
+        payload_hash.updateFromValues(
+            os.path.relpath(filename_full, dist_dir).replace("\\", "/")
+        )
 
-                file_header += struct.pack("I", compressed_size)
+        if _isPayloadLink(filename_full):
+            payload_hash.updateFromValues(os.readlink(filename_full))
+            continue
 
-            output_file.write(file_header)
-            payload_item_size += len(file_header)
+        payload_hash.updateFromValues(
+            int(not isWin32OrPosixWindows() and os.access(filename_full, os.X_OK))
+        )
 
-            if is_archive and is_compressing:
-                with open(compression_cache_filename, "rb") as archive_entry_file:
-                    pos1 = output_file.tell()
-                    shutil.copyfileobj(archive_entry_file, output_file)
-                    pos2 = output_file.tell()
-                    assert pos2 - pos1 == compressed_size
+        hash_crc32 = HashCRC32()
 
-                if count == 0 or not use_compression_cache:
-                    os.unlink(compression_cache_filename)
+        with open(filename_full, "rb") as input_file:
+            while True:
+                chunk = input_file.read(1024 * 1024)
 
-                payload_item_size += compressed_size
+                if not chunk:
+                    break
 
-            else:
-                shutil.copyfileobj(input_file, output_file)
-                payload_item_size += input_size
+                hash_crc32.updateFromBytes(chunk)
+                payload_hash.updateFromBytes(chunk)
 
-    reportProgressBar(
-        item=filename_relative,
-        update=True,
-    )
+        # CRC32 value 0 is avoided, used as error indicator in C code.
+        file_checksum_values[filename_full] = hash_crc32.asDigest() or 1
 
-    return payload_item_size
+    return file_checksum_values, payload_hash.asDigest()
 
 
 def _getCacheFilename(binary_filename, low_memory):
@@ -209,6 +281,263 @@ def _getCacheFilename(binary_filename, low_memory):
     return os.path.join(cache_dir, hash_value.asHexDigest())
 
 
+def _compressArchiveFile(filename_full, low_memory):
+    compression_cache_filename = _getCacheFilename(
+        binary_filename=filename_full, low_memory=low_memory
+    )
+
+    if not os.path.exists(compression_cache_filename):
+        from zstandard import ZstdCompressor  # pylint: disable=I0021,import-error
+
+        # Each file is an independent frame, compressed single threaded, as
+        # many of them are compressed at the same time. Giving the size makes
+        # it part of the frame header, which limits the memory needed for
+        # decompressing it.
+        compressor_context = ZstdCompressor(level=getCompressorLevel(low_memory))
+
+        # Write to a temporary file first, as identical files, e.g. duplicate
+        # DLLs, share the same cache file and could be done at the same time.
+        compression_tmp_filename = "%s.%d.tmp" % (
+            compression_cache_filename,
+            threading.current_thread().ident,
+        )
+
+        with open(filename_full, "rb") as input_file:
+            with open(compression_tmp_filename, "wb") as archive_entry_file:
+                compressor_context.copy_stream(
+                    input_file, archive_entry_file, size=getFileSize(filename_full)
+                )
+
+        os.replace(compression_tmp_filename, compression_cache_filename)
+
+    return compression_cache_filename
+
+
+def _compressArchiveFiles(file_list, low_memory, job_limit):
+    """Compress files for archive mode in parallel, returns cache filenames."""
+
+    # Only for Python3, but compression is not available for Python2 anyway.
+    from concurrent.futures import (  # pylint: disable=I0021,import-error,no-name-in-module
+        ThreadPoolExecutor,
+        as_completed,
+    )
+
+    file_list = [
+        filename_full
+        for filename_full in file_list
+        if isWin32OrPosixWindows() or not os.path.islink(filename_full)
+    ]
+
+    # Create it once, rather than from all the threads.
+    makePath(getCacheDir("onefile-compression"))
+
+    setupProgressBar(
+        stage="Onefile Compression",
+        unit="file",
+        total=len(file_list),
+    )
+
+    result = {}
+
+    # The compression releases the GIL, so threads scale with the cores just
+    # as well as processes would, while not needing to transfer data.
+    with ThreadPoolExecutor(max_workers=max(1, job_limit)) as executor:
+        futures = dict(
+            (
+                executor.submit(_compressArchiveFile, filename_full, low_memory),
+                filename_full,
+            )
+            for filename_full in file_list
+        )
+
+        for future in as_completed(futures):
+            filename_full = futures[future]
+            result[filename_full] = future.result()
+
+            reportProgressBar(item=os.path.basename(filename_full))
+
+    closeProgressBar()
+
+    return result
+
+
+# Target uncompressed size of the blocks of the payload, larger files are a
+# block of their own.
+_payload_block_size = 4 * 1024 * 1024
+
+
+def _isPayloadLink(filename_full):
+    return not isWin32OrPosixWindows() and os.path.islink(filename_full)
+
+
+def _getPayloadBlocks(file_list):
+    """Split the files with contents into blocks of consecutive files."""
+
+    blocks = []
+    block = []
+    block_size = 0
+
+    for filename_full in file_list:
+        if _isPayloadLink(filename_full):
+            continue
+
+        file_size = getFileSize(filename_full)
+
+        if block and block_size + file_size > _payload_block_size:
+            blocks.append(block)
+            block = []
+            block_size = 0
+
+        block.append(filename_full)
+        block_size += file_size
+
+    if block:
+        blocks.append(block)
+
+    return blocks
+
+
+def _compressPayloadBlock(block, low_memory):
+    from zstandard import ZstdCompressor  # pylint: disable=I0021,import-error
+
+    # Each block is an independent frame, compressed single threaded, as many
+    # of them are compressed at the same time.
+    compressor_context = ZstdCompressor(level=getCompressorLevel(low_memory))
+
+    block_file = tempfile.TemporaryFile()
+
+    with compressor_context.stream_writer(
+        block_file,
+        size=sum(getFileSize(filename_full) for filename_full in block),
+        closefd=False,
+    ) as compressed_file:
+        for filename_full in block:
+            with open(filename_full, "rb") as input_file:
+                shutil.copyfileobj(input_file, compressed_file)
+
+    return block_file
+
+
+def _compressPayloadBlocks(blocks, low_memory, job_limit):
+    """Compress payload blocks in parallel, returns temporary files in order."""
+
+    # Only for Python3, but compression is not available for Python2 anyway.
+    from concurrent.futures import (  # pylint: disable=I0021,import-error,no-name-in-module
+        ThreadPoolExecutor,
+    )
+
+    setupProgressBar(
+        stage="Onefile Compression",
+        unit="block",
+        total=len(blocks),
+    )
+
+    result = []
+
+    with ThreadPoolExecutor(max_workers=max(1, job_limit)) as executor:
+        futures = [
+            executor.submit(_compressPayloadBlock, block, low_memory)
+            for block in blocks
+        ]
+
+        for count, future in enumerate(futures, start=1):
+            result.append(future.result())
+
+            reportProgressBar(item="block %d" % count)
+
+    closeProgressBar()
+
+    return result
+
+
+def _writeOnefilePayloadBlocks(
+    output_file,
+    file_list,
+    dist_dir,
+    filename_encoding,
+    file_checksums,
+    file_checksum_values,
+    win_path_sep,
+    use_compression_cache,
+    low_memory,
+    job_limit,
+):
+    """Write the files as compressed blocks, with an index of them in front.
+
+    Without archive, compression is done on blocks of file contents, each an
+    independent frame, so they can be decompressed in parallel.
+
+    Returns:
+        uncompressed size of the payload
+    """
+
+    blocks = _getPayloadBlocks(file_list)
+    block_files = _compressPayloadBlocks(
+        blocks=blocks, low_memory=low_memory, job_limit=job_limit
+    )
+
+    setupProgressBar(
+        stage="Onefile Payload",
+        unit="module",
+        total=len(file_list),
+    )
+
+    payload_size = 0
+    payload_index = BytesIO()
+
+    for count, filename_full in enumerate(file_list, start=1):
+        payload_size += _attachOnefilePayloadFile(
+            output_file=payload_index,
+            is_archive=False,
+            file_compressor=None,
+            is_compressing=True,
+            use_compression_cache=use_compression_cache,
+            low_memory=low_memory,
+            filename_full=filename_full,
+            count=count,
+            dist_dir=dist_dir,
+            filename_encoding=filename_encoding,
+            file_checksums=file_checksums,
+            win_path_sep=win_path_sep,
+            compression_cache_filename=None,
+            file_checksum=file_checksum_values.get(filename_full),
+            with_contents=False,
+        )
+
+    # Using empty filename as a terminator.
+    payload_index.write("\0".encode(filename_encoding))
+
+    payload_index.write(struct.pack("I", len(blocks)))
+
+    for block, block_file in zip(blocks, block_files):
+        block_file.seek(0, 2)
+
+        payload_index.write(struct.pack("Q", block_file.tell()))
+        payload_index.write(struct.pack("I", len(block)))
+
+        payload_size += sum(getFileSize(filename_full) for filename_full in block)
+
+    payload_size += payload_index.tell()
+
+    # The content size is part of the frame, so the index can be decompressed
+    # in one go.
+    from zstandard import ZstdCompressor  # pylint: disable=I0021,import-error
+
+    payload_index = ZstdCompressor(level=getCompressorLevel(low_memory)).compress(
+        payload_index.getvalue()
+    )
+
+    output_file.write(struct.pack("Q", len(payload_index)))
+    output_file.write(payload_index)
+
+    for block_file in block_files:
+        block_file.seek(0, 0)
+        shutil.copyfileobj(block_file, output_file)
+        block_file.close()
+
+    return payload_size
+
+
 def _getInputFileList(dist_dir, start_binary):
     file_list = getFileList(dist_dir, normalize=False)
     file_list_size = len(file_list)
@@ -223,6 +552,122 @@ def _getInputFileList(dist_dir, start_binary):
     return tuple(file_list)
 
 
+def _writeOnefilePayloadChecksums(output_file, file_list, dist_dir, file_checksums):
+    """Write the hash of the payload as a whole, and get checksums of the files.
+
+    In cached mode, the manifest of unpacked files is reused only for the same
+    payload hash, and the file checksums are verified at run time.
+    """
+
+    if not file_checksums:
+        return {}
+
+    file_checksum_values, payload_hash = _getPayloadChecksums(
+        file_list=file_list, dist_dir=dist_dir
+    )
+
+    output_file.write(payload_hash)
+
+    return file_checksum_values
+
+
+def _writeOnefilePayloadFiles(
+    output_file,
+    file_list,
+    dist_dir,
+    filename_encoding,
+    file_checksums,
+    file_checksum_values,
+    win_path_sep,
+    as_archive,
+    is_compressing,
+    compressor,
+    compression_cache_filenames,
+    use_compression_cache,
+    low_memory,
+):
+    """Write the files one after another, each compressed for archives.
+
+    Returns:
+        size of the payload, with compressed sizes for archives
+    """
+
+    # All modes need passing, pylint: disable=too-many-arguments
+
+    setupProgressBar(
+        stage="Onefile Payload",
+        unit="module",
+        total=len(file_list),
+    )
+
+    payload_size = 0
+
+    # Archive files are compressed each on their own, otherwise nothing is
+    # compressed.
+    if as_archive:
+        file_compressor = compressor
+    else:
+
+        @contextmanager
+        def file_compressor(f):
+            yield f
+
+    for count, filename_full in enumerate(file_list, start=1):
+        payload_size += _attachOnefilePayloadFile(
+            output_file=output_file,
+            is_archive=as_archive,
+            file_compressor=file_compressor,
+            is_compressing=is_compressing,
+            use_compression_cache=use_compression_cache,
+            low_memory=low_memory,
+            filename_full=filename_full,
+            count=count,
+            dist_dir=dist_dir,
+            filename_encoding=filename_encoding,
+            file_checksums=file_checksums,
+            win_path_sep=win_path_sep,
+            compression_cache_filename=compression_cache_filenames.get(filename_full),
+            file_checksum=file_checksum_values.get(filename_full),
+        )
+
+    # Using empty filename as a terminator.
+    filename_encoded = "\0".encode(filename_encoding)
+    output_file.write(filename_encoded)
+    payload_size += len(filename_encoded)
+
+    return payload_size
+
+
+def _finishOnefilePayload(output_file, start_pos, payload_size, is_compressing):
+    # TODO: If put into a resource, this is not really needed anymore.
+    if isWin32Windows():
+        # add padding to have the start position at a double world boundary
+        # this is needed on windows so that a possible certificate immediately
+        # follows the start position
+        pad = output_file.tell() % 8
+        if pad != 0:
+            output_file.write(bytes(8 - pad))
+
+    output_file.seek(0, 2)
+    end_pos = output_file.tell()
+
+    compressed_size = end_pos - start_pos
+
+    if is_compressing:
+        onefile_logger.info(
+            "Onefile payload compression ratio (%.2f%%) size %d to %d."
+            % (
+                (float(compressed_size) / payload_size) * 100,
+                payload_size,
+                compressed_size,
+            )
+        )
+
+    # Size of the payload data plus the size of that size storage, so C code can
+    # jump directly to it.
+    output_file.write(struct.pack("Q", end_pos - start_pos))
+
+
 def attachOnefilePayload(
     dist_dir,
     onefile_output_filename,
@@ -241,6 +686,13 @@ def attachOnefilePayload(
         job_limit=job_limit,
     )
 
+    is_compressing = compression_indicator == b"Y"
+
+    if isWin32Windows():
+        filename_encoding = "utf-16le"
+    else:
+        filename_encoding = "utf8"
+
     @decoratorRetries(
         logger=onefile_logger,
         purpose="write payload to '%s'" % onefile_output_filename,
@@ -257,86 +709,59 @@ def attachOnefilePayload(
             # Move the binary to start immediately to the start position
             file_list = _getInputFileList(dist_dir=dist_dir, start_binary=start_binary)
 
-            if isWin32Windows():
-                filename_encoding = "utf-16le"
-            else:
-                filename_encoding = "utf8"
-
-            payload_size = 0
-
-            setupProgressBar(
-                stage="Onefile Payload",
-                unit="module",
-                total=len(file_list),
+            file_checksum_values = _writeOnefilePayloadChecksums(
+                output_file=output_file,
+                file_list=file_list,
+                dist_dir=dist_dir,
+                file_checksums=file_checksums,
             )
 
-            # Abstract the differences here for the time being.
-            if as_archive:
-                # Fake compressor then
-                @contextmanager
-                def overall_compressor(f):
-                    yield f
-
-                file_compressor = compressor
-                is_archive = True
+            if is_compressing and not as_archive:
+                payload_size = _writeOnefilePayloadBlocks(
+                    output_file=output_file,
+                    file_list=file_list,
+                    dist_dir=dist_dir,
+                    filename_encoding=filename_encoding,
+                    file_checksums=file_checksums,
+                    file_checksum_values=file_checksum_values,
+                    win_path_sep=win_path_sep,
+                    use_compression_cache=use_compression_cache,
+                    low_memory=low_memory,
+                    job_limit=job_limit,
+                )
             else:
-                overall_compressor = compressor
-
-                @contextmanager
-                def file_compressor(f):
-                    yield f
-
-                is_archive = False
-
-            with overall_compressor(output_file) as compressed_file:
-                for count, filename_full in enumerate(file_list, start=1):
-                    payload_size += _attachOnefilePayloadFile(
-                        output_file=compressed_file,
-                        is_archive=is_archive,
-                        file_compressor=file_compressor,
-                        is_compressing=compression_indicator == b"Y",
-                        use_compression_cache=use_compression_cache,
-                        low_memory=low_memory,
-                        filename_full=filename_full,
-                        count=count,
-                        dist_dir=dist_dir,
-                        filename_encoding=filename_encoding,
-                        file_checksums=file_checksums,
-                        win_path_sep=win_path_sep,
-                    )
-
-                # Using empty filename as a terminator.
-                filename_encoded = "\0".encode(filename_encoding)
-                compressed_file.write(filename_encoded)
-                payload_size += len(filename_encoded)
-
-            # TODO: If put into a resource, this is not really needed anymore.
-            if isWin32Windows():
-                # add padding to have the start position at a double world boundary
-                # this is needed on windows so that a possible certificate immediately
-                # follows the start position
-                pad = output_file.tell() % 8
-                if pad != 0:
-                    output_file.write(bytes(8 - pad))
-
-            output_file.seek(0, 2)
-            end_pos = output_file.tell()
-
-            compressed_size = end_pos - start_pos
-
-            if compression_indicator == b"Y":
-                onefile_logger.info(
-                    "Onefile payload compression ratio (%.2f%%) size %d to %d."
-                    % (
-                        (float(compressed_size) / payload_size) * 100,
-                        payload_size,
-                        compressed_size,
+                # For archives, the files are independent frames that can be
+                # done in parallel ahead of time, and only need to be copied
+                # afterwards.
+                if is_compressing:
+                    compression_cache_filenames = _compressArchiveFiles(
+                        file_list=file_list, low_memory=low_memory, job_limit=job_limit
                     )
+                else:
+                    compression_cache_filenames = {}
+
+                payload_size = _writeOnefilePayloadFiles(
+                    output_file=output_file,
+                    file_list=file_list,
+                    dist_dir=dist_dir,
+                    filename_encoding=filename_encoding,
+                    file_checksums=file_checksums,
+                    file_checksum_values=file_checksum_values,
+                    win_path_sep=win_path_sep,
+                    as_archive=as_archive,
+                    is_compressing=is_compressing,
+                    compressor=compressor,
+                    compression_cache_filenames=compression_cache_filenames,
+                    use_compression_cache=use_compression_cache,
+                    low_memory=low_memory,
                 )
 
-            # Size of the payload data plus the size of that size storage, so C code can
-            # jump directly to it.
-            output_file.write(struct.pack("Q", end_pos - start_pos))
+            _finishOnefilePayload(
+                output_file=output_file,
+                start_pos=start_pos,
+                payload_size=payload_size,
+                is_compressing=is_compressing,
+            )
 
         closeProgressBar()
 
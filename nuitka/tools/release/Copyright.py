@@ -64,6 +64,7 @@ _plain_files = (
     "nuitka",
     ".sourcery.yaml",
     "nuitka-watch",
+    "nuitka-pgo-merge",
     "nuitka-run",
     "nuitka2",
     "nuitka2-run",
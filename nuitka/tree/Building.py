@@ -43,6 +43,11 @@ from nuitka.__past__ import long, unicode
 from nuitka.BytecodeCaching import (
     getCachedImportedModuleUsageAttempts,
     hasCachedImportedModuleUsageAttempts,
+    isModuleTreeCacheUsage,
+    isRestoredModuleTree,
+    loadModuleTreeFromCache,
+    makeModuleTreeCacheName,
+    rememberModuleTreeCacheName,
 )
 from nuitka.Bytecodes import loadCodeObjectData
 from nuitka.containers.OrderedSets import OrderedSet
@@ -1150,6 +1155,28 @@ def _createModule(
             # Not used anymore
             source_code = None
         else:
+            if (
+                mode == "compiled"
+                and not is_top
+                and module_filename is not None
+                and source_code is not None
+                and isModuleTreeCacheUsage()
+            ):
+                cache_name = makeModuleTreeCacheName(
+                    module_name=module_name,
+                    module_filename=module_filename,
+                    source_code=source_code,
+                )
+
+                result = loadModuleTreeFromCache(
+                    module_name=module_name, cache_name=cache_name, reason=reason
+                )
+
+                if result is not None:
+                    return result
+            else:
+                cache_name = None
+
             if is_package:
                 result = CompiledPythonPackage(
                     module_name=module_name,
@@ -1169,6 +1196,9 @@ def _createModule(
                     source_ref=source_ref,
                 )
 
+            if cache_name is not None:
+                rememberModuleTreeCacheName(module=result, cache_name=cache_name)
+
     return result
 
 
@@ -1472,7 +1502,11 @@ def buildModule(
 
         OutputDirectories.setMainModule(module)
 
-    if module.isCompiledPythonModule() and source_code is not None:
+    if (
+        module.isCompiledPythonModule()
+        and source_code is not None
+        and not isRestoredModuleTree(module)
+    ):
         try:
             createModuleTree(
                 module=module,
@@ -37,11 +37,30 @@ def once_decorator(func):
         if func.cached_value is None:
             func.cached_value = func()
 
+            _internal_helper_factories[func.cached_value.getName()] = (
+                func.__module__,
+                func.__name__,
+            )
+
         return func.cached_value
 
     return replacement
 
 
+# Factories of the internal helper functions by helper function name, so e.g.
+# cached module trees can refer to them.
+_internal_helper_factories = {}
+
+
+def getInternalHelperFunctionFactory(function_body):
+    """Get module and function name of the factory of an internal helper function.
+
+    Returns:
+        tuple of module name and function name, or None if not a helper.
+    """
+    return _internal_helper_factories.get(function_body.getName())
+
+
 def getInternalModule():
     """Get the singleton internal module."""
 
@@ -0,0 +1,307 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Reading of ELF files, to find their library dependencies without tools.
+
+This only reads what the dynamic loader needs to know for finding the
+dependencies, i.e. the identity of the file, "DT_NEEDED" entries, the
+"DT_SONAME" and the "DT_RPATH" and "DT_RUNPATH" search paths.
+"""
+
+import struct
+
+from nuitka.containers.Namedtuples import makeNamedtupleClass
+
+# spell-checker: ignore RUNPATH,SONAME,STRTAB,STRSZ
+
+ElfFileInfo = makeNamedtupleClass(
+    "ElfFileInfo",
+    (
+        "elf_class",
+        "machine",
+        "interpreter",
+        "soname",
+        "needed",
+        "rpath",
+        "runpath",
+    ),
+)
+
+_PT_LOAD = 1
+_PT_DYNAMIC = 2
+_PT_INTERP = 3
+
+_DT_NULL = 0
+_DT_NEEDED = 1
+_DT_STRTAB = 5
+_DT_STRSZ = 10
+_DT_SONAME = 14
+_DT_RPATH = 15
+_DT_RUNPATH = 29
+
+
+def _decodeElfString(value):
+    if str is not bytes:
+        value = value.decode("utf8", "surrogateescape")
+
+    return value
+
+
+def _readElfHeader(elf_file):
+    """Read the ELF header.
+
+    Returns:
+        tuple of ELF class, endian struct prefix, machine, and the offset,
+        entry size and count of the program headers, or None if not usable.
+    """
+
+    ident = bytearray(elf_file.read(16))
+
+    if len(ident) < 16 or ident[:4] != b"\x7fELF":
+        return None
+
+    elf_class = ident[4]
+    endian = {1: "<", 2: ">"}.get(ident[5])
+
+    if elf_class not in (1, 2) or endian is None:
+        return None
+
+    if elf_class == 2:
+        header_format = endian + "HHIQQQIHHHHHH"
+    else:
+        header_format = endian + "HHIIIIIHHHHHH"
+
+    (
+        _e_type,
+        machine,
+        _e_version,
+        _e_entry,
+        program_header_offset,
+        _e_shoff,
+        _e_flags,
+        _e_ehsize,
+        program_header_size,
+        program_header_count,
+        _e_shentsize,
+        _e_shnum,
+        _e_shstrndx,
+    ) = struct.unpack(header_format, elf_file.read(struct.calcsize(header_format)))
+
+    # Extended program header numbering is not supported.
+    if program_header_count == 0xFFFF:
+        return None
+
+    return (
+        elf_class,
+        endian,
+        machine,
+        program_header_offset,
+        program_header_size,
+        program_header_count,
+    )
+
+
+def _readElfProgramHeaders(
+    elf_file,
+    elf_class,
+    endian,
+    program_header_offset,
+    program_header_size,
+    program_header_count,
+):
+    """Read the program header table.
+
+    Returns:
+        tuple of loaded segments as (address, size, offset) tuples, the offset
+        and size of the dynamic section or None, and the interpreter or None.
+    """
+
+    if elf_class == 2:
+        program_header_format = endian + "IIQQQQQQ"
+    else:
+        program_header_format = endian + "IIIIIIII"
+
+    loads = []
+    dynamic = None
+    interpreter = None
+
+    for count in range(program_header_count):
+        elf_file.seek(program_header_offset + count * program_header_size)
+
+        values = struct.unpack(
+            program_header_format,
+            elf_file.read(struct.calcsize(program_header_format)),
+        )
+
+        # The order of fields differs for the classes.
+        if elf_class == 2:
+            p_type, _p_flags, p_offset, p_vaddr, _p_paddr, p_filesz = values[:6]
+        else:
+            p_type, p_offset, p_vaddr, _p_paddr, p_filesz = values[:5]
+
+        if p_type == _PT_LOAD:
+            loads.append((p_vaddr, p_filesz, p_offset))
+        elif p_type == _PT_DYNAMIC:
+            dynamic = p_offset, p_filesz
+        elif p_type == _PT_INTERP:
+            elf_file.seek(p_offset)
+            interpreter = _decodeElfString(elf_file.read(p_filesz).rstrip(b"\0"))
+
+    return loads, dynamic, interpreter
+
+
+def _readElfDynamicSection(elf_file, elf_class, endian, dynamic):
+    """Read the entries of the dynamic section, that we care about.
+
+    Returns:
+        tuple of the string table address and size, each None if not given,
+        and the string valued entries as (tag, string offset) tuples.
+    """
+
+    if elf_class == 2:
+        dynamic_format = endian + "qQ"
+    else:
+        dynamic_format = endian + "iI"
+
+    elf_file.seek(dynamic[0])
+    dynamic_data = elf_file.read(dynamic[1])
+    dynamic_size = struct.calcsize(dynamic_format)
+
+    entries = []
+    string_table_address = None
+    string_table_size = None
+
+    for offset in range(0, len(dynamic_data) - dynamic_size + 1, dynamic_size):
+        tag, value = struct.unpack_from(dynamic_format, dynamic_data, offset)
+
+        if tag == _DT_NULL:
+            break
+
+        if tag == _DT_STRTAB:
+            string_table_address = value
+        elif tag == _DT_STRSZ:
+            string_table_size = value
+        elif tag in (_DT_NEEDED, _DT_SONAME, _DT_RPATH, _DT_RUNPATH):
+            entries.append((tag, value))
+
+    return string_table_address, string_table_size, entries
+
+
+def _readElfStringTable(elf_file, loads, string_table_address, string_table_size):
+    # The string table is given as a virtual address, the loaded segments tell
+    # where that is in the file.
+    for p_vaddr, p_filesz, p_offset in loads:
+        if p_vaddr <= string_table_address < p_vaddr + p_filesz:
+            elf_file.seek(string_table_address - p_vaddr + p_offset)
+            return elf_file.read(string_table_size)
+
+    return None
+
+
+def _decodeElfDynamicStrings(string_table, entries):
+    """Decode the string values of dynamic section entries.
+
+    Returns:
+        dictionary of lists of values by tag, or None if a string is not
+        terminated within the table.
+    """
+
+    result = {}
+
+    for tag, value in entries:
+        value_end = string_table.find(b"\0", value)
+
+        # Strings must be terminated within the table.
+        if value_end == -1:
+            return None
+
+        result.setdefault(tag, []).append(
+            _decodeElfString(string_table[value:value_end])
+        )
+
+    return result
+
+
+def _readElfFileInfo(elf_file):
+    header = _readElfHeader(elf_file)
+
+    if header is None:
+        return None
+
+    elf_class, endian, machine = header[:3]
+
+    loads, dynamic, interpreter = _readElfProgramHeaders(
+        elf_file, elf_class, endian, *header[3:]
+    )
+
+    dynamic_strings = {}
+
+    if dynamic is not None:
+        string_table_address, string_table_size, entries = _readElfDynamicSection(
+            elf_file=elf_file, elf_class=elf_class, endian=endian, dynamic=dynamic
+        )
+
+        if entries:
+            if string_table_address is None or string_table_size is None:
+                return None
+
+            string_table = _readElfStringTable(
+                elf_file=elf_file,
+                loads=loads,
+                string_table_address=string_table_address,
+                string_table_size=string_table_size,
+            )
+
+            if string_table is None:
+                return None
+
+            dynamic_strings = _decodeElfDynamicStrings(
+                string_table=string_table, entries=entries
+            )
+
+            if dynamic_strings is None:
+                return None
+
+    # For the single valued entries, the last one given wins.
+    return ElfFileInfo(
+        elf_class=elf_class,
+        machine=machine,
+        interpreter=interpreter,
+        soname=dynamic_strings.get(_DT_SONAME, [None])[-1],
+        needed=tuple(dynamic_strings.get(_DT_NEEDED, ())),
+        rpath=dynamic_strings.get(_DT_RPATH, [None])[-1],
+        runpath=dynamic_strings.get(_DT_RUNPATH, [None])[-1],
+    )
+
+
+def getElfFileInfo(filename):
+    """Get the dynamic loading information of an ELF file.
+
+    Args:
+        filename: ELF file to read
+
+    Returns:
+        ElfFileInfo or None if not an ELF file, or one not understood.
+    """
+
+    try:
+        with open(filename, "rb") as elf_file:
+            return _readElfFileInfo(elf_file)
+    except (IOError, OSError, struct.error):
+        return None
+
+
+#     Part of "Nuitka", an optimizing Python compiler that is compatible and
+#     integrates with CPython, but also works on its own.
+#
+#     Licensed under the GNU Affero General Public License, Version 3 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.gnu.org/licenses/agpl.txt
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
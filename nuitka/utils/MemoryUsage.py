@@ -3,6 +3,8 @@
 
 """Tools for tracing memory usage at compiled time."""
 
+import os
+
 from nuitka.containers.OrderedDicts import OrderedDict
 from nuitka.Tracing import memory_logger, printLine
 
@@ -65,6 +67,56 @@ def getOwnProcessMemoryUsage():
         return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * factor
 
 
+def getTotalPhysicalMemory():
+    """Physical memory of the machine in bytes, None if not known."""
+
+    if isWin32Windows():
+        import ctypes.wintypes
+
+        # Lets allow this to match Windows API it reflects,
+        # pylint: disable=invalid-name
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.wintypes.DWORD),
+                ("dwMemoryLoad", ctypes.wintypes.DWORD),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX(dwLength=ctypes.sizeof(MEMORYSTATUSEX))
+
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return None
+
+        return status.ullTotalPhys
+    else:
+        try:
+            return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (AttributeError, ValueError, OSError):
+            return None
+
+
+def getMaxRssFromRusage(rusage):
+    """Peak memory usage in bytes from "rusage" of a process, None if not known."""
+
+    # On Windows, and without "os.wait4" these are not available.
+    if not rusage:
+        return None
+
+    # OS dependent scaling, see above.
+    if isMacOS():
+        factor = 1
+    else:
+        factor = 1024
+
+    return rusage.ru_maxrss * factor
+
+
 def getHumanReadableProcessMemoryUsage():
     return formatMemoryUsageValue(getOwnProcessMemoryUsage())
 
@@ -11,6 +11,11 @@ from nuitka.__past__ import WindowsError  # pylint: disable=I0021,redefined-buil
 from nuitka.__past__ import unicode
 from nuitka.containers.OrderedDicts import OrderedDict
 from nuitka.containers.OrderedSets import OrderedSet
+from nuitka.freezer.DllCopyCache import (
+    getDllCopyCacheKey,
+    restoreCachedDllCopy,
+    storeCachedDllCopy,
+)
 from nuitka.options.Options import (
     getMacOSTargetArch,
     isShowInclusion,
@@ -767,19 +772,19 @@ def makeMacOSThinBinary(dest_path, original_path):
         )
 
 
-def copyDllFile(source_path, dist_dir, dest_path, executable, other_entry_points):
-    """Copy an extension/DLL file making some adjustments on the way."""
-
-    target_filename = os.path.join(dist_dir, dest_path)
-    makeContainingPath(target_filename)
+def _getDllCopyModifications(dest_path, other_entry_points):
+    """Describe the modifications to make to a DLL copy.
 
-    copyFile(source_path=source_path, dest_path=target_filename)
+    Only what cannot be derived from the source file contents is included,
+    making it usable for caching of the resulting copies.
+    """
+    result = []
 
     if isWin32Windows() and python_version < 0x300:
-        _removeSxsFromDLL(target_filename)
+        result.append(("remove_sxs",))
 
     if isMacOS() and getMacOSTargetArch() != "universal":
-        makeMacOSThinBinary(dest_path=target_filename, original_path=source_path)
+        result.append(("thin_binary", getMacOSTargetArch()))
 
     if isElfUsingPlatform():
         # Path must be normalized for this to be correct, but entry points enforced that.
@@ -804,20 +809,85 @@ def copyDllFile(source_path, dist_dir, dest_path, executable, other_entry_points
 
             rpaths.add(os.path.join("$ORIGIN", *([".."] * c)))
 
-        # Make sure, sub-folders use by the original DLL are actually still
-        # included.
-        #
-        # TODO: Actually it would be nice if these were trimmed to what actually
-        # exists and is used, but that's pretty complex and maybe not worth the
-        # effort. This would look like "fixupBinaryDLLPathsMacOS" somewhat, and
-        # actually this code is indeed kind of misplaced here.
-        rpaths.update(
-            rpath
-            for rpath in getSharedLibraryRPATHs(source_path, elements=True)
-            if rpath.startswith("$ORIGIN")
+        result.append(("rpath", tuple(rpaths)))
+
+    return tuple(result)
+
+
+def _applyDllCopyModifications(source_path, target_filename, modifications):
+    for modification in modifications:
+        if modification[0] == "remove_sxs":
+            _removeSxsFromDLL(target_filename)
+        elif modification[0] == "thin_binary":
+            makeMacOSThinBinary(dest_path=target_filename, original_path=source_path)
+        elif modification[0] == "rpath":
+            rpaths = OrderedSet(modification[1])
+
+            # Make sure, sub-folders use by the original DLL are actually still
+            # included.
+            #
+            # TODO: Actually it would be nice if these were trimmed to what actually
+            # exists and is used, but that's pretty complex and maybe not worth the
+            # effort. This would look like "fixupBinaryDLLPathsMacOS" somewhat, and
+            # actually this code is indeed kind of misplaced here.
+            rpaths.update(
+                rpath
+                for rpath in getSharedLibraryRPATHs(source_path, elements=True)
+                if rpath.startswith("$ORIGIN")
+            )
+
+            setSharedLibraryRPATH(target_filename, ":".join(rpaths))
+        else:
+            assert False, modification
+
+
+def copyDllFile(
+    source_path,
+    dist_dir,
+    dest_path,
+    executable,
+    other_entry_points,
+    use_cache=False,
+):
+    """Copy an extension/DLL file making some adjustments on the way.
+
+    Args:
+        source_path: DLL to copy
+        dist_dir: standalone distribution folder
+        dest_path: relative path inside the distribution folder
+        executable: make the copy executable
+        other_entry_points: all copied entry points, for RPATH decisions
+        use_cache: use the DLL copy cache, which must have been started
+    """
+
+    target_filename = os.path.join(dist_dir, dest_path)
+    makeContainingPath(target_filename)
+
+    modifications = _getDllCopyModifications(
+        dest_path=dest_path, other_entry_points=other_entry_points
+    )
+
+    # Without modifications, the copy is as fast as the cache can be.
+    if use_cache and modifications:
+        cache_key = getDllCopyCacheKey(
+            source_path=source_path, modifications=modifications
+        )
+    else:
+        cache_key = None
+
+    if cache_key is None or not restoreCachedDllCopy(
+        cache_key=cache_key, target_filename=target_filename
+    ):
+        copyFile(source_path=source_path, dest_path=target_filename)
+
+        _applyDllCopyModifications(
+            source_path=source_path,
+            target_filename=target_filename,
+            modifications=modifications,
         )
 
-        setSharedLibraryRPATH(target_filename, ":".join(rpaths))
+        if cache_key is not None:
+            storeCachedDllCopy(cache_key=cache_key, target_filename=target_filename)
 
     if isWin32Windows() and isUnstripped():
         pdb_filename = changeFilenameExtension(path=source_path, extension=".pdb")
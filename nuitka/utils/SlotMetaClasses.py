@@ -8,6 +8,30 @@ from abc import ABCMeta
 from nuitka.Errors import NuitkaNodeDesignError
 
 
+def setSlotsObjectState(self, state):
+    """Default for unpickling objects with slots, used as "__setstate__".
+
+    Unlike the default, slots shadowed by class attributes in sub classes are
+    tolerated, they are not assignable, but their value is provided by the class
+    anyway.
+    """
+
+    if type(state) is tuple:
+        dict_state, slots_state = state
+    else:
+        dict_state, slots_state = state, None
+
+    if dict_state:
+        self.__dict__.update(dict_state)
+
+    if slots_state:
+        for key, value in slots_state.items():
+            try:
+                setattr(self, key, value)
+            except AttributeError:
+                pass
+
+
 def getMetaClassBase(meta_class_prefix, require_slots):
     """For Python2/3 compatible source, we create a base class that has the metaclass
     used and doesn't require making a syntax choice.
@@ -32,10 +56,15 @@ def getMetaClassBase(meta_class_prefix, require_slots):
 
             return ABCMeta.__new__(mcs, name, bases, dictionary)
 
+    dictionary = {"__setstate__": setSlotsObjectState}
+
+    if require_slots:
+        dictionary["__slots__"] = ()
+
     MetaClassBase = MetaClass(
         "%sMetaClassBase" % meta_class_prefix,
         (object,),
-        {"__slots__": ()} if require_slots else {},
+        dictionary,
     )
 
     return MetaClassBase
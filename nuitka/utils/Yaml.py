@@ -16,16 +16,29 @@ from __future__ import absolute_import
 
 import ast
 import os
+import pickle
 import pkgutil
 import re
+import sys
 from posixpath import normpath
 
 from nuitka.containers.OrderedDicts import OrderedDict
-from nuitka.options.Options import getUserProvidedYamlFiles
+from nuitka.options.Options import (
+    getUserProvidedYamlFiles,
+    shallDisablePackageConfigCacheUsage,
+)
 from nuitka.Tracing import general
-
-from .FileOperations import getFileContents
-from .Hashing import HashCRC32
+from nuitka.Version import version_string
+
+from .AppDirs import getCacheDir
+from .FileOperations import (
+    getFileContents,
+    getNormalizedPathJoin,
+    makePath,
+    putBinaryFileContents,
+    replaceFileAtomic,
+)
+from .Hashing import Hash, HashCRC32
 from .Importing import importFromInlineCopy
 from .ModuleNames import checkModuleName
 from .PrivatePipSpace import getPrivatePackage
@@ -363,43 +376,66 @@ class PackageConfigYaml(object):
         "data",
         "logger",
         "checked_sections",
+        "bad_checksum_modules",
     )
 
     def __init__(
-        self, logger, name, file_data, assume_yes_for_downloads, check_checksums
+        self,
+        logger,
+        name,
+        file_data,
+        assume_yes_for_downloads,
+        check_checksums,
+        cached_data=None,
     ):
         self.logger = logger
         self.name = name
 
-        assert type(file_data) is bytes
-        data = parseYaml(
-            logger=logger,
-            data=file_data,
-            error_message="""\
+        if cached_data is not None:
+            # Values are pickled module configurations, loaded on first use.
+            self.data, self.bad_checksum_modules = cached_data
+            self.checked_sections = set()
+        else:
+            assert type(file_data) is bytes
+            data = parseYaml(
+                logger=logger,
+                data=file_data,
+                error_message="""\
 Error, empty (or malformed?) user package configuration '%s' used."""
-            % name,
-        )
-
-        assert type(data) is list, type(data)
+                % name,
+            )
 
-        self._init(logger, data)
+            assert type(data) is list, type(data)
 
-        if check_checksums:
-            bad_checksum_modules = checkDataChecksums(file_data, self.data)
+            self._init(logger, data)
 
-            if bad_checksum_modules:
-                logger.info(
-                    "Detected %d module(s) with mismatching checksum in '%s': %s"
-                    % (len(bad_checksum_modules), name, ",".join(bad_checksum_modules))
+            if check_checksums:
+                self.bad_checksum_modules = checkDataChecksums(file_data, self.data)
+            else:
+                self.bad_checksum_modules = ()
+
+        if self.bad_checksum_modules:
+            logger.info(
+                "Detected %d module(s) with mismatching checksum in '%s': %s"
+                % (
+                    len(self.bad_checksum_modules),
+                    name,
+                    ",".join(self.bad_checksum_modules),
                 )
+            )
 
-                validateSchema(
-                    logger=logger,
-                    name=name,
-                    data=data,
-                    assume_yes_for_downloads=assume_yes_for_downloads,
-                    reject_message=None,
-                )
+            self._loadAllModuleData()
+
+            validateSchema(
+                logger=logger,
+                name=name,
+                data=[
+                    dict(module_data, **{"module-name": module_name})
+                    for module_name, module_data in self.data.items()
+                ],
+                assume_yes_for_downloads=assume_yes_for_downloads,
+                reject_message=None,
+            )
 
     def _init(self, logger, data):
         self.data = OrderedDict()
@@ -439,9 +475,22 @@ Error, empty (or malformed?) user package configuration '%s' used."""
     def __repr__(self):
         return "<PackageConfigYaml %s>" % self.name
 
+    def _getModuleData(self, name):
+        result = self.data.get(name)
+
+        if type(result) is bytes:
+            result = pickle.loads(result)
+            self.data[name] = result
+
+        return result
+
+    def _loadAllModuleData(self):
+        for name in self.data:
+            self._getModuleData(name)
+
     def get(self, name, section):
         """Return a configs for that section."""
-        result = self.data.get(name)
+        result = self._getModuleData(name)
 
         if result is not None:
             result = result.get(section, ())
@@ -477,6 +526,8 @@ Error, empty (or malformed?) user package configuration '%s' used."""
         return self.data.keys()
 
     def items(self):
+        self._loadAllModuleData()
+
         return self.data.items()
 
     def update(self, other):
@@ -486,6 +537,8 @@ Error, empty (or malformed?) user package configuration '%s' used."""
         for key, value in other.items():
             # assert key not in self.data, key
             if key in self.data:
+                self._getModuleData(key)
+
                 new_implicit_imports = value.get("implicit-imports", None)
                 if new_implicit_imports:
                     value.pop("implicit-imports")
@@ -545,6 +598,94 @@ def parseYaml(logger, data, error_message):
 
 _yaml_cache = {}
 
+# Bump this, if the format of the package configuration cache changes.
+_package_config_cache_version = 1
+
+
+def _getPackageConfigCacheFilename(file_data, check_checksums):
+    hash_value = Hash()
+
+    hash_value.updateFromBytes(file_data)
+
+    # Pickle formats and the Nuitka code parsing it, matter too.
+    hash_value.updateFromValues(
+        sys.version,
+        version_string,
+        _package_config_cache_version,
+        "check_checksums" if check_checksums else "no_check_checksums",
+    )
+
+    return getNormalizedPathJoin(
+        getCacheDir("package-config"), hash_value.asHexDigest() + ".pickle"
+    )
+
+
+def _loadPackageConfigCache(cache_filename):
+    if not os.path.exists(cache_filename):
+        return None
+
+    try:
+        return pickle.loads(getFileContents(cache_filename, mode="rb"))
+    except Exception:  # Catch all the things, pylint: disable=broad-except
+        # Corrupt or incompatible cache file, rather parse again.
+        return None
+
+
+def _storePackageConfigCache(cache_filename, package_config):
+    cache_data = (
+        OrderedDict(
+            (module_name, pickle.dumps(module_data, -1))
+            for module_name, module_data in package_config.data.items()
+        ),
+        tuple(package_config.bad_checksum_modules),
+    )
+
+    makePath(os.path.dirname(cache_filename))
+
+    # Other compilations might use the cache at the same time.
+    cache_filename_tmp = "%s.tmp%d" % (cache_filename, os.getpid())
+    putBinaryFileContents(cache_filename_tmp, pickle.dumps(cache_data, -1))
+    replaceFileAtomic(cache_filename_tmp, cache_filename)
+
+
+def _makePackageConfigYaml(
+    logger, name, file_data, assume_yes_for_downloads, check_checksums, use_cache
+):
+    """Create package configuration, using a parsed form from the cache if possible.
+
+    Parsing the YAML is slow, so it is cached keyed by the file contents, and
+    each module configuration is unpickled only when first used.
+    """
+    if use_cache:
+        cache_filename = _getPackageConfigCacheFilename(
+            file_data=file_data, check_checksums=check_checksums
+        )
+
+        cached_data = _loadPackageConfigCache(cache_filename)
+
+        if cached_data is not None:
+            return PackageConfigYaml(
+                logger=logger,
+                name=name,
+                file_data=file_data,
+                assume_yes_for_downloads=assume_yes_for_downloads,
+                check_checksums=check_checksums,
+                cached_data=cached_data,
+            )
+
+    result = PackageConfigYaml(
+        logger=logger,
+        name=name,
+        file_data=file_data,
+        assume_yes_for_downloads=assume_yes_for_downloads,
+        check_checksums=check_checksums,
+    )
+
+    if use_cache:
+        _storePackageConfigCache(cache_filename=cache_filename, package_config=result)
+
+    return result
+
 
 def getYamlDataHash(data):
     result = HashCRC32()
@@ -554,7 +695,12 @@ def getYamlDataHash(data):
 
 
 def parsePackageYaml(
-    logger, package_name, filename, assume_yes_for_downloads, check_checksums
+    logger,
+    package_name,
+    filename,
+    assume_yes_for_downloads,
+    check_checksums,
+    use_cache=False,
 ):
     key = package_name, filename
 
@@ -567,12 +713,13 @@ def parsePackageYaml(
         if file_data is None:
             raise IOError("Cannot find %s.%s" % (package_name, filename))
 
-        _yaml_cache[key] = PackageConfigYaml(
+        _yaml_cache[key] = _makePackageConfigYaml(
             logger=logger,
             name=filename,
             file_data=file_data,
             assume_yes_for_downloads=assume_yes_for_downloads,
             check_checksums=check_checksums,
+            use_cache=use_cache,
         )
 
     return _yaml_cache[key]
@@ -589,6 +736,8 @@ def getYamlPackageConfiguration(logger, assume_yes_for_downloads, check_checksum
     if logger is None:
         logger = general
 
+    use_cache = not shallDisablePackageConfigCacheUsage()
+
     if _package_config is None:
         _package_config = parsePackageYaml(
             logger=logger,
@@ -596,6 +745,7 @@ def getYamlPackageConfiguration(logger, assume_yes_for_downloads, check_checksum
             filename="standard.nuitka-package.config.yml",
             assume_yes_for_downloads=assume_yes_for_downloads,
             check_checksums=check_checksums,
+            use_cache=use_cache,
         )
         _package_config.update(
             parsePackageYaml(
@@ -604,6 +754,7 @@ def getYamlPackageConfiguration(logger, assume_yes_for_downloads, check_checksum
                 filename="stdlib2.nuitka-package.config.yml",
                 assume_yes_for_downloads=assume_yes_for_downloads,
                 check_checksums=check_checksums,
+                use_cache=use_cache,
             )
         )
         _package_config.update(
@@ -613,6 +764,7 @@ def getYamlPackageConfiguration(logger, assume_yes_for_downloads, check_checksum
                 filename="stdlib3.nuitka-package.config.yml",
                 assume_yes_for_downloads=assume_yes_for_downloads,
                 check_checksums=check_checksums,
+                use_cache=use_cache,
             )
         )
 
@@ -624,6 +776,7 @@ def getYamlPackageConfiguration(logger, assume_yes_for_downloads, check_checksum
                     filename="commercial.nuitka-package.config.yml",
                     assume_yes_for_downloads=assume_yes_for_downloads,
                     check_checksums=check_checksums,
+                    use_cache=use_cache,
                 )
             )
         except IOError:
@@ -634,12 +787,13 @@ def getYamlPackageConfiguration(logger, assume_yes_for_downloads, check_checksum
         # about it somewhat.
         for user_yaml_filename in getUserProvidedYamlFiles():
             _package_config.update(
-                PackageConfigYaml(
+                _makePackageConfigYaml(
                     logger=logger,
                     name=user_yaml_filename,
                     file_data=getFileContents(user_yaml_filename, mode="rb"),
                     assume_yes_for_downloads=assume_yes_for_downloads,
                     check_checksums=check_checksums,
+                    use_cache=use_cache,
                 )
             )
 
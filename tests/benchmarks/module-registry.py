@@ -0,0 +1,138 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Speed of module registry lookups with many modules.
+
+Fills the registry of Nuitka with synthetic modules, half of them done and
+half of them active, and then times lookups by name of each kind, and getting
+the done modules, which large programs do all the time during compilation.
+Run it with the Nuitka version to measure, e.g. from a git checkout.
+"""
+
+import os
+import sys
+import time
+
+# Find nuitka package relative to us.
+sys.path.insert(
+    0,
+    os.path.normpath(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+    ),
+)
+
+# isort:start
+
+from nuitka import ModuleRegistry
+
+module_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+lookup_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+done_modules_count = 100
+
+
+class SyntheticModule(object):
+    """Only what the registry uses of modules."""
+
+    kind = "py"
+
+    def __init__(self, module_name):
+        self.module_name = module_name
+
+    def getFullName(self):
+        return self.module_name
+
+    def startTraversal(self):
+        pass
+
+    @staticmethod
+    def isTopModule():
+        return True
+
+
+def fillRegistry():
+    ModuleRegistry.addRootModule(SyntheticModule("__main__"))
+    ModuleRegistry.startTraversal()
+
+    for count in range(module_count):
+        ModuleRegistry.addUsedModule(
+            module=SyntheticModule("package.module_%d" % count),
+            using_module=None,
+            usage_tag="import",
+            reason="synthetic",
+            source_ref=None,
+        )
+
+    # Half of the modules are done, the others still active.
+    for _count in range(module_count // 2):
+        ModuleRegistry.nextModule()
+
+
+def timeCall(description, count, function, *args):
+    start = time.time()
+
+    for _count in range(count):
+        function(*args)
+
+    print("%-40s %8.3fs" % (description, time.time() - start))
+
+
+def main():
+    start = time.time()
+    fillRegistry()
+    print(
+        "%-40s %8.3fs"
+        % ("Filling with %d modules" % module_count, time.time() - start)
+    )
+
+    # Look up a module late in the registry, which is the worst case for a
+    # scan, active and done, and one that is not there.
+    for module_name in (
+        "package.module_%d" % (module_count - 1),
+        "package.module_%d" % (module_count // 2 - 1),
+        "package.missing",
+    ):
+        timeCall(
+            "%d getModuleByName(%s)" % (lookup_count, module_name.split(".")[-1]),
+            lookup_count,
+            ModuleRegistry.getModuleByName,
+            module_name,
+        )
+
+    timeCall(
+        "%d hasDoneModule" % lookup_count,
+        lookup_count,
+        ModuleRegistry.hasDoneModule,
+        "package.module_0",
+    )
+    timeCall(
+        "%d getModuleInclusionInfoByName" % lookup_count,
+        lookup_count,
+        ModuleRegistry.getModuleInclusionInfoByName,
+        "package.missing",
+    )
+    timeCall(
+        "%d getDoneModules" % done_modules_count,
+        done_modules_count,
+        ModuleRegistry.getDoneModules,
+    )
+
+
+if __name__ == "__main__":
+    main()
+
+#     Python test originally created or extracted from other peoples work. The
+#     parts from me are licensed as below. It is at least Free Software where
+#     it's copied from other people. In these cases, that will normally be
+#     indicated.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
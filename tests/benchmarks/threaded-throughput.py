@@ -0,0 +1,106 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Throughput of compiled code with multiple threads.
+
+Runs the same work in 1, 2, 4, ... threads, up to the number of CPUs, and
+reports how throughput scales. Without a GIL, i.e. with free-threaded Python,
+this should scale with the threads, as the work uses function creation,
+closures, generators, frames and module variables, which all use free lists
+or caches of the compiled runtime, that must not be shared by threads.
+"""
+
+import multiprocessing
+import sys
+import threading
+import time
+
+rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+module_value = 3
+
+
+def makeAdder(value):
+    def adder(x):
+        return x + value + module_value
+
+    return adder
+
+
+def generateValues(count):
+    for i in range(count):
+        yield i * module_value
+
+
+def work(count):
+    total = 0
+
+    for i in range(count):
+        adder = makeAdder(i)
+
+        for value in generateValues(5):
+            total += adder(value)
+
+    return total
+
+
+def runThreads(thread_count):
+    threads = [
+        threading.Thread(target=work, args=(rounds,)) for _i in range(thread_count)
+    ]
+
+    start = time.time()
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return thread_count * rounds / (time.time() - start)
+
+
+def main():
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    print("GIL enabled: %s" % gil_enabled)
+
+    cpu_count = multiprocessing.cpu_count()
+
+    thread_counts = [1]
+    while thread_counts[-1] * 2 <= cpu_count:
+        thread_counts.append(thread_counts[-1] * 2)
+
+    single_throughput = None
+
+    for thread_count in thread_counts:
+        throughput = runThreads(thread_count)
+
+        if single_throughput is None:
+            single_throughput = throughput
+
+        print(
+            "%2d threads: %10.0f rounds/s, scaling %.2f"
+            % (thread_count, throughput, throughput / single_throughput)
+        )
+
+
+if __name__ == "__main__":
+    main()
+
+#     Python test originally created or extracted from other peoples work. The
+#     parts from me are licensed as below. It is at least Free Software where
+#     it's copied from other people. In these cases, that will normally be
+#     indicated.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
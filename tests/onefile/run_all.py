@@ -11,6 +11,7 @@ mode, trying to find issues with that form of packaging.
 
 
 import os
+import subprocess
 import sys
 
 # Find nuitka package relative to us. The replacement is for POSIX python
@@ -47,7 +48,12 @@ from nuitka.tools.testing.RuntimeTracing import (
     doesSupportTakingRuntimeTrace,
     getRuntimeTraceOfLoadedFiles,
 )
-from nuitka.utils.FileOperations import deleteFile
+from nuitka.utils.FileOperations import (
+    deleteFile,
+    getFileContents,
+    putBinaryFileContents,
+    removeDirectory,
+)
 from nuitka.utils.Timing import TimerReport
 from nuitka.utils.Utils import isMacOS
 
@@ -59,6 +65,49 @@ def displayError(dirname, filename):
     displayFileContents("inclusion log", inclusion_log_path)
 
 
+def _checkManifestReuse(binary_filename):
+    unpacked_dir = os.path.abspath("manifest-reuse-unpacked")
+    manifest_filename = unpacked_dir + ".manifest"
+
+    try:
+        # Already ran for comparison, so the manifest must exist.
+        if not os.path.exists(manifest_filename):
+            return "no manifest was written"
+
+        manifest_contents = getFileContents(manifest_filename, mode="rb")
+
+        if manifest_contents[:4] != b"KAMF":
+            return "manifest has no valid header"
+
+        # A warm start must not write the manifest again.
+        manifest_mtime = os.stat(manifest_filename).st_mtime
+        subprocess.check_call([binary_filename])
+
+        if os.stat(manifest_filename).st_mtime != manifest_mtime:
+            return "manifest was not reused"
+
+        # With a different payload hash, it must not be reused, but replaced.
+        # The hash follows the magic, entry count, and payload size.
+        stale_contents = bytearray(manifest_contents)
+        stale_contents[16] ^= 0xFF
+        putBinaryFileContents(manifest_filename, bytes(stale_contents))
+
+        subprocess.check_call([binary_filename])
+
+        if getFileContents(manifest_filename, mode="rb") != manifest_contents:
+            return "manifest of other payload was not replaced"
+    finally:
+        removeDirectory(
+            unpacked_dir,
+            logger=test_logger,
+            ignore_errors=True,
+            extra_recommendation=None,
+        )
+        deleteFile(manifest_filename, must_exist=False)
+
+    return None
+
+
 def main():
     python_version = setup(suite="onefile", needs_io_encoding=True)
 
@@ -153,6 +202,15 @@ def main():
         )
 
         try:
+            if filename == "ManifestReuseTest.py":
+                manifest_error = _checkManifestReuse(binary_filename)
+
+                if manifest_error is not None:
+                    test_logger.warning(
+                        "Onefile manifest check failed, %s." % manifest_error
+                    )
+                    search_mode.onErrorDetected(1)
+
             if not doesSupportTakingRuntimeTrace():
                 test_logger.info("Runtime traces are not possible on this machine.")
                 continue
@@ -0,0 +1,58 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Python PGO test for recorded call counts and the branch hints from them."""
+
+# nuitka-project: --pgo-python
+
+from __future__ import print_function
+
+
+def calledOften(value):
+    if value >= 0:
+        value += 1
+
+    if value < 0:
+        value -= 1
+
+    return value
+
+
+def neverCalled(value):
+    print("Never called with", value)
+
+    return value * 2
+
+
+def main():
+    total = 0
+
+    for count in range(1000):
+        total += calledOften(count)
+
+    print("Total", total)
+
+    if total < 0:
+        print(neverCalled(total), neverCalled(-total))
+
+
+main()
+
+print("OK.")
+
+#     Python test originally created or extracted from other peoples work. The
+#     parts from me are licensed as below. It is at least Free Software where
+#     it's copied from other people. In these cases, that will normally be
+#     indicated.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
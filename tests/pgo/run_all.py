@@ -24,6 +24,7 @@ sys.path.insert(
 
 from nuitka.reports.CompilationReportReader import (
     extractModulesUsedByModule,
+    extractPythonPgoDecisions,
     parseCompilationReport,
 )
 from nuitka.tools.testing.Common import (
@@ -34,6 +35,82 @@ from nuitka.tools.testing.Common import (
 )
 
 
+def _checkUnusedModule(compilation_report):
+    modules_used = extractModulesUsedByModule(
+        compilation_report=compilation_report, module_name="__main__"
+    )
+    assert (
+        modules_used["ImportedButMaybeNotUsed"]["exclusion_reason"]
+        == "PGO based decision"
+    ), modules_used
+
+
+def _getPgoDecisions(decisions, owner_name):
+    return [
+        decision
+        for (module_name, name), decision in decisions.items()
+        if module_name == "__main__" and name.startswith(owner_name + ":")
+    ]
+
+
+def _checkBranchHints(compilation_report):
+    function_decisions, branch_decisions, _type_decisions = extractPythonPgoDecisions(
+        compilation_report
+    )
+
+    (called_often,) = _getPgoDecisions(function_decisions, "calledOften")
+    assert called_often["calls"] == 1000, called_often
+    assert called_often["hotness"] == "hot", called_often
+
+    (never_called,) = _getPgoDecisions(function_decisions, "neverCalled")
+    assert never_called["calls"] == 0, never_called
+    assert never_called["hotness"] == "cold", never_called
+
+    # The first branch is always taken, the second never.
+    branches = _getPgoDecisions(branch_decisions, "calledOften")
+    assert [
+        (branch["taken"], branch["not_taken"], branch["hint"]) for branch in branches
+    ] == [(1000, 0, "likely"), (0, 1000, "unlikely")], branches
+
+
+def _getPgoTypeDecisions(type_decisions, owner_name):
+    # Site names are of the form "owner:line:...", give the part after that.
+    return dict(
+        (name.split(":", 2)[2], decision)
+        for (module_name, name), decision in type_decisions.items()
+        if module_name == "__main__" and name.startswith(owner_name + ":")
+    )
+
+
+def _checkTypeGuards(compilation_report):
+    _function_decisions, _branch_decisions, type_decisions = (
+        extractPythonPgoDecisions(compilation_report)
+    )
+
+    # The arguments and operands are dominated by "int", and code is to be
+    # specialized for it.
+    add_numbers = _getPgoTypeDecisions(type_decisions, "addNumbers")
+    assert sorted(
+        (name, decision["specialized"]) for name, decision in add_numbers.items()
+    ) == [
+        ("left", "int"),
+        ("operation0:0", "int"),
+        ("operation0:1", "int"),
+        ("right", "int"),
+    ], add_numbers
+
+    # Without a dominant type, nothing is specialized.
+    add_anything = _getPgoTypeDecisions(type_decisions, "addAnything")
+    operand = add_anything["operation0:0"]
+    assert operand["specialized"] == "none", operand
+    assert operand["observed"] == {"int": 500, "str": 500}, operand
+
+    # Attribute lookups are specialized for the type of their source.
+    append_value = _getPgoTypeDecisions(type_decisions, "appendValue")
+    attribute_source = append_value["attribute0:append"]
+    assert attribute_source["specialized"] == "list", attribute_source
+
+
 def main():
     setup(suite="pgo", needs_io_encoding=True)
 
@@ -73,13 +150,12 @@ def main():
 
             compilation_report = parseCompilationReport(report_filename)
 
-            modules_used = extractModulesUsedByModule(
-                compilation_report=compilation_report, module_name="__main__"
-            )
-            assert (
-                modules_used["ImportedButMaybeNotUsed"]["exclusion_reason"]
-                == "PGO based decision"
-            ), modules_used
+            if filename == "unused_module":
+                _checkUnusedModule(compilation_report)
+            elif filename == "branch_hints":
+                _checkBranchHints(compilation_report)
+            elif filename == "type_guards":
+                _checkTypeGuards(compilation_report)
 
     search_mode.finish()
 
@@ -0,0 +1,62 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+"""Python PGO test for recorded types and the code specialized for them."""
+
+# nuitka-project: --pgo-python
+
+from __future__ import print_function
+
+
+def addNumbers(left, right):
+    return left + right
+
+
+def addAnything(left, right):
+    return left + right
+
+
+def appendValue(values, value):
+    values.append(value)
+
+
+def main():
+    total = 0
+    values = []
+
+    for count in range(1000):
+        total = addNumbers(total, count)
+
+        appendValue(values, count)
+
+        if count % 2:
+            addAnything(count, count)
+        else:
+            addAnything(str(count), str(count))
+
+    print("Total", total, len(values))
+
+    # After specialization, other types must still work through the guards.
+    print("Strings", addNumbers("a", "b"), addNumbers(1.5, 2))
+
+
+main()
+
+print("OK.")
+
+#     Python test originally created or extracted from other peoples work. The
+#     parts from me are licensed as below. It is at least Free Software where
+#     it's copied from other people. In these cases, that will normally be
+#     indicated.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
@@ -0,0 +1,34 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+# nuitka-project: --follow-imports
+# nuitka-project: --experimental=module-skipping
+
+""" Modules skipped in later optimization passes must keep their uses.
+
+Complex calls use helper functions that are owned by another module, these
+were released when the module using them was skipped in a later pass, and
+code generation then crashed.
+"""
+
+import star_calls
+import star_calls_user
+
+print(star_calls.callWithStars(max, 1, 2))
+print(star_calls.callWithStars(dict, a=1, b=2) == {"a": 1, "b": 2})
+print(star_calls_user.callAll())
+
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
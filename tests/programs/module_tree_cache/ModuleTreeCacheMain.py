@@ -0,0 +1,34 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+# nuitka-project: --follow-imports
+# nuitka-project: --experimental=module-tree-cache
+
+""" Modules restored from the optimized tree cache must work the same.
+
+The first compilation writes the tree of "cached_module" to the cache, later
+ones restore it, including its use of helper functions owned by another module.
+"""
+
+import cached_module
+
+print(cached_module.callWithStars(max, 1, 2))
+print(cached_module.Counter(3).values())
+print(list(cached_module.generateSquares(4)))
+print(cached_module.makeAdder(2)(5))
+print(cached_module.module_value, not cached_module.module_value)
+
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
@@ -0,0 +1,45 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+import sys
+
+module_value = sys.version_info[0] > 1
+
+
+def callWithStars(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+class Counter(object):
+    def __init__(self, count):
+        self.count = count
+
+    def values(self):
+        return [value for value in range(self.count)]
+
+
+def generateSquares(count):
+    for value in range(count):
+        yield value * value
+
+
+def makeAdder(value):
+    def adder(x):
+        return x + value
+
+    return adder
+
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
@@ -0,0 +1,124 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+# nuitka-project: --runtime-sampling-profiler
+# nuitka-skip-unless-expression: os.name != "nt"
+
+""" Sampling profiler output must contain the frames of the program.
+
+The program runs itself again with the profiler activated, and then checks
+the collapsed stacks written by it for the frames of the work done. Without
+compilation, there is no profiler, so then there is nothing to check.
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def profiledInnerFunction(duration):
+    # Busy loop, the profiling timer only counts used processor time.
+    end = time.time() + duration
+    count = 0
+
+    while time.time() < end:
+        count += 1
+
+    return count
+
+
+def profiledOuterFunction():
+    for _i in range(5):
+        profiledInnerFunction(0.1)
+
+
+expected_frame_names = ("<module>", "profiledOuterFunction", "profiledInnerFunction")
+
+
+def readCollapsedStacks(filename):
+    stacks = []
+
+    with open(filename) as profile_file:
+        for line in profile_file:
+            stack, count = line.rstrip("\n").rsplit(" ", 1)
+
+            stacks.append(
+                (
+                    tuple(frame.split(" (", 1)[0] for frame in stack.split(";")),
+                    int(count),
+                )
+            )
+
+    return stacks
+
+
+def checkProfile(filename):
+    stacks = readCollapsedStacks(filename)
+
+    print("Samples taken:", sum(count for _stack, count in stacks) > 0)
+
+    frame_names = set()
+    for stack, _count in stacks:
+        frame_names.update(stack)
+
+    for frame_name in expected_frame_names:
+        print("Frame %s found:" % frame_name, frame_name in frame_names)
+
+    # Collapsed stacks start with the outermost frame.
+    print(
+        "Calls nested:",
+        any(
+            stack[-2:] == ("profiledOuterFunction", "profiledInnerFunction")
+            for stack, _count in stacks
+        ),
+    )
+
+
+def main():
+    if "NUITKA_SAMPLING_PROFILE" in os.environ:
+        profiledOuterFunction()
+        return
+
+    if "__compiled__" not in globals():
+        print("Samples taken:", True)
+        for frame_name in expected_frame_names:
+            print("Frame %s found:" % frame_name, True)
+        print("Calls nested:", True)
+        return
+
+    output_dir = tempfile.mkdtemp()
+    profile_filename = os.path.join(output_dir, "profile.txt")
+
+    try:
+        env = dict(os.environ)
+        env["NUITKA_SAMPLING_PROFILE"] = profile_filename
+        env["NUITKA_SAMPLING_PROFILE_INTERVAL"] = "1000"
+
+        subprocess.check_call([sys.argv[0]], env=env)
+
+        checkProfile(profile_filename)
+    finally:
+        shutil.rmtree(output_dir)
+
+
+main()
+
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
@@ -0,0 +1,146 @@
+#     Copyright 2025, Kay Hayen, mailto:kay.hayen@gmail.com find license text at end of file
+
+
+# nuitka-project: --follow-imports
+# nuitka-project: --runtime-startup-trace
+
+""" Startup trace output must be valid Chrome trace event JSON.
+
+The program runs itself again with the startup trace activated, and then
+checks the events written, which are left as an unterminated JSON array, for
+the startup steps, and the imports done, also from another thread. Without
+compilation, there is no startup trace, so then there is nothing to check.
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+expected_event_names = (
+    "Nuitka_Py_Initialize",
+    "createGlobalConstants",
+    "EXECUTE_MAIN_MODULE",
+    "traced_module",
+    "traced_thread_module",
+)
+
+
+def importInThread():
+    # Imported for the trace only, pylint: disable=unused-import
+    import traced_thread_module
+
+
+def runTracedImports():
+    # Imported for the trace only, pylint: disable=unused-import
+    import traced_module
+
+    thread = threading.Thread(target=importInThread)
+    thread.start()
+    thread.join()
+
+
+def readTraceEvents(filename):
+    with open(filename) as trace_file:
+        trace = trace_file.read()
+
+    # The array may be left unterminated, and with a trailing comma, which
+    # viewers of the trace event format accept.
+    trace = trace.rstrip()
+
+    if not trace.endswith("]"):
+        trace = trace.rstrip(",") + "]"
+
+    return json.loads(trace)
+
+
+def checkEventNesting(events):
+    # Begin and end events must balance for every thread.
+    depths = {}
+
+    for event in events:
+        if event["ph"] not in ("B", "E"):
+            continue
+
+        key = event["pid"], event["tid"]
+
+        if event["ph"] == "B":
+            depths[key] = depths.get(key, 0) + 1
+        else:
+            depths[key] = depths.get(key, 0) - 1
+
+            if depths[key] < 0:
+                return False
+
+    return not any(depths.values())
+
+
+def checkTrace(filename):
+    events = readTraceEvents(filename)
+
+    print("Trace parsed:", type(events) is list)
+    print("Events nested:", checkEventNesting(events))
+
+    begin_events = dict(
+        (event["name"], event) for event in events if event["ph"] == "B"
+    )
+
+    for event_name in expected_event_names:
+        print("Event %s found:" % event_name, event_name in begin_events)
+
+    print(
+        "Thread import separate:",
+        begin_events["traced_module"]["tid"]
+        != begin_events["traced_thread_module"]["tid"],
+    )
+
+
+def main():
+    if "NUITKA_STARTUP_TRACE" in os.environ:
+        runTracedImports()
+        return
+
+    if "__compiled__" not in globals():
+        print("Trace parsed:", True)
+        print("Events nested:", True)
+        for event_name in expected_event_names:
+            print("Event %s found:" % event_name, True)
+        print("Thread import separate:", True)
+        return
+
+    output_dir = tempfile.mkdtemp()
+    trace_filename = os.path.join(output_dir, "trace.json")
+
+    try:
+        env = dict(os.environ)
+        env["NUITKA_STARTUP_TRACE"] = trace_filename
+        env.pop("NUITKA_STARTUP_TRACE_APPEND", None)
+
+        subprocess.check_call([sys.argv[0]], env=env)
+
+        checkTrace(trace_filename)
+    finally:
+        shutil.rmtree(output_dir)
+
+
+main()
+
+#     Python tests originally created or extracted from other peoples work. The
+#     parts were too small to be protected.
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.